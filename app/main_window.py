@@ -47,6 +47,7 @@ from imaging.image_loader import ImageLoader
 from inspection.alert_tracker import AlertTracker
 from config.inspection_parameters import InspectionParameters
 from config.inspection_parameters_io import load_parameters
+from config.debug_log import DebugLog, lazy
 from config.camera_parameters_io import load_camera_parameters, save_camera_parameters
 from config.auto_run_setting_io import load_auto_run_setting
 from imaging.pocket_teach_overlay import PocketTeachOverlay
@@ -203,6 +204,15 @@ class MainWindow(QMainWindow):
         # Debug flags - matches C++ m_lDebugFlag and m_bDebugSaveFailedImages
         from config.debug_flags_io import load_debug_flags
         self.debug_flag = load_debug_flags()  # Bitwise OR of all debug flags
+        # Per-station override of debug_flag for production runs (e.g. DEBUG_TIME on Doc1 only);
+        # flags are scoped per inspection, so the other stations are not slowed down
+        from config.debug_flags_io import load_station_debug_flags
+        station_names = {station.value: station for station in Station}
+        self.station_debug_flags = {
+            station_names[name]: flags
+            for name, flags in load_station_debug_flags().items()
+            if name in station_names
+        }
         from config.debug_flags import DEBUG_SAVE_FAIL_IMAGE
         self.debug_save_failed_images = bool(self.debug_flag & DEBUG_SAVE_FAIL_IMAGE)
         # Sync step mode from debug flags
@@ -3863,10 +3873,13 @@ All lot counters reset and ready for next lot."""
         """Display an image (possibly with overlays) without overwriting the original."""
         self.displayed_image = image
 
-        # Debug: Verify current_image is not being modified
+        # Debug: Verify current_image is not being modified (means only computed when logged)
         if self.current_image is not None:
-            mean_val = cv2.mean(self.current_image)[0]
-            print(f"[DEBUG] current_image mean: {mean_val:.1f}, displayed_image mean: {cv2.mean(image)[0]:.1f}")
+            current_image = self.current_image
+            DebugLog(self.debug_flag)(
+                "[DEBUG] current_image mean: {:.1f}, displayed_image mean: {:.1f}",
+                lazy(lambda: cv2.mean(current_image)[0]), lazy(lambda: cv2.mean(image)[0])
+            )
 
         # IMPORTANT: Create a copy of the RGB data to prevent memory sharing with QImage
         rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
@@ -3992,13 +4005,16 @@ All lot counters reset and ready for next lot."""
         # Get station-specific parameters with shared flags
         params = self.inspection_parameters_by_station[test_station]
 
-        # Debug: Log image state before test
-        mean_before = cv2.mean(self.current_image)[0]
+        # Debug: Log image state before test (full-frame statistics only computed when logged)
+        debug_log = DebugLog(self.debug_flag)
+        current_image = self.current_image
         # Also check the ROI region that will be tested
         x, y, w, h = params.package_x, params.package_y, params.package_w, params.package_h
-        roi_crop = self.current_image[y:y+h, x:x+w]
-        roi_mean = cv2.mean(roi_crop)[0]
-        print(f"[DEBUG] Before test - current_image mean: {mean_before:.1f}, ROI mean: {roi_mean:.1f}")
+        debug_log(
+            "[DEBUG] Before test - current_image mean: {:.1f}, ROI mean: {:.1f}",
+            lazy(lambda: cv2.mean(current_image)[0]),
+            lazy(lambda: cv2.mean(current_image[y:y+h, x:x+w])[0])
+        )
 
         print(f"\n[TEST] Station: {station}")
         if station == Station.BOTTOM:
@@ -4016,9 +4032,9 @@ All lot counters reset and ready for next lot."""
             # FEED station test
             if step_mode_active:
                 print(f"[TEST] Step Mode ENABLED - running step-by-step inspection")
-                # Create explicit copy using numpy to prevent any reference sharing
-                test_image = np.array(self.current_image, copy=True, order='C')
-                print(f"[DEBUG] Test image copy - id={id(test_image)}")
+                # No copy needed: the inspection never modifies its input frame (overlays go to a private copy)
+                test_image = self.current_image
+                debug_log("[DEBUG] Test image - id={}", id(test_image))
                 result = test_feed(
                     image=test_image,
                     params=params,
@@ -4027,9 +4043,9 @@ All lot counters reset and ready for next lot."""
                     debug_flags=debug_flags
                 )
             else:
-                # Create explicit copy using numpy to prevent any reference sharing
-                test_image = np.array(self.current_image, copy=True, order='C')
-                print(f"[DEBUG] Test image copy - id={id(test_image)}")
+                # No copy needed: the inspection never modifies its input frame (overlays go to a private copy)
+                test_image = self.current_image
+                debug_log("[DEBUG] Test image - id={}", id(test_image))
                 result = test_feed(
                     image=test_image,
                     params=params,
@@ -4039,14 +4055,14 @@ All lot counters reset and ready for next lot."""
             # TOP/BOTTOM test with optional step mode
             if step_mode_active:
                 print(f"[TEST] Step Mode ENABLED - running step-by-step inspection")
-                # Create explicit copy using numpy to prevent any reference sharing
-                # FORCE new memory allocation by using array constructor
-                test_image = np.array(self.current_image, copy=True, order='C')
-                # Verify the copy is independent
-                test_mean = cv2.mean(test_image)[0]
-                test_roi = test_image[y:y+h, x:x+w]
-                test_roi_mean = cv2.mean(test_roi)[0]
-                print(f"[DEBUG] Test image copy - mean: {test_mean:.1f}, ROI mean: {test_roi_mean:.1f}, id={id(test_image)}")
+                # No copy needed: the inspection never modifies its input frame (overlays go to a private copy)
+                test_image = self.current_image
+                debug_log(
+                    "[DEBUG] Test image - mean: {:.1f}, ROI mean: {:.1f}, id={}",
+                    lazy(lambda: cv2.mean(test_image)[0]),
+                    lazy(lambda: cv2.mean(test_image[y:y+h, x:x+w])[0]),
+                    id(test_image)
+                )
                 result = test_top_bottom(
                     image=test_image,
                     params=params,
@@ -4055,21 +4071,22 @@ All lot counters reset and ready for next lot."""
                     debug_flags=debug_flags
                 )
             else:
-                # Create explicit copy using numpy to prevent any reference sharing
-                # FORCE new memory allocation by using array constructor
-                test_image = np.array(self.current_image, copy=True, order='C')
-                # Verify the copy is independent
-                test_mean = cv2.mean(test_image)[0]
-                test_roi = test_image[y:y+h, x:x+w]
-                test_roi_mean = cv2.mean(test_roi)[0]
-                print(f"[DEBUG] Test image copy - mean: {test_mean:.1f}, ROI mean: {test_roi_mean:.1f}, id={id(test_image)}")
+                # No copy needed: the inspection never modifies its input frame (overlays go to a private copy)
+                test_image = self.current_image
+                debug_log(
+                    "[DEBUG] Test image - mean: {:.1f}, ROI mean: {:.1f}, id={}",
+                    lazy(lambda: cv2.mean(test_image)[0]),
+                    lazy(lambda: cv2.mean(test_image[y:y+h, x:x+w])[0]),
+                    id(test_image)
+                )
                 result = test_top_bottom(
                     image=test_image,
                     params=params,
                     debug_flags=debug_flags
                 )
 
-        if result.result_image is not None:
+        # has_image: the overlay itself is only rendered when it is shown or saved
+        if result.has_image:
             from config.debug_flags import DEBUG_DRAW
             if self.debug_flag & DEBUG_DRAW:
                 self._show_image(result.result_image)
@@ -4077,8 +4094,7 @@ All lot counters reset and ready for next lot."""
                 self._show_image(self.current_image)
 
         # Debug: Verify current_image wasn't modified by test
-        mean_after = cv2.mean(self.current_image)[0]
-        print(f"[DEBUG] After test - current_image mean: {mean_after:.1f}")
+        debug_log("[DEBUG] After test - current_image mean: {:.1f}", lazy(lambda: cv2.mean(self.current_image)[0]))
 
         # Check alert threshold if test failed
         if result.status == TestStatus.FAIL:
@@ -4234,10 +4250,8 @@ All lot counters reset and ready for next lot."""
             # Get station-specific parameters
             params = self.inspection_parameters_by_station[test_station]
             
-            # Run inspection based on station
-            debug_flags = self.debug_flag
-            from config.debug_runtime import set_debug_flags
-            set_debug_flags(debug_flags)
+            # Run inspection based on station (flags are scoped to this station thread's inspection)
+            debug_flags = self.station_debug_flags.get(station, self.debug_flag)
             
             if station == Station.FEED:
                 result = test_feed(
@@ -4253,7 +4267,8 @@ All lot counters reset and ready for next lot."""
                 )
             
             # Update UI with result image in the corresponding Doc panel
-            if result.result_image is not None and doc_index in self.camera_panels:
+            # has_image: the overlay itself is only rendered when DEBUG_DRAW shows it
+            if result.has_image and doc_index in self.camera_panels:
                 from config.debug_flags import DEBUG_DRAW
                 if self.debug_flag & DEBUG_DRAW:
                     self._display_image_in_panel(doc_index, result.result_image)
@@ -4,38 +4,67 @@ Debug Flags Configuration I/O - integer flag storage
 
 import json
 from pathlib import Path
+from typing import Dict, Optional
 
 DEBUG_FLAGS_FILE = Path("debug_flags.json")
 
-def load_debug_flags() -> int:
-    """
-    Load debug flags from JSON file.
-    Returns integer flag value (bitwise OR of all enabled flags).
-    Matches C++ behavior of loading flags into long m_lDebugFlag.
-    """
+
+def _load_debug_flags_data() -> dict:
+    """Raw content of the debug flags file ({} if missing or unreadable)."""
     if not DEBUG_FLAGS_FILE.exists():
-        return 0
+        return {}
     
     try:
         with open(DEBUG_FLAGS_FILE, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        
-        # Return the integer flag value
-        return data.get('debug_flag', 0)
+        return data if isinstance(data, dict) else {}
     
     except (json.JSONDecodeError, IOError):
-        return 0
+        return {}
+
+def load_debug_flags() -> int:
+    """
+    Load debug flags from JSON file.
+    Returns integer flag value (bitwise OR of all enabled flags).
+    Matches C++ behavior of loading flags into long m_lDebugFlag.
+    """
+    # Return the integer flag value
+    return _load_debug_flags_data().get('debug_flag', 0)
+
+
+def load_station_debug_flags() -> Dict[str, int]:
+    """
+    Load per-station debug flag overrides from the same JSON file.
+    Returns {station name: integer flag value}, e.g. {"Feed": 256} to time
+    only the FEED station; stations without an entry use debug_flag.
+    """
+    station_flags = _load_debug_flags_data().get('station_debug_flags', {})
+    if not isinstance(station_flags, dict):
+        return {}
+    
+    result = {}
+    for station, flags in station_flags.items():
+        try:
+            result[str(station)] = int(flags)
+        except (TypeError, ValueError):
+            continue
+    return result
 
 
-def save_debug_flags(debug_flag: int) -> None:
+def save_debug_flags(debug_flag: int, station_flags: Optional[Dict[str, int]] = None) -> None:
     """
     Save debug flags to JSON file.
     Saves integer flag value (bitwise OR of all enabled flags).
     Matches C++ behavior of saving long m_lDebugFlag.
+    station_flags replaces the per-station overrides; None keeps the saved ones.
     """
+    if station_flags is None:
+        station_flags = load_station_debug_flags()
     data = {
         'debug_flag': debug_flag
     }
+    if station_flags:
+        data['station_debug_flags'] = dict(station_flags)
     
     try:
         with open(DEBUG_FLAGS_FILE, 'w', encoding='utf-8') as f:
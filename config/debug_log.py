@@ -0,0 +1,75 @@
+"""
+Lazy debug logging for the inspection hot path.
+
+A DebugLog is bound to a debug flag word and a category mask. Messages are
+str.format templates whose arguments are only formatted when the category is
+enabled, so a disabled call costs one flag test:
+
+    log = DebugLog(debug_flags)
+    log("[INFO] Body width: {:.1f}px", width)
+    edge_log = log.category(DEBUG_EDGE)
+    edge_log("[DEBUG] {} edge points", len(points))
+    log("[DEBUG] Frame mean={:.1f}", lazy(lambda: cv2.mean(image)[0]))
+
+Wrap arguments that are expensive to compute (full-frame statistics, ...) in
+lazy(); they are then only evaluated when the message is printed.
+Templates without arguments are printed as-is (no brace escaping needed).
+"""
+
+from config.debug_flags import (
+    DEBUG_PRINT, DEBUG_PRINT_EXT, DEBUG_EDGE, DEBUG_BLOB,
+    DEBUG_HIST, DEBUG_TIME, DEBUG_TIME_EXT
+)
+from config.debug_runtime import get_debug_flags
+
+# Any of these flags turns on the general inspection log (same as is_debug_enabled)
+DEBUG_LOG_MASK = (
+    DEBUG_PRINT | DEBUG_PRINT_EXT | DEBUG_EDGE |
+    DEBUG_BLOB | DEBUG_HIST | DEBUG_TIME | DEBUG_TIME_EXT
+)
+
+
+class lazy:
+    """Log argument computed only when the message is actually formatted."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __format__(self, spec):
+        return format(self.fn(), spec)
+
+    def __str__(self):
+        return str(self.fn())
+
+    def __repr__(self):
+        return repr(self.fn())
+
+
+class DebugLog:
+    """
+    Debug output gated by a debug flag category.
+
+    Args:
+        flags: Debug flag word (None = current config.debug_runtime flags)
+        mask: Category flags that enable this log (default: any print flag)
+    """
+
+    __slots__ = ("flags", "mask", "enabled")
+
+    def __init__(self, flags=None, mask=DEBUG_LOG_MASK):
+        self.flags = get_debug_flags() if flags is None else flags
+        self.mask = mask
+        self.enabled = bool(self.flags & mask)
+
+    def __bool__(self):
+        return self.enabled
+
+    def __call__(self, msg, *args):
+        if self.enabled:
+            print(msg.format(*args) if args else msg)
+
+    def category(self, mask):
+        """Log for another category, bound to the same flag word."""
+        return DebugLog(self.flags, mask)
@@ -1,29 +1,47 @@
 """
 Runtime Debug Flag State - shared by inspection functions.
+
+The flags live in a context variable, not a process global: every station
+thread (ProductionController) and every inspection scoped with
+debug_flags_context() sees its own value, so stations can run concurrently
+with different debug settings. New threads start with flags 0; use
+contextvars.copy_context() to hand the caller's flags to a worker thread.
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from config.debug_flags import (
     DEBUG_PRINT, DEBUG_PRINT_EXT, DEBUG_EDGE, DEBUG_BLOB,
     DEBUG_HIST, DEBUG_TIME, DEBUG_TIME_EXT
 )
 
-_current_debug_flags: int = 0
+_current_debug_flags: ContextVar[int] = ContextVar("debug_flags", default=0)
 
 
 def set_debug_flags(flags: int) -> None:
-    """Set current debug flags for runtime checks."""
-    global _current_debug_flags
-    _current_debug_flags = flags
+    """Set debug flags for runtime checks in the current thread / context."""
+    _current_debug_flags.set(flags)
 
 
 def get_debug_flags() -> int:
-    """Get current debug flags."""
-    return _current_debug_flags
+    """Get debug flags of the current thread / context."""
+    return _current_debug_flags.get()
+
+
+@contextmanager
+def debug_flags_context(flags: int):
+    """Use flags for runtime checks inside the with block (one inspection)."""
+    token = _current_debug_flags.set(flags)
+    try:
+        yield
+    finally:
+        _current_debug_flags.reset(token)
 
 
 def is_debug_enabled() -> bool:
     """Return True if any debug print flag is enabled."""
-    return bool(_current_debug_flags & (
+    return bool(_current_debug_flags.get() & (
         DEBUG_PRINT | DEBUG_PRINT_EXT | DEBUG_EDGE |
         DEBUG_BLOB | DEBUG_HIST | DEBUG_TIME | DEBUG_TIME_EXT
     ))
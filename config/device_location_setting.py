@@ -35,10 +35,12 @@ class DeviceLocationSetting:
     # Shift Tolerance
     x_pkg_shift_tol: int = 50
     y_pkg_shift_tol: int = 50
+    pkg_search_window: bool = False
     
     # Sampling
     x_sampling_size: int = 1
     y_sampling_size: int = 1
+    pyramid_scale: int = 1
     
     # Angle & Height
     max_parallel_angle: int = 10
@@ -0,0 +1,122 @@
+"""
+Inspection timing - always-on per-check spans and rolling latency statistics.
+
+Every inspection records one Span per check (plus location / mark steps):
+name, duration (time.perf_counter_ns), pixels processed and verdict. The
+spans are attached to the TestResult and, when the caller opened a timing
+sink (ProductionController does this per station), aggregated into rolling
+p50/p95/p99 latency windows.
+
+Recording a span is a perf_counter_ns() call and a list append; percentiles
+are only computed when statistics are requested.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import NamedTuple
+
+# Span name of the whole inspection (test_top_bottom / test_feed call)
+INSPECTION_SPAN = "Inspection"
+
+
+class Span(NamedTuple):
+    """One timed step of an inspection."""
+    name: str
+    duration_ns: int
+    pixels: int = 0
+    passed: bool = True
+
+    @property
+    def duration_ms(self):
+        return self.duration_ns / 1e6
+
+
+def add_span(spans, name, start_ns, pixels=0, passed=True):
+    """Append a Span that started at start_ns (time.perf_counter_ns()) and ends now."""
+    spans.append(Span(name, time.perf_counter_ns() - start_ns, int(pixels), bool(passed)))
+
+
+class LatencyWindow:
+    """Rolling window of durations (ns) with nearest-rank percentiles."""
+
+    def __init__(self, size=1000):
+        self.durations = deque(maxlen=size)
+        self.count = 0
+        self.fails = 0
+        self.pixels = 0
+
+    def add(self, span):
+        self.durations.append(span.duration_ns)
+        self.count += 1
+        self.pixels += span.pixels
+        if not span.passed:
+            self.fails += 1
+
+    def percentile(self, q, ordered=None):
+        ordered = ordered if ordered is not None else sorted(self.durations)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, math.ceil(q / 100.0 * len(ordered)) - 1))
+        return ordered[index] / 1e6
+
+    def summary(self):
+        ordered = sorted(self.durations)
+        return {
+            "count": self.count,
+            "fails": self.fails,
+            "avg_pixels": self.pixels / self.count if self.count else 0,
+            "p50_ms": self.percentile(50, ordered),
+            "p95_ms": self.percentile(95, ordered),
+            "p99_ms": self.percentile(99, ordered),
+            "max_ms": ordered[-1] / 1e6 if ordered else 0.0,
+        }
+
+
+class InspectionTimingStats:
+    """Rolling latency windows per span name for one station (thread-safe)."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def record(self, spans):
+        with self._lock:
+            for span in spans:
+                latency = self._windows.get(span.name)
+                if latency is None:
+                    latency = self._windows[span.name] = LatencyWindow(self.window)
+                latency.add(span)
+
+    def summary(self):
+        """{span name: {count, fails, avg_pixels, p50_ms, p95_ms, p99_ms, max_ms}}"""
+        with self._lock:
+            return {name: latency.summary() for name, latency in self._windows.items()}
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+
+
+_timing_sink: ContextVar = ContextVar("inspection_timing_sink", default=None)
+
+
+@contextmanager
+def inspection_timing_sink(stats):
+    """Aggregate the spans of inspections run inside the with block into stats."""
+    token = _timing_sink.set(stats)
+    try:
+        yield stats
+    finally:
+        _timing_sink.reset(token)
+
+
+def record_inspection(spans):
+    """Hand finished inspection spans to the current timing sink, if any."""
+    stats = _timing_sink.get()
+    if stats is not None:
+        stats.record(spans)
@@ -24,6 +24,7 @@ from device.camera_registry import CameraRegistry
 from device.mvs_camera import MVSCamera
 from imaging.grab_service import GrabService
 from device.io_constants import RESULT_PASS, RESULT_FAIL_GENERAL
+from config.inspection_timing import InspectionTimingStats, inspection_timing_sink
 
 
 @dataclass
@@ -73,6 +74,8 @@ class ProductionController:
             "total_passed": 0,
             "total_failed": 0
         }
+        # Rolling per-check latency per station (doc_index), fed by the inspection spans
+        self.timing_stats: Dict[int, InspectionTimingStats] = {}
     
     def configure_station(self, doc_index: int, position_sensor_line: int,
                          camera_trigger_line: int, ejector_distance: int = 0,
@@ -321,8 +324,13 @@ class ProductionController:
             True if passed, False if failed
         """
         if self.inspection_callback:
+            timing = self.timing_stats.get(doc_index)
+            if timing is None:
+                timing = self.timing_stats.setdefault(doc_index, InspectionTimingStats())
             try:
-                return self.inspection_callback(doc_index, frame)
+                # Spans of the inspection run by the callback go to this station's statistics
+                with inspection_timing_sink(timing):
+                    return self.inspection_callback(doc_index, frame)
             except Exception as e:
                 print(f"[Doc{doc_index}] Inspection callback error: {e}")
                 return False
@@ -332,8 +340,24 @@ class ProductionController:
             return True
     
     def get_statistics(self) -> dict:
-        """Get production statistics."""
-        return self.stats.copy()
+        """
+        Get production statistics.
+
+        "latency" maps each station name to {span name: {count, fails,
+        avg_pixels, p50_ms, p95_ms, p99_ms, max_ms}} over the last 1000
+        inspections; span names are the checks, the location / mark steps
+        and "Inspection" for the whole call.
+        """
+        stats = self.stats.copy()
+        stats["latency"] = {
+            self._station_name(doc_index): timing.summary()
+            for doc_index, timing in self.timing_stats.items()
+        }
+        return stats
+    
+    def _station_name(self, doc_index: int) -> str:
+        config = self.station_configs.get(doc_index)
+        return config.station_name if config else f"Doc{doc_index}"
     
     def reset_statistics(self) -> None:
         """Reset production statistics."""
@@ -342,6 +366,8 @@ class ProductionController:
             "total_passed": 0,
             "total_failed": 0
         }
+        for timing in self.timing_stats.values():
+            timing.reset()
 
 
 # Example usage configuration for old system stations
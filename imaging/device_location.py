@@ -6,9 +6,13 @@ Based on ChipCap-Oldversion blob-based location method with comprehensive parame
 
 import numpy as np
 import cv2
-from typing import Tuple, Optional, Dict, List
+from typing import Tuple, Optional, Dict, List, Iterable, Union
 from dataclasses import dataclass
 
+from config.debug_flags import DEBUG_BLOB, DEBUG_EDGE
+from config.debug_log import DebugLog
+from imaging.roi import cut_by_window, grow_rect
+
 
 @dataclass
 class DeviceLocationResult:
@@ -24,11 +28,75 @@ class DeviceLocationResult:
     method: str = "blob"  # blob, edge, or hybrid
 
 
+# Edge-scan angles that rotate losslessly with a transpose/flip
+_EXACT_ROTATIONS = {
+    90: cv2.ROTATE_90_COUNTERCLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_CLOCKWISE,
+}
+
+# Pixel stride of the whole-frame sample a search-window scan thresholds against
+_FRAME_MEAN_STRIDE = 4
+
+
+def package_search_rect(
+    settings: Dict,
+    taught_rect: Optional[Tuple[int, int, int, int]],
+    frame_shape: Tuple[int, ...]
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Search window (x, y, w, h) for package detection, or None for the whole frame.
+
+    With pkg_search_window enabled the detector only scans the taught package
+    rectangle grown by the X/Y package shift tolerances, clipped to the frame.
+    """
+    if not settings.get("pkg_search_window", False) or not taught_rect:
+        return None
+    x, y, w, h = (int(v) for v in taught_rect)
+    if w <= 0 or h <= 0:
+        return None
+
+    frame_h, frame_w = frame_shape[:2]
+    tol_x = max(0, int(settings.get("x_pkg_shift_tol", 50)))
+    tol_y = max(0, int(settings.get("y_pkg_shift_tol", 50)))
+    x1, y1 = max(0, x - tol_x), max(0, y - tol_y)
+    x2, y2 = min(frame_w, x + w + tol_x), min(frame_h, y + h + tol_y)
+    if x2 <= x1 or y2 <= y1 or (x2 - x1) * (y2 - y1) >= frame_w * frame_h:
+        return None
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def _mask_rects(rects) -> List[Tuple[int, int, int, int]]:
+    """Mask rects (x, y, w, h) as ints; malformed entries are skipped."""
+    parsed = []
+    for rect in rects or []:
+        try:
+            x, y, w, h = (int(v) for v in rect)
+        except (TypeError, ValueError):
+            continue
+        parsed.append((x, y, w, h))
+    return parsed
+
+
+def _window_slices(rect, origin: Tuple[int, int]) -> Tuple[slice, slice]:
+    """Row/column slices of a frame rect (x, y, w, h) in an image whose [0, 0] is at origin."""
+    x, y, w, h = rect
+    x, y = int(x) - origin[0], int(y) - origin[1]
+    return slice(max(0, y), max(0, y + int(h))), slice(max(0, x), max(0, x + int(w)))
+
+
 class DeviceLocationDetector:
     """Comprehensive device location detector with all features"""
     
-    def __init__(self, settings: Dict):
-        """Initialize detector with settings"""
+    def __init__(self, settings: Dict, frame_shape: Optional[Tuple[int, ...]] = None):
+        """Initialize detector with settings.
+
+        Everything that only depends on the settings (kernel, mask rects,
+        ignore mask width, filter flags) is built here once; with frame_shape
+        the full-frame edge-scan rotation is prepared as well. Reuse one
+        detector across frames with the same settings (detector argument of
+        detect_device_location, InspectionPlan.device_location_detector).
+        """
         self.settings = settings
         self.enable_edge_scan = settings.get("enable_edge_scan", True)
         self.enable_reverse_edge = settings.get("enable_reverse_edge", False)
@@ -54,13 +122,45 @@ class DeviceLocationDetector:
         self.ignore_left = settings.get("ignore_left", False)
         self.ignore_right = settings.get("ignore_right", False)
         self.line_mask_count = settings.get("line_mask_count", 0)
+        self.pyramid_scale = max(1, int(settings.get("pyramid_scale", 1) or 1))
+
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (self.dilate_size, self.dilate_size))
+        self._mask_size = self._ignore_mask_size()
+        self._reflection_rects = _mask_rects(settings.get("reflection_mask", [])) \
+            if settings.get("enable_reflection_mask", False) else []
+        self._line_rects = _mask_rects(settings.get("line_masks", [])[:self.line_mask_count]) \
+            if self.line_mask_count > 0 else []
+        self._filters = bool(
+            settings.get("enable_4color", False)
+            or self._reflection_rects
+            or self._line_rects
+            or settings.get("ignore_blue", False)
+            or settings.get("filter_red_enable", False)
+        )
+        # (plane shape, angle) -> (rotation matrix, inverse, rotated size)
+        self._rotations: Dict[Tuple[int, int, int], Tuple[np.ndarray, np.ndarray, Tuple[int, int]]] = {}
+        if frame_shape is not None and self.enable_edge_scan:
+            self._rotation(frame_shape, self._edge_angle())
         
     def detect(
         self,
         image: np.ndarray,
-        debug: bool = False
+        debug: bool = False,
+        context=None,
+        search_rect: Optional[Tuple[int, int, int, int]] = None,
+        window: Optional[Tuple[int, int, int, int]] = None
     ) -> DeviceLocationResult:
-        """Detect device location using configured methods"""
+        """Detect device location using configured methods.
+
+        When an InspectionContext is given and no color filter is active, the
+        detection plane is taken from the context instead of copying the frame.
+        search_rect is the taught package rectangle; with pkg_search_window
+        enabled only the window around it is scanned (see package_search_rect)
+        and the result is returned in frame coordinates. An explicit window
+        (x, y, w, h), e.g. a tracker prediction, is scanned instead.
+        With pyramid_scale > 1 the package is located on a 1/pyramid_scale
+        plane and refined at full resolution (x/y sampling is then unused).
+        """
         
         if image is None or image.size == 0:
             return DeviceLocationResult(
@@ -74,11 +174,45 @@ class DeviceLocationDetector:
                 contrast=0, confidence=0, message="Package location disabled", method="none"
             )
 
-        # Apply optional filters on color image
-        proc = self.apply_filters(image, debug)
+        # Ignore scan masks cover the borders of the search area. An explicit
+        # window is scanned without them, so it must stay clear of them.
+        mask_size = self._mask_size
+        area = package_search_rect(self.settings, search_rect, image.shape)
+        if window is not None:
+            if mask_size and self._masks_reach(window, area or (0, 0, image.shape[1], image.shape[0]), mask_size):
+                window = None
+            else:
+                mask_size = 0
+        if window is None:
+            window = area
+        origin = (window[0], window[1]) if window is not None else (0, 0)
+        # A window scan keeps the whole-frame binarization level
+        frame_mean = None
+        if window is not None:
+            frame_mean = self._frame_mean(context.frame if context is not None else image)
+
+        if context is not None and not self._filters_active():
+            # Unfiltered frame: reuse the shared per-frame planes
+            proc = context.frame
+            gray = self._select_gray(proc, context)
+            if window is not None:
+                wx, wy, ww, wh = window
+                proc = proc[wy:wy + wh, wx:wx + ww]
+                gray = gray[wy:wy + wh, wx:wx + ww]
+        else:
+            if window is not None:
+                # Filter only the search window (mask rects are shifted to it)
+                wx, wy, ww, wh = window
+                image = image[wy:wy + wh, wx:wx + ww]
+
+            # Apply optional filters on color image
+            proc = self.apply_filters(image, debug, origin=origin)
 
-        # Select image mode for detection
-        gray = self._select_gray(proc)
+            # Select image mode for detection
+            gray = self._select_gray(proc)
+
+        if debug and window is not None:
+            print(f"[DEBUG] Search window: {window}, frame mean={frame_mean:.1f}")
 
         # Flip check (use full-resolution gray)
         if self.enable_flip_check and self._check_flip(proc, gray, debug):
@@ -87,6 +221,11 @@ class DeviceLocationDetector:
                 contrast=0, confidence=0, message="Flip detected", method="none"
             )
 
+        # Coarse-to-fine: coarse pass on a downscaled plane, refined at full resolution
+        if self.pyramid_scale > 1:
+            result = self._locate_pyramid(gray, self.pyramid_scale, debug, frame_mean, mask_size)
+            return self._apply_post_checks(result, 1, 1, debug, origin)
+
         # Sampling (downscale) for speed
         scale_x = max(1, int(self.x_sampling_size))
         scale_y = max(1, int(self.y_sampling_size))
@@ -97,49 +236,108 @@ class DeviceLocationDetector:
             if debug:
                 print(f"[DEBUG] Sampling: scaled to {gray.shape[1]}x{gray.shape[0]} (x{scale_x}, y{scale_y})")
         
-        # Convert to grayscale
-        if len(gray.shape) != 2:
-            gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
-        
         if debug:
             print(f"[DEBUG] Device Location: Image shape={image.shape}")
             print(f"[DEBUG] Methods enabled: edge_scan={self.enable_edge_scan}, "
                   f"reverse_edge={self.enable_reverse_edge}, 4color={self.enable_4color}")
+
+        result = self._locate(gray, debug, frame_mean, mask_size)
+        return self._apply_post_checks(result, scale_x, scale_y, debug, origin)
+
+    def _locate(
+        self,
+        gray: np.ndarray,
+        debug: bool = False,
+        mean_intensity: Optional[float] = None,
+        mask_size: int = 0
+    ) -> DeviceLocationResult:
+        """Edge scan (if enabled) with blob fallback on one plane; bbox in plane coordinates."""
         
         # Step 1: Try edge scan method if enabled
         if self.enable_edge_scan:
             edge_gray = gray
-            angle = int(self.reverse_edge_angle if self.enable_reverse_edge else self.edge_scan_angle) % 360
+            angle = self._edge_angle()
 
-            if angle != 0:
-                edge_gray, rot_m, rot_size = self._rotate_image(gray, angle)
+            inv_m = None
+            if angle in _EXACT_ROTATIONS:
+                # Lossless transpose/flip, no interpolation or border fill
+                edge_gray = cv2.rotate(gray, _EXACT_ROTATIONS[angle])
+                if debug:
+                    print(f"[DEBUG] Edge Scan: rotated image by {angle}° (exact)")
+            elif angle != 0:
+                edge_gray, inv_m, rot_size = self._rotate_image(gray, angle)
                 if debug:
                     print(f"[DEBUG] Edge Scan: rotated image by {angle}° (size={rot_size})")
-            else:
-                rot_m, rot_size = None, None
 
-            edge_result = self._detect_with_edge_scan(edge_gray, debug)
+            edge_result = self._detect_with_edge_scan(edge_gray, debug, mean_intensity, mask_size)
 
-            if edge_result.detected and rot_m is not None:
-                edge_result = self._map_affine_result(edge_result, rot_m, gray.shape, debug)
+            if edge_result.detected and angle in _EXACT_ROTATIONS:
+                edge_result = self._map_exact_rotation(edge_result, angle, gray.shape, debug)
+            elif edge_result.detected and inv_m is not None:
+                edge_result = self._map_affine_result(edge_result, inv_m, gray.shape, debug)
 
             if edge_result.detected:
-                edge_result = self._apply_post_checks(edge_result, scale_x, scale_y, debug)
                 return edge_result
         
         # Step 2: Fallback to blob-based detection
-        blob_result = self._detect_with_blob(gray, debug)
-        blob_result = self._apply_post_checks(blob_result, scale_x, scale_y, debug)
-        return blob_result
+        return self._detect_with_blob(gray, debug, mean_intensity, mask_size)
+
+    def _locate_pyramid(
+        self,
+        gray: np.ndarray,
+        scale: int,
+        debug: bool = False,
+        mean_intensity: Optional[float] = None,
+        mask_size: int = 0
+    ) -> DeviceLocationResult:
+        """
+        Two-level search: locate on a 1/scale plane, then re-detect at full
+        resolution in a band around the coarse box only.
+
+        Both passes threshold around the full-resolution mean, so the refined
+        box is the one a full-resolution scan finds. If the refinement fails,
+        is cut off by its window or would reach the ignore scan masks, the
+        whole plane is scanned at full resolution.
+        """
+        h, w = gray.shape[:2]
+        if mean_intensity is None:
+            mean_intensity = cv2.mean(gray)[0]
+
+        coarse = cv2.resize(gray, (max(1, w // scale), max(1, h // scale)), interpolation=cv2.INTER_AREA)
+        coarse_result = self._locate(coarse, debug, mean_intensity, mask_size // scale)
+
+        if coarse_result.detected:
+            # Coarse box error: one coarse pixel plus the morphology at coarse scale
+            band = scale * (2 + self.dilate_size)
+            window = grow_rect(
+                (coarse_result.x * scale, coarse_result.y * scale,
+                 coarse_result.width * scale, coarse_result.height * scale),
+                band, band, (0, 0, w, h)
+            )
+            if window is not None and not (mask_size and self._masks_reach(window, (0, 0, w, h), mask_size)):
+                wx, wy, ww, wh = window
+                refined = self._locate(gray[wy:wy + wh, wx:wx + ww], debug, mean_intensity, 0)
+                if refined.detected:
+                    refined.x += wx
+                    refined.y += wy
+                    if not cut_by_window((refined.x, refined.y, refined.width, refined.height), window, (0, 0, w, h)):
+                        if debug:
+                            print(f"[DEBUG] Pyramid: coarse 1/{scale} box refined in window {window}")
+                        return refined
+
+        if debug:
+            print(f"[DEBUG] Pyramid: refinement failed, full-resolution scan")
+        return self._locate(gray, debug, mean_intensity, mask_size)
 
     def _apply_post_checks(
         self,
         result: DeviceLocationResult,
         scale_x: int,
         scale_y: int,
-        debug: bool = False
+        debug: bool = False,
+        origin: Tuple[int, int] = (0, 0)
     ) -> DeviceLocationResult:
-        """Apply post-detection validation and scaling."""
+        """Apply post-detection validation, scaling and the search window offset."""
 
         if not result.detected:
             return result
@@ -153,6 +351,10 @@ class DeviceLocationDetector:
             if debug:
                 print(f"[DEBUG] Scaled result back: ({result.x}, {result.y}, {result.width}x{result.height})")
 
+        # Search window back to frame coordinates
+        result.x += origin[0]
+        result.y += origin[1]
+
         # Index gap check
         if self.index_gap_enable and result.y < int(self.index_gap_min_y):
             if debug:
@@ -165,25 +367,47 @@ class DeviceLocationDetector:
 
         return result
 
-    def _select_gray(self, image: np.ndarray) -> np.ndarray:
+    def _select_gray(self, image: np.ndarray, context=None) -> np.ndarray:
         """Select grayscale image based on settings."""
         if len(image.shape) != 3:
-            return image.copy()
+            return context.gray if context is not None else image.copy()
 
         # Use red package location or explicit color selection
         if self.enable_red_pkg_location or self.settings.get("insp_img_red", False):
-            return image[:, :, 2]
+            return context.channel("r") if context is not None else image[:, :, 2]
         if self.settings.get("insp_img_green", False):
-            return image[:, :, 1]
+            return context.channel("g") if context is not None else image[:, :, 1]
         if self.settings.get("insp_img_blue", False):
-            return image[:, :, 0]
+            return context.channel("b") if context is not None else image[:, :, 0]
 
         # Default: merge (grayscale)
+        if context is not None:
+            return context.gray
         return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
-    def _rotate_image(self, gray: np.ndarray, angle: int) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
-        """Rotate image by arbitrary angle and return rotated image and matrix."""
-        h, w = gray.shape[:2]
+    def _frame_mean(self, image: np.ndarray) -> float:
+        """Mean of the filtered detection plane over the whole frame, from a strided sample."""
+        sample = image[::_FRAME_MEAN_STRIDE, ::_FRAME_MEAN_STRIDE]
+        if self._filters_active():
+            sample = self.apply_filters(sample, masks=False)
+        return float(np.mean(self._select_gray(sample)))
+
+    def _filters_active(self) -> bool:
+        """Return True if apply_filters would modify the frame."""
+        return self._filters
+
+    def _edge_angle(self) -> int:
+        """Edge-scan rotation angle in degrees (0-359)."""
+        return int(self.reverse_edge_angle if self.enable_reverse_edge else self.edge_scan_angle) % 360
+
+    def _rotation(self, shape: Tuple[int, ...], angle: int) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
+        """Rotation matrix, its inverse and the rotated size for a plane shape, built once per shape."""
+        h, w = shape[:2]
+        key = (h, w, angle)
+        cached = self._rotations.get(key)
+        if cached is not None:
+            return cached
+
         center = (w / 2.0, h / 2.0)
         rot_m = cv2.getRotationMatrix2D(center, angle, 1.0)
 
@@ -195,19 +419,51 @@ class DeviceLocationDetector:
         rot_m[0, 2] += (new_w / 2.0) - center[0]
         rot_m[1, 2] += (new_h / 2.0) - center[1]
 
-        rotated = cv2.warpAffine(gray, rot_m, (new_w, new_h), flags=cv2.INTER_LINEAR)
-        return rotated, rot_m, (new_w, new_h)
+        cached = (rot_m, cv2.invertAffineTransform(rot_m), (new_w, new_h))
+        self._rotations[key] = cached
+        return cached
+
+    def _rotate_image(self, gray: np.ndarray, angle: int) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
+        """Rotate image by arbitrary angle and return rotated image, inverse matrix and size."""
+        rot_m, inv_m, size = self._rotation(gray.shape, angle)
+        rotated = cv2.warpAffine(gray, rot_m, size, flags=cv2.INTER_LINEAR)
+        return rotated, inv_m, size
+
+    def _map_exact_rotation(
+        self,
+        result: DeviceLocationResult,
+        angle: int,
+        orig_shape: Tuple[int, int],
+        debug: bool = False
+    ) -> DeviceLocationResult:
+        """Map a bbox found in a cv2.rotate'd image back to original coordinates."""
+        orig_h, orig_w = orig_shape[:2]
+        x, y, w, h = result.x, result.y, result.width, result.height
+
+        if angle == 90:
+            # Counter-clockwise: rotated pixel (x', y') is original (W-1-y', x')
+            x, y, w, h = orig_w - y - h, x, h, w
+        elif angle == 180:
+            x, y = orig_w - x - w, orig_h - y - h
+        else:
+            # 270 (clockwise): rotated pixel (x', y') is original (y', H-1-x')
+            x, y, w, h = y, orig_h - x - w, h, w
+
+        if debug:
+            print(f"[DEBUG] Edge Scan: mapped bbox back to ({x}, {y}, {w}x{h})")
+
+        result.x, result.y, result.width, result.height = x, y, w, h
+        return result
 
     def _map_affine_result(
         self,
         result: DeviceLocationResult,
-        rot_m: np.ndarray,
+        inv_m: np.ndarray,
         orig_shape: Tuple[int, int],
         debug: bool = False
     ) -> DeviceLocationResult:
-        """Map rotated detection result back to original coordinates using inverse affine."""
+        """Map rotated detection result back to original coordinates using the inverse affine."""
         orig_h, orig_w = orig_shape[:2]
-        inv_m = cv2.invertAffineTransform(rot_m)
 
         corners = np.array([
             [result.x, result.y],
@@ -240,15 +496,19 @@ class DeviceLocationDetector:
     def _detect_with_edge_scan(
         self,
         gray: np.ndarray,
-        debug: bool = False
+        debug: bool = False,
+        mean_intensity: Optional[float] = None,
+        mask_size: int = 0
     ) -> DeviceLocationResult:
-        """Detect using edge scanning method"""
+        """Detect using edge scanning method (threshold around mean_intensity, default: gray mean)"""
         
-        if debug:
-            print(f"[DEBUG] Edge Scan: Using edge detection method")
+        # Edge scan details are gated by the DEBUG_EDGE category
+        edge_log = DebugLog(None if debug else 0).category(DEBUG_EDGE)
+        edge_log("[DEBUG] Edge Scan: Using edge detection method")
         
         # Create binary image
-        mean_intensity = np.mean(gray)
+        if mean_intensity is None:
+            mean_intensity = np.mean(gray)
         lower = max(0, int(mean_intensity) - self.contrast)
         upper = min(255, int(mean_intensity) + self.contrast + self.contrast_plus)
         
@@ -260,16 +520,15 @@ class DeviceLocationDetector:
             binary = cv2.inRange(gray, lower, upper)
             binary = cv2.bitwise_not(binary)
 
-        binary = self._apply_ignore_masks(binary)
+        binary = self._apply_ignore_masks(binary, mask_size)
         
-        if debug:
+        if edge_log:
             white_pixels = np.count_nonzero(binary)
-            print(f"[DEBUG] Edge Scan: White pixels={white_pixels} ({white_pixels/binary.size*100:.1f}%)")
+            edge_log("[DEBUG] Edge Scan: White pixels={} ({:.1f}%)", white_pixels, white_pixels / binary.size * 100)
         
         # Morphological operations
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (self.dilate_size, self.dilate_size))
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=1)
+        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self._kernel, iterations=1)
+        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, self._kernel, iterations=1)
         
         # Find contours
         contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -312,8 +571,7 @@ class DeviceLocationDetector:
         confidence = (area_ratio * 0.6 + contrast_ratio * 0.4) * 100
         confidence = min(confidence, 100)
         
-        if debug:
-            print(f"[DEBUG] Edge Scan Result: ({x}, {y}, {w}x{h}), confidence={confidence:.1f}%")
+        edge_log("[DEBUG] Edge Scan Result: ({}, {}, {}x{}), confidence={:.1f}%", x, y, w, h, confidence)
         
         return DeviceLocationResult(
             detected=True, x=x, y=y, width=w, height=h,
@@ -324,32 +582,28 @@ class DeviceLocationDetector:
     def _detect_with_blob(
         self,
         gray: np.ndarray,
-        debug: bool = False
+        debug: bool = False,
+        mean_intensity: Optional[float] = None,
+        mask_size: int = 0
     ) -> DeviceLocationResult:
-        """Detect using blob-based method"""
+        """Detect using blob-based method (threshold around mean_intensity, default: gray mean)"""
         
-        # Gate blob debug output by DEBUG_BLOB flag
-        # Import here to avoid circular imports
-        if debug:
-            from config.debug_flags import DEBUG_BLOB
-            from config.debug_runtime import get_debug_flags
-            should_log_blob = bool(get_debug_flags() & DEBUG_BLOB)
-            
-            if should_log_blob:
-                print(f"[DEBUG] Blob Detection: Using blob analysis method")
+        # Blob details are gated by the DEBUG_BLOB category
+        blob_log = DebugLog(None if debug else 0).category(DEBUG_BLOB)
+        blob_log("[DEBUG] Blob Detection: Using blob analysis method")
         
-        mean_intensity = np.mean(gray)
+        if mean_intensity is None:
+            mean_intensity = np.mean(gray)
         lower = max(0, int(mean_intensity) - self.contrast)
         upper = min(255, int(mean_intensity) + self.contrast + self.contrast_plus)
         
         binary = cv2.inRange(gray, lower, upper)
         binary = cv2.bitwise_not(binary)
 
-        binary = self._apply_ignore_masks(binary)
+        binary = self._apply_ignore_masks(binary, mask_size)
         
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (self.dilate_size, self.dilate_size))
-        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=1)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
+        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, self._kernel, iterations=1)
+        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self._kernel, iterations=1)
         
         contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
@@ -379,13 +633,7 @@ class DeviceLocationDetector:
         confidence = (area_ratio * 0.6 + contrast_ratio * 0.4) * 100
         confidence = min(confidence, 100)
         
-        if debug:
-            from config.debug_flags import DEBUG_BLOB
-            from config.debug_runtime import get_debug_flags
-            should_log_blob = bool(get_debug_flags() & DEBUG_BLOB)
-            
-            if should_log_blob:
-                print(f"[DEBUG] Blob Result: ({x}, {y}, {w}x{h}), confidence={confidence:.1f}%")
+        blob_log("[DEBUG] Blob Result: ({}, {}, {}x{}), confidence={:.1f}%", x, y, w, h, confidence)
         
         return DeviceLocationResult(
             detected=True, x=x, y=y, width=w, height=h,
@@ -467,11 +715,21 @@ class DeviceLocationDetector:
     def apply_filters(
         self,
         image: np.ndarray,
-        debug: bool = False
+        debug: bool = False,
+        origin: Tuple[int, int] = (0, 0),
+        masks: bool = True
     ) -> np.ndarray:
-        """Apply color filters and image processing"""
+        """Apply color filters and image processing.
+
+        origin is the frame position of image[0, 0] when image is a search
+        window crop; reflection and line mask rects are given in frame
+        coordinates and are shifted by it. masks=False skips the rect masks
+        (for subsampled frames).
+        """
         
-        result = image.copy()
+        # Only the rect masks write into the frame; the other filters return new arrays
+        zero_rects = masks and bool(self._reflection_rects or self._line_rects)
+        result = image.copy() if zero_rects else image
 
         # 4-color enhancement (contrast adjustment)
         if self.settings.get("enable_4color", False):
@@ -482,19 +740,18 @@ class DeviceLocationDetector:
                 print(f"[DEBUG] 4-color enhancement applied: threshold={threshold}")
 
         # Reflection mask (optional)
-        if self.settings.get("enable_reflection_mask", False):
-            mask_rects = self.settings.get("reflection_mask", [])
-            for rect in mask_rects:
-                try:
-                    x, y, w, h = rect
-                    result[y:y+h, x:x+w] = 0
-                except Exception:
-                    continue
-            if debug and mask_rects:
-                print(f"[DEBUG] Reflection mask applied: {len(mask_rects)} regions")
-
-        # Line masks (optional)
-        result = self._apply_line_masks(result, debug)
+        if masks and self._reflection_rects:
+            for rect in self._reflection_rects:
+                result[_window_slices(rect, origin)] = 0
+            if debug:
+                print(f"[DEBUG] Reflection mask applied: {len(self._reflection_rects)} regions")
+
+        # Line masks (optional); result is already a copy
+        if masks and self._line_rects:
+            for rect in self._line_rects:
+                result[_window_slices(rect, origin)] = 0
+            if debug:
+                print(f"[DEBUG] Line masks applied: {len(self._line_rects)} regions")
         
         # Blue filter
         if self.settings.get("ignore_blue", False):
@@ -527,9 +784,26 @@ class DeviceLocationDetector:
         
         return result
 
-    def _apply_ignore_masks(self, binary: np.ndarray) -> np.ndarray:
-        """Apply ignore scan masks to binary image."""
-        mask_size = int(self.edge_scan_mask_y) if self.edge_scan_mask_y else 0
+    def _ignore_mask_size(self) -> int:
+        """Width of the ignore scan masks, or 0 if no side is ignored."""
+        if not (self.ignore_top or self.ignore_bottom or self.ignore_left or self.ignore_right):
+            return 0
+        return max(0, int(self.edge_scan_mask_y)) if self.edge_scan_mask_y else 0
+
+    @staticmethod
+    def _masks_reach(rect, area, mask_size: int) -> bool:
+        """True if rect (x, y, w, h) comes within mask_size of a border of the search area (x, y, w, h).
+
+        Checked against every side: with an edge-scan rotation the masked sides
+        of the rotated plane map to other sides of the frame.
+        """
+        x, y, w, h = rect
+        ax, ay, aw, ah = area
+        return x < ax + mask_size or y < ay + mask_size \
+            or x + w > ax + aw - mask_size or y + h > ay + ah - mask_size
+
+    def _apply_ignore_masks(self, binary: np.ndarray, mask_size: int) -> np.ndarray:
+        """Apply ignore scan masks (mask_size px wide) to binary image."""
         if mask_size <= 0:
             return binary
 
@@ -546,28 +820,6 @@ class DeviceLocationDetector:
 
         return binary
 
-    def _apply_line_masks(self, image: np.ndarray, debug: bool = False) -> np.ndarray:
-        """Apply line masks from settings if present."""
-        if self.line_mask_count <= 0:
-            return image
-
-        mask_rects = self.settings.get("line_masks", [])
-        if not mask_rects:
-            return image
-
-        masked = image.copy()
-        for rect in mask_rects[: self.line_mask_count]:
-            try:
-                x, y, w, h = rect
-                masked[y:y+h, x:x+w] = 0
-            except Exception:
-                continue
-
-        if debug:
-            print(f"[DEBUG] Line masks applied: {min(len(mask_rects), self.line_mask_count)} regions")
-
-        return masked
-
 
 def detect_device_location(
     image: np.ndarray,
@@ -578,7 +830,11 @@ def detect_device_location(
     recheck_val: int = 50,
     use_red_detection: bool = False,
     settings_dict: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
+    search_rect: Optional[Tuple[int, int, int, int]] = None,
+    tracker=None,
+    detector: Optional[DeviceLocationDetector] = None
 ) -> DeviceLocationResult:
     """
     Detect the location of the device package in the image.
@@ -593,6 +849,13 @@ def detect_device_location(
         use_red_detection: Enable red color-based detection
         settings_dict: Dictionary of all settings
         debug: Enable debug output
+        context: Optional InspectionContext sharing the per-frame gray planes
+        search_rect: Taught package rect (x, y, w, h); with pkg_search_window
+            enabled detection is limited to it +/- the package shift tolerance
+        tracker: Optional imaging.location_tracker.LocationTracker; once locked,
+            the package is first searched in a tight window around its prediction
+        detector: Optional DeviceLocationDetector already built for settings_dict
+            (e.g. InspectionPlan.device_location_detector); built here otherwise
     
     Returns:
         DeviceLocationResult with detected location and confidence
@@ -608,17 +871,42 @@ def detect_device_location(
     if settings_dict is None:
         settings_dict = {}
 
-    if use_red_detection:
-        settings_dict["enable_red_pkg_location"] = True
+    # The caller's settings may be read-only (plan settings); never write into them
+    if use_red_detection and not settings_dict.get("enable_red_pkg_location", False):
+        settings_dict = dict(settings_dict, enable_red_pkg_location=True)
     
-    detector = DeviceLocationDetector(settings_dict)
+    if detector is None:
+        detector = DeviceLocationDetector(settings_dict, image.shape)
     
+    # Tracked: scan the tight window around the predicted package first
+    result, tracked, window = None, False, None
+    if tracker is not None:
+        bounds = package_search_rect(settings_dict, search_rect, image.shape) \
+            or (0, 0, image.shape[1], image.shape[0])
+        window = tracker.search_window("package", bounds)
+    if window is not None:
+        result = detector.detect(image, debug, context=context, search_rect=search_rect, window=window)
+        tracked = result.detected and tracker.accepts(
+            "package", window, (result.x, result.y, result.width, result.height), bounds
+        )
+        if debug:
+            print(f"[DEBUG] Package tracking: window={window}, {'hit' if tracked else 'miss, full search'}")
+
     # Perform detection
-    result = detector.detect(image, debug)
+    if not tracked:
+        result = detector.detect(image, debug, context=context, search_rect=search_rect)
+
+    # The track follows the detector box (the recheck may resize it)
+    if tracker is not None:
+        if result.detected:
+            tracker.update("package", (result.x, result.y, result.width, result.height), tracked=tracked)
+        else:
+            tracker.miss("package")
     
     # Recheck if enabled and initial detection successful
     if recheck and result.detected:
-        rechecked = _recheck_location(image, result.x, result.y, result.width, result.height, recheck_val, debug)
+        recheck_image = context.gray if context is not None else image
+        rechecked = _recheck_location(recheck_image, result.x, result.y, result.width, result.height, recheck_val, debug)
         if rechecked:
             result.x, result.y, result.width, result.height = rechecked
             result.message += " (rechecked)"
@@ -626,6 +914,52 @@ def detect_device_location(
     return result
 
 
+def detect_batch(
+    images: Iterable[Union[np.ndarray, str]],
+    settings_dict: Optional[Dict] = None,
+    recheck: bool = True,
+    recheck_val: int = 50,
+    search_rect: Optional[Tuple[int, int, int, int]] = None,
+    debug: bool = False
+) -> List[DeviceLocationResult]:
+    """
+    Detect the package in a sequence of frames, e.g. an offline run over saved images.
+
+    Args:
+        images: Frames (BGR, uint8) or image file paths; files are read one at a time
+        settings_dict: Dictionary of all settings, shared by every frame
+        recheck: Whether to recheck the location
+        recheck_val: Recheck threshold value
+        search_rect: Taught package rect (see detect_device_location)
+        debug: Enable debug output
+
+    Returns:
+        One DeviceLocationResult per frame, in order. Frames of the same size
+        share one detector.
+    """
+    settings_dict = settings_dict if settings_dict is not None else {}
+    detectors = {}  # frame size -> DeviceLocationDetector
+    results = []
+    for image in images:
+        if isinstance(image, str):
+            path, image = image, cv2.imread(image)
+            if image is None:
+                results.append(DeviceLocationResult(
+                    detected=False, x=0, y=0, width=0, height=0,
+                    contrast=0, confidence=0, message=f"Image load failed: {path}", method="none"
+                ))
+                continue
+        size = image.shape[:2]
+        if size not in detectors:
+            detectors[size] = DeviceLocationDetector(settings_dict, image.shape)
+        results.append(detect_device_location(
+            image, recheck=recheck, recheck_val=recheck_val,
+            settings_dict=settings_dict, debug=debug, search_rect=search_rect,
+            detector=detectors[size]
+        ))
+    return results
+
+
 def _recheck_location(
     image: np.ndarray,
     x: int,
@@ -0,0 +1,136 @@
+"""
+Location Tracker - temporal prior for package and pocket location.
+
+On a running tape consecutive parts sit at almost the same place in the
+frame. LocationTracker keeps, per station and target ("package", "pocket"),
+a constant-position Kalman filter on the detected rect position and the last
+detected size. Once a target has been seen on min_hits consecutive parts,
+the detectors first search a tight window around the prediction and only
+fall back to the full search window when nothing acceptable is found there.
+
+A detection that lands far outside the prediction gate (tape jump, splice,
+re-teach) restarts the track from that detection; a miss drops the lock, so
+the next part is searched in the full window again.
+"""
+
+import math
+import threading
+from typing import Dict, Optional, Tuple
+
+from imaging.roi import cut_by_window, grow_rect
+
+
+class _Track:
+    """Constant-position Kalman filter on (x, y) plus the last seen size."""
+
+    def __init__(self, rect, meas_var):
+        x, y, w, h = rect
+        self.pos = [float(x), float(y)]
+        self.var = [float(meas_var), float(meas_var)]
+        self.size = (int(w), int(h))
+        self.hits = 1
+
+    def innovation(self, rect, process_var, meas_var):
+        """Largest per-axis innovation of rect against the prediction, in standard deviations."""
+        return max(
+            abs(float(rect[axis]) - self.pos[axis]) / math.sqrt(self.var[axis] + process_var + meas_var)
+            for axis in (0, 1)
+        )
+
+    def update(self, rect, process_var, meas_var):
+        # Predict (position unchanged, drift adds variance), then correct
+        self.var = [v + process_var for v in self.var]
+        for axis in (0, 1):
+            gain = self.var[axis] / (self.var[axis] + meas_var)
+            self.pos[axis] += gain * (float(rect[axis]) - self.pos[axis])
+            self.var[axis] *= (1.0 - gain)
+        self.size = (int(rect[2]), int(rect[3]))
+        self.hits += 1
+
+
+class LocationTracker:
+    """
+    Predicts where the package / pocket will be on the next part.
+
+    Args:
+        process_var: Position drift variance added per part (px^2)
+        meas_var: Detection noise variance (px^2)
+        gate_sigma: Innovation (in sigmas) above which a detection restarts the track
+        min_hits: Consecutive detections before the tight window is used
+        min_margin: Minimum margin of the tight window around the predicted rect (px)
+        size_tol: Accepted relative size change of a detection in the tight window
+    """
+
+    def __init__(self, process_var=1.0, meas_var=1.0, gate_sigma=6.0, min_hits=3,
+                 min_margin=8, size_tol=0.1):
+        self.process_var = process_var
+        self.meas_var = meas_var
+        self.gate_sigma = gate_sigma
+        self.min_hits = min_hits
+        self.min_margin = min_margin
+        self.size_tol = size_tol
+        self.stats = {"tracked": 0, "full": 0, "miss": 0, "reset": 0}
+        self._tracks: Dict[str, _Track] = {}
+        self._lock = threading.Lock()
+
+    def search_window(self, key: str, bounds) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Tight search window (x, y, w, h) around the predicted rect, or None if not locked.
+
+        bounds: Full search window (x, y, w, h) the window is clipped to
+        """
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is None or track.hits < self.min_hits:
+                return None
+            w, h = track.size
+            x, y = int(round(track.pos[0])), int(round(track.pos[1]))
+            # Gate of the next detection: predicted variance plus measurement noise
+            margin_x, margin_y = (
+                max(self.min_margin, int(math.ceil(
+                    self.gate_sigma * math.sqrt(track.var[axis] + self.process_var + self.meas_var))))
+                for axis in (0, 1)
+            )
+
+        return grow_rect((x, y, w, h), margin_x, margin_y, bounds)
+
+    def accepts(self, key: str, window, rect, bounds) -> bool:
+        """
+        True if rect, found in the tight window, is the tracked target.
+
+        The rect must not touch a window edge that lies inside bounds (the
+        full search would not have cut it off there) and its size must match
+        the track within size_tol.
+        """
+        if cut_by_window(rect, window, bounds):
+            return False
+        w, h = rect[2], rect[3]
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is None:
+                return False
+            tw, th = track.size
+        return abs(w - tw) <= self.size_tol * tw and abs(h - th) <= self.size_tol * th
+
+    def update(self, key: str, rect, tracked: bool = False) -> None:
+        """Feed a detected rect (x, y, w, h); tracked = found in the tight window."""
+        with self._lock:
+            self.stats["tracked" if tracked else "full"] += 1
+            track = self._tracks.get(key)
+            if track is None or track.innovation(rect, self.process_var, self.meas_var) > self.gate_sigma:
+                if track is not None:
+                    self.stats["reset"] += 1
+                self._tracks[key] = _Track(rect, self.meas_var)
+            else:
+                track.update(rect, self.process_var, self.meas_var)
+
+    def miss(self, key: str) -> None:
+        """Target not found: drop the lock so the next part uses the full search."""
+        with self._lock:
+            self.stats["miss"] += 1
+            self._tracks.pop(key, None)
+
+    def reset(self) -> None:
+        """Forget all tracks (new lot, re-teach)."""
+        with self._lock:
+            self._tracks.clear()
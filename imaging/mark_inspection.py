@@ -37,7 +37,8 @@ def detect_marks(
     image: np.ndarray,
     config: MarkInspectionConfig,
     roi: Optional[Tuple[int, int, int, int]] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None
 ) -> MarkDetectionResult:
     """
     Detect marks in the image using configured detection method
@@ -47,6 +48,7 @@ def detect_marks(
         config: Mark Inspection Configuration
         roi: Region of Interest (x, y, w, h) - if None, uses entire image
         debug: Enable debug output
+        context: Optional InspectionContext sharing the per-frame gray plane
     
     Returns:
         MarkDetectionResult with detected marks
@@ -78,7 +80,9 @@ def detect_marks(
         )
     
     # Convert to grayscale if needed
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image
@@ -6,11 +6,13 @@ body area dust mask filtering, and direction (parallel/non-parallel) validation.
 """
 
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from imaging.roi import cut_by_window, grow_rect
+
 
 @dataclass
 class PocketLocationResult:
@@ -256,8 +258,8 @@ def _compute_black_white_thresholds(image: np.ndarray) -> Tuple[int, int]:
     if image is None or image.size == 0:
         return 0, 255
 
-    hist = cv2.calcHist([image], [0], None, [256], [0, 256]).flatten()
-    total = float(np.sum(hist))
+    hist = cv2.calcHist([image], [0], None, [256], [0, 256]).flatten().astype(np.int64)
+    total = float(hist.sum())
     if total <= 0:
         return 0, 255
 
@@ -269,25 +271,15 @@ def _compute_black_white_thresholds(image: np.ndarray) -> Tuple[int, int]:
     white_mean_pct = white_pct * 0.7
     black_mean_pct = black_pct * 0.7
 
-    # White threshold: from high to low
+    # White threshold: first level from high to low reaching the target
     white_target = total * (white_mean_pct / 100.0)
-    cum = 0.0
-    white_avg = 255
-    for i in range(255, -1, -1):
-        cum += hist[i]
-        if cum >= white_target:
-            white_avg = i
-            break
-
-    # Black threshold: from low to high
+    i = int(np.searchsorted(np.cumsum(hist[::-1]), white_target, side="left"))
+    white_avg = 255 - i if i < 256 else 255
+
+    # Black threshold: first level from low to high reaching the target
     black_target = total * (black_mean_pct / 100.0)
-    cum = 0.0
-    black_avg = 0
-    for i in range(0, 256):
-        cum += hist[i]
-        if cum >= black_target:
-            black_avg = i
-            break
+    i = int(np.searchsorted(np.cumsum(hist), black_target, side="left"))
+    black_avg = i if i < 256 else 0
 
     return black_avg, white_avg
 
@@ -355,29 +347,8 @@ def _apply_post_seal_low_contrast_fallback(
     black_avg, white_avg = _compute_black_white_thresholds(image)
     percents = _threshold_percentages()
 
-    fallback_contour = None
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    for pct in percents:
-        thres = _compute_threshold_value(black_avg, white_avg, fallback_contrast, pct)
-        _, bin_mask = cv2.threshold(image, thres, 255, cv2.THRESH_BINARY)
-        bin_mask = cv2.morphologyEx(bin_mask, cv2.MORPH_CLOSE, kernel, iterations=1)
-        inv_mask = cv2.bitwise_not(bin_mask)
-        inv_mask = cv2.morphologyEx(inv_mask, cv2.MORPH_CLOSE, kernel, iterations=1)
-
-        dark_contour = _find_best_contour(inv_mask)
-        light_contour = _find_best_contour(bin_mask)
-
-        if dark_contour is not None and light_contour is not None:
-            dark_area = cv2.contourArea(dark_contour)
-            light_area = cv2.contourArea(light_contour)
-            fallback_contour = dark_contour if dark_area >= light_area else light_contour
-        elif dark_contour is not None:
-            fallback_contour = dark_contour
-        elif light_contour is not None:
-            fallback_contour = light_contour
-
-        if fallback_contour is not None:
-            break
+    thresholds = [_compute_threshold_value(black_avg, white_avg, fallback_contrast, pct) for pct in percents]
+    fallback_contour, _, _ = _search_pocket_contour(image, thresholds, None, None, debug=debug)
     
     if fallback_contour is not None:
         if debug:
@@ -429,41 +400,54 @@ def _apply_paper_dust_mask(
     
     # Dust mask width/height - fixed offset for dust filtering
     dust_offset = 20  # pixels to filter
+
+    # Each strip is filled with the mean of the image as masked so far. The
+    # sum is taken once and updated per strip instead of re-reading the image.
+    total = int(np.sum(masked_image, dtype=np.int64))
+    count = masked_image.size
+
+    def _fill(rows: slice, cols: slice) -> None:
+        nonlocal total
+        region = masked_image[rows, cols]
+        if region.size == 0:
+            return
+        region_sum = int(np.sum(region, dtype=np.int64))
+        fill = int(total / count)
+        region[...] = fill
+        total += fill * region.size - region_sum
     
     # Mask left and right edges
     if left_right_enable:
+        rows = slice(max(0, y - dust_offset), min(image.shape[0], y + h + dust_offset))
         # Left dust mask
         left_x = max(0, x - dust_offset)
         left_w = min(dust_offset, x)
         if left_w > 0:
-            masked_image[max(0, y-dust_offset):min(image.shape[0], y+h+dust_offset), 
-                        left_x:left_x+left_w] = np.mean(masked_image)
+            _fill(rows, slice(left_x, left_x + left_w))
         
         # Right dust mask
         right_x = min(image.shape[1], x + w)
         right_w = min(dust_offset, image.shape[1] - right_x)
         if right_w > 0:
-            masked_image[max(0, y-dust_offset):min(image.shape[0], y+h+dust_offset),
-                        right_x:right_x+right_w] = np.mean(masked_image)
+            _fill(rows, slice(right_x, right_x + right_w))
         
         if debug:
             print(f"[DEBUG] Paper dust mask applied: left & right edges")
     
     # Mask top and bottom edges
     if top_bottom_enable:
+        cols = slice(max(0, x - dust_offset), min(image.shape[1], x + w + dust_offset))
         # Top dust mask
         top_y = max(0, y - dust_offset)
         top_h = min(dust_offset, y)
         if top_h > 0:
-            masked_image[top_y:top_y+top_h,
-                        max(0, x-dust_offset):min(image.shape[1], x+w+dust_offset)] = np.mean(masked_image)
+            _fill(slice(top_y, top_y + top_h), cols)
         
         # Bottom dust mask
         bottom_y = min(image.shape[0], y + h)
         bottom_h = min(dust_offset, image.shape[0] - bottom_y)
         if bottom_h > 0:
-            masked_image[bottom_y:bottom_y+bottom_h,
-                        max(0, x-dust_offset):min(image.shape[1], x+w+dust_offset)] = np.mean(masked_image)
+            _fill(slice(bottom_y, bottom_y + bottom_h), cols)
         
         if debug:
             print(f"[DEBUG] Paper dust mask applied: top & bottom edges")
@@ -578,7 +562,8 @@ def check_outer_pocket_stain(
     image: np.ndarray,
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Inspect black/white stains outside the pocket area.
@@ -611,7 +596,9 @@ def check_outer_pocket_stain(
         _pp_int(params, "inspect_offset_bottom", 0),
     )
 
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -671,7 +658,8 @@ def check_emboss_tape_pickup(
     pocket_location: Tuple[int, int, int, int],
     package_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Emboss tape pickup inspection based on contrast difference between pocket and package.
@@ -686,7 +674,9 @@ def check_emboss_tape_pickup(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
 
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -756,7 +746,8 @@ def check_sealing_stain(
     image: np.ndarray,
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Sealing stain inspection on left and right sides.
@@ -765,7 +756,9 @@ def check_sealing_stain(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
 
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -848,7 +841,8 @@ def check_sealing_stain2(
     image: np.ndarray,
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Sealing stain 2 inspection (alternate contrast and ROI).
@@ -864,7 +858,9 @@ def check_sealing_stain2(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
 
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -923,7 +919,8 @@ def check_sealing_shift(
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
     package_location: Optional[Tuple[int, int, int, int]] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Sealing shift inspection to detect shift of sealing mark left/right or top/bottom.
@@ -947,7 +944,9 @@ def check_sealing_shift(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
     
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -1074,7 +1073,8 @@ def check_hole_side_shift(
     image: np.ndarray,
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Hole side shift inspection - detect pitch hole position shift.
@@ -1097,7 +1097,9 @@ def check_hole_side_shift(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
     
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -1194,7 +1196,8 @@ def check_sealing_distance_center(
     image: np.ndarray,
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Sealing distance measurement from center point (alternative to hole reference).
@@ -1219,7 +1222,9 @@ def check_sealing_distance_center(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
     
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -1328,7 +1333,8 @@ def check_bottom_dent_inspection(
     image: np.ndarray,
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Bottom dent inspection - detects dents in emboss tape at bottom station.
@@ -1351,7 +1357,9 @@ def check_bottom_dent_inspection(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
     
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -1445,7 +1453,8 @@ def check_special_black_emboss_sealing(
     image: np.ndarray,
     pocket_location: Tuple[int, int, int, int],
     pocket_params: Optional[Dict] = None,
-    debug: bool = False
+    debug: bool = False,
+    context=None,
 ) -> Tuple[bool, Dict]:
     """
     Special black emboss sealing tape inspection.
@@ -1471,7 +1480,9 @@ def check_special_black_emboss_sealing(
     if image is None or image.size == 0:
         return True, {"messages": ["Invalid image"], "pass": True}
     
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -1652,33 +1663,100 @@ def _apply_paper_dust_mask_binary(
     if num_labels <= 1:
         return mask
 
+    # Removal decision for all components at once, from their stats
     edge_margin = 5
-    for label in range(1, num_labels):
-        x, y, bw, bh, area = stats[label]
-        if area <= 0:
-            continue
+    bx = stats[1:, cv2.CC_STAT_LEFT]
+    by = stats[1:, cv2.CC_STAT_TOP]
+    bw = stats[1:, cv2.CC_STAT_WIDTH]
+    bh = stats[1:, cv2.CC_STAT_HEIGHT]
+
+    remove = np.zeros(num_labels - 1, dtype=bool)
+    if enable_left_right:
+        near_left_right = (bx <= edge_margin) | (bx + bw >= w - edge_margin)
+        remove |= near_left_right & (bh < int(h * 0.7))
+    if enable_top_bottom:
+        near_top_bottom = (by <= edge_margin) | (by + bh >= h - edge_margin)
+        remove |= near_top_bottom & (bw < int(w * 0.7))
+    remove &= stats[1:, cv2.CC_STAT_AREA] > 0
+
+    # One lookup pass over the label image clears every removed component
+    if remove.any():
+        keep = np.full(num_labels, 255, dtype=np.uint8)
+        keep[1:][remove] = 0
+        cv2.bitwise_and(mask, np.take(keep, labels), dst=mask)
 
-        near_left = x <= edge_margin
-        near_right = (x + bw) >= (w - edge_margin)
-        near_top = y <= edge_margin
-        near_bottom = (y + bh) >= (h - edge_margin)
+    if debug:
+        print("[DEBUG] Paper dust mask (binary) applied")
 
-        remove = False
-        if enable_left_right and (near_left or near_right):
-            if bh < int(h * 0.7):
-                remove = True
+    return mask
 
-        if enable_top_bottom and (near_top or near_bottom):
-            if bw < int(w * 0.7):
-                remove = True
 
-        if remove:
-            mask[labels == label] = 0
+_POCKET_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
 
-    if debug:
-        print("[DEBUG] Paper dust mask (binary) applied")
 
-    return mask
+def _threshold_masks(
+    roi: np.ndarray,
+    threshold: int,
+    paper_dust: Optional[Tuple[bool, bool, bool]] = None,
+    debug: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Closed (light, dark) masks of roi for threshold, paper dust (lr, tb, contrast+) removed first."""
+    _, bin_mask = cv2.threshold(roi, threshold, 255, cv2.THRESH_BINARY)
+    if paper_dust is not None:
+        bin_mask = _apply_paper_dust_mask_binary(bin_mask, *paper_dust, debug=debug)
+    bin_mask = cv2.morphologyEx(bin_mask, cv2.MORPH_CLOSE, _POCKET_KERNEL, iterations=1)
+    inv_mask = cv2.morphologyEx(cv2.bitwise_not(bin_mask), cv2.MORPH_CLOSE, _POCKET_KERNEL, iterations=1)
+    return bin_mask, inv_mask
+
+
+def _pick_pocket_contour(
+    bin_mask: np.ndarray,
+    inv_mask: np.ndarray,
+    expected_area: Optional[float],
+    expected_ratio: Optional[float],
+    polarity: Optional[str] = None
+) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """Best dark/light pocket contour of one candidate; polarity ("dark"/"light") skips the other one."""
+    dark_contour = _find_best_contour(inv_mask) if polarity != "light" else None
+    light_contour = _find_best_contour(bin_mask) if polarity != "dark" else None
+
+    if dark_contour is not None and light_contour is not None:
+        dark_score = _score_contour(dark_contour, expected_area, expected_ratio)
+        light_score = _score_contour(light_contour, expected_area, expected_ratio)
+        if dark_score >= light_score:
+            return dark_contour, "dark"
+        return light_contour, "light"
+    if dark_contour is not None:
+        return dark_contour, "dark"
+    if light_contour is not None:
+        return light_contour, "light"
+    return None, None
+
+
+def _search_pocket_contour(
+    roi: np.ndarray,
+    thresholds: List[int],
+    expected_area: Optional[float],
+    expected_ratio: Optional[float],
+    paper_dust: Optional[Tuple[bool, bool, bool]] = None,
+    polarity: Optional[str] = None,
+    debug: bool = False
+) -> Tuple[Optional[np.ndarray], Optional[str], int]:
+    """
+    First candidate threshold, in the given order, that yields a pocket contour.
+
+    Returns (contour, "dark"/"light", index into thresholds), or
+    (None, None, -1). The dark mask is the complement of the closed light
+    mask, closed again, so on a non-empty ROI the first candidate already
+    yields a contour unless a polarity is forced; later ones are not built
+    speculatively.
+    """
+    for i, threshold in enumerate(thresholds):
+        bin_mask, inv_mask = _threshold_masks(roi, threshold, paper_dust, debug)
+        contour, found = _pick_pocket_contour(bin_mask, inv_mask, expected_area, expected_ratio, polarity)
+        if contour is not None:
+            return contour, found, i
+    return None, None, -1
 
 
 def detect_pocket_location(
@@ -1686,6 +1764,8 @@ def detect_pocket_location(
     teach_rect: Optional[Tuple[int, int, int, int]] = None,
     pocket_params: Optional[Dict] = None,
     debug: bool = False,
+    context=None,
+    tracker=None,
 ) -> PocketLocationResult:
     """
     Detect pocket location in image with advanced features.
@@ -1703,6 +1783,15 @@ def detect_pocket_location(
     - teach_rect: (x, y, width, height) of taught pocket location
     - pocket_params: dict of parameters from pocket_params.json
     - debug: enable debug output
+    - context: optional InspectionContext; reuses its shared gray frame
+    - tracker: optional imaging.location_tracker.LocationTracker; once locked,
+      the pocket is first searched in a tight window around its prediction
+      (thresholds still come from the full search ROI histogram)
+
+    With pocket_pyramid_scale > 1 (and no paper dust mask, whose edge blobs
+    depend on the scanned area) the search ROI is first scanned at 1/scale and
+    the pocket is re-detected at full resolution in a band around the coarse
+    contour only.
     
     Returns PocketLocationResult with detection status and metrics
     """
@@ -1711,7 +1800,9 @@ def detect_pocket_location(
 
     params = pocket_params or {}
 
-    if len(image.shape) == 3:
+    if context is not None:
+        gray = context.gray
+    elif len(image.shape) == 3:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     else:
         gray = image.copy()
@@ -1752,55 +1843,112 @@ def detect_pocket_location(
         print(f"[DEBUG] Pocket detection: black_avg={black_avg}, white_avg={white_avg}, "
               f"edge_contrast={contrast}, post_seal_contrast={post_seal_contrast}")
 
-    def _try_detect_with_contrast(contrast_offset: int, label: str) -> Tuple[Optional[np.ndarray], str]:
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        method_local = "none"
-        best_local = None
-        for pct in percents:
-            thres = _compute_threshold_value(black_avg, white_avg, contrast_offset, pct)
-            if debug:
-                print(f"[DEBUG] {label}: threshold_percent={pct}, threshold_value={thres}")
-
-            _, bin_mask = cv2.threshold(search_roi, thres, 255, cv2.THRESH_BINARY)
-
-            # Apply paper dust mask on binary image
-            lr_enable = _pp_bool(params, "paper_dust_left_right", False)
-            tb_enable = _pp_bool(params, "paper_dust_top_bottom", False)
-            contrast_plus = _pp_bool(params, "paper_dust_contrast_plus", False)
-            if lr_enable or tb_enable:
-                bin_mask = _apply_paper_dust_mask_binary(bin_mask, lr_enable, tb_enable, contrast_plus, debug=debug)
-
-            bin_mask = cv2.morphologyEx(bin_mask, cv2.MORPH_CLOSE, kernel, iterations=1)
-            inv_mask = cv2.bitwise_not(bin_mask)
-            inv_mask = cv2.morphologyEx(inv_mask, cv2.MORPH_CLOSE, kernel, iterations=1)
-
-            dark_contour = _find_best_contour(inv_mask)
-            light_contour = _find_best_contour(bin_mask)
-
-            if dark_contour is not None and light_contour is not None:
-                dark_score = _score_contour(dark_contour, expected_area, expected_ratio)
-                light_score = _score_contour(light_contour, expected_area, expected_ratio)
-                best_local = dark_contour if dark_score >= light_score else light_contour
-                method_local = f"{label}_dark" if dark_score >= light_score else f"{label}_light"
-            elif dark_contour is not None:
-                best_local = dark_contour
-                method_local = f"{label}_dark"
-            elif light_contour is not None:
-                best_local = light_contour
-                method_local = f"{label}_light"
+    lr_enable = _pp_bool(params, "paper_dust_left_right", False)
+    tb_enable = _pp_bool(params, "paper_dust_top_bottom", False)
+    contrast_plus = _pp_bool(params, "paper_dust_contrast_plus", False)
+    paper_dust = (lr_enable, tb_enable, contrast_plus) if lr_enable or tb_enable else None
+    pyramid_scale = max(1, _pp_int(params, "pocket_pyramid_scale", 1))
+    if paper_dust is not None:
+        pyramid_scale = 1
+
+    # Candidates in selection order: every threshold percent of the primary
+    # contrast, then of the post-seal low contrast
+    stages = [(contrast, "primary")]
+    if enable_post_seal and post_seal_contrast < 255:
+        stages.append((post_seal_contrast, "post_seal"))
+
+    def _candidates(stage_list) -> List[Tuple[str, int, int]]:
+        return [
+            (label, pct, _compute_threshold_value(black_avg, white_avg, offset, pct))
+            for offset, label in stage_list for pct in percents
+        ]
 
-            if best_local is not None:
-                break
+    def _try_detect(stage_list) -> Tuple[Optional[np.ndarray], str]:
+        if pyramid_scale > 1:
+            return _try_detect_pyramid(stage_list)
+        return _try_detect_in(scan_roi, _candidates(stage_list))
+
+    def _try_detect_pyramid(stage_list) -> Tuple[Optional[np.ndarray], str]:
+        """
+        Coarse pass on scan_roi at 1/pyramid_scale, refined at full resolution.
+
+        The refinement keeps the coarse candidate threshold and dark/light
+        choice and takes the largest contour of that polarity in a band around
+        the coarse box. If it finds none, or the contour is cut off by the
+        band, scan_roi is searched at full resolution.
+        """
+        rh, rw = scan_roi.shape[:2]
+        coarse = cv2.resize(scan_roi, (max(1, rw // pyramid_scale), max(1, rh // pyramid_scale)),
+                            interpolation=cv2.INTER_AREA)
+        coarse_area = expected_area / (pyramid_scale * pyramid_scale) if expected_area is not None else None
+        candidates = _candidates(stage_list)
+        contour, polarity, index = _search_pocket_contour(
+            coarse, [c[2] for c in candidates], coarse_area, expected_ratio, debug=debug
+        )
 
-        return best_local, method_local
+        if contour is not None:
+            cx, cy, cw, ch = cv2.boundingRect(contour)
+            # Coarse box error: one coarse pixel plus the 3x3 closes at coarse scale
+            band = pyramid_scale * 5
+            window = grow_rect(
+                (cx * pyramid_scale, cy * pyramid_scale, cw * pyramid_scale, ch * pyramid_scale),
+                band, band, (0, 0, rw, rh)
+            )
+            if window is not None:
+                wx, wy, ww, wh = window
+                label = candidates[index][0]
+                refined, _ = _try_detect_in(scan_roi[wy:wy + wh, wx:wx + ww], [candidates[index]], polarity)
+                if refined is not None:
+                    rx, ry, rw_box, rh_box = cv2.boundingRect(refined)
+                    if not cut_by_window((rx + wx, ry + wy, rw_box, rh_box), window, (0, 0, rw, rh)):
+                        if debug:
+                            print(f"[DEBUG] {label}: pyramid 1/{pyramid_scale} contour refined in window {window}")
+                        return refined + np.array([wx, wy], dtype=refined.dtype), f"{label}_{polarity}"
 
-    best_contour, method = _try_detect_with_contrast(contrast, "primary")
+        if debug:
+            print("[DEBUG] Pocket pyramid refinement failed, full-resolution search")
+        return _try_detect_in(scan_roi, candidates)
+
+    def _try_detect_in(
+        roi: np.ndarray,
+        candidates: List[Tuple[str, int, int]],
+        polarity: Optional[str] = None
+    ) -> Tuple[Optional[np.ndarray], str]:
+        """First (label, percent, threshold) candidate giving a pocket contour in roi."""
+        if debug:
+            for label, pct, thres in candidates:
+                print(f"[DEBUG] {label}: threshold_percent={pct}, threshold_value={thres}")
+        contour, found, index = _search_pocket_contour(
+            roi, [c[2] for c in candidates], expected_area, expected_ratio,
+            paper_dust=paper_dust, polarity=polarity, debug=debug
+        )
+        if contour is None:
+            return None, "none"
+        return contour, f"{candidates[index][0]}_{found}"
+
+    # Tracked: search the tight window around the predicted pocket first
+    scan_roi = search_roi
+    best_contour, tracked = None, False
+    bounds = (roi_offset[0], roi_offset[1], search_roi.shape[1], search_roi.shape[0])
+    window = tracker.search_window("pocket", bounds) if tracker is not None else None
+    if window is not None:
+        wx, wy, ww, wh = window
+        contour, method = _try_detect_in(gray[wy:wy + wh, wx:wx + ww], _candidates(stages[:1]))
+        if contour is not None:
+            bx, by, bw, bh = cv2.boundingRect(contour)
+            if tracker.accepts("pocket", window, (bx + wx, by + wy, bw, bh), bounds):
+                best_contour, tracked = contour, True
+                roi_offset = (wx, wy)
+        if debug:
+            print(f"[DEBUG] Pocket tracking: window={window}, {'hit' if tracked else 'miss, full search'}")
 
-    # Try post-seal low contrast fallback if primary detection failed
-    if best_contour is None and enable_post_seal and post_seal_contrast < 255:
-        best_contour, method = _try_detect_with_contrast(post_seal_contrast, "post_seal")
+    # Post-seal low contrast candidates are the fallback if no primary one gives a contour
+    if best_contour is None:
+        best_contour, method = _try_detect(stages)
 
     if best_contour is None:
+        if tracker is not None:
+            tracker.miss("pocket")
         return PocketLocationResult(False, 0, 0, 0, 0, 0, 0,
                                    "Pocket contour not found (primary and fallback failed)", "none")
 
@@ -1826,17 +1974,21 @@ def detect_pocket_location(
         else:
             search_roi = gray
         
+        # Tracked pockets are re-detected in the tight window only
+        scan_roi = gray[wy:wy + wh, wx:wx + ww] if tracked else search_roi
+        
         # Re-detect pocket with masked image using histogram-based thresholding
         black_avg, white_avg = _compute_black_white_thresholds(search_roi)
-        best_contour, method = _try_detect_with_contrast(contrast, "primary")
-        if best_contour is None and enable_post_seal and post_seal_contrast < 255:
-            best_contour, method = _try_detect_with_contrast(post_seal_contrast, "post_seal")
+        best_contour, method = _try_detect(stages)
 
         if best_contour is not None:
             x, y, w, h = cv2.boundingRect(best_contour)
             x += roi_offset[0]
             y += roi_offset[1]
             pocket_location = (x, y, w, h)
+
+    if tracker is not None:
+        tracker.update("pocket", pocket_location, tracked=tracked)
     
     # Direction angle validation (parallel vs non-parallel)
     angle_valid, angle, parallel_mode = _validate_direction_angle(best_contour, params, debug=debug)
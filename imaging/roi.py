@@ -12,3 +12,28 @@ class Rect:
 
     def bottom(self):
         return self.y + self.h
+
+
+def grow_rect(rect, margin_x, margin_y, bounds):
+    """rect (x, y, w, h) grown by the margins and clipped to bounds (x, y, w, h); None if empty."""
+    x, y, w, h = rect
+    bx, by, bw, bh = bounds
+    x1, y1 = max(bx, x - margin_x), max(by, y - margin_y)
+    x2, y2 = min(bx + bw, x + w + margin_x), min(by + bh, y + h + margin_y)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def cut_by_window(rect, window, bounds):
+    """
+    True if rect, found inside window, touches a window edge that lies inside bounds.
+
+    Such a rect may continue outside the window, where a search over all of
+    bounds would have seen the rest of it.
+    """
+    x, y, w, h = rect
+    wx, wy, ww, wh = window
+    bx, by, bw, bh = bounds
+    return (x <= wx and wx > bx) or (y <= wy and wy > by) \
+        or (x + w >= wx + ww and wx + ww < bx + bw) or (y + h >= wy + wh and wy + wh < by + bh)
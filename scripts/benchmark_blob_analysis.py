@@ -0,0 +1,103 @@
+"""
+Benchmark: blob analysis of the smear / stain / black-defect checks on noisy parts.
+
+Renders a 480x360 body with a few real defects plus "dust" (3x3 bright specks
+and Gaussian noise) at increasing dust density, binarizes and cleans it
+as the checks do, and times the blob stage:
+
+- contours: findContours + contourArea / boundingRect and the area / size rule
+  per contour in Python (the previous implementation)
+- engine:   tests.blob_analysis.find_defect_blobs (connectedComponentsWithStats,
+  rule applied to the stats array; masks under CONTOUR_PATH_RATIO foreground
+  are traced with findContours instead)
+
+It also reports whether both found the same defects, and the time of a whole
+check_body_smear call.
+
+Run from the repository root:
+    python scripts/benchmark_blob_analysis.py [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tests.blob_analysis import DISABLED_LIMIT, NOISE_AREA, clean_defect_mask, find_defect_blobs
+from tests.body_smear import check_body_smear
+
+ROI = (80, 60, 480, 360)
+MIN_AREA, MIN_SQUARE = 20, DISABLED_LIMIT
+DUST_LEVELS = (0.0, 0.002, 0.005, 0.01, 0.02)
+
+
+def render(dust, rng):
+    """Body at 90 with three bright defects, 3x3 dust specks (dust: speck density) and noise."""
+    gray = np.full((480, 640), 200, np.uint8)
+    cv2.rectangle(gray, (80, 60), (559, 419), 90, -1)
+    for center, radius in (((200, 160), 6), ((360, 300), 3), ((460, 120), 9)):
+        cv2.circle(gray, center, radius, 230, -1)
+    # Specks survive the 3x3 cleaning but stay below the noise area, so they are never defects
+    specks = cv2.dilate((rng.random(gray.shape) < dust).astype(np.uint8), np.ones((3, 3), np.uint8))
+    gray[specks > 0] = 255
+    noisy = np.clip(gray + rng.normal(0, 12, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(noisy, cv2.COLOR_GRAY2BGR)
+
+
+def contour_blobs(binary, min_area, min_square, apply_or=True):
+    """Reference: the per-contour Python loop the checks used before the blob engine."""
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    rects = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area < NOISE_AREA:
+            continue
+        bx, by, bw, bh = cv2.boundingRect(contour)
+        area_fail = (min_area != DISABLED_LIMIT) and (area >= min_area)
+        size_fail = (min_square != DISABLED_LIMIT) and (bw >= min_square or bh >= min_square)
+        if area_fail or size_fail:
+            rects.append((bx, by, bw, bh))
+    return rects
+
+
+def defect_mask(image):
+    x, y, w, h = ROI
+    gray = cv2.cvtColor(image[y:y + h, x:x + w], cv2.COLOR_BGR2GRAY)
+    _, binary = cv2.threshold(gray, int(np.mean(gray)) + 40, 255, cv2.THRESH_BINARY)
+    return clean_defect_mask(binary)
+
+
+def timed(fn, repeats):
+    """Result of fn and its best time (ms) over repeats calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000.0
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = np.random.default_rng(3)
+    print(f"Best of {repeats} runs, {ROI[2]}x{ROI[3]} body ROI, min_area={MIN_AREA}")
+    print(f"{'dust':>6s}{'blobs':>8s}{'contours ms':>14s}{'engine ms':>12s}{'speedup':>9s}"
+          f"{'same defects':>14s}{'check ms':>11s}")
+    for dust in DUST_LEVELS:
+        image = render(dust, rng)
+        binary = defect_mask(image)
+        blobs = cv2.connectedComponents(binary, connectivity=8)[0] - 1
+        reference, t_contours = timed(lambda: contour_blobs(binary, MIN_AREA, MIN_SQUARE), repeats)
+        engine, t_engine = timed(lambda: find_defect_blobs(binary, MIN_AREA, MIN_SQUARE), repeats)
+        _, t_check = timed(lambda: check_body_smear(image, ROI, 40, MIN_AREA, MIN_SQUARE), repeats)
+        same = sorted(reference) == sorted(engine.rect_list())
+        print(f"{dust:6.3f}{blobs:8d}{t_contours:14.3f}{t_engine:12.3f}{t_contours / t_engine:8.1f}x"
+              f"{str(same):>14s}{t_check:11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark: body-crack edge stage on a synthetic crack corpus.
+
+Renders a corpus of bodies with thin bright and dark cracks (random angle,
+length and position), chips and noise, and compares the crack edge stage of
+tests.body_crack.check_body_crack:
+
+- reference: the previous stage - per polarity (white, and black with Low/High
+  detection on) a threshold binary, CV_8U Sobel of the top/bottom and
+  left/right thirds into np.zeros_like results, combined with cv2.add
+- engine:    tests.body_crack._crack_edges - both CV_16S gradients once,
+  edges thresholded straight into one preallocated mask
+
+It reports whether both give identical edge masks and identical
+check_body_crack detections (the reference is patched into the check), and
+the time of the edge stage and of a whole check call.
+
+Run from the repository root:
+    python scripts/benchmark_crack_edges.py [images] [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tests.body_crack as body_crack
+
+ROI = (100, 80, 440, 320)
+CONTRAST, MIN_LENGTH, MIN_ELONGATION = 30, 20, 5.0
+
+
+def render(rng):
+    """Body at a random level with 0-4 thin cracks (bright or dark), an occasional chip and noise."""
+    gray = np.full((480, 640), 40, np.uint8)
+    body = int(rng.integers(90, 170))
+    cv2.rectangle(gray, (100, 80), (539, 399), body, -1)
+    for _ in range(rng.integers(0, 5)):
+        x0, y0 = int(rng.integers(110, 530)), int(rng.integers(90, 390))
+        # Mostly along the body axes (slanted cracks fail the elongation rule)
+        angle = rng.choice((0.0, np.pi / 2)) + rng.uniform(-0.15, 0.15)
+        length = rng.integers(10, 160)
+        x1, y1 = int(x0 + length * np.cos(angle)), int(y0 + length * np.sin(angle))
+        level = body + int(rng.choice((-1, 1)) * rng.integers(40, 90))
+        cv2.line(gray, (x0, y0), (x1, y1), int(np.clip(level, 0, 255)), int(rng.integers(1, 3)))
+    if rng.random() < 0.3:
+        cv2.circle(gray, (int(rng.integers(100, 540)), int(rng.choice((80, 399)))), int(rng.integers(4, 12)), 40, -1)
+    noisy = np.clip(gray + rng.normal(0, 2, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(noisy, cv2.COLOR_GRAY2BGR)
+
+
+def reference_edges(gray, white_th, black_th, detect_low_high):
+    """The previous edge stage: both polarities, Sobel per third, zeros_like results, cv2.add."""
+    def tb_edges(threshold, thresh_type):
+        _, binary = cv2.threshold(gray, threshold, 255, thresh_type)
+        h = gray.shape[0]
+        result = np.zeros_like(gray)
+        for rows in (slice(0, h // 3), slice(2 * h // 3, h)):
+            edges = cv2.Sobel(gray[rows, :], cv2.CV_8U, 0, 1, ksize=3)
+            result[rows, :] = cv2.threshold(edges, 50, 255, cv2.THRESH_BINARY)[1]
+        return result
+
+    def lr_edges(threshold, thresh_type):
+        _, binary = cv2.threshold(gray, threshold, 255, thresh_type)
+        w = gray.shape[1]
+        result = np.zeros_like(gray)
+        for cols in (slice(0, w // 3), slice(2 * w // 3, w)):
+            edges = cv2.Sobel(gray[:, cols], cv2.CV_8U, 1, 0, ksize=3)
+            result[:, cols] = cv2.threshold(edges, 50, 255, cv2.THRESH_BINARY)[1]
+        return result
+
+    combined = cv2.add(tb_edges(white_th, cv2.THRESH_BINARY), lr_edges(white_th, cv2.THRESH_BINARY))
+    if detect_low_high:
+        combined = cv2.add(combined, cv2.add(tb_edges(black_th, cv2.THRESH_BINARY_INV),
+                                             lr_edges(black_th, cv2.THRESH_BINARY_INV)))
+    return cv2.threshold(combined, 127, 255, cv2.THRESH_BINARY)[1]
+
+
+def engine_edges(gray):
+    grad_x = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3)
+    grad_y = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3)
+    return body_crack._crack_edges(grad_x, grad_y)
+
+
+def inspect_crop(image):
+    x, y, w, h = ROI
+    gray = cv2.cvtColor(image[y:y + h, x:x + w], cv2.COLOR_BGR2GRAY)
+    body_avg = int(np.mean(gray))
+    return gray, min(255, body_avg + CONTRAST), max(0, body_avg - CONTRAST)
+
+
+def detections(images, detect_low_high):
+    return [body_crack.check_body_crack(image, ROI, CONTRAST, MIN_LENGTH, MIN_ELONGATION,
+                                        detect_low_high=detect_low_high) for image in images]
+
+
+def timed(fn, repeats):
+    """Best time (ms) of fn over repeats calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = np.random.default_rng(11)
+    images = [render(rng) for _ in range(count)]
+    crops = [inspect_crop(image) for image in images]
+    print(f"{count} crack images, {ROI[2]}x{ROI[3]} body ROI, best of {repeats} runs per image")
+
+    engine_check = body_crack._crack_edges
+    for detect_low_high in (False, True):
+        same_edges = all(
+            np.array_equal(reference_edges(gray, white_th, black_th, detect_low_high), engine_edges(gray))
+            for gray, white_th, black_th in crops
+        )
+        engine_found = detections(images, detect_low_high)
+
+        # The reference stage patched into check_body_crack (it reads the crop itself)
+        reference_found = []
+        for image, (gray, white_th, black_th) in zip(images, crops):
+            edges = reference_edges(gray, white_th, black_th, detect_low_high)
+            body_crack._crack_edges = lambda grad_x, grad_y, edges=edges: edges
+            reference_found.append(body_crack.check_body_crack(
+                image, ROI, CONTRAST, MIN_LENGTH, MIN_ELONGATION, detect_low_high=detect_low_high))
+        body_crack._crack_edges = engine_check
+        cracks = sum(found[0] for found in engine_found)
+
+        t_reference = sum(timed(lambda: reference_edges(gray, white_th, black_th, detect_low_high), repeats)
+                          for gray, white_th, black_th in crops) / count
+        t_engine = sum(timed(lambda: engine_edges(gray), repeats) for gray, _, _ in crops) / count
+        t_check = sum(timed(lambda: body_crack.check_body_crack(
+            image, ROI, CONTRAST, MIN_LENGTH, MIN_ELONGATION, detect_low_high=detect_low_high), repeats)
+            for image in images[:20]) / min(count, 20)
+        print(f"Low/High {'ON ' if detect_low_high else 'OFF'}: cracks found {cracks}, "
+              f"same edges {same_edges}, same detections {engine_found == reference_found}")
+        print(f"  edge stage: reference {t_reference:.3f}ms, engine {t_engine:.3f}ms "
+              f"({t_reference / t_engine:.1f}x); check_body_crack {t_check:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
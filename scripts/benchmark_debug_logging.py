@@ -0,0 +1,108 @@
+"""
+Benchmark: per-part inspection time with all debug flags off.
+
+Compares the lazy DebugLog against eager formatting (every log call builds
+its message and full-frame debug statistics are computed, as the
+print-shadowing code did) on a synthetic 640x480 TOP/BOTTOM part.
+
+Run from the repository root:
+    python scripts/benchmark_debug_logging.py [parts]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.debug_log import DebugLog
+from config.inspection_parameters import InspectionParameters
+import tests.test_top_bottom as ttb
+
+
+class EagerLog(DebugLog):
+    """Formats every message (and evaluates lazy arguments), then drops it."""
+
+    __slots__ = ("calls",)
+
+    def __init__(self, flags=None, mask=None):
+        super().__init__(flags or 0)
+        self.calls = 0
+
+    def __call__(self, msg, *args):
+        self.calls += 1
+        if args:
+            msg.format(*args)
+
+
+def make_part():
+    rng = np.random.default_rng(1)
+    img = np.full((480, 640, 3), 200, np.uint8)
+    cv2.rectangle(img, (200, 150), (440, 330), (70, 70, 70), -1)
+    cv2.rectangle(img, (200, 150), (255, 330), (150, 150, 150), -1)
+    cv2.rectangle(img, (385, 150), (440, 330), (150, 150, 150), -1)
+    return cv2.add(img, rng.integers(0, 25, img.shape, dtype=np.uint8))
+
+
+def make_params():
+    params = InspectionParameters(package_x=200, package_y=150, package_w=240, package_h=180)
+    params.body_width_min, params.body_width_max = 100, 250
+    params.body_length_min, params.body_length_max = 150, 300
+    # Checks that pass on the synthetic part, so every part runs the whole pipeline
+    for flag in ("enable_package_location", "check_terminal_length_diff", "check_terminal_pogo",
+                 "check_terminal_offset", "check_incomplete_termination_1", "check_terminal_color",
+                 "check_terminal_oxidation", "check_body_stain_1", "check_body_stain_2", "check_body_color",
+                 "check_body_width_diff", "check_body_smear_1", "check_body_smear_2", "check_body_smear_3",
+                 "check_reverse_chip"):
+        params.flags[flag] = True
+    return params
+
+
+def time_parts(fn, image, params, parts):
+    fn(image.copy(), params)  # warm up (plan compile, caches)
+    times = []
+    for _ in range(parts):
+        frame = image.copy()
+        start = time.perf_counter()
+        fn(frame, params)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return np.median(times), np.mean(times)
+
+
+def main():
+    parts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    image = make_part()
+    params = make_params()
+
+    fn = ttb.test_top_bottom
+    print(f"Parts per run: {parts}, debug flags: 0, result: {fn(image.copy(), params).message}")
+
+    ttb.DebugLog = DebugLog
+    lazy_p50, lazy_mean = time_parts(fn, image, params, parts)
+    ttb.DebugLog = EagerLog
+    eager_p50, eager_mean = time_parts(fn, image, params, parts)
+    ttb.DebugLog = DebugLog
+
+    print(f"lazy:  p50={lazy_p50:7.3f}ms  mean={lazy_mean:7.3f}ms")
+    print(f"eager: p50={eager_p50:7.3f}ms  mean={eager_mean:7.3f}ms  (saved {eager_mean - lazy_mean:.3f}ms/part)")
+
+    # Cost of a single disabled call
+    log = DebugLog(0)
+    value = 123.456
+    n = 200000
+    start = time.perf_counter()
+    for _ in range(n):
+        log("[INFO] Body width: {:.1f}px, ROI=({}, {})", value, n, n)
+    lazy_ns = (time.perf_counter() - start) * 1e9 / n
+    start = time.perf_counter()
+    for _ in range(n):
+        f"[INFO] Body width: {value:.1f}px, ROI=({n}, {n})"
+    eager_ns = (time.perf_counter() - start) * 1e9 / n
+    print(f"Disabled log call: lazy={lazy_ns:.0f}ns, eager f-string={eager_ns:.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: reused DeviceLocationDetector instances.
+
+Renders 1280x1024 frames with one package and locates it in the taught
+search window (pkg_search_window) with a non-exact edge-scan angle, a
+reflection mask and line masks, so the per-frame setup is a visible share of
+the detection time. Compares per frame:
+
+- fresh:  detect_device_location building a new detector per call
+- reused: detect_device_location with one detector built up front (what an
+          InspectionPlan does per frame size)
+- batch:  detect_batch over the whole sequence
+
+It reports whether the boxes are identical and the mean time per frame.
+
+Run from the repository root:
+    python scripts/benchmark_device_detector_cache.py [frames] [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from imaging.device_location import DeviceLocationDetector, detect_batch, detect_device_location
+
+FRAME_W, FRAME_H = 1280, 1024
+TAUGHT = (500, 400, 260, 190)
+SETTINGS = {
+    "enable_edge_scan": True, "edge_scan_angle": 30, "enable_4color": False, "ignore_blue": False,
+    "contrast": 50, "pkg_search_window": True, "x_pkg_shift_tol": 40, "y_pkg_shift_tol": 40,
+    "enable_reflection_mask": True, "reflection_mask": [[100, 100, 40, 40], [1100, 900, 60, 60]],
+    "line_mask_count": 2, "line_masks": [[0, 0, 1280, 8], [0, 1016, 1280, 8]],
+}
+
+
+def render(rng):
+    """Dark tape with a bright package shifted up to 20px from the taught rect."""
+    gray = np.full((FRAME_H, FRAME_W), 30, np.uint8)
+    x, y, w, h = TAUGHT
+    dx, dy = (int(v) for v in rng.integers(-20, 21, 2))
+    cv2.rectangle(gray, (x + dx, y + dy), (x + w + dx - 1, y + h + dy - 1), int(rng.integers(170, 230)), -1)
+    noisy = np.clip(gray + rng.normal(0, 3, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(noisy, cv2.COLOR_GRAY2BGR)
+
+
+def bbox(result):
+    return (result.x, result.y, result.width, result.height) if result.detected else None
+
+
+DETECTOR = DeviceLocationDetector(SETTINGS, (FRAME_H, FRAME_W, 3))
+
+
+def fresh(frame):
+    return detect_device_location(frame, recheck=False, settings_dict=SETTINGS, search_rect=TAUGHT)
+
+
+def reused(frame):
+    return detect_device_location(frame, recheck=False, settings_dict=SETTINGS, search_rect=TAUGHT,
+                                  detector=DETECTOR)
+
+
+def best_per_frame(fn, repeats, count):
+    """Best time (ms per frame) of fn() over repeats runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0 / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = np.random.default_rng(25)
+    frames = [render(rng) for _ in range(count)]
+    print(f"{count} frames {FRAME_W}x{FRAME_H}, search window around {TAUGHT}, best of {repeats} runs")
+
+    fresh_boxes = [bbox(fresh(frame)) for frame in frames]
+    reused_boxes = [bbox(reused(frame)) for frame in frames]
+    batch_boxes = [bbox(r) for r in detect_batch(frames, SETTINGS, recheck=False, search_rect=TAUGHT)]
+    found = sum(box is not None for box in fresh_boxes)
+    print(f"found {found}/{count}, identical {fresh_boxes == reused_boxes == batch_boxes}")
+
+    t_fresh = best_per_frame(lambda: [fresh(frame) for frame in frames], repeats, count)
+    t_reused = best_per_frame(lambda: [reused(frame) for frame in frames], repeats, count)
+    t_batch = best_per_frame(lambda: detect_batch(frames, SETTINGS, recheck=False, search_rect=TAUGHT),
+                             repeats, count)
+    print(f"  fresh {t_fresh:.3f}ms, reused {t_reused:.3f}ms ({t_fresh / t_reused:.2f}x), "
+          f"batch {t_batch:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
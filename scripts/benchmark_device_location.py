@@ -0,0 +1,118 @@
+"""
+Benchmark: DeviceLocationDetector on full-resolution frames.
+
+Renders 2448x2048 tape frames with one package (random level, position and a
+small tilt) near a taught position, and compares for each exact edge-scan
+angle (90/180/270):
+
+- reference: the previous rotation - warpAffine with bilinear interpolation
+  on the whole frame, mapped back through the inverse affine transform
+- exact:     cv2.rotate transpose/flip on the whole frame
+- window:    exact rotation on the taught package rect +/- the package shift
+  tolerance only (pkg_search_window)
+
+It reports the largest bbox corner difference to the reference and the
+detection time per frame.
+
+Run from the repository root:
+    python scripts/benchmark_device_location.py [frames] [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import imaging.device_location as device_location
+
+FRAME_W, FRAME_H = 2448, 2048
+TAUGHT = (1000, 800, 520, 380)
+SHIFT_TOL = 60
+
+
+def render(rng):
+    """Dark tape with a lighter pocket and a package shifted up to 40px from the taught rect."""
+    gray = np.full((FRAME_H, FRAME_W), 30, np.uint8)
+    x, y, w, h = TAUGHT
+    cv2.rectangle(gray, (x - 150, y - 150), (x + w + 150, y + h + 150), 70, -1)
+    cx = x + w / 2 + rng.uniform(-40, 40)
+    cy = y + h / 2 + rng.uniform(-40, 40)
+    box = cv2.boxPoints(((cx, cy), (w, h), rng.uniform(-3, 3))).astype(np.int32)
+    cv2.fillPoly(gray, [box], int(rng.integers(170, 230)))
+    noisy = np.clip(gray + rng.normal(0, 3, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(noisy, cv2.COLOR_GRAY2BGR)
+
+
+def settings(angle, window):
+    return {
+        "enable_edge_scan": True, "edge_scan_angle": angle, "enable_4color": False,
+        "enable_reflection_mask": False, "ignore_blue": False, "contrast": 50,
+        "pkg_search_window": window, "x_pkg_shift_tol": SHIFT_TOL, "y_pkg_shift_tol": SHIFT_TOL,
+    }
+
+
+def bbox(result):
+    return (result.x, result.y, result.width, result.height) if result.detected else None
+
+
+def corner_diff(a, b):
+    if a is None or b is None:
+        return 0 if a == b else float("inf")
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]),
+               abs(a[0] + a[2] - b[0] - b[2]), abs(a[1] + a[3] - b[1] - b[3]))
+
+
+def timed(fn, repeats):
+    """Best time (ms) of fn over repeats calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = np.random.default_rng(20)
+    frames = [render(rng) for _ in range(count)]
+    print(f"{count} frames {FRAME_W}x{FRAME_H}, taught package {TAUGHT}, shift tolerance {SHIFT_TOL}px, "
+          f"best of {repeats} runs per frame")
+
+    exact_rotations = device_location._EXACT_ROTATIONS
+    for angle in (90, 180, 270):
+        full = device_location.DeviceLocationDetector(settings(angle, False))
+        windowed = device_location.DeviceLocationDetector(settings(angle, True))
+
+        def reference(frame):
+            # Force the previous warpAffine path
+            device_location._EXACT_ROTATIONS = {}
+            try:
+                return full.detect(frame)
+            finally:
+                device_location._EXACT_ROTATIONS = exact_rotations
+
+        reference_boxes = [bbox(reference(frame)) for frame in frames]
+        exact_boxes = [bbox(full.detect(frame)) for frame in frames]
+        window_boxes = [bbox(windowed.detect(frame, search_rect=TAUGHT)) for frame in frames]
+        found = sum(box is not None for box in exact_boxes)
+        exact_diff = max(corner_diff(a, b) for a, b in zip(reference_boxes, exact_boxes))
+        window_diff = max(corner_diff(a, b) for a, b in zip(exact_boxes, window_boxes))
+
+        t_reference = sum(timed(lambda: reference(frame), repeats) for frame in frames) / count
+        t_exact = sum(timed(lambda: full.detect(frame), repeats) for frame in frames) / count
+        t_window = sum(timed(lambda: windowed.detect(frame, search_rect=TAUGHT), repeats)
+                       for frame in frames) / count
+        print(f"angle {angle}: found {found}/{count}, max corner diff exact vs reference {exact_diff}px, "
+              f"window vs exact {window_diff}px")
+        print(f"  reference {t_reference:.2f}ms, exact {t_exact:.2f}ms ({t_reference / t_exact:.1f}x), "
+              f"window {t_window:.2f}ms ({t_reference / t_window:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: package and pocket location with and without a LocationTracker.
+
+Renders a FEED sequence: a 1280x1024 tape frame with a dark pocket and a
+bright package, jittering by +/-2 px along the tape from part to part, with
+a tape jump of 35 px in the middle of the run. Each frame is located with:
+
+- full:    detect_device_location / detect_pocket_location as before
+- tracked: the same calls with one LocationTracker kept across the sequence
+
+It reports how many parts were found in the tight window, how many fell
+back to the full search, whether both modes give the same rects, and the
+mean location time per part.
+
+Run from the repository root:
+    python scripts/benchmark_location_tracking.py [parts] [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from imaging.device_location import detect_device_location
+from imaging.location_tracker import LocationTracker
+from imaging.pocket_location import detect_pocket_location
+
+FRAME_W, FRAME_H = 1280, 1024
+# Taught pocket; the tape is guided in Y, so only the X shift is tolerated
+POCKET = (440, 350, 400, 300)
+PACKAGE_SIZE = (300, 220)
+JUMP = 35
+POCKET_PARAMS = {"edge_contrast_value": 0, "pocket_shift_x_pos": 80, "pocket_shift_x_neg": 80,
+                 "pocket_shift_y_pos": 0, "pocket_shift_y_neg": 0}
+DEVICE_SETTINGS = {"enable_edge_scan": True, "edge_scan_angle": 0, "enable_4color": False,
+                   "enable_reflection_mask": False, "ignore_blue": False, "contrast": 50}
+
+
+def render(rng, dx):
+    """Light tape, a dark pocket spanning the guided tape rows and a bright package, shifted by dx."""
+    gray = np.full((FRAME_H, FRAME_W), 150, np.uint8)
+    x, y, w, h = POCKET
+    cv2.rectangle(gray, (x + dx, y - 20), (x + w + dx - 1, y + h + 19), 40, -1)
+    pw, ph = PACKAGE_SIZE
+    px, py = x + (w - pw) // 2 + dx, y + (h - ph) // 2
+    cv2.rectangle(gray, (px, py), (px + pw - 1, py + ph - 1), 230, -1)
+    noisy = np.clip(gray + rng.normal(0, 3, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(noisy, cv2.COLOR_GRAY2BGR)
+
+
+def locate(frame, tracker):
+    package = detect_device_location(frame, recheck=False, settings_dict=dict(DEVICE_SETTINGS), tracker=tracker)
+    pocket = detect_pocket_location(frame, teach_rect=POCKET, pocket_params=POCKET_PARAMS, tracker=tracker)
+    return ((package.x, package.y, package.width, package.height) if package.detected else None,
+            (pocket.x, pocket.y, pocket.width, pocket.height) if pocket.detected else None)
+
+
+def run_sequence(frames, make_tracker, repeats):
+    """Rects, tracker and best mean time (ms) per part over repeats runs of the whole sequence."""
+    best = float("inf")
+    for _ in range(repeats):
+        tracker = make_tracker()
+        start = time.perf_counter()
+        rects = [locate(frame, tracker) for frame in frames]
+        best = min(best, time.perf_counter() - start)
+    return rects, tracker, best * 1000.0 / len(frames)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rng = np.random.default_rng(21)
+    offsets = [int(rng.integers(-2, 3)) + (JUMP if i >= count // 2 else 0) for i in range(count)]
+    frames = [render(rng, dx) for dx in offsets]
+    print(f"{count} parts {FRAME_W}x{FRAME_H}, +/-2 px jitter, {JUMP} px tape jump at part {count // 2}, "
+          f"best of {repeats} runs of the sequence")
+
+    full_rects, _, t_full = run_sequence(frames, lambda: None, repeats)
+    tracked_rects, tracker, t_tracked = run_sequence(frames, LocationTracker, repeats)
+
+    found = sum(package is not None and pocket is not None for package, pocket in full_rects)
+    print(f"found {found}/{count}, same rects {full_rects == tracked_rects}, tracker {tracker.stats}")
+    print(f"  package + pocket location: full {t_full:.2f}ms, tracked {t_tracked:.2f}ms "
+          f"({t_full / t_tracked:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
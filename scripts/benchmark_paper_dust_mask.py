@@ -0,0 +1,135 @@
+"""
+Benchmark: paper dust masks on dusty paper tape.
+
+Renders pocket search ROIs (1500x1360) with a dark pocket and several hundred
+dust specks and scratches, many of them touching the ROI edges, and compares:
+
+- binary:  the previous per-component removal (mask[labels == label] = 0,
+           one full-image comparison per removed component) against
+           _apply_paper_dust_mask_binary (vectorized decision + label LUT)
+- strips:  the previous strip fill (np.mean of the whole image per strip)
+           against _apply_paper_dust_mask (one sum, updated per strip)
+
+It reports whether the outputs are identical and the time per ROI.
+
+Run from the repository root:
+    python scripts/benchmark_paper_dust_mask.py [specks] [rois] [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from imaging.pocket_location import _apply_paper_dust_mask, _apply_paper_dust_mask_binary
+
+ROI_W, ROI_H = 1500, 1360
+POCKET = (400, 400, 700, 560)
+PARAMS = {"paper_dust_left_right": True, "paper_dust_top_bottom": True}
+
+
+def render(rng, specks):
+    """Light paper, a dark pocket, dust specks (a third on the ROI edges) and short scratches."""
+    gray = np.full((ROI_H, ROI_W), 150, np.uint8)
+    x, y, w, h = POCKET
+    cv2.rectangle(gray, (x, y), (x + w - 1, y + h - 1), 40, -1)
+    for i in range(specks):
+        if i % 3 == 0:
+            side = rng.integers(4)
+            cx = int(rng.integers(0, ROI_W)) if side < 2 else (0 if side == 2 else ROI_W - 1)
+            cy = int(rng.integers(0, ROI_H)) if side >= 2 else (0 if side == 0 else ROI_H - 1)
+        else:
+            cx, cy = int(rng.integers(0, ROI_W)), int(rng.integers(0, ROI_H))
+        level = int(rng.integers(0, 60)) if i % 2 else int(rng.integers(200, 256))
+        if i % 5 == 0:
+            dx, dy = int(rng.integers(-40, 41)), int(rng.integers(-40, 41))
+            cv2.line(gray, (cx, cy), (cx + dx, cy + dy), level, 2)
+        else:
+            cv2.circle(gray, (cx, cy), int(rng.integers(1, 6)), level, -1)
+    return np.clip(gray + rng.normal(0, 3, gray.shape), 0, 255).astype(np.uint8)
+
+
+def reference_binary(binary, enable_left_right, enable_top_bottom):
+    """The previous removal loop (no contrast+ open)."""
+    mask = binary.copy()
+    h, w = mask.shape[:2]
+    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    edge_margin = 5
+    for label in range(1, num_labels):
+        x, y, bw, bh, area = stats[label]
+        near_left = x <= edge_margin
+        near_right = (x + bw) >= (w - edge_margin)
+        near_top = y <= edge_margin
+        near_bottom = (y + bh) >= (h - edge_margin)
+        remove = False
+        if enable_left_right and (near_left or near_right) and bh < int(h * 0.7):
+            remove = True
+        if enable_top_bottom and (near_top or near_bottom) and bw < int(w * 0.7):
+            remove = True
+        if area > 0 and remove:
+            mask[labels == label] = 0
+    return mask
+
+
+def reference_strips(image, pocket):
+    """The previous strip fill (mean of the whole image re-read per strip)."""
+    x, y, w, h = pocket
+    out = image.copy()
+    d = 20
+    rows = slice(max(0, y - d), min(image.shape[0], y + h + d))
+    cols = slice(max(0, x - d), min(image.shape[1], x + w + d))
+    if min(d, x) > 0:
+        out[rows, max(0, x - d):max(0, x - d) + min(d, x)] = np.mean(out)
+    right_x = min(image.shape[1], x + w)
+    if min(d, image.shape[1] - right_x) > 0:
+        out[rows, right_x:right_x + min(d, image.shape[1] - right_x)] = np.mean(out)
+    if min(d, y) > 0:
+        out[max(0, y - d):max(0, y - d) + min(d, y), cols] = np.mean(out)
+    bottom_y = min(image.shape[0], y + h)
+    if min(d, image.shape[0] - bottom_y) > 0:
+        out[bottom_y:bottom_y + min(d, image.shape[0] - bottom_y), cols] = np.mean(out)
+    return out
+
+
+def timed(fn, repeats):
+    """Best time (ms) of fn over repeats calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main():
+    specks = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    rng = np.random.default_rng(24)
+    rois = [render(rng, specks) for _ in range(count)]
+    binaries = [cv2.threshold(roi, 95, 255, cv2.THRESH_BINARY_INV)[1] for roi in rois]
+    print(f"{count} ROIs {ROI_W}x{ROI_H}, {specks} specks each, best of {repeats} runs")
+
+    components = sum(cv2.connectedComponents(b, connectivity=8)[0] - 1 for b in binaries) / count
+    same = all(np.array_equal(reference_binary(b, True, True), _apply_paper_dust_mask_binary(b, True, True, False))
+               for b in binaries)
+    t_reference = sum(timed(lambda: reference_binary(b, True, True), repeats) for b in binaries) / count
+    t_lut = sum(timed(lambda: _apply_paper_dust_mask_binary(b, True, True, False), repeats)
+                for b in binaries) / count
+    print(f"binary ({components:.0f} components per ROI): identical {same}, "
+          f"per-component {t_reference:.2f}ms, label LUT {t_lut:.2f}ms ({t_reference / t_lut:.1f}x)")
+
+    same = all(np.array_equal(reference_strips(roi, POCKET), _apply_paper_dust_mask(roi, POCKET, PARAMS))
+               for roi in rois)
+    t_reference = sum(timed(lambda: reference_strips(roi, POCKET), repeats) for roi in rois) / count
+    t_once = sum(timed(lambda: _apply_paper_dust_mask(roi, POCKET, PARAMS), repeats) for roi in rois) / count
+    print(f"strips: identical {same}, mean per strip {t_reference:.2f}ms, "
+          f"sum once {t_once:.2f}ms ({t_reference / t_once:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
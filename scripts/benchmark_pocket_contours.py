@@ -0,0 +1,106 @@
+"""
+Benchmark: pocket threshold histogram and contour search.
+
+Renders 2448x2048 FEED frames with a dark pocket, a bright package and
+scattered dust specks, and compares:
+
+- thresholds: the previous per-level Python walk over the histogram against
+  _compute_black_white_thresholds (cumsum / searchsorted)
+- location:   detect_pocket_location (shared candidate engine), found count
+  and time per frame
+
+The threshold comparison reports whether the results are identical.
+
+Run from the repository root:
+    python scripts/benchmark_pocket_contours.py [frames] [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import imaging.pocket_location as pocket_location
+
+FRAME_W, FRAME_H = 2448, 2048
+POCKET = (900, 700, 700, 560)
+POCKET_PARAMS = {"edge_contrast_value": 0, "pocket_shift_x_pos": 400, "pocket_shift_x_neg": 400,
+                 "pocket_shift_y_pos": 400, "pocket_shift_y_neg": 400,
+                 "enable_post_seal": True, "post_seal_low_contrast": 10}
+
+
+def render(rng):
+    """Light tape, a dark pocket shifted up to 60px, a bright package and dust specks."""
+    gray = np.full((FRAME_H, FRAME_W), 150, np.uint8)
+    x, y, w, h = POCKET
+    x += int(rng.integers(-60, 61))
+    y += int(rng.integers(-60, 61))
+    cv2.rectangle(gray, (x, y), (x + w - 1, y + h - 1), 40, -1)
+    cv2.rectangle(gray, (x + 90, y + 90), (x + w - 91, y + h - 91), int(rng.integers(210, 240)), -1)
+    for _ in range(200):
+        center = (int(rng.integers(0, FRAME_W)), int(rng.integers(0, FRAME_H)))
+        cv2.circle(gray, center, int(rng.integers(1, 5)), int(rng.integers(0, 256)), -1)
+    return np.clip(gray + rng.normal(0, 3, gray.shape), 0, 255).astype(np.uint8)
+
+
+def reference_thresholds(image):
+    """The previous histogram walk (one Python step per gray level)."""
+    hist = cv2.calcHist([image], [0], None, [256], [0, 256]).flatten()
+    total = float(np.sum(hist))
+    white_target = total * (70.0 * 0.7 / 100.0)
+    black_target = total * (30.0 * 0.7 / 100.0)
+    cum, white_avg = 0.0, 255
+    for i in range(255, -1, -1):
+        cum += hist[i]
+        if cum >= white_target:
+            white_avg = i
+            break
+    cum, black_avg = 0.0, 0
+    for i in range(0, 256):
+        cum += hist[i]
+        if cum >= black_target:
+            black_avg = i
+            break
+    return black_avg, white_avg
+
+
+def timed(fn, repeats):
+    """Best time (ms) of fn over repeats calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def locate(frame):
+    result = pocket_location.detect_pocket_location(frame, teach_rect=POCKET, pocket_params=POCKET_PARAMS)
+    return (result.x, result.y, result.width, result.height, result.method) if result.detected else None
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = np.random.default_rng(23)
+    frames = [render(rng) for _ in range(count)]
+    rois = [frame[300:1660, 500:2000] for frame in frames]
+    print(f"{count} frames {FRAME_W}x{FRAME_H}, best of {repeats} runs per frame")
+
+    same = all(reference_thresholds(roi) == pocket_location._compute_black_white_thresholds(roi) for roi in rois)
+    t_reference = sum(timed(lambda: reference_thresholds(roi), repeats) for roi in rois) / count
+    t_vector = sum(timed(lambda: pocket_location._compute_black_white_thresholds(roi), repeats)
+                   for roi in rois) / count
+    print(f"thresholds: identical {same}, loop {t_reference:.3f}ms, searchsorted {t_vector:.3f}ms")
+
+    found = sum(locate(frame) is not None for frame in frames)
+    t_locate = sum(timed(lambda: locate(frame), repeats) for frame in frames) / count
+    print(f"location: found {found}/{count}, {t_locate:.2f}ms per frame")
+
+
+if __name__ == "__main__":
+    main()
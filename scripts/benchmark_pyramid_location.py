@@ -0,0 +1,113 @@
+"""
+Benchmark: coarse-to-fine pyramid search for package and pocket location.
+
+Renders 2448x2048 FEED frames with a dark pocket and a bright, slightly
+tilted package (random level and position) and locates both with:
+
+- full:      pyramid off (full-resolution morphology and findContours)
+- pyramid N: coarse pass at 1/N, refined at full resolution in a band
+             around the coarse box (pyramid_scale / pocket_pyramid_scale)
+
+It reports the largest bbox corner difference to the full-resolution result
+and the detection time per frame.
+
+Run from the repository root:
+    python scripts/benchmark_pyramid_location.py [frames] [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from imaging.device_location import DeviceLocationDetector
+from imaging.pocket_location import detect_pocket_location
+
+FRAME_W, FRAME_H = 2448, 2048
+POCKET = (900, 700, 700, 560)
+PACKAGE_SIZE = (520, 380)
+SCALES = (4, 8)
+POCKET_PARAMS = {"edge_contrast_value": 0, "pocket_shift_x_pos": 400, "pocket_shift_x_neg": 400,
+                 "pocket_shift_y_pos": 400, "pocket_shift_y_neg": 400}
+DEVICE_SETTINGS = {"enable_edge_scan": True, "edge_scan_angle": 90, "enable_4color": False,
+                   "enable_reflection_mask": False, "ignore_blue": False, "contrast": 50}
+
+
+def render(rng):
+    """Light tape, a dark pocket shifted up to 60px and a bright tilted package inside it."""
+    gray = np.full((FRAME_H, FRAME_W), 150, np.uint8)
+    x, y, w, h = POCKET
+    x += int(rng.integers(-60, 61))
+    y += int(rng.integers(-60, 61))
+    cv2.rectangle(gray, (x, y), (x + w - 1, y + h - 1), 40, -1)
+    pw, ph = PACKAGE_SIZE
+    center = (x + w / 2 + rng.uniform(-30, 30), y + h / 2 + rng.uniform(-30, 30))
+    box = cv2.boxPoints((center, (pw, ph), rng.uniform(-3, 3))).astype(np.int32)
+    cv2.fillPoly(gray, [box], int(rng.integers(210, 240)))
+    noisy = np.clip(gray + rng.normal(0, 3, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(noisy, cv2.COLOR_GRAY2BGR)
+
+
+def bbox(result):
+    return (result.x, result.y, result.width, result.height) if result.detected else None
+
+
+def corner_diff(a, b):
+    if a is None or b is None:
+        return 0 if a == b else float("inf")
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]),
+               abs(a[0] + a[2] - b[0] - b[2]), abs(a[1] + a[3] - b[1] - b[3]))
+
+
+def timed(fn, repeats):
+    """Best time (ms) of fn over repeats calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def package_locator(scale):
+    detector = DeviceLocationDetector(dict(DEVICE_SETTINGS, pyramid_scale=scale))
+    return lambda frame: detector.detect(frame)
+
+
+def pocket_locator(scale):
+    params = dict(POCKET_PARAMS, pocket_pyramid_scale=scale)
+    return lambda frame: detect_pocket_location(frame, teach_rect=POCKET, pocket_params=params)
+
+
+def compare(name, make_locator, frames, repeats):
+    full = make_locator(1)
+    full_boxes = [bbox(full(frame)) for frame in frames]
+    t_full = sum(timed(lambda: full(frame), repeats) for frame in frames) / len(frames)
+    found = sum(box is not None for box in full_boxes)
+    print(f"{name}: found {found}/{len(frames)}, full {t_full:.2f}ms")
+    for scale in SCALES:
+        locate = make_locator(scale)
+        boxes = [bbox(locate(frame)) for frame in frames]
+        diff = max(corner_diff(a, b) for a, b in zip(full_boxes, boxes))
+        t_pyramid = sum(timed(lambda: locate(frame), repeats) for frame in frames) / len(frames)
+        print(f"  pyramid {scale}: {t_pyramid:.2f}ms ({t_full / t_pyramid:.1f}x), "
+              f"max corner diff vs full {diff}px")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = np.random.default_rng(22)
+    frames = [render(rng) for _ in range(count)]
+    print(f"{count} frames {FRAME_W}x{FRAME_H}, best of {repeats} runs per frame")
+
+    compare("package", package_locator, frames, repeats)
+    compare("pocket", pocket_locator, frames, repeats)
+
+
+if __name__ == "__main__":
+    main()
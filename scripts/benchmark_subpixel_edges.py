@@ -0,0 +1,185 @@
+"""
+Benchmark: repeatability of the dimension measurements on sub-pixel shifted edges.
+
+Renders a synthetic body (with terminals) at 8x resolution and area-downsamples
+it, so the moving edges land at fractional pixel positions. For shifts of
+0.0 .. 0.9 px it measures body width, body length and terminal length over
+several noise realizations, with sub-pixel refinement (tests.subpixel_edges)
+and with the refinement switched off (integer-pixel edges), and reports:
+
+- linearity: RMS of (measured change - true shift) across the shifts
+- repeatability: mean standard deviation over the noise realizations
+
+The edge line fit (tests.subpixel_edges.fit_line_robust) is compared with the
+iterative outlier removal it replaced (least-squares refits, band 15 -> 7 px):
+
+- accuracy: error at the line centre on synthetic edges with gross outliers
+- sample: body length / width on 1.bmp (the package ROI, contrast 75) over
+  noisy frames shifted by -2..2 px, once along x and once along y. The scan of
+  this part yields two edge groups per side, so it shows whether the fit keeps
+  to the same group from frame to frame
+
+Run from the repository root:
+    python scripts/benchmark_subpixel_edges.py [noise_realizations]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tests.measurements as measurements
+import tests.subpixel_edges as subpixel_edges
+
+SCALE = 8
+SHIFTS = np.arange(10) / 10.0
+ROI = (180, 130, 280, 220)
+TERMINAL_ROI = (ROI[0], ROI[1], ROI[2], int(ROI[3] * 0.3))
+SAMPLE = Path(__file__).resolve().parents[1] / "1.bmp"
+SAMPLE_ROI = (75, 72, 182, 104)
+SAMPLE_FRAMES = 60
+FIT_EDGES = 2000
+
+
+def render(shift, rng):
+    """Body 240x150 px (+shift on the bottom and right edges), dark terminal band on top."""
+    big = np.full((480 * SCALE, 640 * SCALE), 200, np.uint8)
+    x0, y0 = 200 * SCALE, 165 * SCALE
+    x1 = int(round((440 + shift) * SCALE))
+    y1 = int(round((315 + shift) * SCALE))
+    cv2.rectangle(big, (x0, y0), (x1 - 1, y1 - 1), 60, -1)
+    # Terminal band: its lower edge moves with the shift as well
+    cv2.rectangle(big, (x0, 140 * SCALE), (x1 - 1, int(round((180 + shift) * SCALE)) - 1), 20, -1)
+    gray = cv2.resize(big, (640, 480), interpolation=cv2.INTER_AREA)
+    noisy = np.clip(gray + rng.normal(0, 3, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(noisy, cv2.COLOR_GRAY2BGR)
+
+
+def measure(image):
+    return (
+        measurements.measure_body_width(image, ROI),
+        measurements.measure_body_length(image, ROI),
+        measurements.measure_terminal_length(image, ROI, TERMINAL_ROI, edge_contrast=40),
+    )
+
+
+def run(realizations):
+    rng = np.random.default_rng(7)
+    frames = [[render(shift, rng) for _ in range(realizations)] for shift in SHIFTS]
+    start = time.perf_counter()
+    values = np.array([[measure(frame) for frame in row] for row in frames], dtype=float)
+    elapsed = (time.perf_counter() - start) * 1000.0 / (len(SHIFTS) * realizations)
+    # values: (shift, realization, measurement)
+    change = values.mean(axis=1) - values[0].mean(axis=0)
+    linearity = np.sqrt(np.mean((change - SHIFTS[:, None]) ** 2, axis=0))
+    repeatability = values.std(axis=1).mean(axis=0)
+    return linearity, repeatability, elapsed
+
+
+def iterative_fit(points, iterations=5, initial_tolerance=15):
+    """Reference: the replaced fit - least-squares refits, keeping points within 15, 13, .. 7 px."""
+    kept = np.ones(len(points), bool)
+    tolerance = initial_tolerance
+    for _ in range(iterations):
+        if np.count_nonzero(kept) < 3:
+            break
+        line = subpixel_edges.fit_line(points[kept])
+        if line is None:
+            break
+        kept &= np.abs(points[:, 1] - (line[0] * points[:, 0] + line[1])) < tolerance
+        tolerance = max(tolerance - 2, 5)
+    line = subpixel_edges.fit_line(points[kept])
+    if line is None:
+        return None
+    residuals = points[kept, 1] - (line[0] * points[kept, 0] + line[1])
+    return subpixel_edges.LineFit(line, kept, float(np.sqrt(np.mean(residuals * residuals))))
+
+
+def fit_accuracy(fit, count):
+    """Mean / p99 error (px) at the line centre and time per fit on synthetic edges with 0-40% outliers."""
+    rng = np.random.default_rng(11)
+    x = np.arange(100, dtype=float)
+    edges = []
+    for _ in range(count):
+        slope, intercept = rng.uniform(-0.05, 0.05), rng.uniform(20, 80)
+        y = slope * x + intercept + rng.normal(0, 0.3, x.size)
+        outliers = rng.random(x.size) < rng.uniform(0, 0.4)
+        y[outliers] += rng.uniform(-40, 40, np.count_nonzero(outliers))
+        edges.append((np.column_stack((x, y)), slope * 49.5 + intercept))
+    start = time.perf_counter()
+    fits = [fit(points) for points, _ in edges]
+    elapsed = (time.perf_counter() - start) * 1e6 / count
+    errors = np.array([abs(f.line[0] * 49.5 + f.line[1] - truth) for f, (_, truth) in zip(fits, edges)])
+    return errors.mean(), np.percentile(errors, 99), elapsed
+
+
+def sample_repeatability(frames):
+    """Body length / width std and range (px) on shifted, noisy frames of the sample image."""
+    image = cv2.imread(str(SAMPLE))
+    rng = np.random.default_rng(5)
+    results = {}
+    for axis in ("x", "y"):
+        values = []
+        for shift in rng.integers(-2, 3, frames):
+            dx, dy = (shift, 0) if axis == "x" else (0, shift)
+            frame = np.roll(image, (dy, dx), axis=(0, 1)).astype(float)
+            frame = np.clip(frame + rng.normal(0, 3, frame.shape), 0, 255).astype(np.uint8)
+            values.append((measurements.measure_body_length(frame, SAMPLE_ROI, 75),
+                           measurements.measure_body_width(frame, SAMPLE_ROI, 75)))
+        results[axis] = np.array(values, dtype=float)
+    return results
+
+
+def compare_line_fits(frames):
+    """Print the accuracy and sample repeatability of fit_line_robust and of the replaced fit."""
+    fits = {"robust": subpixel_edges.fit_line_robust, "iterative": iterative_fit}
+    print(f"Line fit on {FIT_EDGES} synthetic edges (0-40% outliers), error at the line centre:")
+    for name, fit in fits.items():
+        mean, p99, elapsed = fit_accuracy(fit, FIT_EDGES)
+        print(f"  {name:10s} mean {mean:.3f} px  p99 {p99:.3f} px  {elapsed:.0f}us per fit")
+
+    print(f"{SAMPLE.name} ROI {SAMPLE_ROI}, {frames} frames shifted -2..2 px, noise sigma=3:")
+    for name, fit in fits.items():
+        measurements.fit_line_robust = fit
+        for axis, values in sample_repeatability(frames).items():
+            length, width = values[:, 0], values[:, 1]
+            print(f"  {name:10s} shift {axis}: length std {np.nanstd(length):6.2f} "
+                  f"({np.nanmin(length):6.2f}..{np.nanmax(length):6.2f})  "
+                  f"width std {np.nanstd(width):5.2f} ({np.nanmin(width):6.2f}..{np.nanmax(width):6.2f})  "
+                  f"failed {np.count_nonzero(np.isnan(length))}")
+    measurements.fit_line_robust = fits["robust"]
+
+
+def integer_edges():
+    """Switch the sub-pixel refinement off (edges stay on the integer pixel)."""
+    zero = lambda *args, **kwargs: np.zeros(np.broadcast(*args[:2]).shape)
+    subpixel_edges.parabolic_offset = zero
+    subpixel_edges.crossing_offset = zero
+    measurements.crossing_offset = zero
+
+
+def main():
+    realizations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # Before integer_edges() switches the sub-pixel refinement off
+    compare_line_fits(SAMPLE_FRAMES)
+    print()
+    print(f"Shifts: {SHIFTS[0]:.1f}..{SHIFTS[-1]:.1f} px, {realizations} noise realizations each (sigma=3)")
+    names = ("body width", "body length", "terminal length")
+
+    subpixel = run(realizations)
+    integer_edges()
+    integer = run(realizations)
+
+    print(f"{'':16s}{'linearity RMS (px)':>24s}{'repeatability std (px)':>28s}")
+    for i, name in enumerate(names):
+        print(f"{name:16s}  sub-pixel {subpixel[0][i]:6.3f}  integer {integer[0][i]:6.3f}"
+              f"    sub-pixel {subpixel[1][i]:6.3f}  integer {integer[1][i]:6.3f}")
+    print(f"time per part (3 measurements): sub-pixel {subpixel[2]:.3f}ms, integer {integer[2]:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Test script for package location through the compiled FEED inspection plan.
+
+This script tests that:
+1. test_feed locates the package with the plan's (read-only) device location settings
+2. The plan builds its DeviceLocationDetector once per frame size and reuses it
+3. Red package location works with the read-only plan settings
+4. TOP and BOTTOM parameter sets keep their own cached plans
+
+The config files are written to a temporary working directory, so the
+repository's own *.json settings are not read or modified.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import cv2
+import numpy as np
+
+from config.inspection_parameters import InspectionParameters
+from tests.checks import STATION_FEED, STATION_TOP_BOTTOM
+from tests.inspection_plan import clear_config_cache, get_inspection_plan
+from tests.test_runner import TestStatus
+from tests import test_top_bottom as station_tests
+
+FRAME_W, FRAME_H = 1280, 1024
+TAUGHT = (500, 400, 260, 190)
+DEVICE_LOCATION_SETTINGS = {
+    "enable_pkg": True, "teach_pos": False, "enable_edge_scan": False, "enable_4color": False,
+    "ignore_blue": False, "enable_reflection_mask": False, "filter_red_enable": False,
+    "enable_red_pkg_location": False, "insp_img_red": False, "index_gap_enable": False,
+    "pkg_loc_recheck": False, "contrast": 50, "pkg_search_window": True,
+    "x_pkg_shift_tol": 40, "y_pkg_shift_tol": 40,
+}
+
+
+def _render_part(dx=12, dy=-8):
+    """Dark tape with a bright package shifted (dx, dy) from the taught rect."""
+    gray = np.full((FRAME_H, FRAME_W), 30, np.uint8)
+    x, y, w, h = TAUGHT
+    cv2.rectangle(gray, (x + dx, y + dy), (x + w + dx - 1, y + h + dy - 1), 200, -1)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+
+def _feed_params():
+    params = InspectionParameters()
+    params.flags = {"enable_package_location": True}
+    params.package_x, params.package_y, params.package_w, params.package_h = TAUGHT
+    return params
+
+
+@contextmanager
+def _work_dir():
+    """Run in an empty temporary working directory (the config files are relative paths)."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            yield
+        finally:
+            os.chdir(cwd)
+            clear_config_cache()
+
+
+def _write_settings(settings):
+    with open("device_location_setting.json", "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=4)
+    clear_config_cache()
+
+
+def test_feed_package_location():
+    """Test that test_feed detects the package with the FEED plan's settings."""
+    with _work_dir():
+        _write_settings(DEVICE_LOCATION_SETTINGS)
+        result = station_tests.test_feed(_render_part(), _feed_params())
+
+        assert result.status == TestStatus.PASS, f"FEED inspection failed: {result.message}"
+        span_names = [span.name for span in result.spans]
+        assert "Package Location Detect" in span_names, f"Package location did not run: {span_names}"
+        print("✅ FEED package location passed")
+
+
+def test_plan_detector_reused():
+    """Test that the FEED plan reuses its detector and a settings change gives a new one."""
+    with _work_dir():
+        _write_settings(DEVICE_LOCATION_SETTINGS)
+        params = _feed_params()
+        plan = get_inspection_plan(params, STATION_FEED)
+        detector = plan.device_location_detector((FRAME_H, FRAME_W, 3))
+
+        station_tests.test_feed(_render_part(), params)
+        assert get_inspection_plan(params, STATION_FEED) is plan, "FEED plan was recompiled"
+        assert plan.device_location_detector((FRAME_H, FRAME_W, 3)) is detector, "Detector was rebuilt"
+
+        _write_settings(dict(DEVICE_LOCATION_SETTINGS, contrast=60))
+        changed = get_inspection_plan(params, STATION_FEED)
+        assert changed is not plan, "Settings change did not recompile the plan"
+        assert changed.device_location_detector((FRAME_H, FRAME_W, 3)).contrast == 60
+        print("✅ Plan detector reused until the settings change")
+
+
+def test_feed_red_package_location():
+    """Test that red package location does not write into the read-only plan settings."""
+    with _work_dir():
+        _write_settings(dict(DEVICE_LOCATION_SETTINGS, enable_red_pkg_location=True))
+        result = station_tests.test_feed(_render_part(), _feed_params())
+
+        assert result.status == TestStatus.PASS, f"FEED inspection failed: {result.message}"
+        print("✅ Red package location passed")
+
+
+def test_top_bottom_plans_cached_separately():
+    """Test that TOP and BOTTOM parameter sets do not evict each other's plan."""
+    with _work_dir():
+        _write_settings(DEVICE_LOCATION_SETTINGS)
+        top, bottom = InspectionParameters(), InspectionParameters()
+        bottom.flags = {"enable_body_length": True}
+
+        top_plan = get_inspection_plan(top, STATION_TOP_BOTTOM)
+        bottom_plan = get_inspection_plan(bottom, STATION_TOP_BOTTOM)
+        assert get_inspection_plan(top, STATION_TOP_BOTTOM) is top_plan, "TOP plan was evicted"
+        assert get_inspection_plan(bottom, STATION_TOP_BOTTOM) is bottom_plan, "BOTTOM plan was evicted"
+        print("✅ TOP and BOTTOM plans cached separately")
+
+
+def main():
+    """Run all tests."""
+    print("\n" + "="*70)
+    print("FEED PACKAGE LOCATION TEST")
+    print("="*70)
+
+    tests = (
+        test_feed_package_location,
+        test_plan_detector_reused,
+        test_feed_red_package_location,
+        test_top_bottom_plans_cached_separately,
+    )
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            success = False
+
+    print("="*70)
+    print("✅ All tests passed!" if success else "❌ Some tests failed")
+    print("="*70)
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,12 +18,12 @@ Algorithm Overview:
 
 import cv2
 import numpy as np
-from config.debug_runtime import resolve_debug
+from tests.inspection_context import crop_gradient
 
 
 def check_body_crack(image, roi, contrast, min_length, min_elongation, broken_connection=0,
                      offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
-                     detect_low_high=False, debug=False):
+                     detect_low_high=False, debug=False, context=None):
     """
     Check for body cracks (white cracks/breaks) on package surface.
     
@@ -47,6 +47,7 @@ def check_body_crack(image, roi, contrast, min_length, min_elongation, broken_co
         broken_connection: Maximum allowed gap in crack structure (pixels, 0=no gaps)
         offset_top/bottom/left/right: ROI offsets to exclude edges
         debug: If True, print debug information
+        context: Optional InspectionContext; crops are taken from its shared gray plane
     
     Returns:
         tuple: (defects_found, largest_length, is_pass, defect_rects)
@@ -56,7 +57,10 @@ def check_body_crack(image, roi, contrast, min_length, min_elongation, broken_co
             - defect_rects: list of crack bounding boxes
     """
     # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
+    if context is not None:
+        image = context.gray
+    else:
+        image = np.copy(image)
     
     x, y, w, h = roi
     
@@ -104,18 +108,26 @@ def check_body_crack(image, roi, contrast, min_length, min_elongation, broken_co
     # Edge Detection: Combine TB (vertical) and LR (horizontal) analysis
     # ============================================
     
-    # 1. VERTICAL EDGE DETECTION (Top-Bottom)
-    tb_high = _detect_tb_edges(gray, white_th, mode="white", debug=debug)
-    lr_high = _detect_lr_edges(gray, white_th, mode="white", debug=debug)
-
-    edge_combined = cv2.add(tb_high, lr_high)
-
-    if detect_low_high:
-        tb_low = _detect_tb_edges(gray, black_th, mode="black", debug=debug)
-        lr_low = _detect_lr_edges(gray, black_th, mode="black", debug=debug)
-        edge_combined = cv2.add(edge_combined, cv2.add(tb_low, lr_low))
+    # Gray gradients of the inspection crop (CV_16S), from the shared per-frame cache when
+    # the crop is the one the context computes (inside the work window)
+    inspect_roi = (inspect_x, inspect_y, inspect_w, inspect_h)
+    shared = context if context is not None and context.in_window(inspect_roi) else None
+    grad_y = crop_gradient(shared, gray, inspect_roi, 0, 1)
+    grad_x = crop_gradient(shared, gray, inspect_roi, 1, 0)
 
-    edge_combined = cv2.threshold(edge_combined, 127, 255, cv2.THRESH_BINARY)[1]
+    if debug:
+        # The polarity thresholds are only reported; the edges come from the gray gradient
+        polarities = [("white", white_th, cv2.THRESH_BINARY)]
+        if detect_low_high:
+            polarities.append(("black", black_th, cv2.THRESH_BINARY_INV))
+        for polarity, threshold, thresh_type in polarities:
+            _, binary = cv2.threshold(gray, threshold, 255, thresh_type)
+            pct = (np.sum(binary == 255) / binary.size) * 100
+            print(f"[DEBUG] Body Crack: Binary {polarity}%={pct:.1f}")
+
+    # TB (top/bottom thirds) and LR (left/right thirds) edges in one mask. They do not
+    # depend on the polarity, so Low/High detection adds no pixels of its own.
+    edge_combined = _crack_edges(grad_x, grad_y)
     
     if debug:
         white_pct = (np.sum(edge_combined == 255) / edge_combined.size) * 100
@@ -210,110 +222,34 @@ def check_body_crack(image, roi, contrast, min_length, min_elongation, broken_co
     return defects_found, int(largest_length), is_pass, defect_rects
 
 
-def _detect_tb_edges(gray, threshold, mode="white", debug=False):
-    debug = resolve_debug(debug)
+def _crack_edges(grad_x, grad_y):
     """
-    Detect Top-Bottom edges (vertical intensity changes).
-    These help find horizontal cracks.
-    
-    Algorithm:
-    1. Binarize above threshold (white pixels)
-    2. Extract top region (rows 0 to height/3)
-    3. Extract bottom region (rows 2*height/3 to height)
-    4. Detect edges at region boundaries
-    5. Return binary image of detected edges
-    
-    Args:
-        gray: Grayscale image
-        threshold: Intensity threshold
-        debug: Print debug info
-    
-    Returns:
-        Binary image with TB edges marked
-    """
-    # Binarize with polarity
-    thresh_type = cv2.THRESH_BINARY if mode == "white" else cv2.THRESH_BINARY_INV
-    _, binary = cv2.threshold(gray, threshold, 255, thresh_type)
-    
-    if debug:
-        white_pct = (np.sum(binary == 255) / binary.size) * 100
-        print(f"[DEBUG] TB Edge: Binary white%={white_pct:.1f}")
-    
-    # Split into regions
-    h = gray.shape[0]
-    top_region = gray[:h//3, :]
-    bottom_region = gray[2*h//3:, :]
-    
-    # Detect edges in each region using Sobel
-    top_edges = cv2.Sobel(top_region, cv2.CV_8U, 0, 1, ksize=3)
-    bottom_edges = cv2.Sobel(bottom_region, cv2.CV_8U, 0, 1, ksize=3)
-    
-    # Threshold edges
-    _, top_binary = cv2.threshold(top_edges, 50, 255, cv2.THRESH_BINARY)
-    _, bottom_binary = cv2.threshold(bottom_edges, 50, 255, cv2.THRESH_BINARY)
-    
-    # Reconstruct full image with detected edges
-    tb_result = np.zeros_like(gray)
-    tb_result[:h//3, :] = top_binary
-    tb_result[2*h//3:, :] = bottom_binary
-    
-    return tb_result
+    TB and LR crack edges of an inspection crop, written into one preallocated mask.
 
-
-def _detect_lr_edges(gray, threshold, mode="white", debug=False):
-    debug = resolve_debug(debug)
-    """
-    Detect Left-Right edges (horizontal intensity changes).
-    These help find vertical cracks.
-    
-    Algorithm:
-    1. Binarize above threshold (white pixels)
-    2. Extract left region (cols 0 to width/3)
-    3. Extract right region (cols 2*width/3 to width)
-    4. Detect edges at region boundaries
-    5. Return binary image of detected edges
-    
-    Args:
-        gray: Grayscale image
-        threshold: Intensity threshold
-        debug: Print debug info
-    
-    Returns:
-        Binary image with LR edges marked
+    Edge pixels (255) are where the CV_16S 3x3 Sobel d/dy of the top and bottom thirds
+    and d/dx of the left and right thirds exceed 50, as the saturated CV_8U Sobel of
+    each third thresholded at 50. A third is evaluated as a Sobel of that third alone:
+    its outer rows (TB) / columns (LR) stay 0, where the reflected border cancels, and
+    elsewhere it equals the crop gradient.
     """
-    # Binarize with polarity
-    thresh_type = cv2.THRESH_BINARY if mode == "white" else cv2.THRESH_BINARY_INV
-    _, binary = cv2.threshold(gray, threshold, 255, thresh_type)
-    
-    if debug:
-        white_pct = (np.sum(binary == 255) / binary.size) * 100
-        print(f"[DEBUG] LR Edge: Binary white%={white_pct:.1f}")
-    
-    # Split into regions
-    w = gray.shape[1]
-    left_region = gray[:, :w//3]
-    right_region = gray[:, 2*w//3:]
-    
-    # Detect edges in each region using Sobel
-    left_edges = cv2.Sobel(left_region, cv2.CV_8U, 1, 0, ksize=3)
-    right_edges = cv2.Sobel(right_region, cv2.CV_8U, 1, 0, ksize=3)
-    
-    # Threshold edges
-    _, left_binary = cv2.threshold(left_edges, 50, 255, cv2.THRESH_BINARY)
-    _, right_binary = cv2.threshold(right_edges, 50, 255, cv2.THRESH_BINARY)
-    
-    # Reconstruct full image with detected edges
-    lr_result = np.zeros_like(gray)
-    lr_result[:, :w//3] = left_binary
-    lr_result[:, 2*w//3:] = right_binary
-    
-    return lr_result
+    h, w = grad_y.shape
+    edges = np.zeros((h, w), np.uint8)
+    for start, stop in ((0, h // 3), (2 * h // 3, h)):
+        if stop - start > 2:
+            rows = slice(start + 1, stop - 1)
+            cv2.compare(grad_y[rows], 50, cv2.CMP_GT, dst=edges[rows])
+    for start, stop in ((0, w // 3), (2 * w // 3, w)):
+        if stop - start > 2:
+            cols = slice(start + 1, stop - 1)
+            band = edges[:, cols]
+            cv2.bitwise_or(band, cv2.compare(grad_x[:, cols], 50, cv2.CMP_GT), dst=band)
+    return edges
 
 
 def check_body_hairline_crack(image, roi, contrast, min_length, noise_filter_size=0,
                               detect_white=True, detect_black=False,
                               offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
-                              debug=False):
+                              debug=False, context=None):
     """
     Detect hairline cracks (very thin lines) on the package body.
 
@@ -330,11 +266,15 @@ def check_body_hairline_crack(image, roi, contrast, min_length, noise_filter_siz
         detect_black: Enable detection of dark hairline cracks
         offset_top/bottom/left/right: ROI offsets to ignore edges
         debug: If True, print debug information
+        context: Optional InspectionContext; crops are taken from its shared gray plane
 
     Returns:
         tuple: (defects_found, longest_length, is_pass, defect_rects)
     """
-    image = np.copy(image)
+    if context is not None:
+        image = context.gray
+    else:
+        image = np.copy(image)
 
     x, y, w, h = roi
     inspect_x = x + offset_left
@@ -359,9 +299,11 @@ def check_body_hairline_crack(image, roi, contrast, min_length, noise_filter_siz
     white_th = min(255, max(0, body_avg + contrast))
     black_th = min(255, max(0, body_avg - contrast))
 
-    # Gradient magnitude to emphasize thin lines
-    grad_x = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3)
-    grad_y = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3)
+    # Gradient magnitude to emphasize thin lines (CV_16S planes shared with the crack check)
+    inspect_roi = (inspect_x, inspect_y, inspect_w, inspect_h)
+    shared = context if context is not None and context.in_window(inspect_roi) else None
+    grad_x = crop_gradient(shared, gray, inspect_roi, 1, 0)
+    grad_y = crop_gradient(shared, gray, inspect_roi, 0, 1)
     grad_mag = cv2.convertScaleAbs(cv2.absdiff(grad_x, grad_y))
 
     masks = []
@@ -447,7 +389,7 @@ def check_edge_chipoff(image, roi,
                        corner_mask_left=5, corner_mask_right=5,
                        ignore_reflection=False, ignore_vertical_line=False,
                        enable_high_contrast=False, high_contrast_value=50,
-                       debug=False):
+                       debug=False, context=None):
     """
     Check for edge chipoff defects on top and bottom body edges.
     
@@ -469,9 +411,12 @@ def check_edge_chipoff(image, roi,
         enable_high_contrast: enable additional high contrast edge inspection
         high_contrast_value: contrast threshold for high contrast mode
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
     
     Returns: (total_defects, largest_area, is_pass, defect_rects)
     """
+    if context is not None:
+        image = context.gray
     x, y, w, h = roi
     
     # Define top and bottom edge inspection regions
@@ -500,12 +445,14 @@ def check_edge_chipoff(image, roi,
             continue
         
         gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if len(crop.shape) == 3 else crop
+        masked_rows = 0
         
         # Apply corner mask (chamfer left and right corners)
         if corner_mask_left > 0 or corner_mask_right > 0:
             gray = gray.copy()
             mask_left = min(corner_mask_left, rw // 2)
             mask_right = min(corner_mask_right, rw // 2)
+            masked_rows = min(max(mask_left, mask_right), rh)
             
             # Mask left corner (triangular region)
             if mask_left > 0:
@@ -517,18 +464,28 @@ def check_edge_chipoff(image, roi,
                 for i in range(min(mask_right, rh)):
                     gray[i, rw-mask_right+i:rw] = 255
         
+        # One region average for every polarity pass; with the band tables only the
+        # masked top rows are summed again
+        if context is not None and gray.shape == (rh, rw):
+            region_sum = context.band_sum(region)
+            if masked_rows:
+                region_sum += int(cv2.sumElems(gray[:masked_rows])[0]) - context.band_sum((rx, ry, rw, masked_rows))
+            avg = int(region_sum / gray.size)
+        else:
+            avg = int(np.mean(gray))
+        
         # Detect black defects (darker than average - cb_contrast)
         black_defects, black_largest, black_rects = _detect_edge_defects(
             gray, cb_contrast, min_area, min_square, polarity='black', 
             ignore_reflection=ignore_reflection, ignore_vertical_line=ignore_vertical_line,
-            debug=debug
+            debug=debug, avg=avg
         )
         
         # Detect white defects (brighter than average + cw_contrast)
         white_defects, white_largest, white_rects = _detect_edge_defects(
             gray, cw_contrast, min_area, min_square, polarity='white',
             ignore_reflection=ignore_reflection, ignore_vertical_line=ignore_vertical_line,
-            debug=debug
+            debug=debug, avg=avg
         )
         
         # High contrast additional inspection
@@ -536,7 +493,7 @@ def check_edge_chipoff(image, roi,
             hc_defects, hc_largest, hc_rects = _detect_edge_defects(
                 gray, high_contrast_value, min_area, min_square, polarity='black',
                 ignore_reflection=ignore_reflection, ignore_vertical_line=ignore_vertical_line,
-                debug=debug
+                debug=debug, avg=avg
             )
             black_defects += hc_defects
             black_largest = max(black_largest, hc_largest)
@@ -562,7 +519,7 @@ def check_edge_chipoff(image, roi,
 
 
 def _detect_edge_defects(gray, contrast, min_area, min_square, polarity='black',
-                         ignore_reflection=False, ignore_vertical_line=False, debug=False):
+                         ignore_reflection=False, ignore_vertical_line=False, debug=False, avg=None):
     """
     Detect edge defects (black or white) using contrast thresholding.
     
@@ -573,13 +530,15 @@ def _detect_edge_defects(gray, contrast, min_area, min_square, polarity='black',
         polarity: 'black' or 'white'
         ignore_reflection: filter reflections (horizontal bright lines)
         ignore_vertical_line: filter vertical lines
+        avg: region average (int) if the caller already has it
     
     Returns: (defect_count, largest_area, rects)
     """
     if gray.size == 0:
         return 0, 0, []
     
-    avg = int(np.mean(gray))
+    if avg is None:
+        avg = int(np.mean(gray))
     
     if polarity == 'black':
         # Black defects: darker than avg - contrast
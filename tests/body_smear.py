@@ -7,14 +7,29 @@ Reverse Chip Check - detects if chip is accidentally placed upside down (reverse
 Based on ChipCap old application logic from CCInsp.cpp lines 31870-31960
 """
 
+from typing import NamedTuple, Tuple
+
 import cv2
 import numpy as np
 from config.debug_runtime import resolve_debug
+from tests.blob_analysis import DISABLED_LIMIT, clean_defect_mask, find_defect_blobs
+
+
+class BodyDefectSpec(NamedTuple):
+    """One Body Smear (white defects) or Body Stain (black defects) check of the fused body-defect pass."""
+    white: bool                             # True: smear (above threshold), False: stain (at or below)
+    contrast: int
+    min_area: int
+    min_square: int = 255
+    use_avg_contrast: bool = True
+    apply_or: bool = True
+    offsets: Tuple[int, int, int, int] = (0, 0, 0, 0)   # top, bottom, left, right
+    red_dot_min: int = 255                  # stain only: max defect count (255 = disabled)
 
 
 def check_body_smear(image, roi, contrast, min_area, min_square=255, use_avg_contrast=True,
                      apply_or=True, offset_top=0, offset_bottom=0,
-                     offset_left=0, offset_right=0, debug=False):
+                     offset_left=0, offset_right=0, debug=False, context=None):
     """
     Check for body smear (white defects) on package surface.
     
@@ -35,6 +50,7 @@ def check_body_smear(image, roi, contrast, min_area, min_square=255, use_avg_con
         apply_or: If True, fail if ANY enabled threshold is exceeded (area OR size). If False, require ALL enabled thresholds.
         offset_top/bottom/left/right: ROI offsets to exclude edges
         debug: If True, print debug information
+        context: Optional InspectionContext; crops are taken from its shared gray plane
     
     Returns:
         dict with:
@@ -43,138 +59,14 @@ def check_body_smear(image, roi, contrast, min_area, min_square=255, use_avg_con
         - 'pass': True if no significant defects found
         - 'defect_rects': list of defect bounding boxes
     """
-    # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
-    
-    x, y, w, h = roi
-    
-    # Apply offsets to create inspection ROI
-    inspect_x = x + offset_left
-    inspect_y = y + offset_top
-    inspect_w = w - offset_left - offset_right
-    inspect_h = h - offset_top - offset_bottom
-    
-    if inspect_w <= 0 or inspect_h <= 0:
-        if debug:
-            print(f"[DEBUG] Body Smear: Invalid inspection ROI after offsets")
-        return {'defects_found': 0, 'largest_area': 0, 'pass': True, 'defect_rects': []}
-    
-    if debug:
-        print(f"[DEBUG] Body Smear: Original ROI=({x}, {y}, {w}, {h})")
-        print(f"[DEBUG] Body Smear: Inspection ROI=({inspect_x}, {inspect_y}, {inspect_w}, {inspect_h})")
-        print(f"[DEBUG] Body Smear: Contrast={contrast}, MinArea={min_area}, MinSquare={min_square}")
-        print(f"[DEBUG] Body Smear: UseAvgContrast={use_avg_contrast}, ApplyOR={apply_or}")
-    
-    # Crop inspection region
-    crop = image[inspect_y:inspect_y+inspect_h, inspect_x:inspect_x+inspect_w]
-    
-    if crop.size == 0:
-        if debug:
-            print(f"[DEBUG] Body Smear: Empty crop")
-        return 0, 0, True, []
-    
-    # Convert to grayscale if needed
-    if len(crop.shape) == 3:
-        # Color image
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-    else:
-        # Already grayscale
-        gray = crop
-    
-    # Calculate threshold
-    if use_avg_contrast:
-        # Adaptive: body average + contrast
-        body_avg = int(np.mean(gray))
-        threshold = min(255, max(0, body_avg + contrast))
-        if debug:
-            print(f"[DEBUG] Body Smear: Body avg={body_avg}, Adaptive threshold={threshold}")
-    else:
-        # Fixed contrast value
-        threshold = min(255, max(0, contrast))
-        if debug:
-            print(f"[DEBUG] Body Smear: Fixed threshold={threshold}")
-    
-    # Binarize: detect white (bright) defects
-    # Pixels ABOVE threshold are considered defects (white smears)
-    _, binary = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
-    
-    if debug:
-        white_pct = (np.sum(binary == 255) / binary.size) * 100
-        print(f"[DEBUG] Body Smear: Binary white%={white_pct:.1f}")
-    
-    # Clean up noise with morphological operations
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
-    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=1)
-    
-    # Find contours (blobs)
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    if debug:
-        print(f"[DEBUG] Body Smear: Found {len(contours)} contours")
-    
-    # Analyze defects
-    defects = []
-    defect_rects = []
-    
-    for contour in contours:
-        area = cv2.contourArea(contour)
-        
-        # Skip very small noise
-        if area < 10:
-            continue
-        
-        # Get bounding rectangle
-        bx, by, bw, bh = cv2.boundingRect(contour)
-        
-        # Check if defect meets criteria
-        area_fail = (min_area != 255) and (area >= min_area)
-        size_fail = False
-        if min_square != 255:
-            size_fail = (bw >= min_square) or (bh >= min_square)
-
-        if apply_or:
-            # OR logic: fail if ANY enabled threshold is exceeded
-            is_defect = area_fail or size_fail
-        else:
-            # AND logic: fail only if ALL enabled thresholds are exceeded
-            checks = []
-            if min_area != 255:
-                checks.append(area_fail)
-            if min_square != 255:
-                checks.append(size_fail)
-            is_defect = all(checks) if checks else False
-        
-        if is_defect:
-            defects.append({
-                'area': area,
-                'width': bw,
-                'height': bh,
-                'rect': (inspect_x + bx, inspect_y + by, bw, bh)
-            })
-            defect_rects.append((inspect_x + bx, inspect_y + by, bw, bh))
-    
-    # Determine pass/fail
-    defects_found = len(defects)
-    largest_area = max([d['area'] for d in defects]) if defects else 0
-    
-    # Pass if no defects found
-    is_pass = (defects_found == 0)
-    
-    if debug:
-        print(f"[DEBUG] Body Smear: Defects found={defects_found}, Largest area={largest_area:.0f}")
-        print(f"[DEBUG] Body Smear: Result={'PASS' if is_pass else 'FAIL'}")
-        if defects:
-            print(f"[DEBUG] Body Smear: Defect details:")
-            for i, d in enumerate(defects):
-                print(f"  [{i}] Area={d['area']:.0f}, Size={d['width']}x{d['height']}, Rect={d['rect']}")
-    
-    return defects_found, int(largest_area), is_pass, defect_rects
+    spec = BodyDefectSpec(True, contrast, min_area, min_square, use_avg_contrast, apply_or,
+                          (offset_top, offset_bottom, offset_left, offset_right))
+    return inspect_body_defects(image, roi, [spec], debug, context)[0]
 
 
 def check_body_stain(image, roi, contrast, min_area, min_square=255, use_avg_contrast=True,
                     apply_or=True, offset_top=0, offset_bottom=0,
-                    offset_left=0, offset_right=0, red_dot_min=255, debug=False):
+                    offset_left=0, offset_right=0, red_dot_min=255, debug=False, context=None):
     """
     Check for body stain (black defects) on package surface.
     
@@ -197,6 +89,7 @@ def check_body_stain(image, roi, contrast, min_area, min_square=255, use_avg_con
         offset_top/bottom/left/right: ROI offsets to exclude edges
         red_dot_min: Maximum acceptable number of defects (255 = disabled)
         debug: If True, print debug information
+        context: Optional InspectionContext; crops are taken from its shared gray plane
     
     Returns:
         tuple: (defects_found, largest_area, is_pass, defect_rects)
@@ -205,145 +98,140 @@ def check_body_stain(image, roi, contrast, min_area, min_square=255, use_avg_con
             - is_pass: True if no significant stains found and defect count within limit
             - defect_rects: list of defect bounding boxes
     """
+    spec = BodyDefectSpec(False, contrast, min_area, min_square, use_avg_contrast, apply_or,
+                          (offset_top, offset_bottom, offset_left, offset_right), red_dot_min)
+    return inspect_body_defects(image, roi, [spec], debug, context)[0]
+
+
+def inspect_body_defects(image, roi, specs, debug=False, context=None):
+    """
+    Fused Body Smear / Body Stain pass over several checks on the same package ROI.
+
+    Checks with the same inspection ROI (same offsets) share one gray crop and its
+    average; every distinct (threshold, polarity) binary is thresholded and cleaned
+    once, and blob extraction runs once per distinct binary and rule. Each result is
+    exactly what check_body_smear / check_body_stain returns for that spec alone.
+
+    Args:
+        image: Input BGR image
+        roi: Package ROI (x, y, w, h)
+        specs: BodyDefectSpec per check
+        debug: If True, print debug information
+        context: Optional InspectionContext; crops are taken from its shared gray plane
+
+    Returns:
+        list of (defects_found, largest_area, is_pass, defect_rects), one per spec
+    """
     # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
-    
-    x, y, w, h = roi
-    
-    # Apply offsets to create inspection ROI
-    inspect_x = x + offset_left
-    inspect_y = y + offset_top
-    inspect_w = w - offset_left - offset_right
-    inspect_h = h - offset_top - offset_bottom
-    
-    if inspect_w <= 0 or inspect_h <= 0:
-        if debug:
-            print(f"[DEBUG] Body Stain: Invalid inspection ROI after offsets")
-        return 0, 0, True, []
-    
-    if debug:
-        print(f"[DEBUG] Body Stain: Original ROI=({x}, {y}, {w}, {h})")
-        print(f"[DEBUG] Body Stain: Inspection ROI=({inspect_x}, {inspect_y}, {inspect_w}, {inspect_h})")
-        print(f"[DEBUG] Body Stain: Contrast={contrast}, MinArea={min_area}, MinSquare={min_square}")
-        print(f"[DEBUG] Body Stain: UseAvgContrast={use_avg_contrast}, ApplyOR={apply_or}")
-    
-    # Crop inspection region
-    crop = image[inspect_y:inspect_y+inspect_h, inspect_x:inspect_x+inspect_w]
-    
-    if crop.size == 0:
-        if debug:
-            print(f"[DEBUG] Body Stain: Empty crop")
-        return 0, 0, True, []
-    
-    # Convert to grayscale if needed
-    if len(crop.shape) == 3:
-        # Color image
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    if context is not None:
+        image = context.gray
     else:
-        # Already grayscale
-        gray = crop
-    
-    # Calculate threshold
-    if use_avg_contrast:
-        # Adaptive: body average - contrast (INVERTED from Body Smear)
-        body_avg = int(np.mean(gray))
-        threshold = min(255, max(0, body_avg - contrast))
-        if debug:
-            print(f"[DEBUG] Body Stain: Body avg={body_avg}, Adaptive threshold={threshold}")
-    else:
-        # Fixed contrast value
-        threshold = min(255, max(0, contrast))
+        image = np.copy(image)
+
+    x, y, w, h = roi
+    crops = {}      # inspection ROI -> (gray crop, body average)
+    binaries = {}   # (inspection ROI, threshold, white) -> cleaned binary
+    blob_sets = {}  # binary key + (min_area, min_square, apply_or) -> Blobs
+    results = []
+    for spec in specs:
+        label = "Body Smear" if spec.white else "Body Stain"
+        offset_top, offset_bottom, offset_left, offset_right = spec.offsets
+
+        # Apply offsets to create inspection ROI
+        inspect_x = x + offset_left
+        inspect_y = y + offset_top
+        inspect_w = w - offset_left - offset_right
+        inspect_h = h - offset_top - offset_bottom
+
+        if inspect_w <= 0 or inspect_h <= 0:
+            if debug:
+                print(f"[DEBUG] {label}: Invalid inspection ROI after offsets")
+            results.append({'defects_found': 0, 'largest_area': 0, 'pass': True, 'defect_rects': []}
+                           if spec.white else (0, 0, True, []))
+            continue
+
         if debug:
-            print(f"[DEBUG] Body Stain: Fixed threshold={threshold}")
-    
-    # Binarize: detect black (dark) defects
-    # Pixels BELOW threshold are considered defects (black stains)
-    # Use THRESH_BINARY_INV to invert the result
-    _, binary = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY_INV)
-    
-    if debug:
-        black_pct = (np.sum(binary == 255) / binary.size) * 100
-        print(f"[DEBUG] Body Stain: Binary black%={black_pct:.1f}")
-    
-    # Clean up noise with morphological operations
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
-    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=1)
-    
-    # Find contours (blobs)
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    if debug:
-        print(f"[DEBUG] Body Stain: Found {len(contours)} contours")
-    
-    # Analyze defects
-    defects = []
-    defect_rects = []
-    
-    for contour in contours:
-        area = cv2.contourArea(contour)
-        
-        # Skip very small noise
-        if area < 10:
+            print(f"[DEBUG] {label}: Original ROI=({x}, {y}, {w}, {h})")
+            print(f"[DEBUG] {label}: Inspection ROI=({inspect_x}, {inspect_y}, {inspect_w}, {inspect_h})")
+            print(f"[DEBUG] {label}: Contrast={spec.contrast}, MinArea={spec.min_area}, MinSquare={spec.min_square}")
+            print(f"[DEBUG] {label}: UseAvgContrast={spec.use_avg_contrast}, ApplyOR={spec.apply_or}")
+
+        inspect_roi = (inspect_x, inspect_y, inspect_w, inspect_h)
+        if inspect_roi not in crops:
+            # Crop inspection region, converted to grayscale if needed
+            crop = image[inspect_y:inspect_y+inspect_h, inspect_x:inspect_x+inspect_w]
+            if crop.size and len(crop.shape) == 3:
+                crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+            crops[inspect_roi] = [crop, None]
+        gray = crops[inspect_roi][0]
+
+        if gray.size == 0:
+            if debug:
+                print(f"[DEBUG] {label}: Empty crop")
+            results.append((0, 0, True, []))
             continue
-        
-        # Get bounding rectangle
-        bx, by, bw, bh = cv2.boundingRect(contour)
-        
-        # Check if defect meets criteria
-        area_fail = (min_area != 255) and (area >= min_area)
-        size_fail = False
-        if min_square != 255:
-            size_fail = (bw >= min_square) or (bh >= min_square)
 
-        if apply_or:
-            # OR logic: fail if ANY enabled threshold is exceeded
-            is_defect = area_fail or size_fail
+        # Calculate threshold: body average +/- contrast (smear: +, stain: -), or a fixed value
+        direction = 1 if spec.white else -1
+        if spec.use_avg_contrast:
+            if crops[inspect_roi][1] is None:
+                crops[inspect_roi][1] = int(np.mean(gray))
+            body_avg = crops[inspect_roi][1]
+            threshold = min(255, max(0, body_avg + direction * spec.contrast))
+            if debug:
+                print(f"[DEBUG] {label}: Body avg={body_avg}, Adaptive threshold={threshold}")
         else:
-            # AND logic: fail only if ALL enabled thresholds are exceeded
-            checks = []
-            if min_area != 255:
-                checks.append(area_fail)
-            if min_square != 255:
-                checks.append(size_fail)
-            is_defect = all(checks) if checks else False
-        
-        if is_defect:
-            defects.append({
-                'area': area,
-                'width': bw,
-                'height': bh,
-                'rect': (inspect_x + bx, inspect_y + by, bw, bh)
-            })
-            defect_rects.append((inspect_x + bx, inspect_y + by, bw, bh))
-    
-    # Determine pass/fail
-    defects_found = len(defects)
-    largest_area = max([d['area'] for d in defects]) if defects else 0
-    
-    # Pass if no defects found
-    is_pass = (defects_found == 0)
-    
-    # Check red dot min count (defect count threshold)
-    if red_dot_min != 255 and defects_found > red_dot_min:
-        is_pass = False
+            threshold = min(255, max(0, spec.contrast))
+            if debug:
+                print(f"[DEBUG] {label}: Fixed threshold={threshold}")
+
+        binary_key = (inspect_roi, threshold, spec.white)
+        binary = binaries.get(binary_key)
+        if binary is None:
+            # Smear: pixels ABOVE threshold are defects; stain: pixels at or BELOW it
+            # (THRESH_BINARY_INV). Noise is cleaned with the shared morphology kernel.
+            mode = cv2.THRESH_BINARY if spec.white else cv2.THRESH_BINARY_INV
+            _, binary = cv2.threshold(gray, threshold, 255, mode)
+            if debug:
+                white_pct = (np.sum(binary == 255) / binary.size) * 100
+                print(f"[DEBUG] {label}: Binary {'white' if spec.white else 'black'}%={white_pct:.1f}")
+            binary = binaries[binary_key] = clean_defect_mask(binary)
+
+        # Label all blobs in one pass; the area / size rule (OR: any enabled limit exceeded,
+        # AND: all enabled limits exceeded) is applied to the whole stats array
+        blob_key = binary_key + (spec.min_area, spec.min_square, spec.apply_or)
+        blobs = blob_sets.get(blob_key)
+        if blobs is None:
+            blobs = blob_sets[blob_key] = find_defect_blobs(binary, spec.min_area, spec.min_square, spec.apply_or)
+        defect_rects = blobs.rect_list(inspect_x, inspect_y)
+
+        # Pass if no defects found
+        defects_found = blobs.count
+        largest_area = blobs.largest_area
+        is_pass = (defects_found == 0)
+
+        # Stain: check red dot min count (defect count threshold)
+        red_dot_min = spec.red_dot_min
+        if not spec.white and red_dot_min != DISABLED_LIMIT and defects_found > red_dot_min:
+            is_pass = False
+            if debug:
+                print(f"[DEBUG] {label}: Red Dot Min check FAILED - found {defects_found} defects, max allowed {red_dot_min}")
+
         if debug:
-            print(f"[DEBUG] Body Stain: Red Dot Min check FAILED - found {defects_found} defects, max allowed {red_dot_min}")
-    
-    if debug:
-        print(f"[DEBUG] Body Stain: Defects found={defects_found}, Largest area={largest_area:.0f}")
-        if red_dot_min != 255:
-            print(f"[DEBUG] Body Stain: Red Dot Min check={red_dot_min}, Defect count check={'PASS' if defects_found <= red_dot_min else 'FAIL'}")
-        print(f"[DEBUG] Body Stain: Result={'PASS' if is_pass else 'FAIL'}")
-        if defects:
-            print(f"[DEBUG] Body Stain: Defect details:")
-            for i, d in enumerate(defects):
-                print(f"  [{i}] Area={d['area']:.0f}, Size={d['width']}x{d['height']}, Rect={d['rect']}")
-    
-    return defects_found, int(largest_area), is_pass, defect_rects
+            print(f"[DEBUG] {label}: Defects found={defects_found}, Largest area={largest_area:.0f}")
+            if not spec.white and red_dot_min != 255:
+                print(f"[DEBUG] {label}: Red Dot Min check={red_dot_min}, Defect count check={'PASS' if defects_found <= red_dot_min else 'FAIL'}")
+            print(f"[DEBUG] {label}: Result={'PASS' if is_pass else 'FAIL'}")
+            if defect_rects:
+                print(f"[DEBUG] {label}: Defect details:")
+                for i, (rect, area) in enumerate(zip(defect_rects, blobs.areas.tolist())):
+                    print(f"  [{i}] Area={area:.0f}, Size={rect[2]}x{rect[3]}, Rect={rect}")
+
+        results.append((defects_found, int(largest_area), is_pass, defect_rects))
+    return results
 
 
-def check_reverse_chip(image, roi, teach_intensity, contrast_diff, debug=False):
+def check_reverse_chip(image, roi, teach_intensity, contrast_diff, debug=False, context=None):
     debug = resolve_debug(debug)
     """
     Check if chip is reversed (accidentally placed upside down).
@@ -361,6 +249,7 @@ def check_reverse_chip(image, roi, teach_intensity, contrast_diff, debug=False):
         teach_intensity: Taught body intensity during teaching (recorded from good chip)
         contrast_diff: Maximum acceptable difference in intensity (e.g., 20)
         debug: If True, print debug information
+        context: Optional InspectionContext; crops are taken from its shared gray plane
     
     Returns:
         tuple: (measured_intensity, is_reversed, is_pass)
@@ -368,6 +257,8 @@ def check_reverse_chip(image, roi, teach_intensity, contrast_diff, debug=False):
             - is_reversed: True if chip appears reversed
             - is_pass: True if check passes (not reversed or within tolerance)
     """
+    if context is not None:
+        image = context.gray
     x, y, w, h = roi
     
     # Apply 40px margin on left and right (from old code)
@@ -441,7 +332,7 @@ def check_reverse_chip(image, roi, teach_intensity, contrast_diff, debug=False):
 
 def check_body_stand_stain(image, roi, edge_contrast, difference, 
                           offset_top=0, offset_bottom=0,
-                          offset_left=0, offset_right=0, debug=False):
+                          offset_left=0, offset_right=0, debug=False, context=None):
     debug = resolve_debug(debug)
     """
     Check for body stand stain (thin stain line at package sealing edge).
@@ -459,6 +350,7 @@ def check_body_stand_stain(image, roi, edge_contrast, difference,
         difference: Maximum acceptable intensity difference between top and bottom
         offset_top/bottom/left/right: ROI offsets to exclude edges
         debug: If True, print debug information
+        context: Optional InspectionContext; crops are taken from its shared gray plane
     
     Returns:
         tuple: (top_intensity, bottom_intensity, is_pass)
@@ -467,7 +359,10 @@ def check_body_stand_stain(image, roi, edge_contrast, difference,
             - is_pass: True if stain not detected (difference within threshold)
     """
     # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
+    if context is not None:
+        image = context.gray
+    else:
+        image = np.copy(image)
     
     x, y, w, h = roi
     
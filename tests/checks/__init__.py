@@ -0,0 +1,25 @@
+"""
+Inspection checks for test_top_bottom / test_feed.
+
+Importing this package registers every check (see registry.py); the station
+pipelines in pipelines.py reference them by key.
+"""
+
+from tests.checks.registry import (
+    STATION_FEED, STATION_TOP_BOTTOM,
+    CheckOutcome, CheckSpec, InspectionRun,
+    get_check, register_check, registered_checks,
+)
+from tests.checks import dimension, body, terminal, location, pocket  # noqa: F401  (register checks)
+from tests.checks.pipelines import FEED_PIPELINE, TOP_BOTTOM_PIPELINE, PipelineEntry
+from tests.checks.runner import apply_outcome, run_checks, save_post_seal_image
+from tests.checks.scheduler import CheckScheduler
+
+__all__ = [
+    "STATION_FEED", "STATION_TOP_BOTTOM",
+    "CheckOutcome", "CheckSpec", "InspectionRun",
+    "get_check", "register_check", "registered_checks",
+    "FEED_PIPELINE", "TOP_BOTTOM_PIPELINE", "PipelineEntry",
+    "apply_outcome", "run_checks", "save_post_seal_image",
+    "CheckScheduler",
+]
@@ -0,0 +1,617 @@
+"""
+Body checks - color, stain, smear, reverse chip, crack and edge chipoff.
+"""
+
+from tests.checks.common import (
+    color_roi_overlay, in_place_overlay, resolve_intensity_window,
+    safe_roi_mean_gray, skipped,
+)
+from tests.checks.options import blob_configured, ci_val
+from tests.checks.registry import (
+    INPUT_FRAME, INPUT_GRAY, INPUT_PACKAGE_ROI, CheckOutcome, register_check,
+)
+from tests.body_crack import check_body_crack, check_body_hairline_crack, check_edge_chipoff, draw_edge_chipoff_bands
+from tests.body_smear import BodyDefectSpec, check_reverse_chip, inspect_body_defects
+
+_BLOB_SCHEMA = ("defects_found", "largest_area")
+# Checks evaluated together by the fused body-defect pass (see _body_defect_result)
+_BODY_DEFECT_KEYS = frozenset({"body_smear_1", "body_smear_2", "body_smear_3", "body_stain_1", "body_stain_2"})
+
+
+# -------------------------------------------------
+# Resolvers
+# -------------------------------------------------
+
+def _resolve_body_color(params, thresholds, pocket_params, station):
+    ci_tab = thresholds.get("ColorInspectionTab", {}) if thresholds else {}
+    contrast = int(ci_tab.get("ci_body_contrast", 255))
+    roi_w_cfg = int(ci_tab.get("ci_body_width", 255))
+    roi_h_cfg = int(ci_tab.get("ci_body_height", 255))
+    return dict(
+        contrast=contrast,
+        roi_w_cfg=roi_w_cfg,
+        roi_h_cfg=roi_h_cfg,
+        offset_top=ci_val(ci_tab, "ci_offset_top", 0),
+        offset_bottom=ci_val(ci_tab, "ci_offset_bottom", 0),
+        offset_left=ci_val(ci_tab, "ci_offset_left", 0),
+        offset_right=ci_val(ci_tab, "ci_offset_right", 0),
+        configured=not (contrast == 255 and roi_w_cfg == 255 and roi_h_cfg == 255),
+    )
+
+
+def _make_body_stain_resolver(stain_num):
+    def _resolve(params, thresholds, pocket_params, station):
+        body_stain_tab = thresholds.get("BodyStainTab", {})
+        contrast = int(body_stain_tab.get(f"bs{stain_num}_contrast", 255))
+        min_area = int(body_stain_tab.get(f"bs{stain_num}_min_area", 255))
+        min_square = int(body_stain_tab.get(f"bs{stain_num}_min_square", 255))
+        return dict(
+            contrast=contrast,
+            min_area=min_area,
+            min_square=min_square,
+            apply_or=bool(body_stain_tab.get(f"bs{stain_num}_apply_or", True)),
+            offset_top=int(body_stain_tab.get(f"bs{stain_num}_off_top", 5)),
+            offset_bottom=int(body_stain_tab.get(f"bs{stain_num}_off_bottom", 5)),
+            offset_left=int(body_stain_tab.get(f"bs{stain_num}_off_left", 5)),
+            offset_right=int(body_stain_tab.get(f"bs{stain_num}_off_right", 5)),
+            red_dot_min=int(body_stain_tab.get(f"bs{stain_num}_red_dot_min", 255)),
+            configured=blob_configured(contrast, min_area, min_square),
+        )
+    return _resolve
+
+
+def _make_body_smear_resolver(smear_num):
+    def _resolve(params, thresholds, pocket_params, station):
+        body_smear_tab = thresholds.get("BodySmearTab", {})
+        contrast = int(body_smear_tab.get(f"bs{smear_num}_contrast", 255))
+        min_area = int(body_smear_tab.get(f"bs{smear_num}_min_area", 255))
+        min_square = int(body_smear_tab.get(f"bs{smear_num}_min_square", 255))
+        return dict(
+            contrast=contrast,
+            min_area=min_area,
+            min_square=min_square,
+            use_avg_contrast=bool(body_smear_tab.get(f"bs{smear_num}_use_avg_contrast", True)),
+            apply_or=bool(body_smear_tab.get(f"bs{smear_num}_apply_or", True)),
+            offset_top=int(body_smear_tab.get(f"bs{smear_num}_offset_top", 5)),
+            offset_bottom=int(body_smear_tab.get(f"bs{smear_num}_offset_bottom", 5)),
+            offset_left=int(body_smear_tab.get(f"bs{smear_num}_offset_left", 5)),
+            offset_right=int(body_smear_tab.get(f"bs{smear_num}_offset_right", 5)),
+            configured=blob_configured(contrast, min_area, min_square),
+        )
+    return _resolve
+
+
+def _resolve_reverse_chip(params, thresholds, pocket_params, station):
+    body_smear_tab = thresholds.get("BodySmearTab", {})
+    return dict(
+        teach_intensity=int(body_smear_tab.get("reverse_teach_intensity", 128)),
+        contrast_diff=int(body_smear_tab.get("reverse_contrast_diff", 20)),
+    )
+
+
+def _resolve_body_crack(params, thresholds, pocket_params, station):
+    bc_tab = thresholds.get("BodyCrackTab", {})
+    contrast = int(bc_tab.get("bc_left_contrast", 255))
+    min_length = int(bc_tab.get("bc_left_min_length", 255))
+    min_elongation = float(bc_tab.get("bc_left_min_elongation", 255))
+    offsets = {
+        name: int(bc_tab.get(f"bc_offset_{name}", 0))
+        for name in ("top", "bottom", "left", "right")
+    }
+    hair_contrast = int(bc_tab.get("bc_hair_contrast", 255))
+    hair_min_length = int(bc_tab.get("bc_hair_min_length", 255))
+    hair_noise = int(bc_tab.get("bc_hair_noise_filtering", 0))
+    return dict(
+        configured=not (contrast == 255 or (min_length == 255 and min_elongation == 255)),
+        # Defaults for unconfigured parameters (255)
+        contrast=30 if contrast == 255 else contrast,
+        min_length=20 if min_length == 255 else min_length,
+        min_elongation=5.0 if min_elongation == 255 else min_elongation,
+        raw_contrast=contrast,
+        raw_min_length=min_length,
+        raw_min_elongation=min_elongation,
+        broken_connection=int(bc_tab.get("bc_left_broken_connection", 0)),
+        low_high_enable=bool(bc_tab.get("bc_left_reject_enable", False)),
+        **{f"offset_{name}": 0 if value == 255 else value for name, value in offsets.items()},
+        # Body Hairline Crack (same tab), runs if either polarity is enabled
+        hair_white_enable=bool(bc_tab.get("bc_hair_white_enable", False)),
+        hair_black_enable=bool(bc_tab.get("bc_hair_black_enable", False)),
+        hair_contrast=30 if hair_contrast == 255 else hair_contrast,
+        hair_min_length=15 if hair_min_length == 255 else hair_min_length,
+        hair_noise=0 if hair_noise == 255 else hair_noise,
+    )
+
+
+def _resolve_edge_chipoff(params, thresholds, pocket_params, station):
+    ec_tab = thresholds.get("EdgeChipoff", {}) if thresholds else {}
+    cb_top = int(ec_tab.get("ec_contrast_black_top", 20))
+    cb_bot = int(ec_tab.get("ec_contrast_black_bot", 20))
+    cw_top = int(ec_tab.get("ec_contrast_white_top", 25))
+    cw_bot = int(ec_tab.get("ec_contrast_white_bot", 25))
+    min_area = int(ec_tab.get("ec_min_area", 50))
+    min_square = int(ec_tab.get("ec_min_square", 5))
+    return dict(
+        configured=not (cb_top == 255 and cb_bot == 255 and cw_top == 255 and cw_bot == 255),
+        # Defaults for unconfigured parameters (255)
+        cb_top=20 if cb_top == 255 else cb_top,
+        cb_bot=20 if cb_bot == 255 else cb_bot,
+        cw_top=25 if cw_top == 255 else cw_top,
+        cw_bot=25 if cw_bot == 255 else cw_bot,
+        min_area=50 if min_area == 255 else min_area,
+        min_square=5 if min_square == 255 else min_square,
+        edge_width_top=int(ec_tab.get("ec_edge_width_top", 10)),
+        edge_width_bot=int(ec_tab.get("ec_edge_width_bot", 10)),
+        insp_offset_top=int(ec_tab.get("ec_insp_offset_top", 5)),
+        insp_offset_bot=int(ec_tab.get("ec_insp_offset_bot", 5)),
+        corner_mask_left=int(ec_tab.get("ec_corner_mask_left", 5)),
+        corner_mask_right=int(ec_tab.get("ec_corner_mask_right", 5)),
+        ignore_reflection=bool(ec_tab.get("ec_ignore_reflection", False)),
+        ignore_vertical_line=bool(ec_tab.get("ec_ignore_vertical_line", False)),
+        enable_high_contrast=bool(ec_tab.get("ec_enable_high_contrast", False)),
+        high_contrast_value=int(ec_tab.get("ec_high_contrast_value", 50)),
+    )
+
+
+# -------------------------------------------------
+# Fused Body Smear / Body Stain pass
+# -------------------------------------------------
+
+def _body_defect_spec(check):
+    opts = check.options
+    return BodyDefectSpec(
+        white=check.key.startswith("body_smear"),
+        contrast=opts["contrast"],
+        min_area=opts["min_area"],
+        min_square=opts["min_square"],
+        use_avg_contrast=opts.get("use_avg_contrast", True),
+        apply_or=opts["apply_or"],
+        offsets=(opts["offset_top"], opts["offset_bottom"], opts["offset_left"], opts["offset_right"]),
+        red_dot_min=opts.get("red_dot_min", 255),
+    )
+
+
+def _body_defect_result(run, check):
+    """
+    (defects_found, largest_area, is_pass, defect_rects) of a Body Smear / Body Stain check.
+
+    The first smear / stain check of a frame inspects every configured one of the plan in a
+    single inspect_body_defects pass (shared crop, average and binaries), memoized on the
+    frame's InspectionContext; the others read their results from it.
+    """
+    if run.context is None:
+        return inspect_body_defects(run.working_image, run.package_roi, [_body_defect_spec(check)], debug=True)[0]
+
+    def fused_pass():
+        checks = [
+            planned for planned in run.plan.checks
+            if planned.key in _BODY_DEFECT_KEYS and planned.error is None and planned.options["configured"]
+        ]
+        results = inspect_body_defects(
+            run.working_image, run.package_roi, [_body_defect_spec(planned) for planned in checks],
+            debug=True, context=run.context,
+        )
+        return {planned.test_name: result for planned, result in zip(checks, results)}
+
+    results = run.context.shared(("body_defects", run.package_roi), fused_pass)
+    if check.test_name not in results:
+        return inspect_body_defects(
+            run.working_image, run.package_roi, [_body_defect_spec(check)], debug=True, context=run.context
+        )[0]
+    return results[check.test_name]
+
+
+# -------------------------------------------------
+# Checks
+# -------------------------------------------------
+
+@register_check(
+    "body_color", resolve=_resolve_body_color,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=0.1, result_schema=("mean", "window_min", "window_max"),
+)
+def run_body_color(run, check):
+    test_name = check.test_name
+    params = run.params
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured")
+
+    offset_top = opts["offset_top"]
+    offset_bottom = opts["offset_bottom"]
+    offset_left = opts["offset_left"]
+    offset_right = opts["offset_right"]
+    base_x = params.package_x + offset_left
+    base_y = params.package_y + offset_top
+    base_w = params.package_w - offset_left - offset_right
+    base_h = params.package_h - offset_top - offset_bottom
+    if base_w <= 0 or base_h <= 0:
+        return CheckOutcome.failure(f"{test_name} NG", [f"{test_name}: Invalid ROI after offsets"])
+
+    roi_w = opts["roi_w_cfg"] if opts["roi_w_cfg"] != 255 else int(base_w * 0.5)
+    roi_h = opts["roi_h_cfg"] if opts["roi_h_cfg"] != 255 else int(base_h * 0.5)
+
+    roi_x = base_x + (base_w - roi_w) // 2
+    roi_y = base_y + (base_h - roi_h) // 2
+    roi = (roi_x, roi_y, roi_w, roi_h)
+
+    mean_intensity = safe_roi_mean_gray(run.working_image, roi, run.context)
+    if mean_intensity is None:
+        return CheckOutcome.failure(f"{test_name} NG", [f"{test_name}: ROI not found"])
+
+    contrast = opts["contrast"]
+    window_min, window_max = resolve_intensity_window(
+        mean_intensity,
+        getattr(params, "body_intensity_min", None),
+        getattr(params, "body_intensity_max", None),
+        contrast,
+    )
+
+    if window_min is None or window_max is None:
+        return skipped(run, test_name, "thresholds not set")
+
+    is_pass = window_min <= mean_intensity <= window_max
+    values = dict(mean=mean_intensity, window_min=window_min, window_max=window_max)
+    overlays = [color_roi_overlay(roi, is_pass, "BODY")] if run.step_mode else []
+
+    if not is_pass:
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: {mean_intensity:.1f} (Allowed {window_min}-{window_max})"],
+            overlays=overlays,
+            values=values,
+            pause_lines=[f"{test_name}: Test paused"],
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"{mean_intensity:.1f}",
+                "expected": f"{window_min}-{window_max}",
+                "suggested_min": max(0, int(mean_intensity - 5)),
+                "suggested_max": min(255, int(mean_intensity + 5)),
+                "debug_info": f"Mean={mean_intensity:.1f}\nWindow={window_min}-{window_max}\nContrast={contrast}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (mean={mean_intensity:.1f})"], overlays=overlays, values=values)
+
+
+def _run_body_stain(run, check):
+    # Body Stain detection - check for black defects on body surface
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    # Parameters from device_inspection.json BodyStainTab (bs1_* / bs2_*)
+    opts = check.options
+    contrast = opts["contrast"]
+    min_area = opts["min_area"]
+    min_square = opts["min_square"]
+    apply_or = opts["apply_or"]
+    red_dot_min = opts["red_dot_min"]
+
+    # Check if parameters are configured (255 means not configured)
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={contrast}, min_area={min_area}, min_square={min_square})")
+
+    defects_found, largest_area, is_pass, defect_rects = _body_defect_result(run, check)
+
+    run.log("[INFO] {}: defects={}, largest={}, pass={}", test_name, defects_found, largest_area, is_pass)
+    values = dict(defects_found=defects_found, largest_area=largest_area)
+
+    if not is_pass:
+        run.log("[FAIL] {} detected defects", test_name)
+        expected_txt = f"Area < {min_area}px"
+        limit_txt = f"max area={min_area}px"
+        if min_square != 255:
+            expected_txt += f" and W/H < {min_square}px" if not apply_or else f" or W/H < {min_square}px"
+            limit_txt += f", max W/H={min_square}px"
+        if red_dot_min != 255:
+            expected_txt += f" and Count <= {red_dot_min}"
+            limit_txt += f", max count={red_dot_min}"
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: {defects_found} defects (largest={largest_area}px, {limit_txt})"],
+            defect_rects=list(defect_rects or []),
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Defects={defects_found}, Largest={largest_area}px",
+                "expected": expected_txt,
+                "suggested_min": None,
+                "suggested_max": int(largest_area * 1.2) if largest_area > 0 else min_area,
+                "debug_info": f"Defects Found: {defects_found}\nLargest Area: {largest_area}px\nMin Area Threshold: {min_area}px\nMin Square Threshold: {min_square}px\nRed Dot Min Count: {red_dot_min}\nApply OR: {apply_or}\nContrast: {contrast}\n\nSuggested new min_area: {int(largest_area * 1.2)}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (defects={defects_found})"], values=values)
+
+
+for _num in (1, 2):
+    register_check(
+        f"body_stain_{_num}", resolve=_make_body_stain_resolver(_num),
+        inputs=(INPUT_FRAME, INPUT_GRAY, INPUT_PACKAGE_ROI), cost=2.0, result_schema=_BLOB_SCHEMA,
+    )(_run_body_stain)
+
+
+def _run_body_smear(run, check):
+    # Body Smear detection - check for white defects on body surface
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    # Parameters from device_inspection.json BodySmearTab (bs1_* .. bs3_*)
+    opts = check.options
+    contrast = opts["contrast"]
+    min_area = opts["min_area"]
+    min_square = opts["min_square"]
+    apply_or = opts["apply_or"]
+
+    # Check if parameters are configured (255 means not configured)
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={contrast}, min_area={min_area}, min_square={min_square})")
+
+    defects_found, largest_area, is_pass, defect_rects = _body_defect_result(run, check)
+
+    run.log("[INFO] {}: defects={}, largest={}, pass={}", test_name, defects_found, largest_area, is_pass)
+    values = dict(defects_found=defects_found, largest_area=largest_area)
+
+    if not is_pass:
+        run.log("[FAIL] {} detected defects", test_name)
+        expected_txt = f"Area < {min_area}px"
+        limit_txt = f"max area={min_area}px"
+        if min_square != 255:
+            expected_txt += f" and W/H < {min_square}px" if not apply_or else f" or W/H < {min_square}px"
+            limit_txt += f", max W/H={min_square}px"
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: {defects_found} defects (largest={largest_area}px, {limit_txt})"],
+            defect_rects=list(defect_rects or []),
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Defects={defects_found}, Largest={largest_area}px",
+                "expected": expected_txt,
+                "suggested_min": None,
+                "suggested_max": int(largest_area * 1.2) if largest_area > 0 else min_area,
+                "debug_info": f"Defects Found: {defects_found}\nLargest Area: {largest_area}px\nMin Area Threshold: {min_area}px\nMin Square Threshold: {min_square}px\nApply OR: {apply_or}\nContrast: {contrast}\n\nSuggested new min_area: {int(largest_area * 1.2)}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (defects={defects_found})"], values=values)
+
+
+for _num in (1, 2, 3):
+    register_check(
+        f"body_smear_{_num}", resolve=_make_body_smear_resolver(_num),
+        inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=2.0, result_schema=_BLOB_SCHEMA,
+    )(_run_body_smear)
+
+
+@register_check(
+    "reverse_chip", resolve=_resolve_reverse_chip,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=0.1, result_schema=("measured_intensity", "is_reversed"),
+)
+def run_reverse_chip(run, check):
+    # Reverse Chip Check - detects if chip is accidentally reversed
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    # Parameters from device_inspection.json BodySmearTab
+    opts = check.options
+    teach_intensity = opts["teach_intensity"]
+    contrast_diff = opts["contrast_diff"]
+
+    measured_intensity, is_reversed, is_pass = check_reverse_chip(
+        run.working_image,
+        run.package_roi,
+        teach_intensity=teach_intensity,
+        contrast_diff=contrast_diff,
+        debug=True,
+        context=run.context
+    )
+
+    run.log("[INFO] {}: measured={}, reversed={}, pass={}", test_name, measured_intensity, is_reversed, is_pass)
+    values = dict(measured_intensity=measured_intensity, is_reversed=is_reversed)
+
+    if not is_pass:
+        run.log("[FAIL] {} - chip appears reversed", test_name)
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: Reversed! (intensity={measured_intensity}, expected={teach_intensity}±{contrast_diff})"],
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Intensity={measured_intensity}",
+                "expected": f"Within {contrast_diff} of {teach_intensity}",
+                "suggested_min": None,
+                "suggested_max": None,
+                "debug_info": f"Taught Intensity: {teach_intensity}\nMeasured Intensity: {measured_intensity}\nDifference: {abs(measured_intensity - teach_intensity)}\nThreshold: {contrast_diff}\n\nChip appears REVERSED!\n\nSuggested new teach_intensity: {measured_intensity}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (intensity={measured_intensity})"], values=values)
+
+
+@register_check(
+    "body_crack", resolve=_resolve_body_crack,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=8.0,
+    result_schema=("defects_found", "largest_length", "hairline_defects", "hairline_length"),
+)
+def run_body_crack(run, check):
+    # Body Crack - detect white cracks on body surface, then hairline cracks (same tab)
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={opts['raw_contrast']}, min_length={opts['raw_min_length']}, min_elongation={opts['raw_min_elongation']})")
+
+    contrast = opts["contrast"]
+    min_length = opts["min_length"]
+    min_elongation = opts["min_elongation"]
+    offsets = dict(
+        offset_top=opts["offset_top"],
+        offset_bottom=opts["offset_bottom"],
+        offset_left=opts["offset_left"],
+        offset_right=opts["offset_right"],
+    )
+
+    defects_found, largest_length, is_pass, defect_rects = check_body_crack(
+        run.working_image,
+        run.package_roi,
+        contrast=contrast,
+        min_length=min_length,
+        min_elongation=min_elongation,
+        broken_connection=opts["broken_connection"],
+        detect_low_high=opts["low_high_enable"],
+        debug=True,
+        context=run.context,
+        **offsets
+    )
+
+    run.log("[INFO] {}: defects={}, largest_length={}, pass={}", test_name, defects_found, largest_length, is_pass)
+    values = dict(defects_found=defects_found, largest_length=largest_length)
+
+    if not is_pass:
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: {defects_found} cracks detected (longest={largest_length}px)"],
+            defect_rects=list(defect_rects or []),
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Cracks={defects_found}, Longest={largest_length}px",
+                "expected": f"Min Length < {min_length}px, Elongation > {min_elongation:.1f}",
+                "suggested_min": None,
+                "suggested_max": int(largest_length * 1.2) if largest_length > 0 else min_length,
+                "debug_info": f"Cracks Found: {defects_found}\nLongest Length: {largest_length}px\nMin Length Threshold: {min_length}px\nMin Elongation: {min_elongation:.1f}\nContrast: {contrast}"
+            },
+        )
+
+    messages = [f"{test_name} OK ({defects_found} cracks, max_length={largest_length}px)"]
+
+    hair_white_enable = opts["hair_white_enable"]
+    hair_black_enable = opts["hair_black_enable"]
+    if not (hair_white_enable or hair_black_enable):
+        return CheckOutcome(messages=messages, values=values)
+
+    hair_contrast = opts["hair_contrast"]
+    hair_min_length = opts["hair_min_length"]
+    hair_noise = opts["hair_noise"]
+    hl_defects, hl_length, hl_pass, hl_rects = check_body_hairline_crack(
+        run.working_image,
+        run.package_roi,
+        contrast=hair_contrast,
+        min_length=hair_min_length,
+        noise_filter_size=hair_noise,
+        detect_white=hair_white_enable,
+        detect_black=hair_black_enable,
+        debug=True,
+        context=run.context,
+        **offsets
+    )
+
+    run.log("[INFO] Body Hairline Crack: defects={}, longest={}, pass={}", hl_defects, hl_length, hl_pass)
+    values.update(hairline_defects=hl_defects, hairline_length=hl_length)
+
+    if not hl_pass:
+        return CheckOutcome.failure(
+            "Body Hairline Crack NG",
+            [f"Body Hairline Crack: {hl_defects} cracks (longest={hl_length}px)"],
+            defect_rects=list(hl_rects or []),
+            values=values,
+            pause_lines=["Body Hairline Crack: Test paused for parameter adjustment"],
+            step_result={
+                "step_name": "Body Hairline Crack",
+                "status": "FAIL",
+                "measured": f"Cracks={hl_defects}, Longest={hl_length}px",
+                "expected": f"Min Length < {hair_min_length}px",
+                "suggested_min": None,
+                "suggested_max": int(hl_length * 1.2) if hl_length > 0 else hair_min_length,
+                "debug_info": f"Hairline Defects: {hl_defects}\nLongest: {hl_length}px\nContrast: {hair_contrast}\nMin Length: {hair_min_length}\nNoise Filter: {hair_noise}\nWhiteEnable: {hair_white_enable}\nBlackEnable: {hair_black_enable}"
+            },
+        )
+
+    messages.append(f"Body Hairline Crack OK ({hl_defects} cracks, max_length={hl_length}px)")
+    return CheckOutcome(messages=messages, values=values)
+
+
+@register_check(
+    "edge_chipoff", resolve=_resolve_edge_chipoff,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=3.0, result_schema=_BLOB_SCHEMA,
+)
+def run_edge_chipoff(run, check):
+    # Edge Chipoff - detect broken defects on body edges (top/bottom)
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured")
+
+    band_options = dict(
+        edge_width_top=opts["edge_width_top"],
+        edge_width_bot=opts["edge_width_bot"],
+        insp_offset_top=opts["insp_offset_top"],
+        insp_offset_bot=opts["insp_offset_bot"],
+        corner_mask_left=opts["corner_mask_left"],
+        corner_mask_right=opts["corner_mask_right"],
+    )
+    defects_found, largest_area, is_pass, defect_rects = check_edge_chipoff(
+        run.working_image,
+        run.package_roi,
+        contrast_black_top=opts["cb_top"],
+        contrast_black_bot=opts["cb_bot"],
+        contrast_white_top=opts["cw_top"],
+        contrast_white_bot=opts["cw_bot"],
+        min_area=opts["min_area"],
+        min_square=opts["min_square"],
+        ignore_reflection=opts["ignore_reflection"],
+        ignore_vertical_line=opts["ignore_vertical_line"],
+        enable_high_contrast=opts["enable_high_contrast"],
+        high_contrast_value=opts["high_contrast_value"],
+        debug=True,
+        context=run.context,
+        **band_options
+    )
+
+    run.log("[INFO] {}: defects={}, largest={}, pass={}", test_name, defects_found, largest_area, is_pass)
+    values = dict(defects_found=defects_found, largest_area=largest_area)
+
+    # Draw inspection bands in step mode
+    overlays = []
+    if run.step_mode:
+        overlays.append(in_place_overlay(
+            draw_edge_chipoff_bands, run.package_roi, color=(0, 255, 0), thickness=2, **band_options
+        ))
+
+    if not is_pass:
+        min_area = opts["min_area"]
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: {defects_found} defects (largest={largest_area}px)"],
+            overlays=overlays,
+            defect_rects=list(defect_rects or []),
+            values=values,
+            pause_lines=[f"{test_name}: Test paused"],
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Defects={defects_found}, Largest={largest_area}px",
+                "expected": f"Area < {min_area}, Size < {opts['min_square']}",
+                "suggested_min": None,
+                "suggested_max": int(largest_area * 1.2) if largest_area > 0 else min_area,
+                "debug_info": f"Contrast Black T{opts['cb_top']} B{opts['cb_bot']}\nContrast White T{opts['cw_top']} B{opts['cw_bot']}\nMinArea={min_area}\nMinSquare={opts['min_square']}\nEdge Width T{opts['edge_width_top']} B{opts['edge_width_bot']}\nInsp Offset T{opts['insp_offset_top']} B{opts['insp_offset_bot']}\nCorner Mask L{opts['corner_mask_left']} R{opts['corner_mask_right']}\nIgnore Reflection={opts['ignore_reflection']}\nIgnore Vertical Line={opts['ignore_vertical_line']}\nHigh Contrast={opts['enable_high_contrast']} ({opts['high_contrast_value']})"
+            },
+        )
+
+    return CheckOutcome(
+        messages=[f"{test_name} OK ({defects_found} defects, largest={largest_area}px)"],
+        overlays=overlays,
+        values=values,
+    )
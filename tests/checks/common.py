@@ -0,0 +1,66 @@
+"""
+Helpers shared by the check implementations.
+"""
+
+import cv2
+
+from tests.checks.registry import CheckOutcome
+
+
+def safe_roi_mean_gray(image, roi, context=None):
+    """Return the mean grayscale intensity for a clamped ROI; None if empty."""
+    if context is not None:
+        image = context.gray
+    x, y, w, h = roi
+    h = max(1, h)
+    w = max(1, w)
+    x = max(0, x)
+    y = max(0, y)
+    x2 = min(image.shape[1], x + w)
+    y2 = min(image.shape[0], y + h)
+    if x2 <= x or y2 <= y:
+        return None
+    if context is not None:
+        # O(1) from the frame's band tables
+        return float(context.band_mean((x, y, x2 - x, y2 - y)))
+    roi_img = image[y:y2, x:x2]
+    if roi_img.size == 0:
+        return None
+    if len(roi_img.shape) == 3:
+        roi_img = cv2.cvtColor(roi_img, cv2.COLOR_BGR2GRAY)
+    return float(roi_img.mean())
+
+
+def resolve_intensity_window(measured, teach_min, teach_max, contrast):
+    """Resolve min/max thresholds from taught values or contrast tolerance."""
+    if teach_min is not None and teach_max is not None and not (teach_min == 0 and teach_max == 255):
+        return int(teach_min), int(teach_max)
+    if contrast != 255:
+        tol = max(1, int(contrast))
+        return max(0, int(measured - tol)), min(255, int(measured + tol))
+    return None, None
+
+
+def color_roi_overlay(roi, is_pass, label):
+    """Overlay drawing a labelled green (pass) / red (fail) ROI box."""
+    def draw(image):
+        color = (0, 255, 0) if is_pass else (0, 0, 255)
+        x, y, w, h = roi
+        cv2.rectangle(image, (x, y), (x + w, y + h), color, 2)
+        cv2.putText(image, label, (x, y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+        return image
+    return draw
+
+
+def in_place_overlay(draw_fn, *args, **kwargs):
+    """Wrap an in-place drawing helper (returns None) as an overlay."""
+    def draw(image):
+        draw_fn(image, *args, **kwargs)
+        return image
+    return draw
+
+
+def skipped(run, test_name, reason, log_detail=None):
+    """Outcome for a check that is enabled but not configured."""
+    run.log("[SKIP] {} {}", test_name, log_detail or reason)
+    return CheckOutcome(messages=[f"{test_name} SKIPPED ({reason})"])
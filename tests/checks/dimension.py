@@ -0,0 +1,688 @@
+"""
+Dimension checks - body / terminal measurements against taught ranges.
+"""
+
+from tests.checks.options import diff_tolerance, measurement_options
+from tests.checks.registry import (
+    INPUT_EDGE_CONTRAST, INPUT_GRAY, INPUT_PACKAGE_ROI, STATION_FEED,
+    CheckOutcome, register_check,
+)
+from tests.checks.common import skipped
+from tests.measurement_draw import draw_measurement_result
+from tests.measurements import (
+    measure_body_width, measure_body_length,
+    measure_terminal_width, measure_terminal_length,
+    measure_term_to_term_length,
+    measure_body_to_term_width,
+    measure_term_to_body_gap,
+    check_body_width_difference,
+    check_terminal_length_difference,
+)
+
+_RANGE_SCHEMA = ("value", "min_threshold", "max_threshold", "threshold_source")
+# Line-fitted measurements also report the edge fit quality
+_EDGE_RANGE_SCHEMA = _RANGE_SCHEMA + ("edge_rms",)
+
+# Edge line fit residual RMS (px) above which the measured edge is logged as noisy
+NOISY_EDGE_RMS = 1.0
+
+
+# -------------------------------------------------
+# Resolvers
+# -------------------------------------------------
+
+def _resolve_body_width(params, thresholds, pocket_params, station):
+    return measurement_options(
+        thresholds, "body_width_min", "body_width_max",
+        params.body_width_min, params.body_width_max,
+        body_contrast=params.ranges.get("body_contrast", 75),
+        scale_to_roi=station != STATION_FEED,
+    )
+
+
+def _resolve_body_length(params, thresholds, pocket_params, station):
+    return measurement_options(
+        thresholds, "body_length_min", "body_length_max",
+        params.body_length_min, params.body_length_max,
+        body_contrast=params.ranges.get("body_contrast", 75),
+        use_pkg_as_body=bool(thresholds.get("pkg_as_body", False)),
+        scale_to_roi=station != STATION_FEED,
+    )
+
+
+def _resolve_terminal_width(params, thresholds, pocket_params, station):
+    if station == STATION_FEED:
+        fallback_min = int(thresholds.get("terminal_width_min", 10))
+        fallback_max = int(thresholds.get("terminal_width_max", 100))
+    else:
+        fallback_min = params.terminal_width_min if hasattr(params, 'terminal_width_min') else 10
+        fallback_max = params.terminal_width_max if hasattr(params, 'terminal_width_max') else 100
+    return measurement_options(
+        thresholds, "terminal_width_min", "terminal_width_max", fallback_min, fallback_max,
+        scale_to_roi=station != STATION_FEED,
+    )
+
+
+def _resolve_terminal_length(params, thresholds, pocket_params, station):
+    fallback_min = thresholds.get("terminal_length_min", 10)
+    fallback_max = thresholds.get("terminal_length_max", 100)
+    if station == STATION_FEED:
+        fallback_min, fallback_max = int(fallback_min), int(fallback_max)
+    return measurement_options(
+        thresholds, "terminal_length_min", "terminal_length_max", fallback_min, fallback_max,
+        scale_to_roi=station != STATION_FEED,
+    )
+
+
+def _resolve_term_term_length(params, thresholds, pocket_params, station):
+    return measurement_options(
+        thresholds, "term_to_term_length_min", "term_to_term_length_max",
+        int(thresholds.get("term_to_term_length_min", 20)),
+        int(thresholds.get("term_to_term_length_max", 200)),
+        scale_to_roi=station != STATION_FEED,
+    )
+
+
+def _resolve_body_to_term_width(params, thresholds, pocket_params, station):
+    # Range re-check applied after the main evaluation (10-50 when not set)
+    recheck_min = thresholds.get("body_to_term_min", "255") if thresholds else "255"
+    recheck_max = thresholds.get("body_to_term_max", "255") if thresholds else "255"
+    try:
+        recheck_min = int(recheck_min) if recheck_min != "255" and recheck_min != "" else 10
+        recheck_max = int(recheck_max) if recheck_max != "255" and recheck_max != "" else 50
+    except ValueError:
+        recheck_min, recheck_max = 10, 50
+    return measurement_options(
+        thresholds, "body_to_term_min", "body_to_term_max",
+        int(thresholds.get("body_to_term_min", 10)),
+        int(thresholds.get("body_to_term_max", 50)),
+        recheck_min=recheck_min,
+        recheck_max=recheck_max,
+    )
+
+
+def _resolve_term_body_gap(params, thresholds, pocket_params, station):
+    min_required = thresholds.get("term_body_gap_min", "255") if thresholds else "255"
+    try:
+        min_required = None if (min_required == "255" or min_required == "") else int(min_required)
+    except ValueError:
+        min_required = None
+
+    # Prefer explicit gap edge contrast if provided
+    gap_edge_contrast = None
+    gap_edge = thresholds.get("term_body_gap_edge", "255") if thresholds else "255"
+    if gap_edge not in ("255", "", None):
+        try:
+            gap_edge_contrast = int(gap_edge)
+        except ValueError:
+            pass
+    return dict(min_required=min_required, gap_edge_contrast=gap_edge_contrast)
+
+
+def _resolve_body_width_diff(params, thresholds, pocket_params, station):
+    tolerance_str, tolerance = diff_tolerance(thresholds, "body_width_diff_value")
+    return dict(
+        tolerance_str=tolerance_str,
+        tolerance=tolerance,
+        body_contrast=params.ranges.get("body_contrast", 75),
+    )
+
+
+def _resolve_terminal_length_diff(params, thresholds, pocket_params, station):
+    tolerance_str, tolerance = diff_tolerance(thresholds, "terminal_length_diff_value")
+    options = dict(tolerance_str=tolerance_str, tolerance=tolerance, edge_contrast=None)
+    if station != STATION_FEED:
+        # TOP/BOTTOM takes the terminal edge contrast from pocket_params "edge_contrast"
+        edge_contrast = 106  # default
+        if pocket_params:
+            edge_contrast = int(pocket_params.get("edge_contrast", 106))
+        options["edge_contrast"] = edge_contrast
+    return options
+
+
+# -------------------------------------------------
+# Range measurements
+# -------------------------------------------------
+
+def _allowed_range(run, opts):
+    """Min/max for a range measurement: device_inspection.json first, then params."""
+    min_threshold = opts["min_threshold"]
+    max_threshold = opts["max_threshold"]
+    threshold_source = opts["threshold_source"]
+    fallback_min = opts["fallback_min"]
+    fallback_max = opts["fallback_max"]
+
+    if not opts["scale_to_roi"]:
+        if min_threshold is None:
+            min_threshold = fallback_min
+        if max_threshold is None:
+            max_threshold = fallback_max
+        return min_threshold, max_threshold, threshold_source
+
+    # fallback to params
+    if min_threshold is None:
+        min_threshold = int(fallback_min) if fallback_min else None
+    else:
+        min_threshold = int(min_threshold)
+    if max_threshold is None:
+        max_threshold = int(fallback_max) if fallback_max else None
+    else:
+        max_threshold = int(max_threshold)
+
+    # Scale-aware sanity check: adjust thresholds if they are
+    # unrealistic for current image resolution.
+    # IMPORTANT: Only apply if thresholds came from params fallback.
+    # If they came from device_inspection.json, trust them explicitly.
+    roi_w = run.params.package_w
+    if roi_w and (min_threshold is not None) and (max_threshold is not None) and threshold_source == "params":
+        too_large = (int(min_threshold) > int(roi_w * 1.2)) or (int(max_threshold) > int(roi_w * 1.2))
+        if too_large:
+            min_threshold = int(roi_w * 0.55)
+            max_threshold = int(roi_w * 0.90)
+            threshold_source = "scaled_by_roi"
+    return min_threshold, max_threshold, threshold_source
+
+
+def _range_outcome(run, check, opts, value, points_data=None, quality=None):
+    """Evaluate a single measured value against its allowed range.
+
+    quality: measurement quality metrics (e.g. edge_rms), added to the outcome values.
+    """
+    test_name = check.test_name
+    if value is None:
+        run.log("[FAIL] {} not detected", test_name)
+        return CheckOutcome.failure(f"{test_name} detect fail", [f"{test_name} not detected"])
+
+    run.log("[INFO] {} measured = {}", test_name, value)
+    min_threshold, max_threshold, threshold_source = _allowed_range(run, opts)
+    run.log("[INFO] Allowed = {} - {} (from {})", min_threshold, max_threshold, threshold_source)
+
+    is_pass = (min_threshold <= value <= max_threshold)
+    values = dict(value=value, min_threshold=min_threshold, max_threshold=max_threshold,
+                  threshold_source=threshold_source)
+    if quality:
+        values.update(quality)
+        if quality.get("edge_rms", 0.0) > NOISY_EDGE_RMS:
+            run.log("[WARN] {} noisy edge: line fit RMS={:.2f}px", test_name, quality["edge_rms"])
+
+    if not is_pass:
+        # Suggested thresholds: ±20% or ±10 pixels, whichever is larger
+        tolerance = max(10, int(value * 0.20))
+        suggested_min = max(1, int(round(value - tolerance)))
+        suggested_max = int(round(value + tolerance))
+        run.log("[FAIL] {} out of range", test_name)
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: {value} (Expected: {min_threshold}-{max_threshold})"],
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"{value} pixels",
+                "expected": f"{min_threshold} - {max_threshold} pixels",
+                "suggested_min": suggested_min,
+                "suggested_max": suggested_max,
+                "debug_info": f"Measured: {value}\nCurrent Min: {min_threshold}\nCurrent Max: {max_threshold}\n\nSuggested Min: {suggested_min}\nSuggested Max: {suggested_max}\n\nSource: {threshold_source}"
+            },
+        )
+
+    outcome = CheckOutcome(messages=[f"{test_name} OK ({value})"], values=values)
+    if run.step_mode:
+        # For PASS: draw the measurement overlays (returns modified copy)
+        roi = run.package_roi
+        outcome.overlays.append(lambda image: draw_measurement_result(
+            image, roi, test_name, "PASS", value, min_threshold, max_threshold, points_data or {}
+        ))
+    return outcome
+
+
+def _terminal_rois(params):
+    top_terminal_roi = (params.package_x, params.package_y, params.package_w, int(params.package_h * 0.3))
+    bottom_terminal_roi = (params.package_x, params.package_y + int(params.package_h * 0.7), params.package_w, int(params.package_h * 0.3))
+    return top_terminal_roi, bottom_terminal_roi
+
+
+def _left_right_terminal_rois(params):
+    left_terminal_roi = (params.package_x, params.package_y, int(params.package_w * 0.3), int(params.package_h * 0.3))
+    right_terminal_roi = (params.package_x + int(params.package_w * 0.7), params.package_y, int(params.package_w * 0.3), int(params.package_h * 0.3))
+    return left_terminal_roi, right_terminal_roi
+
+
+@register_check(
+    "body_width", resolve=_resolve_body_width,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=1.5, result_schema=_EDGE_RANGE_SCHEMA,
+)
+def run_body_width(run, check):
+    opts = check.options
+    params = run.params
+    quality = {}
+    value = measure_body_width(
+        run.working_image,
+        run.package_roi,
+        body_contrast=opts["body_contrast"],
+        debug=True,
+        context=run.context,
+        quality=quality
+    )
+    return _range_outcome(run, check, opts, value, {
+        "top_y": params.package_y + (params.package_h * 0.25),
+        "bottom_y": params.package_y + (params.package_h * 0.75),
+        "center_x": params.package_x + (params.package_w / 2)
+    }, quality)
+
+
+@register_check(
+    "body_length", resolve=_resolve_body_length,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=1.5, result_schema=_EDGE_RANGE_SCHEMA,
+)
+def run_body_length(run, check):
+    opts = check.options
+    params = run.params
+    quality = {}
+    # If configured to use package location as body length, use taught width
+    if opts["use_pkg_as_body"]:
+        value = int(params.package_w)
+        run.log("[INFO] Using package width as Body Length (pkg_as_body)")
+    else:
+        value = measure_body_length(
+            run.working_image,
+            run.package_roi,
+            body_contrast=opts["body_contrast"],
+            debug=True,
+            context=run.context,
+            quality=quality
+        )
+    return _range_outcome(run, check, opts, value, {
+        "left_x": params.package_x + (params.package_w * 0.25),
+        "right_x": params.package_x + (params.package_w * 0.75),
+        "center_y": params.package_y + (params.package_h / 2)
+    }, quality)
+
+
+@register_check(
+    "terminal_width", resolve=_resolve_terminal_width,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_EDGE_CONTRAST), cost=2.0, result_schema=_RANGE_SCHEMA,
+)
+def run_terminal_width(run, check):
+    opts = check.options
+    # Terminal Width: find leftmost/rightmost terminal edges, top terminal first
+    top_terminal_roi, bottom_terminal_roi = _terminal_rois(run.params)
+    value = measure_terminal_width(
+        run.working_image,
+        run.package_roi,
+        top_terminal_roi,
+        edge_contrast=run.edge_contrast_value,
+        debug=run.debug_enabled,
+        context=run.context
+    )
+
+    # If top fails, try bottom terminal
+    if value is None:
+        run.log("[INFO] Top terminal width not detected, trying bottom terminal...")
+        value = measure_terminal_width(
+            run.working_image,
+            run.package_roi,
+            bottom_terminal_roi,
+            edge_contrast=run.edge_contrast_value,
+            debug=True,
+            context=run.context
+        )
+    return _range_outcome(run, check, opts, value)
+
+
+@register_check(
+    "terminal_length", resolve=_resolve_terminal_length,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_EDGE_CONTRAST), cost=3.0, result_schema=_RANGE_SCHEMA,
+)
+def run_terminal_length(run, check):
+    opts = check.options
+    # Terminal Length: multi-scan edge detection, top terminal first
+    top_terminal_roi, bottom_terminal_roi = _terminal_rois(run.params)
+    value = measure_terminal_length(
+        run.working_image,
+        run.package_roi,
+        top_terminal_roi,
+        edge_contrast=run.edge_contrast_value,
+        num_scans=100,
+        debug=True,
+        context=run.context
+    )
+
+    # If top fails, try bottom terminal
+    if value is None:
+        run.log("[INFO] Top terminal length not detected, trying bottom terminal...")
+        value = measure_terminal_length(
+            run.working_image,
+            run.package_roi,
+            bottom_terminal_roi,
+            edge_contrast=run.edge_contrast_value,
+            num_scans=100,
+            debug=True,
+            context=run.context
+        )
+    return _range_outcome(run, check, opts, value)
+
+
+@register_check(
+    "term_term_length", resolve=_resolve_term_term_length,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_EDGE_CONTRAST), cost=3.0, result_schema=_RANGE_SCHEMA,
+)
+def run_term_term_length(run, check):
+    opts = check.options
+    # Term-to-Term Length: gap between left and right terminals
+    left_terminal_roi, right_terminal_roi = _left_right_terminal_rois(run.params)
+    value = measure_term_to_term_length(
+        run.working_image,
+        run.package_roi,
+        left_terminal_roi,
+        right_terminal_roi,
+        edge_contrast=run.edge_contrast_value,
+        num_scans=100,
+        debug=True,
+        context=run.context
+    )
+    return _range_outcome(run, check, opts, value)
+
+
+# -------------------------------------------------
+# Band / gap measurements
+# -------------------------------------------------
+
+def _band_range_failure(test_name, top_v, bot_v, min_threshold, max_threshold, debug_info):
+    worst_v = top_v if not (min_threshold <= top_v <= max_threshold) else bot_v
+    tol = max(5, int(worst_v * 0.2))
+    step_result = {
+        "step_name": test_name,
+        "status": "FAIL",
+        "measured": f"top={top_v}, bottom={bot_v}",
+        "expected": f"{min_threshold}-{max_threshold}" + (" pixels (both)" if debug_info else ""),
+        "suggested_min": max(1, min(top_v, bot_v) - tol),
+        "suggested_max": max(top_v, bot_v) + tol,
+    }
+    if debug_info:
+        step_result["debug_info"] = f"Top: {top_v}\nBottom: {bot_v}\n"
+    return CheckOutcome.failure(
+        f"{test_name} NG",
+        [f"{test_name}: top={top_v}, bottom={bot_v} (Allowed {min_threshold}-{max_threshold})"],
+        step_result=step_result,
+        pause_lines=[f"{test_name}: Test paused"],
+        values=dict(top=top_v, bottom=bot_v, min_threshold=min_threshold, max_threshold=max_threshold),
+    )
+
+
+@register_check(
+    "body_to_term_width", resolve=_resolve_body_to_term_width,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_EDGE_CONTRAST), cost=2.0,
+    result_schema=("top", "bottom", "min_threshold", "max_threshold"),
+)
+def run_body_to_term_width(run, check):
+    """
+    Top and bottom body band thickness, checked against the device range and
+    then against the body_to_term re-check range (10-50 when not set).
+    """
+    test_name = check.test_name
+    opts = check.options
+    result = measure_body_to_term_width(
+        run.working_image,
+        run.package_roi,
+        edge_contrast=run.edge_contrast_value,
+        num_scans=60,
+        debug=True,
+        context=run.context
+    )
+    top_v = result.get('top')
+    bot_v = result.get('bottom')
+    if top_v is None or bot_v is None:
+        run.log("[FAIL] {} not detected", test_name)
+        return CheckOutcome.failure(f"{test_name} detect fail", [f"{test_name} not detected"])
+
+    # thresholds from device
+    min_threshold = opts["min_threshold"]
+    max_threshold = opts["max_threshold"]
+    if min_threshold is None:
+        min_threshold = opts["fallback_min"]
+    if max_threshold is None:
+        max_threshold = opts["fallback_max"]
+    ranges = (
+        (min_threshold, max_threshold, True),
+        (opts["recheck_min"], opts["recheck_max"], False),
+    )
+
+    for min_threshold, max_threshold, with_debug_info in ranges:
+        run.log("[INFO] {} top={}, bottom={} allowed={}-{}", test_name, top_v, bot_v, min_threshold, max_threshold)
+        is_pass = (min_threshold <= top_v <= max_threshold) and (min_threshold <= bot_v <= max_threshold)
+        if not is_pass:
+            return _band_range_failure(test_name, top_v, bot_v, min_threshold, max_threshold, with_debug_info)
+
+    return CheckOutcome(
+        messages=[f"{test_name} OK (top={top_v}, bottom={bot_v})"],
+        values=dict(top=top_v, bottom=bot_v, min_threshold=min_threshold, max_threshold=max_threshold),
+    )
+
+
+def _gap_outcome(run, test_name, gap_val, min_required, with_debug_info):
+    if gap_val is None:
+        run.log("[FAIL] {} not detected", test_name)
+        return CheckOutcome.failure(f"{test_name} detect fail", [f"{test_name} not detected"])
+
+    if min_required is None:
+        # If not configured, just report and continue
+        run.log("[SKIP] {} min not configured; measured={}", test_name, gap_val)
+        return CheckOutcome(messages=[f"{test_name} SKIPPED (measured {gap_val})"], values=dict(gap=gap_val))
+
+    if gap_val < min_required:
+        step_result = {
+            "step_name": test_name,
+            "status": "FAIL",
+            "measured": f"gap={gap_val}",
+            "expected": f">= {min_required} px",
+            "suggested_min": max(1, gap_val - 1),
+        }
+        if with_debug_info:
+            step_result["suggested_max"] = None
+            step_result["debug_info"] = f"Measured minimum gap: {gap_val}\nCurrent minimum: {min_required}"
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: gap={gap_val} (Min {min_required})"],
+            step_result=step_result,
+            pause_lines=[f"{test_name}: Test paused"],
+            values=dict(gap=gap_val, min_required=min_required),
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (gap={gap_val})"], values=dict(gap=gap_val, min_required=min_required))
+
+
+@register_check(
+    "term_body_gap", resolve=_resolve_term_body_gap,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_EDGE_CONTRAST), writes=(INPUT_EDGE_CONTRAST,),
+    cost=2.0, result_schema=("gap", "min_required"),
+)
+def run_term_body_gap(run, check):
+    """
+    Worst-case (minimum) terminal-to-body gap against the configured minimum.
+
+    The gap is measured with the running edge contrast. When a dedicated
+    term_body_gap_edge contrast is configured it becomes the edge contrast
+    for this and every later check, and the gap is re-measured with it if
+    it differs.
+    """
+    test_name = check.test_name
+    opts = check.options
+    min_required = opts["min_required"]
+    edge_contrast = run.edge_contrast_value
+
+    def measure(contrast):
+        return measure_term_to_body_gap(
+            run.working_image,
+            run.package_roi,
+            edge_contrast=contrast,
+            num_scans=60,
+            debug=True,
+            context=run.context
+        )
+
+    outcome = _gap_outcome(run, test_name, measure(edge_contrast), min_required, True)
+    if not outcome.passed:
+        return outcome
+
+    # Prefer explicit gap edge contrast if provided
+    if opts["gap_edge_contrast"] is not None:
+        run.edge_contrast_value = opts["gap_edge_contrast"]
+        if run.edge_contrast_value != edge_contrast:
+            outcome = _gap_outcome(run, test_name, measure(run.edge_contrast_value), min_required, False)
+    return outcome
+
+
+# -------------------------------------------------
+# Difference checks
+# -------------------------------------------------
+
+@register_check(
+    "body_width_diff", resolve=_resolve_body_width_diff,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=2.0,
+    result_schema=("top", "bottom", "difference", "tolerance"),
+)
+def run_body_width_diff(run, check):
+    # Body Width Difference: measure top and bottom body widths separately
+    test_name = check.test_name
+    params = run.params
+    run.log("[INFO] Measuring Body Width Difference...")
+
+    # Tolerance from device_inspection.json (None = not configured)
+    opts = check.options
+    tolerance = opts["tolerance"]
+    if tolerance is None:
+        return skipped(run, test_name, "tolerance not set",
+                       f"tolerance not configured (value={opts['tolerance_str']})")
+
+    # Measure body width at top 25% region
+    top_roi_height = int(params.package_h * 0.25)
+    top_roi = (params.package_x, params.package_y, params.package_w, top_roi_height)
+    top_width = measure_body_width(
+        run.working_image,
+        top_roi,
+        body_contrast=opts["body_contrast"],
+        debug=True,
+        context=run.context
+    )
+
+    # Measure body width at bottom 25% region
+    bottom_roi_height = int(params.package_h * 0.25)
+    bottom_roi = (params.package_x, params.package_y + params.package_h - bottom_roi_height,
+                  params.package_w, bottom_roi_height)
+    bottom_width = measure_body_width(
+        run.working_image,
+        bottom_roi,
+        body_contrast=opts["body_contrast"],
+        debug=True,
+        context=run.context
+    )
+
+    if top_width is None or bottom_width is None:
+        run.log("[FAIL] Body Width Diff measurement failed")
+        return CheckOutcome.failure(f"{test_name} measurement fail", [f"{test_name}: Measurement failed"])
+
+    # Check difference
+    result = check_body_width_difference(top_width, bottom_width, tolerance, debug=True)
+    values = dict(top=result['top'], bottom=result['bottom'], difference=result['difference'],
+                  tolerance=result['tolerance'])
+
+    run.log("[INFO] Top Width: {:.2f}, Bottom Width: {:.2f}", result['top'], result['bottom'])
+    run.log("[INFO] Difference: {:.2f}, Tolerance: {:.2f}", result['difference'], result['tolerance'])
+
+    if not result['is_pass']:
+        run.log("[FAIL] Body Width Diff exceeds tolerance")
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: Diff={result['difference']:.2f} (Tolerance: {tolerance:.2f})"],
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Diff={result['difference']:.2f} (Top={result['top']:.2f}, Bottom={result['bottom']:.2f})",
+                "expected": f"< {tolerance:.2f} pixels",
+                "suggested_min": 0,
+                "suggested_max": int(result['difference'] * 1.5),
+                "debug_info": f"Top Width: {result['top']:.2f}\nBottom Width: {result['bottom']:.2f}\nDifference: {result['difference']:.2f}\nTolerance: {result['tolerance']:.2f}\n\nSuggested new tolerance: {int(result['difference'] * 1.5)}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (Diff={result['difference']:.2f})"], values=values)
+
+
+@register_check(
+    "terminal_length_diff", resolve=_resolve_terminal_length_diff,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_EDGE_CONTRAST), writes=(INPUT_EDGE_CONTRAST,),
+    cost=6.0, result_schema=("left", "right", "max_difference", "tolerance"),
+)
+def run_terminal_length_diff(run, check):
+    # Terminal Length Difference: measure left and right terminal lengths
+    test_name = check.test_name
+    run.log("[INFO] Measuring Terminal Length Difference...")
+
+    # Tolerance from device_inspection.json (None = not configured)
+    opts = check.options
+    tolerance = opts["tolerance"]
+    if tolerance is None:
+        return skipped(run, test_name, "tolerance not set",
+                       f"tolerance not configured (value={opts['tolerance_str']})")
+
+    # TOP/BOTTOM: edge contrast from pocket_params "edge_contrast" (kept for later checks)
+    if opts["edge_contrast"] is not None:
+        run.edge_contrast_value = opts["edge_contrast"]
+
+    # Left terminal ROI: leftmost 30% of package, right: rightmost 30%; top 30% height
+    left_terminal_roi, right_terminal_roi = _left_right_terminal_rois(run.params)
+
+    # For now, measure single values for left and right
+    # In the future, this should be enhanced to collect multiple measurements per side
+    left_length = measure_terminal_length(
+        run.working_image,
+        run.package_roi,
+        left_terminal_roi,
+        edge_contrast=run.edge_contrast_value,
+        num_scans=100,
+        debug=True,
+        context=run.context
+    )
+
+    right_length = measure_terminal_length(
+        run.working_image,
+        run.package_roi,
+        right_terminal_roi,
+        edge_contrast=run.edge_contrast_value,
+        num_scans=100,
+        debug=True,
+        context=run.context
+    )
+
+    if left_length is None or right_length is None:
+        run.log("[FAIL] Terminal Length Diff measurement failed")
+        return CheckOutcome.failure(f"{test_name} measurement fail", [f"{test_name}: Measurement failed"])
+
+    # Check difference
+    result = check_terminal_length_difference([left_length], [right_length], tolerance, debug=run.debug_enabled)
+    values = dict(left=result.get('worst_left', 0), right=result.get('worst_right', 0),
+                  max_difference=result['max_difference'], tolerance=result['tolerance'])
+
+    run.log("[INFO] Left Length: {:.2f}, Right Length: {:.2f}", result.get('worst_left', 0), result.get('worst_right', 0))
+    run.log("[INFO] Max Difference: {:.2f}, Tolerance: {:.2f}", result['max_difference'], result['tolerance'])
+
+    if not result['is_pass']:
+        run.log("[FAIL] Terminal Length Diff exceeds tolerance")
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: Diff={result['max_difference']:.2f} (Tolerance: {tolerance:.2f})"],
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Diff={result['max_difference']:.2f} (Left={result.get('worst_left', 0):.2f}, Right={result.get('worst_right', 0):.2f})",
+                "expected": f"< {tolerance:.2f} pixels",
+                "suggested_min": 0,
+                "suggested_max": int(result['max_difference'] * 1.5),
+                "debug_info": f"Left Length: {result.get('worst_left', 0):.2f}\nRight Length: {result.get('worst_right', 0):.2f}\nMax Difference: {result['max_difference']:.2f}\nTolerance: {result['tolerance']:.2f}\n\nSuggested new tolerance: {int(result['max_difference'] * 1.5)}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (Diff={result['max_difference']:.2f})"], values=values)
@@ -0,0 +1,326 @@
+"""
+Location checks - package location (+ mark inspection) and FEED pocket
+location with pocket dimension / gap / shift tracking.
+"""
+
+import time
+
+from config.inspection_timing import add_span
+from imaging.device_location import detect_device_location, validate_device_location
+from imaging.pocket_location import (
+    detect_pocket_location, validate_pocket_location,
+    check_pocket_dimension, check_pocket_gap, track_pocket_shift,
+)
+from imaging.pocket_shift_log import get_shift_log_manager
+from imaging.mark_inspection import detect_marks, verify_marks
+from tests.checks.registry import (
+    INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_POCKET_ROI, INPUT_POCKET_SHIFT,
+    CheckOutcome, register_check,
+)
+
+
+def _mark_inspection(run, device_roi, messages):
+    """Mark Inspection after device location; failures are warnings only."""
+    mark_config = run.plan.mark_config
+    if not mark_config.symbol_set.enable_mark_inspect:
+        run.log("[INFO] Mark Inspection disabled")
+        return
+
+    run.log("[INFO] Mark Inspection enabled - running detection...")
+    start = time.perf_counter_ns()
+    mark_result = detect_marks(
+        run.working_image,
+        config=mark_config,
+        roi=device_roi,
+        debug=True,
+        context=run.context
+    )
+
+    if mark_result.detected:
+        # Verify marks meet symbol requirements
+        verify_passed, verify_details = verify_marks(
+            mark_result.marks,
+            mark_config,
+            debug=True
+        )
+        add_span(run.spans, "Mark Inspection", start, device_roi[2] * device_roi[3], verify_passed)
+
+        if verify_passed:
+            run.log("[PASS] Mark Inspection: {} marks detected", len(mark_result.marks))
+            run.log("[INFO] Mark confidence: {:.1f}%, method: {}", mark_result.confidence, mark_result.method)
+            messages.append(f"Mark Inspection OK ({len(mark_result.marks)} marks, {mark_result.confidence:.0f}%)")
+        else:
+            run.log("[WARN] Mark verification failed: {}", verify_details.get('message', 'unknown'))
+            messages.append("Mark Inspection WARN (verification failed)")
+    else:
+        add_span(run.spans, "Mark Inspection", start, device_roi[2] * device_roi[3], False)
+        run.log("[WARN] No marks detected: {}", mark_result.error_message)
+        messages.append("Mark Inspection WARN (no marks)")
+
+
+def _taught_package_location(run, test_name, post_seal):
+    params = run.params
+    run.log("[INFO] Using taught package position (teach_pos mode enabled)")
+    run.log("[INFO] Package location: ({}, {}, {}x{})", params.package_x, params.package_y, params.package_w, params.package_h)
+
+    # Validate taught position
+    is_valid = validate_device_location(
+        run.package_roi,
+        run.working_image.shape,
+        min_size=20,
+        max_size_ratio=0.95,
+        debug=True
+    )
+
+    if not is_valid:
+        run.log("[FAIL] Taught package location validation failed")
+        return CheckOutcome.failure(
+            "Package location validation failed",
+            ["Taught package location validation failed",
+             f"Location: ({params.package_x}, {params.package_y}, {params.package_w}x{params.package_h})"],
+            post_seal=post_seal,
+        )
+
+    run.log("[PASS] Package location validated (taught position mode)")
+    messages = [f"{test_name} OK (taught position)"]
+    _mark_inspection(run, run.package_roi, messages)
+    return CheckOutcome(messages=messages)
+
+
+@register_check(
+    "taught_package_location", inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=0.5, result_schema=(),
+)
+def run_taught_package_location(run, check):
+    """TOP/BOTTOM: only the taught position is validated (no detection)."""
+    run.log("[DEBUG] Processing Package Location detection")
+    if not run.plan.dev_loc_settings.get("teach_pos", False):
+        return CheckOutcome()
+    return _taught_package_location(run, check.test_name, post_seal=False)
+
+
+@register_check(
+    "package_location", inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=8.0,
+    result_schema=("method", "confidence"),
+)
+def run_package_location(run, check):
+    """FEED: taught position, or auto-detection with the device location detector."""
+    test_name = check.test_name
+    run.log("[DEBUG] Processing Package Location detection")
+    dev_loc_settings = run.plan.dev_loc_settings
+
+    # Check if using taught position mode (fixed location, no detection)
+    if dev_loc_settings.get("teach_pos", False):
+        return _taught_package_location(run, test_name, post_seal=True)
+
+    # Detect package location with all configured parameters
+    start = time.perf_counter_ns()
+    result = detect_device_location(
+        run.working_image,
+        contrast_threshold=dev_loc_settings.get("contrast", 50),
+        x_shift_tol=dev_loc_settings.get("x_pkg_shift_tol", 50),
+        y_shift_tol=dev_loc_settings.get("y_pkg_shift_tol", 50),
+        recheck=dev_loc_settings.get("pkg_loc_recheck", True),
+        recheck_val=dev_loc_settings.get("pkg_loc_recheck_val", 30),
+        use_red_detection=dev_loc_settings.get("enable_red_pkg_location", False),
+        settings_dict=dev_loc_settings,
+        debug=run.debug_enabled,
+        context=run.context,
+        search_rect=run.package_roi,
+        tracker=run.tracker,
+        detector=run.plan.device_location_detector(run.working_image.shape)
+    )
+    add_span(run.spans, "Package Location Detect", start,
+             run.working_image.shape[0] * run.working_image.shape[1], result.detected)
+
+    if not result.detected:
+        run.log("[FAIL] {}", result.message)
+        return CheckOutcome.failure(
+            f"{test_name} detection failed",
+            ["Package location detection failed", result.message],
+            post_seal=True,
+        )
+
+    is_valid = validate_device_location(
+        (result.x, result.y, result.width, result.height),
+        run.working_image.shape,
+        min_size=20,
+        max_size_ratio=0.95,
+        debug=True
+    )
+
+    if not is_valid:
+        run.log("[FAIL] Package location validation failed")
+        return CheckOutcome.failure(
+            "Package location validation failed",
+            ["Package location validation failed",
+             f"Location: ({result.x}, {result.y}, {result.width}x{result.height})"],
+            post_seal=True,
+        )
+
+    run.log("[PASS] Package location detected: ({}, {}, {}x{})", result.x, result.y, result.width, result.height)
+    run.log("[INFO] Method: {}, Confidence: {:.1f}%, Contrast: {:.1f}", result.method, result.confidence, result.contrast)
+    messages = [f"{test_name} OK (method={result.method}, confidence={result.confidence:.0f}%)"]
+    _mark_inspection(run, (result.x, result.y, result.width, result.height), messages)
+    return CheckOutcome(messages=messages, values=dict(method=result.method, confidence=result.confidence))
+
+
+@register_check(
+    "pocket_location", inputs=(INPUT_GRAY, INPUT_POCKET_ROI),
+    writes=(INPUT_POCKET_ROI, INPUT_POCKET_SHIFT), cost=6.0,
+    result_schema=("method", "confidence", "angle"),
+)
+def run_pocket_location(run, check):
+    """
+    FEED: locate the pocket, then pocket dimension / gap / shift tracking.
+
+    The detected pocket replaces params.pocket_* for the checks after it.
+    """
+    test_name = check.test_name
+    params = run.params
+    pocket_params = run.plan.pocket_params
+
+    if not params.flags.get("enable_pocket_location", False):
+        return CheckOutcome(messages=[f"{test_name} SKIP (disabled)"])
+
+    start = time.perf_counter_ns()
+    result = detect_pocket_location(
+        run.working_image,
+        teach_rect=run.pocket_roi,
+        pocket_params=pocket_params,
+        debug=True,
+        context=run.context,
+        tracker=run.tracker
+    )
+    add_span(run.spans, "Pocket Location Detect", start, params.pocket_w * params.pocket_h, result.detected)
+
+    if not result.detected:
+        run.log("[FAIL] Pocket location detection failed: {}", result.message)
+        return CheckOutcome.failure(
+            "Pocket location detection failed",
+            ["Pocket location detection failed", result.message],
+            post_seal=True,
+        )
+
+    pocket_loc = (result.x, result.y, result.width, result.height)
+    is_valid = validate_pocket_location(
+        pocket_loc,
+        run.working_image.shape,
+        min_size=20,
+        max_size_ratio=0.95,
+        debug=True
+    )
+
+    if not is_valid:
+        run.log("[FAIL] Pocket location validation failed")
+        return CheckOutcome.failure(
+            "Pocket location validation failed",
+            ["Pocket location validation failed",
+             f"Location: ({result.x}, {result.y}, {result.width}x{result.height})"],
+            post_seal=True,
+        )
+
+    # Update pocket location with detected values
+    params.pocket_x = result.x
+    params.pocket_y = result.y
+    params.pocket_w = result.width
+    params.pocket_h = result.height
+
+    # Log detailed detection info
+    detail_msg = f"method={result.method}, confidence={result.confidence:.0f}%"
+    if result.angle > 0:
+        detail_msg += f", angle={result.angle:.2f}°, mode={result.parallel_mode}"
+
+    run.log("[PASS] Pocket location detected: ({}, {}, {}x{})", result.x, result.y, result.width, result.height)
+    run.log("[INFO] {}", detail_msg)
+    messages = [f"{test_name} OK ({detail_msg})"]
+    values = dict(method=result.method, confidence=result.confidence, angle=result.angle)
+
+    # ========================================
+    # Check Pocket Dimension
+    # ========================================
+    if pocket_params.get("pocket_dim_length_enable") or pocket_params.get("pocket_dim_width_enable"):
+        dim_valid, dim_details = check_pocket_dimension(
+            pocket_loc,
+            pocket_params=pocket_params,
+            debug=True
+        )
+
+        if not dim_valid:
+            run.log("[FAIL] Pocket dimension inspection failed")
+            for msg in dim_details["messages"]:
+                run.log("  [FAIL] {}", msg)
+            return CheckOutcome.failure(
+                "Pocket dimension inspection failed",
+                ["Pocket dimension inspection failed"] + dim_details["messages"],
+                post_seal=True,
+            )
+        for msg in dim_details["messages"]:
+            run.log("  [PASS] {}", msg)
+            messages.append(msg)
+
+    # ========================================
+    # Check Pocket Gap
+    # ========================================
+    if pocket_params.get("pocket_gap_enable"):
+        # Use device location if available, otherwise use pocket
+        device_loc = (params.device_x, params.device_y, params.device_w, params.device_h) \
+            if hasattr(params, 'device_x') and params.device_x > 0 else \
+            (result.x + 10, result.y + 10, result.width - 20, result.height - 20)
+
+        gap_valid, gap_details = check_pocket_gap(
+            device_loc,
+            pocket_loc,
+            pocket_params=pocket_params,
+            debug=True
+        )
+
+        if not gap_valid:
+            run.log("[FAIL] Pocket gap inspection failed")
+            for msg in gap_details["messages"]:
+                run.log("  [FAIL] {}", msg)
+            return CheckOutcome.failure(
+                "Pocket gap inspection failed",
+                ["Pocket gap inspection failed"] + gap_details["messages"],
+                post_seal=True,
+            )
+        for msg in gap_details["messages"]:
+            run.log("  [PASS] {}", msg)
+            messages.append(msg)
+
+    # ========================================
+    # Track Pocket Shift
+    # ========================================
+    if pocket_params.get("pocket_shift_enable"):
+        pocket_shift_valid, run.pocket_shift_record, shift_details = track_pocket_shift(
+            result.x,
+            result.y,
+            params.pocket_x,  # taught position
+            params.pocket_y,
+            pocket_params=pocket_params,
+            shift_record=run.pocket_shift_record,
+            debug=True
+        )
+
+        # Log to shift log file
+        shift_log = get_shift_log_manager()
+        if shift_log.get_current_session() is not None:
+            shift_log.log_measurement(
+                shift_x=shift_details["current_shift"][0],
+                shift_y=shift_details["current_shift"][1],
+                avg_x=shift_details["avg_shift"][0],
+                avg_y=shift_details["avg_shift"][1],
+                tolerance_x=shift_details["tolerance_x"],
+                tolerance_y=shift_details["tolerance_y"],
+                valid=pocket_shift_valid
+            )
+
+        for msg in shift_details["messages"]:
+            run.log("  [INFO] {}", msg)
+            messages.append(msg)
+
+        if not pocket_shift_valid:
+            # Alert but don't fail
+            for alert in shift_details["alerts"]:
+                run.log("  [ALERT] {}", alert)
+
+    return CheckOutcome(messages=messages, values=values)
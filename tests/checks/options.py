@@ -0,0 +1,62 @@
+"""
+Parsing helpers shared by the check resolvers.
+
+Resolvers run once per compiled plan (see tests/inspection_plan.py) and turn
+the raw device_inspection.json / params values into the options dict a check
+reads through PlannedCheck.options. "255" means "not configured" throughout.
+"""
+
+
+def ci_val(ci_tab, key, default=0):
+    raw = ci_tab.get(key, "255")
+    try:
+        val = int(raw)
+    except (ValueError, TypeError):
+        return default
+    return default if val == 255 else val
+
+
+def device_threshold_range(thresholds, key_min, key_max):
+    """Min/max override from device_inspection.json ("255" or empty = not set)."""
+    min_threshold = None
+    max_threshold = None
+    threshold_source = "params"
+    if thresholds:
+        try:
+            min_val = thresholds.get(key_min, "")
+            max_val = thresholds.get(key_max, "")
+            if min_val and min_val != "255":
+                min_threshold = int(min_val)
+            if max_val and max_val != "255":
+                max_threshold = int(max_val)
+            if (min_threshold is not None) or (max_threshold is not None):
+                threshold_source = "device_inspection.json"
+        except ValueError:
+            pass
+    return min_threshold, max_threshold, threshold_source
+
+
+def measurement_options(thresholds, key_min, key_max, fallback_min, fallback_max, **extra):
+    min_threshold, max_threshold, threshold_source = device_threshold_range(thresholds, key_min, key_max)
+    return dict(
+        metric_key_min=key_min,
+        metric_key_max=key_max,
+        fallback_min=fallback_min,
+        fallback_max=fallback_max,
+        min_threshold=min_threshold,
+        max_threshold=max_threshold,
+        threshold_source=threshold_source,
+        **extra,
+    )
+
+
+def diff_tolerance(thresholds, key):
+    tolerance_str = thresholds.get(key, "255") if thresholds else "255"
+    if tolerance_str == "255" or not tolerance_str:
+        return tolerance_str, None
+    return tolerance_str, float(tolerance_str)
+
+
+def blob_configured(contrast, min_area, min_square):
+    # 255 means not configured
+    return not (contrast == 255 or (min_area == 255 and min_square == 255))
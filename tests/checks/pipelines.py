@@ -0,0 +1,147 @@
+"""
+Station pipelines - which registered check runs for each inspection entry.
+
+Order is the inspection order. An entry is enabled by params.flags[flag]
+(flag None: enabled from pocket_params, see inspection_plan) and is dropped
+in no-terminal mode when terminal_check is set.
+
+Entries that have no implementation on a station still run through a
+trivial check so they keep counting as enabled tests:
+  TOP/BOTTOM "placeholder" reports "<name> OK (no action)"
+  FEED "unsupported" reports nothing
+"""
+
+from typing import NamedTuple, Optional
+
+from tests.checks.registry import CheckOutcome, register_check
+
+
+class PipelineEntry(NamedTuple):
+    test_name: str
+    flag: Optional[str]
+    check_key: str
+    terminal_check: bool = False
+
+
+@register_check("placeholder", cost=0.0)
+def run_placeholder(run, check):
+    # Placeholder tests with no measurement function
+    return CheckOutcome(messages=[f"{check.test_name} OK (no action)"])
+
+
+@register_check("unsupported", cost=0.0)
+def run_unsupported(run, check):
+    return CheckOutcome()
+
+
+TOP_BOTTOM_PIPELINE = (
+    # Package & Pocket
+    PipelineEntry("Package Location", "enable_package_location", "taught_package_location"),
+
+    # Dimension Measurements (primary)
+    PipelineEntry("Body Length", "check_body_length", "body_length"),
+    PipelineEntry("Body Width", "check_body_width", "body_width"),
+    # Terminal inspections - skip if no_terminal is enabled
+    PipelineEntry("Terminal Width", "check_terminal_width", "terminal_width", True),
+    PipelineEntry("Terminal Length", "check_terminal_length", "terminal_length", True),
+    PipelineEntry("Term-Term Length", "check_term_term_length", "term_term_length", True),
+    PipelineEntry("Terminal Length Diff", "check_terminal_length_diff", "terminal_length_diff", True),
+
+    # Terminal Inspections - all skipped if no_terminal
+    PipelineEntry("Terminal Pogo", "check_terminal_pogo", "placeholder", True),
+    PipelineEntry("Terminal Offset", "check_terminal_offset", "placeholder", True),
+    PipelineEntry("Incomplete Termination 1", "check_incomplete_termination_1", "placeholder", True),
+    PipelineEntry("Incomplete Termination 2", "check_incomplete_termination_2", "placeholder", True),
+    PipelineEntry("Terminal to Body Gap", "check_terminal_to_body_gap", "term_body_gap", True),
+    PipelineEntry("Terminal Color", "check_terminal_color", "placeholder", True),
+    PipelineEntry("Terminal Oxidation", "check_terminal_oxidation", "placeholder", True),
+    PipelineEntry("Inner Terminal Chipoff", "check_inner_term_chipoff", "placeholder", True),
+    PipelineEntry("Outer Terminal Chipoff", "check_outer_term_chipoff", "placeholder", True),
+
+    # Body Inspections
+    PipelineEntry("Body Stain 1", "check_body_stain_1", "placeholder"),
+    PipelineEntry("Body Stain 2", "check_body_stain_2", "placeholder"),
+    PipelineEntry("Body Color", "check_body_color", "placeholder"),
+    PipelineEntry("Body to Term Width", "check_body_to_term_width", "body_to_term_width"),
+    PipelineEntry("Body Width Diff", "check_body_width_diff", "body_width_diff"),
+    PipelineEntry("Body Crack", "check_body_crack", "placeholder"),
+    PipelineEntry("Low/High Contrast", "check_low_high_contrast", "placeholder"),
+    PipelineEntry("Black Defect", "check_black_defect", "placeholder"),
+    PipelineEntry("White Defect", "check_white_defect", "placeholder"),
+
+    # Body Smear
+    PipelineEntry("Body Smear 1", "check_body_smear_1", "placeholder"),
+    PipelineEntry("Body Smear 2", "check_body_smear_2", "placeholder"),
+    PipelineEntry("Body Smear 3", "check_body_smear_3", "placeholder"),
+    PipelineEntry("Reverse Chip", "check_reverse_chip", "reverse_chip"),
+    PipelineEntry("Smear White", "check_smear_white", "placeholder"),
+
+    # Body Edge
+    PipelineEntry("Edge Chipoff", "check_edge_chipoff", "placeholder"),
+    PipelineEntry("Body Edge Black", "check_body_edge_black", "placeholder"),
+    PipelineEntry("Body Edge White", "check_body_edge_white", "placeholder"),
+)
+
+FEED_PIPELINE = (
+    # Package Location
+    PipelineEntry("Package Location", "enable_package_location", "package_location"),
+
+    # Pocket Location
+    PipelineEntry("Pocket Location", "enable_pocket_location", "pocket_location"),
+    # Enabled from pocket_params (outer_stain_black / outer_stain_white), not params.flags
+    PipelineEntry("Outer Pocket Stain", None, "outer_pocket_stain"),
+
+    # Pocket
+    PipelineEntry("Pocket Post Seal", "enable_pocket_post_seal", "unsupported", True),
+
+    # Dimension Measurements
+    PipelineEntry("Body Length", "check_body_length", "body_length"),
+    PipelineEntry("Body Width", "check_body_width", "body_width"),
+    # Terminal inspections - skip if no_terminal is enabled
+    PipelineEntry("Terminal Width", "check_terminal_width", "terminal_width", True),
+    PipelineEntry("Terminal Length", "check_terminal_length", "terminal_length", True),
+    PipelineEntry("Term-Term Length", "check_term_term_length", "term_term_length", True),
+    PipelineEntry("Terminal Length Diff", "check_terminal_length_diff", "terminal_length_diff", True),
+
+    # Terminal Inspections - all skipped if no_terminal
+    PipelineEntry("Terminal Pogo", "check_terminal_pogo", "terminal_pogo", True),
+    PipelineEntry("Terminal Offset", "check_terminal_offset", "terminal_offset", True),
+    PipelineEntry("Incomplete Termination 1", "check_incomplete_termination_1", "incomplete_termination_1", True),
+    PipelineEntry("Incomplete Termination 2", "check_incomplete_termination_2", "unsupported", True),
+    PipelineEntry("Terminal to Body Gap", "check_terminal_to_body_gap", "unsupported", True),
+    PipelineEntry("Terminal Color", "check_terminal_color", "terminal_color", True),
+    PipelineEntry("Terminal Oxidation", "check_terminal_oxidation", "terminal_oxidation", True),
+    PipelineEntry("Inner Terminal Chipoff", "check_inner_term_chipoff", "unsupported", True),
+    PipelineEntry("Outer Terminal Chipoff", "check_outer_term_chipoff", "unsupported", True),
+
+    # Body Inspections
+    PipelineEntry("Body Stain 1", "check_body_stain_1", "body_stain_1"),
+    PipelineEntry("Body Stain 2", "check_body_stain_2", "body_stain_2"),
+    PipelineEntry("Body Color", "check_body_color", "body_color"),
+    PipelineEntry("Body to Term Width", "check_body_to_term_width", "unsupported"),
+    PipelineEntry("Body Width Diff", "check_body_width_diff", "unsupported"),
+    PipelineEntry("Body Crack", "check_body_crack", "unsupported"),
+    PipelineEntry("Low/High Contrast", "check_low_high_contrast", "unsupported"),
+    PipelineEntry("Black Defect", "check_black_defect", "unsupported"),
+    PipelineEntry("White Defect", "check_white_defect", "unsupported"),
+
+    # Body Smear
+    PipelineEntry("Body Smear 1", "check_body_smear_1", "body_smear_1"),
+    PipelineEntry("Body Smear 2", "check_body_smear_2", "body_smear_2"),
+    PipelineEntry("Body Smear 3", "check_body_smear_3", "body_smear_3"),
+    PipelineEntry("Reverse Chip", "check_reverse_chip", "reverse_chip"),
+    PipelineEntry("Smear White", "check_smear_white", "unsupported"),
+
+    # Body Edge
+    PipelineEntry("Body Edge Black", "check_body_edge_black", "unsupported"),
+    PipelineEntry("Body Edge White", "check_body_edge_white", "unsupported"),
+
+    # TQS Inspections (FEED specific)
+    PipelineEntry("Sealing Stain", "enable_sealing_stain", "sealing_stain"),
+    PipelineEntry("Sealing Stain 2", "enable_sealing_stain2", "sealing_stain2"),
+    PipelineEntry("Sealing Shift", "enable_sealing_shift", "sealing_shift"),
+    PipelineEntry("Black to White Scar", "enable_black_to_white_scar", "unsupported"),
+    PipelineEntry("Hole Reference", "enable_hole_reference", "unsupported"),
+    PipelineEntry("White to Black Scan", "enable_white_to_black_scan", "unsupported"),
+    PipelineEntry("Emboss Tape Pickup", "enable_emboss_tape_pickup", "emboss_tape_pickup"),
+)
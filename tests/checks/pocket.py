@@ -0,0 +1,105 @@
+"""
+Pocket / sealing checks (FEED) - every failure saves the PostSeal image.
+
+Each check hands the located pocket to its imaging.pocket_location function
+and reports the "messages" the function returns.
+"""
+
+from imaging.pocket_location import (
+    check_outer_pocket_stain,
+    check_emboss_tape_pickup,
+    check_sealing_stain,
+    check_sealing_stain2,
+    check_sealing_shift,
+    check_hole_side_shift,
+    check_sealing_distance_center,
+    check_bottom_dent_inspection,
+    check_special_black_emboss_sealing,
+)
+from tests.checks.registry import INPUT_GRAY, INPUT_POCKET_ROI, CheckOutcome, register_check
+
+_POCKET_SCHEMA = ("messages",)
+
+
+def _pocket_outcome(run, test_name, valid, details):
+    if not valid:
+        run.log("[FAIL] {} failed", test_name)
+        for msg in details.get("messages", []):
+            run.log("  [FAIL] {}", msg)
+        return CheckOutcome.failure(
+            f"{test_name} failed",
+            [f"{test_name} failed"] + details.get("messages", []),
+            post_seal=True,
+        )
+
+    for msg in details.get("messages", []):
+        run.log("  [PASS] {}", msg)
+    return CheckOutcome(messages=list(details.get("messages", [])))
+
+
+def _pocket_check(check_fn, ok_message=False):
+    """Check running check_fn(image, pocket_loc, ...) on the located pocket."""
+    def run_pocket_check(run, check):
+        test_name = check.test_name
+        run.log("[INFO] Checking {}...", test_name)
+
+        pocket_loc = run.pocket_roi
+        if pocket_loc[2] <= 0 or pocket_loc[3] <= 0:
+            run.log("[FAIL] {} - pocket not available", test_name)
+            return CheckOutcome.failure(f"{test_name} failed", ["Pocket location not available"], post_seal=True)
+
+        valid, details = check_fn(
+            run.working_image,
+            pocket_loc,
+            pocket_params=run.plan.pocket_params,
+            debug=True,
+            context=run.context
+        )
+
+        outcome = _pocket_outcome(run, test_name, valid, details)
+        if outcome.passed and ok_message:
+            # For non-measurement tests, just mark as OK
+            outcome.messages.append(f"{test_name} OK")
+        return outcome
+    return run_pocket_check
+
+
+for _key, _check_fn, _ok_message, _cost in (
+    ("outer_pocket_stain", check_outer_pocket_stain, False, 2.0),
+    ("sealing_stain", check_sealing_stain, False, 2.0),
+    ("sealing_stain2", check_sealing_stain2, False, 2.0),
+    ("sealing_shift", check_sealing_shift, True, 1.0),
+    ("hole_side_shift", check_hole_side_shift, False, 1.0),
+    ("sealing_distance_center", check_sealing_distance_center, False, 1.0),
+    ("bottom_dent", check_bottom_dent_inspection, False, 2.0),
+    ("special_black_emboss_sealing", check_special_black_emboss_sealing, False, 2.0),
+):
+    register_check(
+        _key, inputs=(INPUT_GRAY, INPUT_POCKET_ROI), cost=_cost, result_schema=_POCKET_SCHEMA,
+    )(_pocket_check(_check_fn, _ok_message))
+
+
+@register_check(
+    "emboss_tape_pickup", inputs=(INPUT_GRAY, INPUT_POCKET_ROI), cost=2.0, result_schema=_POCKET_SCHEMA,
+)
+def run_emboss_tape_pickup(run, check):
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    emboss_valid, emboss_details = check_emboss_tape_pickup(
+        run.working_image,
+        run.pocket_roi,
+        run.package_roi,
+        pocket_params=run.plan.pocket_params,
+        debug=True,
+        context=run.context
+    )
+
+    if not emboss_valid:
+        run.log("[FAIL] {} failed", test_name)
+        return CheckOutcome.failure(
+            f"{test_name} failed",
+            [f"{test_name} failed"] + emboss_details.get("messages", []),
+            post_seal=True,
+        )
+    return _pocket_outcome(run, test_name, emboss_valid, emboss_details)
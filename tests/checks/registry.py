@@ -0,0 +1,164 @@
+"""
+Check registry - declarative description of every inspection check.
+
+Each check test_top_bottom / test_feed can run is registered once as a
+CheckSpec: the function that runs it, the resolver that parses its tab
+parameters at plan-compile time, the frame data it reads, a rough cost and
+the values it reports. Station pipelines (tests/checks/pipelines.py) then only
+list which registered checks run, in which order, behind which flag.
+
+A check function never draws the final result or returns a TestResult. It
+returns a CheckOutcome and the runner (tests/checks/runner.py) applies the
+outcomes in plan order: overlays, step-mode dialog, defect boxes, FAIL/PASS.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from config.debug_log import DebugLog
+
+STATION_TOP_BOTTOM = "TOP_BOTTOM"
+STATION_FEED = "FEED"
+
+# Frame data / run state a check reads or writes (CheckSpec.inputs / .writes)
+INPUT_FRAME = "frame"                  # BGR frame or color channels
+INPUT_GRAY = "gray"                    # full-frame grayscale plane
+INPUT_PACKAGE_ROI = "package_roi"      # params.package_*
+INPUT_POCKET_ROI = "pocket_roi"        # params.pocket_*
+INPUT_EDGE_CONTRAST = "edge_contrast"  # running edge contrast value
+INPUT_POCKET_SHIFT = "pocket_shift"    # pocket shift tracking record
+
+
+@dataclass
+class CheckOutcome:
+    """
+    Result of one check, applied by the runner in plan order.
+
+    passed: False stops the inspection with fail_message / fail_lines
+    messages: Summary lines appended when the check passed
+    overlays: fn(image) -> image, drawn before the step-mode dialog
+    defect_rects: (x, y, w, h) boxes drawn in red when the check failed
+    step_result: Dialog data handed to step_callback (failures only)
+    pause_lines: Overlay lines when the user stops in the step dialog
+    post_seal: Failure also saves the PostSeal image (FEED)
+    values: Measured values, keyed by CheckSpec.result_schema
+    """
+    passed: bool = True
+    messages: List[str] = field(default_factory=list)
+    fail_message: Optional[str] = None
+    fail_lines: List[str] = field(default_factory=list)
+    overlays: List[Callable] = field(default_factory=list)
+    defect_rects: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    step_result: Optional[Dict[str, Any]] = None
+    pause_lines: Optional[List[str]] = None
+    post_seal: bool = False
+    values: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def failure(cls, fail_message, fail_lines, **kwargs):
+        return cls(passed=False, fail_message=fail_message, fail_lines=list(fail_lines), **kwargs)
+
+
+@dataclass(frozen=True)
+class CheckSpec:
+    """
+    Registered inspection check.
+
+    key: Registry key, referenced by the station pipelines
+    run: fn(run: InspectionRun, check: PlannedCheck) -> CheckOutcome
+    resolve: fn(params, device_thresholds, pocket_params, station) -> dict,
+        evaluated once when the plan is compiled (None = no parameters)
+    inputs: Frame data / run state the check reads (INPUT_*)
+    writes: Run state the check modifies for the checks after it (INPUT_*)
+    cost: Rough cost in ms on a 640x480 frame, used to order/schedule checks
+    result_schema: Keys of CheckOutcome.values
+    """
+    key: str
+    run: Callable[..., CheckOutcome]
+    resolve: Optional[Callable[..., Mapping[str, Any]]] = None
+    inputs: Tuple[str, ...] = ()
+    writes: Tuple[str, ...] = ()
+    cost: float = 1.0
+    result_schema: Tuple[str, ...] = ()
+
+
+@dataclass
+class InspectionRun:
+    """
+    Per-part state shared by the checks of one inspection.
+
+    image is the caller's frame the result overlay is based on; it is never
+    drawn on. Overlays and defect boxes are collected in draw_ops and only
+    rasterized on a copy when the TestResult image is requested.
+    working_image is the read-only frame every measurement reads.
+
+    Check functions may run on worker threads (max_workers > 1). They only
+    read the run, except for the state they declare in CheckSpec.writes;
+    image and messages are updated by the runner on the calling thread.
+    """
+    image: Any
+    working_image: Any
+    context: Any
+    params: Any
+    plan: Any
+    step_mode: bool = False
+    step_callback: Optional[Callable] = None
+    log: Callable[..., None] = field(default_factory=DebugLog)  # log(template, *args), see config.debug_log
+    debug_enabled: bool = False
+    messages: List[str] = field(default_factory=list)
+    skipped_tests: List[str] = field(default_factory=list)
+    edge_contrast_value: int = 106
+    pocket_shift_record: Any = None
+    max_workers: int = 0  # > 1: run independent checks on a thread pool
+    scheduler: Any = None  # CheckScheduler: adaptive check order (sequential path)
+    tracker: Any = None  # LocationTracker: package / pocket location prior (FEED)
+    draw_ops: List[Callable] = field(default_factory=list)  # fn(image) -> image, in draw order
+    spans: List[Any] = field(default_factory=list)  # config.inspection_timing.Span per check / step
+
+    @property
+    def station(self):
+        return self.plan.station
+
+    @property
+    def package_roi(self):
+        params = self.params
+        return (params.package_x, params.package_y, params.package_w, params.package_h)
+
+    @property
+    def pocket_roi(self):
+        params = self.params
+        return (params.pocket_x, params.pocket_y, params.pocket_w, params.pocket_h)
+
+
+_REGISTRY: Dict[str, CheckSpec] = {}
+
+
+def register_check(key, resolve=None, inputs=(), writes=(), cost=1.0, result_schema=()):
+    """Decorator registering fn(run, check) -> CheckOutcome as check `key`."""
+    def decorator(fn):
+        if key in _REGISTRY:
+            raise ValueError(f"Check '{key}' is already registered")
+        _REGISTRY[key] = CheckSpec(
+            key=key,
+            run=fn,
+            resolve=resolve,
+            inputs=tuple(inputs),
+            writes=tuple(writes),
+            cost=float(cost),
+            result_schema=tuple(result_schema),
+        )
+        return fn
+    return decorator
+
+
+def get_check(key):
+    """Return the CheckSpec registered as key (KeyError if unknown)."""
+    try:
+        return _REGISTRY[key]
+    except KeyError:
+        raise KeyError(f"Unknown inspection check '{key}'") from None
+
+
+def registered_checks():
+    """All registered checks, keyed by registry key."""
+    return dict(_REGISTRY)
@@ -0,0 +1,307 @@
+"""
+Check runner - executes the checks of a compiled plan in order and applies
+their outcomes (overlays, step-mode dialog, defect boxes, FAIL result).
+
+Overlays and defect boxes are not drawn here: they are collected in
+run.draw_ops and handed to the TestResult, which only rasterizes them when
+its result_image is read.
+
+Every check run is timed (config.inspection_timing.Span in run.spans).
+
+With InspectionRun.max_workers > 1 independent checks are fanned out to a
+bounded thread pool (the OpenCV calls release the GIL). Outcomes are still
+applied strictly in plan order, so the verdict and the "first failing check"
+message are the same as in the sequential path.
+
+With InspectionRun.scheduler set (tests/checks/scheduler.py) the checks run
+in the adaptive order chosen from the observed fail rates and run times.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+import cv2
+
+from config.inspection_timing import add_span
+from tests.checks.registry import INPUT_PACKAGE_ROI, INPUT_POCKET_ROI
+from tests.test_runner import TestResult, TestStatus
+from tests.test_draw import defect_boxes, render_overlay, status_label
+
+POST_SEAL_DIR = r"D:\PostSealed"
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_check_executor(max_workers):
+    """Shared thread pool for parallel check execution (one per pool size)."""
+    with _executors_lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inspection-check")
+            _executors[max_workers] = executor
+        return executor
+
+
+def save_post_seal_image(run, reason):
+    """Save the current visualization frame as a PostSeal image (FEED)."""
+    if not run.plan.enable_post_seal:
+        return
+    try:
+        os.makedirs(POST_SEAL_DIR, exist_ok=True)
+        safe_reason = "".join(c if c.isalnum() or c in ("_", "-") else "_" for c in reason)[:40]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"PostSeal_{timestamp}_{safe_reason}.bmp"
+        cv2.imwrite(os.path.join(POST_SEAL_DIR, filename), render_overlay(run.image, run.draw_ops))
+    except Exception as e:
+        run.log("[WARN] PostSeal image save failed: {}", e)
+
+
+def lazy_result(run, status, message, label):
+    """TestResult whose overlay (run.draw_ops + status label) is rendered on demand."""
+    return TestResult(status, message, base_image=run.image, draw_ops=run.draw_ops + [status_label(label)])
+
+
+def fail_result(run, title, lines, post_seal=False):
+    """
+    FAIL TestResult over run.image. lines (the failure reason) are logged;
+    the PostSeal image is saved first if asked.
+    """
+    run.log("[RESULT] FAIL: {}", "; ".join(lines))
+    if post_seal:
+        save_post_seal_image(run, title)
+    return lazy_result(run, TestStatus.FAIL, title, "FAIL")
+
+
+def apply_outcome(run, check, outcome):
+    """
+    Apply one CheckOutcome to the run.
+
+    Returns a TestResult when the inspection stops here (check failed or the
+    user stopped in the step-mode dialog), otherwise None.
+    """
+    test_name = check.test_name
+
+    run.draw_ops.extend(outcome.overlays)
+
+    if outcome.passed:
+        run.messages.extend(outcome.messages)
+        return None
+
+    # Step mode dialog when failed
+    if run.step_mode and run.step_callback and outcome.step_result is not None:
+        should_continue = run.step_callback(outcome.step_result)
+        if not should_continue:
+            run.log("[STEP] Test aborted by user at {}", test_name)
+            return lazy_result(run, TestStatus.FAIL, "Test paused by user", "PAUSE")
+
+    # Visualize defects on failure
+    if outcome.defect_rects:
+        run.draw_ops.append(defect_boxes(outcome.defect_rects))
+
+    return fail_result(run, outcome.fail_message, outcome.fail_lines, post_seal=outcome.post_seal)
+
+
+def _check_pixels(run, spec):
+    """Pixels of the ROI(s) a check reads (the whole frame if it reads no ROI)."""
+    pixels = 0
+    if INPUT_PACKAGE_ROI in spec.inputs:
+        pixels += max(0, run.params.package_w) * max(0, run.params.package_h)
+    if INPUT_POCKET_ROI in spec.inputs:
+        pixels += max(0, run.params.pocket_w) * max(0, run.params.pocket_h)
+    if not pixels:
+        pixels = run.working_image.shape[0] * run.working_image.shape[1]
+    return pixels
+
+
+def run_check(run, check):
+    """Run one check, recording its span (duration, pixels, verdict) in run.spans."""
+    start = time.perf_counter_ns()
+    passed = False
+    try:
+        outcome = check.spec.run(run, check)
+        passed = outcome.passed
+        return outcome
+    finally:
+        add_span(run.spans, check.test_name, start, _check_pixels(run, check.spec), passed)
+
+
+def run_checks(run):
+    """
+    Run every check of run.plan in plan order.
+
+    Returns the TestResult of the first failing check, or None when all
+    checks passed (their summary lines are in run.messages).
+    """
+    # Step mode stays sequential: the operator steps through the checks
+    if run.max_workers > 1 and not run.step_mode and len(run.plan.checks) > 1:
+        return _run_checks_parallel(run)
+    if run.scheduler is not None and not run.step_mode and len(run.plan.checks) > 1:
+        return _run_checks_scheduled(run)
+
+    for check in run.plan.checks:
+        run.log("\n[TEST] {} inspection", check.test_name)
+        outcome = run_check(run, check)
+        result = apply_outcome(run, check, outcome)
+        if result is not None:
+            return result
+    return None
+
+
+class _WorkerRun:
+    """
+    The InspectionRun as seen by one check worker.
+
+    Reads and writes go to the run, except spans: they are collected in a
+    list of the worker's own and only merged into run.spans when the
+    check's outcome is applied.
+    """
+
+    __slots__ = ("_run", "spans")
+
+    def __init__(self, run):
+        object.__setattr__(self, "_run", run)
+        object.__setattr__(self, "spans", [])
+
+    def __getattr__(self, name):
+        return getattr(self._run, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._run, name, value)
+
+
+def _run_one(run, check, cancelled):
+    """Worker: (outcome, spans) of one check, or None when cancelled before it started."""
+    if cancelled.is_set():
+        return None
+    worker = _WorkerRun(run)
+    return run_check(worker, check), worker.spans
+
+
+def _run_checks_parallel(run):
+    """
+    Fan the checks out to the thread pool, in waves separated by barriers.
+
+    A check waits for every earlier check when it writes run state
+    (CheckSpec.writes) or reads state an earlier, still running check writes.
+    Outcomes are applied in plan order; after the first failure every check
+    that has not started yet is cancelled, the running ones are waited for
+    and their results are discarded. Spans are merged into run.spans with
+    the outcome they belong to, so discarded checks leave none behind.
+    """
+    executor = get_check_executor(run.max_workers)
+    cancelled = threading.Event()
+    pending = []  # (check, future), plan order, not applied yet
+    pending_writes = set()
+
+    def cancel_pending(rest):
+        # Checks still running must not touch the run after we return
+        cancelled.set()
+        for _, future in rest:
+            future.cancel()
+        wait([future for _, future in rest])
+
+    def drain():
+        for i, (check, future) in enumerate(pending):
+            try:
+                outcome, spans = future.result()
+            except BaseException:
+                cancel_pending(pending[i + 1:])
+                raise
+            run.spans.extend(spans)
+            result = apply_outcome(run, check, outcome)
+            if result is not None:
+                cancel_pending(pending[i + 1:])
+                return result
+        pending.clear()
+        pending_writes.clear()
+        return None
+
+    # Build the shared gray plane once instead of racing for it in the workers
+    if run.context is not None:
+        run.context.gray
+
+    for check in run.plan.checks:
+        spec = check.spec
+        if spec.writes or pending_writes.intersection(spec.inputs):
+            result = drain()
+            if result is not None:
+                return result
+        run.log("\n[TEST] {} inspection", check.test_name)
+        # Workers see the inspection's debug flags (config.debug_runtime context)
+        context = contextvars.copy_context()
+        pending.append((check, executor.submit(context.run, _run_one, run, check, cancelled)))
+        pending_writes.update(spec.writes)
+    return drain()
+
+
+def _run_checks_scheduled(run):
+    """
+    Run the checks in the order chosen by run.scheduler.
+
+    Every run is timed and recorded. With scheduler.report_order a failure
+    found out of order first runs the skipped checks that come before it in
+    plan order, then the outcomes are applied in plan order, so the result is
+    the one of the sequential path. Otherwise the first failure found is
+    reported right away.
+    """
+    scheduler = run.scheduler
+    checks = run.plan.checks
+    outcomes = {}   # plan index -> CheckOutcome
+    first_error = None  # (plan index, exception)
+
+    def run_timed(index):
+        check = checks[index]
+        run.log("\n[TEST] {} inspection", check.test_name)
+        try:
+            outcome = run_check(run, check)
+        finally:
+            span = run.spans[-1]
+            scheduler.record(run.station, check, span.passed, span.duration_ms)
+        outcomes[index] = outcome
+        return outcome
+
+    stop = None  # plan index of the first failure (or error) found
+    for index in scheduler.order(run.station, checks):
+        try:
+            outcome = run_timed(index)
+        except Exception as e:
+            first_error = (index, e)
+            stop = index
+            break
+        if not outcome.passed:
+            stop = index
+            break
+
+    if stop is not None and not scheduler.report_order:
+        if first_error is not None:
+            raise first_error[1]
+        return apply_outcome(run, checks[stop], outcomes[stop])
+
+    if stop is not None:
+        # Plan-order predecessors the adaptive order has not reached yet
+        for index in range(stop):
+            if index in outcomes:
+                continue
+            try:
+                outcome = run_timed(index)
+            except Exception as e:
+                first_error = (index, e)
+                stop = index
+                break
+            if not outcome.passed:
+                stop = index
+                break
+
+    last = len(checks) - 1 if stop is None else stop
+    for index in range(last + 1):
+        if first_error is not None and index == first_error[0]:
+            raise first_error[1]
+        result = apply_outcome(run, checks[index], outcomes[index])
+        if result is not None:
+            return result
+    return None
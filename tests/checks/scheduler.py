@@ -0,0 +1,184 @@
+"""
+Check Scheduler - adaptive check order from observed fail rates and cost.
+
+test_top_bottom / test_feed stop at the first failing check, so the expected
+time to a verdict is smallest when checks that fail often and run fast come
+first. The scheduler keeps, per station and check, a rolling fail
+probability and a mean run time, and orders the checks of a plan by
+cost / fail probability (ratio rule).
+
+Reordering never breaks data dependencies: a check that writes run state
+(CheckSpec.writes, e.g. edge contrast or the pocket ROI) keeps its position
+relative to every check that reads or writes the same state.
+
+report_order=True (default): a failure found out of order is only reported
+once every check that comes before it in the canonical order has been run
+too, and outcomes are applied in canonical order. Message and overlay are
+then identical to the sequential path, even when a part fails several checks.
+report_order=False reports the first failure found (fastest verdict).
+
+AlertTracker counters only count rejects, so they give each defect's share
+of the rejects; that share seeds a check's fail probability as
+prior_weight pseudo-observations until the rolling window has real data.
+"""
+
+import threading
+from collections import deque
+
+
+class CheckStats:
+    """Rolling pass/fail window and mean run time for one check."""
+
+    def __init__(self, window, initial_cost_ms):
+        self.results = deque(maxlen=window)
+        self.fails = 0
+        self.cost_ms = float(initial_cost_ms)
+
+    def add(self, passed, elapsed_ms, cost_alpha):
+        if len(self.results) == self.results.maxlen:
+            self.fails -= self.results[0]
+        failed = 0 if passed else 1
+        self.results.append(failed)
+        self.fails += failed
+        self.cost_ms += cost_alpha * (elapsed_ms - self.cost_ms)
+
+
+class CheckScheduler:
+    """
+    Orders the checks of a compiled plan to minimize expected time to verdict.
+
+    Args:
+        window: Parts kept in the rolling fail-rate window per check
+        prior_weight: Pseudo-observations given to the AlertTracker prior
+        cost_alpha: EWMA factor of the measured run time (ms)
+        reorder_every: Recompute the order after this many recorded parts
+        report_order: Report the first failure in canonical order (see module doc)
+        alert_tracker: Optional inspection.alert_tracker.AlertTracker
+    """
+
+    def __init__(self, window=500, prior_weight=20, cost_alpha=0.1, reorder_every=25,
+                 report_order=True, alert_tracker=None):
+        self.window = window
+        self.prior_weight = prior_weight
+        self.cost_alpha = cost_alpha
+        self.reorder_every = reorder_every
+        self.report_order = report_order
+        self.alert_tracker = alert_tracker
+        self._stats = {}    # (station, test_name) -> CheckStats
+        self._orders = {}   # (station, test names) -> [parts left, order]
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------
+    # Statistics
+    # -------------------------------------------------
+
+    def _get_stats(self, station, check):
+        key = (station, check.test_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = CheckStats(self.window, check.spec.cost)
+            self._stats[key] = stats
+        return stats
+
+    def record(self, station, check, passed, elapsed_ms):
+        """Record one run of check (elapsed_ms = measured run time)."""
+        with self._lock:
+            self._get_stats(station, check).add(passed, elapsed_ms, self.cost_alpha)
+
+    def _alert_shares(self):
+        """Share of the rejects per AlertTracker defect name."""
+        if self.alert_tracker is None:
+            return {}
+        try:
+            status = self.alert_tracker.get_all_status()
+        except Exception:
+            return {}
+        total_fails = sum(fails for _, fails, _ in status.values())
+        if total_fails <= 0:
+            return {}
+        return {name: fails / total_fails for name, (_, fails, _) in status.items()}
+
+    @staticmethod
+    def _alert_share(test_name, shares):
+        # Longest tracker name the check name starts with ("Body Smear 2" -> "Body Smear")
+        best = None
+        for name in shares:
+            if test_name.startswith(name) and (best is None or len(name) > len(best)):
+                best = name
+        return shares[best] if best is not None else 0.0
+
+    def _fail_probability(self, stats, share):
+        # Laplace-smoothed rolling fail rate with the AlertTracker share as prior
+        runs = len(stats.results) if stats else 0
+        fails = stats.fails if stats else 0
+        return (fails + self.prior_weight * share + 1.0) / (runs + self.prior_weight + 2.0)
+
+    def fail_probability(self, station, check):
+        with self._lock:
+            stats = self._stats.get((station, check.test_name))
+            share = self._alert_share(check.test_name, self._alert_shares())
+            return self._fail_probability(stats, share)
+
+    def expected_cost(self, station, check):
+        with self._lock:
+            stats = self._stats.get((station, check.test_name))
+            return stats.cost_ms if stats else float(check.spec.cost)
+
+    # -------------------------------------------------
+    # Ordering
+    # -------------------------------------------------
+
+    @staticmethod
+    def _predecessors(checks):
+        """Canonical indices each check must run after (inputs/writes hazards)."""
+        preds = []
+        for j, check in enumerate(checks):
+            spec_j = check.spec
+            reads_j = set(spec_j.inputs)
+            writes_j = set(spec_j.writes)
+            before = set()
+            for i in range(j):
+                spec_i = checks[i].spec
+                if (writes_j and (writes_j & set(spec_i.inputs) or writes_j & set(spec_i.writes))) \
+                        or (spec_i.writes and set(spec_i.writes) & reads_j):
+                    before.add(i)
+            preds.append(before)
+        return preds
+
+    def _compute_order(self, station, checks):
+        shares = self._alert_shares()
+        rank = []
+        for check in checks:
+            stats = self._stats.get((station, check.test_name))
+            cost = stats.cost_ms if stats else float(check.spec.cost)
+            probability = self._fail_probability(stats, self._alert_share(check.test_name, shares))
+            rank.append(cost / probability)
+
+        # Greedy list scheduling: among the checks whose predecessors are
+        # scheduled, take the lowest cost / fail probability (canonical order on ties)
+        preds = self._predecessors(checks)
+        done = set()
+        order = []
+        while len(order) < len(checks):
+            ready = [i for i in range(len(checks)) if i not in done and preds[i] <= done]
+            nxt = min(ready, key=lambda i: (rank[i], i))
+            order.append(nxt)
+            done.add(nxt)
+        return order
+
+    def order(self, station, checks):
+        """Execution order (canonical indices) for the checks of a plan."""
+        key = (station, tuple(check.test_name for check in checks))
+        with self._lock:
+            cached = self._orders.get(key)
+            if cached is None or cached[0] <= 0:
+                cached = [self.reorder_every, self._compute_order(station, checks)]
+                self._orders[key] = cached
+            cached[0] -= 1
+            return list(cached[1])
+
+    def reset(self):
+        """Forget all statistics (e.g. on lot change)."""
+        with self._lock:
+            self._stats.clear()
+            self._orders.clear()
@@ -0,0 +1,883 @@
+"""
+Terminal checks - color, pogo, offset, incomplete termination, oxidation
+and terminal chipoff.
+"""
+
+from tests.checks.common import (
+    color_roi_overlay, in_place_overlay, resolve_intensity_window,
+    safe_roi_mean_gray, skipped,
+)
+from tests.checks.options import blob_configured, ci_val
+from tests.checks.registry import (
+    INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_POCKET_ROI, CheckOutcome, register_check,
+)
+from tests.terminal_defects import (
+    check_terminal_pogo,
+    check_terminal_offset,
+    check_terminal_oxidation,
+    check_incomplete_termination_1,
+    check_incomplete_termination_2,
+    check_terminal_chipoff_inner,
+    check_terminal_chipoff_outer,
+    check_compare_terminal_corner,
+    check_black_pixels_count,
+    draw_chipoff_inspection_bands,
+    draw_terminal_corner_regions,
+    draw_black_pixels_bands,
+)
+
+_BLOB_SCHEMA = ("defects_found", "largest_area")
+
+
+# -------------------------------------------------
+# Resolvers
+# -------------------------------------------------
+
+def _resolve_terminal_color(params, thresholds, pocket_params, station):
+    ci_tab = thresholds.get("ColorInspectionTab", {}) if thresholds else {}
+    contrast = int(ci_tab.get("ci_term_contrast", 255))
+    left_width_cfg = int(ci_tab.get("ci_term_left_width", 255))
+    right_width_cfg = int(ci_tab.get("ci_term_right_width", 255))
+    return dict(
+        contrast=contrast,
+        left_width_cfg=left_width_cfg,
+        right_width_cfg=right_width_cfg,
+        offset_top=ci_val(ci_tab, "ci_offset_top", 0),
+        offset_bottom=ci_val(ci_tab, "ci_offset_bottom", 0),
+        offset_left=ci_val(ci_tab, "ci_offset_left", 0),
+        offset_right=ci_val(ci_tab, "ci_offset_right", 0),
+        configured=not (contrast == 255 and left_width_cfg == 255 and right_width_cfg == 255),
+    )
+
+
+def _resolve_terminal_pogo(params, thresholds, pocket_params, station):
+    mt_tab = thresholds.get("MultiTerminal", {})
+    contrast = int(mt_tab.get("mt_pogo_contrast", 255))
+    min_area = int(mt_tab.get("mt_pogo_min_area", 255))
+    min_square = int(mt_tab.get("mt_pogo_min_square", 255))
+    return dict(
+        contrast=contrast,
+        min_area=min_area,
+        min_square=min_square,
+        offset_left=int(mt_tab.get("mt_pogo_corner_mask_left", 0)),
+        offset_right=int(mt_tab.get("mt_pogo_corner_mask_right", 0)),
+        configured=blob_configured(contrast, min_area, min_square),
+    )
+
+
+def _resolve_terminal_offset(params, thresholds, pocket_params, station):
+    tp_tab = thresholds.get("TerminalPlatingTab", {})
+
+    # LEFT terminal offsets
+    left_top = int(tp_tab.get("tpd_left_off_top", 0))
+    left_bottom = int(tp_tab.get("tpd_left_off_bottom", 0))
+    left_left = int(tp_tab.get("tpd_left_off_left", 0))
+    left_right = int(tp_tab.get("tpd_left_off_right", 0))
+    left_corner_x = int(tp_tab.get("tpd_left_corner_mask_x", 0))
+    left_corner_y = int(tp_tab.get("tpd_left_corner_mask_y", 0))
+
+    # RIGHT terminal offsets (default to the LEFT ones)
+    right_top = int(tp_tab.get("tpd_right_off_top", left_top))
+    right_bottom = int(tp_tab.get("tpd_right_off_bottom", left_bottom))
+    right_left = int(tp_tab.get("tpd_right_off_left", left_left))
+    right_right = int(tp_tab.get("tpd_right_off_right", left_right))
+    right_corner_x = int(tp_tab.get("tpd_right_corner_mask_x", left_corner_x))
+    right_corner_y = int(tp_tab.get("tpd_right_corner_mask_y", left_corner_y))
+
+    offsets = [left_top, left_bottom, left_left, left_right, right_top, right_bottom, right_left, right_right]
+    return dict(
+        left_top=left_top,
+        left_bottom=left_bottom,
+        left_left=left_left,
+        left_right=left_right,
+        left_corner_x=left_corner_x,
+        left_corner_y=left_corner_y,
+        right_top=right_top,
+        right_bottom=right_bottom,
+        right_left=right_left,
+        right_right=right_right,
+        right_corner_x=right_corner_x,
+        right_corner_y=right_corner_y,
+        configured=not all(x == 0 for x in offsets),
+    )
+
+
+def _resolve_incomplete_termination_1(params, thresholds, pocket_params, station):
+    # Parameters from Inspection Range dialog (min/max). Use 'max' as configured threshold.
+    contrast = int(params.ranges.get("incomplete_termination_contrast_max", 255))
+    min_area = int(params.ranges.get("incomplete_termination_min_area_max", 255))
+    min_square = int(params.ranges.get("incomplete_termination_min_sqr_size_max", 255))
+    return dict(
+        contrast=contrast,
+        min_area=min_area,
+        min_square=min_square,
+        offset_top=int(params.ranges.get("incomplete_termination_top_max", 0)),
+        offset_bottom=int(params.ranges.get("incomplete_termination_bottom_max", 0)),
+        offset_left=int(params.ranges.get("incomplete_termination_left_max", 0)),
+        offset_right=int(params.ranges.get("incomplete_termination_right_max", 0)),
+        corner_x=int(params.ranges.get("corner_offset_x_max", 0)),
+        corner_y=int(params.ranges.get("corner_offset_y_max", 0)),
+        configured=blob_configured(contrast, min_area, min_square),
+    )
+
+
+def _resolve_incomplete_termination_2(params, thresholds, pocket_params, station):
+    ranges = params.ranges
+    contrast = int(ranges.get("incomplete_termination_contrast_max", 255))
+    min_area = int(ranges.get("incomplete_termination_min_area_max", 255))
+    min_square = int(ranges.get("incomplete_termination_min_sqr_size_max", 255))
+    # Left terminal offsets
+    left_top = int(ranges.get("left_terminal_top_max", ranges.get("incomplete_termination_top_max", 0)))
+    left_bottom = int(ranges.get("left_terminal_bottom_max", ranges.get("incomplete_termination_bottom_max", 0)))
+    left_left = int(ranges.get("left_terminal_left_max", ranges.get("incomplete_termination_left_max", 0)))
+    left_right = int(ranges.get("left_terminal_right_max", ranges.get("incomplete_termination_right_max", 0)))
+    return dict(
+        contrast=contrast,
+        min_area=min_area,
+        min_square=min_square,
+        left_top=left_top,
+        left_bottom=left_bottom,
+        left_left=left_left,
+        left_right=left_right,
+        # Right terminal offsets (default to the left ones)
+        right_top=int(ranges.get("right_terminal_top_max", left_top)),
+        right_bottom=int(ranges.get("right_terminal_bottom_max", left_bottom)),
+        right_left=int(ranges.get("right_terminal_left_max", left_left)),
+        right_right=int(ranges.get("right_terminal_right_max", left_right)),
+        # Corner chamfer offsets
+        corner_x=int(ranges.get("corner_offset_x_max", 0)),
+        corner_y=int(ranges.get("corner_offset_y_max", 0)),
+        configured=blob_configured(contrast, min_area, min_square),
+    )
+
+
+def _resolve_terminal_oxidation(params, thresholds, pocket_params, station):
+    tp_tab = thresholds.get("TerminalPlatingTab", {})
+    teach_contrast = int(tp_tab.get("tpd_oxidation_teach_contrast", 128))
+    contrast_difference = int(tp_tab.get("tpd_oxidation_contrast_diff", 20))
+    return dict(
+        teach_contrast=teach_contrast,
+        contrast_difference=contrast_difference,
+        offset_top=int(tp_tab.get("tpd_oxidation_off_top", 0)),
+        offset_bottom=int(tp_tab.get("tpd_oxidation_off_bottom", 0)),
+        offset_left=int(tp_tab.get("tpd_oxidation_off_left", 0)),
+        offset_right=int(tp_tab.get("tpd_oxidation_off_right", 0)),
+        corner_x=int(tp_tab.get("tpd_oxidation_corner_x", 0)),
+        corner_y=int(tp_tab.get("tpd_oxidation_corner_y", 0)),
+        configured=not (teach_contrast == 255 or contrast_difference == 255),
+    )
+
+
+def _resolve_inner_term_chipoff(params, thresholds, pocket_params, station):
+    tc_tab = thresholds.get("TerminalChipoff", {}) if thresholds else {}
+    contrast = int(tc_tab.get("tc_inner_contrast", 255))
+    min_area = int(tc_tab.get("tc_inner_min_area", 255))
+    min_square = int(tc_tab.get("tc_inner_min_square", 255))
+    return dict(
+        configured=blob_configured(contrast, min_area, min_square),
+        raw_contrast=contrast,
+        raw_min_area=min_area,
+        raw_min_square=min_square,
+        # Defaults for unconfigured parameters (255)
+        contrast=30 if contrast == 255 else contrast,
+        min_area=50 if min_area == 255 else min_area,
+        min_square=5 if min_square == 255 else min_square,
+        inspection_width_x=int(tc_tab.get("tc_inner_inspection_width_x", 80)),
+        inspection_width_y=int(tc_tab.get("tc_inner_inspection_width_y", 40)),
+        corner_ellipse_mask=int(tc_tab.get("tc_inner_corner_ellipse_mask", 0)),
+        enable_corner_offset=bool(tc_tab.get("tc_inner_enable_corner_offset", False)),
+        corner_offset_x=int(tc_tab.get("tc_inner_corner_offset_x", 0)),
+        corner_offset_y=int(tc_tab.get("tc_inner_corner_offset_y", 0)),
+        offset_top=int(tc_tab.get("tc_inner_offset_top", 0)),
+        offset_bottom=int(tc_tab.get("tc_inner_offset_bottom", 0)),
+        offset_left=int(tc_tab.get("tc_inner_offset_left", 0)),
+        offset_right=int(tc_tab.get("tc_inner_offset_right", 0)),
+        enable_pocket_filter=bool(tc_tab.get("tc_inner_enable_pocket_filter", False)),
+    )
+
+
+def _resolve_outer_term_chipoff(params, thresholds, pocket_params, station):
+    tc_tab = thresholds.get("TerminalChipoff", {}) if thresholds else {}
+    contrast = int(tc_tab.get("tc_outer_contrast", 255))
+    min_area = int(tc_tab.get("tc_outer_min_area", 255))
+    min_square = int(tc_tab.get("tc_outer_min_square", 255))
+    band_width_ratio = float(tc_tab.get("tc_outer_band_width_ratio", 0.25))
+    return dict(
+        configured=blob_configured(contrast, min_area, min_square),
+        raw_contrast=contrast,
+        raw_min_area=min_area,
+        raw_min_square=min_square,
+        # Defaults for unconfigured parameters (255)
+        contrast=30 if contrast == 255 else contrast,
+        min_area=50 if min_area == 255 else min_area,
+        min_square=5 if min_square == 255 else min_square,
+        offset_top=int(tc_tab.get("tc_outer_offset_top", 0)),
+        offset_bottom=int(tc_tab.get("tc_outer_offset_bottom", 0)),
+        offset_left=int(tc_tab.get("tc_outer_offset_left", 0)),
+        offset_right=int(tc_tab.get("tc_outer_offset_right", 0)),
+        band_width_ratio=0.25 if band_width_ratio <= 0 or band_width_ratio > 0.5 else band_width_ratio,
+        enable_pocket_filter=bool(tc_tab.get("tc_outer_enable_pocket_filter", False)),
+    )
+
+
+def _resolve_compare_terminal_corner(params, thresholds, pocket_params, station):
+    tc_tab = thresholds.get("TerminalChipoff", {}) if thresholds else {}
+    corner_width_ratio = float(tc_tab.get("tc_compare_corner_width_ratio", 0.15))
+    manually_difference = int(tc_tab.get("tc_compare_corner_diff", 20))
+    return dict(
+        configured=manually_difference != 255,
+        manually_difference=manually_difference,
+        offset_top=int(tc_tab.get("tc_compare_offset_top", 0)),
+        offset_bottom=int(tc_tab.get("tc_compare_offset_bottom", 0)),
+        offset_left=int(tc_tab.get("tc_compare_offset_left", 0)),
+        offset_right=int(tc_tab.get("tc_compare_offset_right", 0)),
+        corner_width_ratio=0.15 if corner_width_ratio <= 0 or corner_width_ratio > 0.5 else corner_width_ratio,
+    )
+
+
+def _resolve_black_pixels_count(params, thresholds, pocket_params, station):
+    tc_tab = thresholds.get("TerminalChipoff", {}) if thresholds else {}
+    contrast = int(tc_tab.get("tc_black_pixels_contrast", 255))
+    level = int(tc_tab.get("tc_black_pixels_level", 255))
+    return dict(
+        configured=not (contrast == 255 or level == 255),
+        contrast=contrast,
+        level=level,
+        width_left=int(tc_tab.get("tc_black_pixels_width_left", 15)),
+        width_right=int(tc_tab.get("tc_black_pixels_width_right", 15)),
+        width_top=int(tc_tab.get("tc_black_pixels_width_top", 15)),
+        width_bottom=int(tc_tab.get("tc_black_pixels_width_bottom", 15)),
+    )
+
+
+# -------------------------------------------------
+# Checks
+# -------------------------------------------------
+
+@register_check(
+    "terminal_color", resolve=_resolve_terminal_color,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=0.1,
+    result_schema=("left_mean", "right_mean", "window_min", "window_max"),
+)
+def run_terminal_color(run, check):
+    test_name = check.test_name
+    params = run.params
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured")
+
+    offset_top = opts["offset_top"]
+    offset_bottom = opts["offset_bottom"]
+    offset_left = opts["offset_left"]
+    offset_right = opts["offset_right"]
+    base_x = params.package_x + offset_left
+    base_y = params.package_y + offset_top
+    base_w = params.package_w - offset_left - offset_right
+    base_h = params.package_h - offset_top - offset_bottom
+    if base_w <= 0 or base_h <= 0:
+        return CheckOutcome.failure(f"{test_name} NG", [f"{test_name}: Invalid ROI after offsets"])
+
+    left_w = opts["left_width_cfg"] if opts["left_width_cfg"] != 255 else int(base_w * 0.3)
+    right_w = opts["right_width_cfg"] if opts["right_width_cfg"] != 255 else int(base_w * 0.3)
+
+    left_roi = (base_x, base_y, left_w, base_h)
+    right_roi = (base_x + base_w - right_w, base_y, right_w, base_h)
+
+    left_mean = safe_roi_mean_gray(run.working_image, left_roi, run.context)
+    right_mean = safe_roi_mean_gray(run.working_image, right_roi, run.context)
+    if left_mean is None or right_mean is None:
+        return CheckOutcome.failure(f"{test_name} NG", [f"{test_name}: ROI not found"])
+
+    contrast = opts["contrast"]
+    window_min, window_max = resolve_intensity_window(
+        (left_mean + right_mean) / 2.0,
+        getattr(params, "terminal_intensity_min", None),
+        getattr(params, "terminal_intensity_max", None),
+        contrast,
+    )
+
+    if window_min is None or window_max is None:
+        return skipped(run, test_name, "thresholds not set")
+
+    left_ok = window_min <= left_mean <= window_max
+    right_ok = window_min <= right_mean <= window_max
+    is_pass = left_ok and right_ok
+    values = dict(left_mean=left_mean, right_mean=right_mean, window_min=window_min, window_max=window_max)
+
+    overlays = []
+    if run.step_mode:
+        overlays.append(color_roi_overlay(left_roi, left_ok, "L"))
+        overlays.append(color_roi_overlay(right_roi, right_ok, "R"))
+
+    if not is_pass:
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: L={left_mean:.1f}, R={right_mean:.1f} (Allowed {window_min}-{window_max})"],
+            overlays=overlays,
+            values=values,
+            pause_lines=[f"{test_name}: Test paused"],
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"L={left_mean:.1f}, R={right_mean:.1f}",
+                "expected": f"{window_min}-{window_max}",
+                "suggested_min": max(0, int(min(left_mean, right_mean) - 5)),
+                "suggested_max": min(255, int(max(left_mean, right_mean) + 5)),
+                "debug_info": f"Left={left_mean:.1f}\nRight={right_mean:.1f}\nWindow={window_min}-{window_max}\nContrast={contrast}"
+            },
+        )
+
+    return CheckOutcome(
+        messages=[f"{test_name} OK (L={left_mean:.1f}, R={right_mean:.1f})"],
+        overlays=overlays,
+        values=values,
+    )
+
+
+def _blob_failure(test_name, defects_found, largest_area, defect_rects, contrast, min_area, min_square,
+                  extra_debug=""):
+    """Failure outcome shared by the pogo / incomplete termination blob checks."""
+    expected_txt = f"Area < {min_area}px"
+    limit_txt = f"max area={min_area}px"
+    if min_square != 255:
+        expected_txt += f" and W/H < {min_square}px"
+        limit_txt += f", max W/H={min_square}px"
+    return CheckOutcome.failure(
+        f"{test_name} NG",
+        [f"{test_name}: {defects_found} defects (largest={largest_area}px, {limit_txt})"],
+        defect_rects=list(defect_rects or []),
+        values=dict(defects_found=defects_found, largest_area=largest_area),
+        step_result={
+            "step_name": test_name,
+            "status": "FAIL",
+            "measured": f"Defects={defects_found}, Largest={largest_area}px",
+            "expected": expected_txt,
+            "suggested_min": None,
+            "suggested_max": int(largest_area * 1.2) if largest_area > 0 else min_area,
+            "debug_info": f"Defects Found: {defects_found}\nLargest Area: {largest_area}px\nMin Area Threshold: {min_area}px\nMin Square Threshold: {min_square}px\nContrast: {contrast}" + extra_debug
+        },
+    )
+
+
+@register_check(
+    "terminal_pogo", resolve=_resolve_terminal_pogo,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=2.0, result_schema=_BLOB_SCHEMA,
+)
+def run_terminal_pogo(run, check):
+    # Terminal Pogo - detect black defects (pogo holes) in terminal areas
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    # Parameters from device_inspection.json MultiTerminal section
+    opts = check.options
+    contrast = opts["contrast"]
+    min_area = opts["min_area"]
+    min_square = opts["min_square"]
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={contrast}, min_area={min_area}, min_square={min_square})")
+
+    defects_found, largest_area, is_pass, defect_rects = check_terminal_pogo(
+        run.working_image,
+        run.package_roi,
+        contrast=contrast,
+        min_area=min_area,
+        min_square=min_square,
+        offset_top=0,
+        offset_bottom=0,
+        offset_left=opts["offset_left"],
+        offset_right=opts["offset_right"],
+        apply_or=True,
+        debug=True,
+        context=run.context
+    )
+
+    run.log("[INFO] {}: defects={}, largest={}, pass={}", test_name, defects_found, largest_area, is_pass)
+    if not is_pass:
+        return _blob_failure(test_name, defects_found, largest_area, defect_rects, contrast, min_area, min_square)
+    return CheckOutcome(
+        messages=[f"{test_name} OK (defects={defects_found})"],
+        values=dict(defects_found=defects_found, largest_area=largest_area),
+    )
+
+
+@register_check(
+    "terminal_offset", resolve=_resolve_terminal_offset,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=1.0, result_schema=("left_valid", "right_valid"),
+)
+def run_terminal_offset(run, check):
+    # Terminal Offset - verify terminals are within expected offset boundaries
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    # Parameters from device_inspection.json TerminalPlatingTab
+    opts = check.options
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured", "not configured (all offsets=0)")
+
+    is_pass, debug_info = check_terminal_offset(
+        run.working_image,
+        run.package_roi,
+        left_top=opts["left_top"],
+        left_bottom=opts["left_bottom"],
+        left_left=opts["left_left"],
+        left_right=opts["left_right"],
+        left_corner_x=opts["left_corner_x"],
+        left_corner_y=opts["left_corner_y"],
+        right_top=opts["right_top"],
+        right_bottom=opts["right_bottom"],
+        right_left=opts["right_left"],
+        right_right=opts["right_right"],
+        right_corner_x=opts["right_corner_x"],
+        right_corner_y=opts["right_corner_y"],
+        debug=True,
+        context=run.context
+    )
+
+    run.log("[INFO] {}: left_valid={}, right_valid={}, pass={}", test_name, debug_info['left_valid'], debug_info['right_valid'], is_pass)
+    values = dict(left_valid=debug_info['left_valid'], right_valid=debug_info['right_valid'])
+
+    if not is_pass:
+        failed_msg = []
+        if not debug_info['left_valid']:
+            failed_msg.append(f"Left terminal invalid ({debug_info['left_info']})")
+        if not debug_info['right_valid']:
+            failed_msg.append(f"Right terminal invalid ({debug_info['right_info']})")
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: " + ", ".join(failed_msg)],
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Left Valid: {debug_info['left_valid']}, Right Valid: {debug_info['right_valid']}",
+                "expected": "Both terminals within offset boundaries",
+                "suggested_min": None,
+                "suggested_max": None,
+                "debug_info": f"Left Info: {debug_info['left_info']}\nRight Info: {debug_info['right_info']}\nLeft ROI: {debug_info['left_roi']}\nRight ROI: {debug_info['right_roi']}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (terminals within bounds)"], values=values)
+
+
+@register_check(
+    "incomplete_termination_1", resolve=_resolve_incomplete_termination_1,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=2.0, result_schema=_BLOB_SCHEMA,
+)
+def run_incomplete_termination_1(run, check):
+    # Incomplete Termination 1 - black defects in terminal bands (top/bottom)
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    contrast = opts["contrast"]
+    min_area = opts["min_area"]
+    min_square = opts["min_square"]
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={contrast}, min_area={min_area}, min_square={min_square})")
+
+    defects_found, largest_area, is_pass, defect_rects = check_incomplete_termination_1(
+        run.working_image,
+        run.package_roi,
+        contrast=contrast,
+        min_area=min_area,
+        min_square=min_square,
+        offset_top=opts["offset_top"],
+        offset_bottom=opts["offset_bottom"],
+        offset_left=opts["offset_left"],
+        offset_right=opts["offset_right"],
+        corner_x=opts["corner_x"],
+        corner_y=opts["corner_y"],
+        apply_or=True,
+        debug=True,
+        context=run.context
+    )
+
+    run.log("[INFO] {}: defects={}, largest={}, pass={}", test_name, defects_found, largest_area, is_pass)
+    if not is_pass:
+        return _blob_failure(test_name, defects_found, largest_area, defect_rects, contrast, min_area, min_square)
+    return CheckOutcome(
+        messages=[f"{test_name} OK (defects={defects_found})"],
+        values=dict(defects_found=defects_found, largest_area=largest_area),
+    )
+
+
+@register_check(
+    "incomplete_termination_2", resolve=_resolve_incomplete_termination_2,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=2.0, result_schema=_BLOB_SCHEMA,
+)
+def run_incomplete_termination_2(run, check):
+    # Incomplete Termination 2 - per terminal with corner offsets
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    contrast = opts["contrast"]
+    min_area = opts["min_area"]
+    min_square = opts["min_square"]
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={contrast}, min_area={min_area}, min_square={min_square})")
+
+    defects_found, largest_area, is_pass, defect_rects = check_incomplete_termination_2(
+        run.working_image,
+        run.package_roi,
+        contrast=contrast,
+        min_area=min_area,
+        min_square=min_square,
+        left_top=opts["left_top"],
+        left_bottom=opts["left_bottom"],
+        left_left=opts["left_left"],
+        left_right=opts["left_right"],
+        right_top=opts["right_top"],
+        right_bottom=opts["right_bottom"],
+        right_left=opts["right_left"],
+        right_right=opts["right_right"],
+        corner_x=opts["corner_x"],
+        corner_y=opts["corner_y"],
+        apply_or=True,
+        debug=True,
+        context=run.context
+    )
+
+    run.log("[INFO] {}: defects={}, largest={}, pass={}", test_name, defects_found, largest_area, is_pass)
+    if not is_pass:
+        return _blob_failure(test_name, defects_found, largest_area, defect_rects, contrast, min_area, min_square,
+                             f"\nCorner Offsets: {opts['corner_x']},{opts['corner_y']}")
+    return CheckOutcome(
+        messages=[f"{test_name} OK (defects={defects_found})"],
+        values=dict(defects_found=defects_found, largest_area=largest_area),
+    )
+
+
+@register_check(
+    "terminal_oxidation", resolve=_resolve_terminal_oxidation,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=1.0, result_schema=("measured_contrast", "difference"),
+)
+def run_terminal_oxidation(run, check):
+    # Terminal Oxidation - detect color change (oxidation) in terminal
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    # Parameters from device_inspection.json TerminalPlatingTab
+    opts = check.options
+    teach_contrast = opts["teach_contrast"]
+    contrast_difference = opts["contrast_difference"]
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (teach={teach_contrast}, diff={contrast_difference})")
+
+    measured_contrast, difference, is_pass = check_terminal_oxidation(
+        run.working_image,
+        run.package_roi,
+        teach_contrast=teach_contrast,
+        contrast_difference=contrast_difference,
+        offset_top=opts["offset_top"],
+        offset_bottom=opts["offset_bottom"],
+        offset_left=opts["offset_left"],
+        offset_right=opts["offset_right"],
+        corner_x=opts["corner_x"],
+        corner_y=opts["corner_y"],
+        debug=True,
+        context=run.context
+    )
+
+    run.log("[INFO] {}: measured={}, taught={}, diff={}, threshold={}, pass={}", test_name, measured_contrast, teach_contrast, difference, contrast_difference, is_pass)
+    values = dict(measured_contrast=measured_contrast, difference=difference)
+
+    if not is_pass:
+        run.log("[FAIL] {} - oxidation detected", test_name)
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: Oxidation detected (Contrast={measured_contrast}, Expected={teach_contrast}±{contrast_difference})"],
+            values=values,
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Contrast={measured_contrast}, Diff={difference}",
+                "expected": f"Within ±{contrast_difference} of {teach_contrast}",
+                "suggested_min": None,
+                "suggested_max": None,
+                "debug_info": f"Taught Contrast: {teach_contrast}\nMeasured Contrast: {measured_contrast}\nDifference: {difference}\nThreshold: {contrast_difference}\n\nSuggested new teach_contrast: {measured_contrast}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (contrast={measured_contrast}, diff={difference})"], values=values)
+
+
+def _chipoff_outcome(run, test_name, opts, result, overlays, debug_info):
+    defects_found, largest_area, is_pass, defect_rects = result
+    values = dict(defects_found=defects_found, largest_area=largest_area)
+    if not is_pass:
+        min_area = opts["min_area"]
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: {defects_found} defects (largest={largest_area}px)"],
+            overlays=overlays,
+            defect_rects=list(defect_rects or []),
+            values=values,
+            pause_lines=[f"{test_name}: Test paused"],
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Defects={defects_found}, Largest={largest_area}px",
+                "expected": f"Area < {min_area}, Size < {opts['min_square']}",
+                "suggested_min": None,
+                "suggested_max": int(largest_area * 1.2) if largest_area > 0 else min_area,
+                "debug_info": debug_info
+            },
+        )
+    return CheckOutcome(
+        messages=[f"{test_name} OK ({defects_found} defects, largest={largest_area}px)"],
+        overlays=overlays,
+        values=values,
+    )
+
+
+@register_check(
+    "inner_term_chipoff", resolve=_resolve_inner_term_chipoff,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_POCKET_ROI), cost=3.0, result_schema=_BLOB_SCHEMA,
+)
+def run_inner_term_chipoff(run, check):
+    test_name = check.test_name
+    params = run.params
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={opts['raw_contrast']}, min_area={opts['raw_min_area']}, min_square={opts['raw_min_square']})")
+
+    # Check if pocket edge filter is enabled
+    enable_pocket_filter = opts["enable_pocket_filter"]
+    pocket_roi = run.pocket_roi if enable_pocket_filter and hasattr(params, 'pocket_x') else None
+    band_options = dict(
+        inspection_width_x=opts["inspection_width_x"],
+        inspection_width_y=opts["inspection_width_y"],
+        offset_top=opts["offset_top"],
+        offset_bottom=opts["offset_bottom"],
+        offset_left=opts["offset_left"],
+        offset_right=opts["offset_right"],
+        enable_corner_offset=opts["enable_corner_offset"],
+        corner_offset_x=opts["corner_offset_x"],
+        corner_offset_y=opts["corner_offset_y"],
+    )
+
+    result = check_terminal_chipoff_inner(
+        run.working_image,
+        run.package_roi,
+        contrast=opts["contrast"],
+        min_area=opts["min_area"],
+        min_square=opts["min_square"],
+        corner_ellipse_mask=opts["corner_ellipse_mask"],
+        apply_or=True,
+        enable_pocket_edge_filter=enable_pocket_filter,
+        pocket_roi=pocket_roi,
+        debug=True,
+        context=run.context,
+        **band_options
+    )
+
+    defects_found, largest_area, is_pass, _ = result
+    run.log("[INFO] {}: defects={}, largest={}, pass={}, pocket_filter={}", test_name, defects_found, largest_area, is_pass, enable_pocket_filter)
+
+    # Draw inspection bands in step mode
+    overlays = []
+    if run.step_mode:
+        overlays.append(in_place_overlay(
+            draw_chipoff_inspection_bands, run.package_roi, band_type='inner',
+            color=(0, 255, 255), thickness=2, **band_options
+        ))
+
+    return _chipoff_outcome(
+        run, test_name, opts, result, overlays,
+        f"Contrast={opts['contrast']}\nMinArea={opts['min_area']}\nMinSquare={opts['min_square']}\nInspection Width X={opts['inspection_width_x']} Y={opts['inspection_width_y']}\nCorner Ellipse Mask={opts['corner_ellipse_mask']}\nCorner Offset Mode={'Chamfered' if opts['enable_corner_offset'] else 'Rectangular'}\nOffsets T{opts['offset_top']} B{opts['offset_bottom']} L{opts['offset_left']} R{opts['offset_right']}"
+    )
+
+
+@register_check(
+    "outer_term_chipoff", resolve=_resolve_outer_term_chipoff,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI, INPUT_POCKET_ROI), cost=3.0, result_schema=_BLOB_SCHEMA,
+)
+def run_outer_term_chipoff(run, check):
+    test_name = check.test_name
+    params = run.params
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (contrast={opts['raw_contrast']}, min_area={opts['raw_min_area']}, min_square={opts['raw_min_square']})")
+
+    # Check if pocket edge filter is enabled
+    enable_pocket_filter = opts["enable_pocket_filter"]
+    pocket_roi = run.pocket_roi if enable_pocket_filter and hasattr(params, 'pocket_x') else None
+    band_options = dict(
+        band_width_ratio=opts["band_width_ratio"],
+        offset_top=opts["offset_top"],
+        offset_bottom=opts["offset_bottom"],
+        offset_left=opts["offset_left"],
+        offset_right=opts["offset_right"],
+    )
+
+    result = check_terminal_chipoff_outer(
+        run.working_image,
+        run.package_roi,
+        contrast=opts["contrast"],
+        min_area=opts["min_area"],
+        min_square=opts["min_square"],
+        apply_or=True,
+        enable_pocket_edge_filter=enable_pocket_filter,
+        pocket_roi=pocket_roi,
+        debug=True,
+        context=run.context,
+        **band_options
+    )
+
+    defects_found, largest_area, is_pass, _ = result
+    run.log("[INFO] {}: defects={}, largest={}, pass={}, pocket_filter={}", test_name, defects_found, largest_area, is_pass, enable_pocket_filter)
+
+    # Draw inspection bands in step mode
+    overlays = []
+    if run.step_mode:
+        overlays.append(in_place_overlay(
+            draw_chipoff_inspection_bands, run.package_roi, band_type='outer',
+            color=(0, 255, 255), thickness=2, **band_options
+        ))
+
+    return _chipoff_outcome(
+        run, test_name, opts, result, overlays,
+        f"Contrast={opts['contrast']}\nMinArea={opts['min_area']}\nMinSquare={opts['min_square']}\nOffsets T{opts['offset_top']} B{opts['offset_bottom']} L{opts['offset_left']} R{opts['offset_right']}\nBandWidthRatio={opts['band_width_ratio']}"
+    )
+
+
+@register_check(
+    "compare_terminal_corner", resolve=_resolve_compare_terminal_corner,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=0.2, result_schema=("left_avg", "right_avg", "difference"),
+)
+def run_compare_terminal_corner(run, check):
+    # Compare Terminal Corner - compare left/right terminal brightness
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    manually_difference = opts["manually_difference"]
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured",
+                       f"not configured (manually_difference={manually_difference})")
+
+    corner_options = dict(
+        corner_width_ratio=opts["corner_width_ratio"],
+        offset_top=opts["offset_top"],
+        offset_bottom=opts["offset_bottom"],
+        offset_left=opts["offset_left"],
+        offset_right=opts["offset_right"],
+    )
+    left_avg, right_avg, difference, is_pass = check_compare_terminal_corner(
+        run.working_image,
+        run.package_roi,
+        manually_difference=manually_difference,
+        debug=True,
+        context=run.context,
+        **corner_options
+    )
+
+    run.log("[INFO] {}: left={}, right={}, diff={}, threshold={}, pass={}", test_name, left_avg, right_avg, difference, manually_difference, is_pass)
+    values = dict(left_avg=left_avg, right_avg=right_avg, difference=difference)
+
+    # Draw corner regions in step mode
+    overlays = []
+    if run.step_mode:
+        overlays.append(in_place_overlay(
+            draw_terminal_corner_regions, run.package_roi, color=(255, 255, 0), thickness=2, **corner_options
+        ))
+
+    if not is_pass:
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: L={left_avg}, R={right_avg}, diff={difference} (max={manually_difference})"],
+            overlays=overlays,
+            values=values,
+            pause_lines=[f"{test_name}: Test paused"],
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Left={left_avg}, Right={right_avg}, Diff={difference}",
+                "expected": f"Difference <= {manually_difference}",
+                "suggested_min": None,
+                "suggested_max": int(difference * 1.2) if difference > 0 else manually_difference,
+                "debug_info": f"Left Average={left_avg}\nRight Average={right_avg}\nDifference={difference}\nThreshold={manually_difference}\nCorner Width Ratio={opts['corner_width_ratio']}"
+            },
+        )
+
+    return CheckOutcome(
+        messages=[f"{test_name} OK (L={left_avg}, R={right_avg}, diff={difference})"],
+        overlays=overlays,
+        values=values,
+    )
+
+
+@register_check(
+    "black_pixels_count", resolve=_resolve_black_pixels_count,
+    inputs=(INPUT_GRAY, INPUT_PACKAGE_ROI), cost=0.5, result_schema=("total_black", "max_side", "side_counts"),
+)
+def run_black_pixels_count(run, check):
+    # Black Pixels Count - count black pixels in terminal bands
+    test_name = check.test_name
+    run.log("[INFO] Checking {}...", test_name)
+
+    opts = check.options
+    contrast = opts["contrast"]
+    level = opts["level"]
+    if not opts["configured"]:
+        return skipped(run, test_name, "not configured", f"not configured (contrast={contrast}, level={level})")
+
+    band_options = dict(
+        inspection_width_left=opts["width_left"],
+        inspection_width_right=opts["width_right"],
+        inspection_width_top=opts["width_top"],
+        inspection_width_bottom=opts["width_bottom"],
+    )
+    total_black, max_side, is_pass, side_counts = check_black_pixels_count(
+        run.working_image,
+        run.package_roi,
+        contrast=contrast,
+        level=level,
+        debug=True,
+        context=run.context,
+        **band_options
+    )
+
+    run.log("[INFO] {}: total={}, max_side={}, level={}, pass={}", test_name, total_black, max_side, level, is_pass)
+    values = dict(total_black=total_black, max_side=max_side, side_counts=side_counts)
+
+    # Draw black pixels bands in step mode
+    overlays = []
+    if run.step_mode:
+        overlays.append(in_place_overlay(
+            draw_black_pixels_bands, run.package_roi, color=(255, 0, 255), thickness=1, **band_options
+        ))
+
+    if not is_pass:
+        return CheckOutcome.failure(
+            f"{test_name} NG",
+            [f"{test_name}: max_side={max_side} exceeds level={level}", f"Sides: {side_counts}"],
+            overlays=overlays,
+            values=values,
+            pause_lines=[f"{test_name}: Test paused"],
+            step_result={
+                "step_name": test_name,
+                "status": "FAIL",
+                "measured": f"Total={total_black}, Max Side={max_side}",
+                "expected": f"Max Side <= {level}",
+                "suggested_min": None,
+                "suggested_max": int(max_side * 1.2) if max_side > 0 else level,
+                "debug_info": f"Total Black Pixels={total_black}\nMax Side Count={max_side}\nLevel Threshold={level}\nContrast={contrast}\nSide Counts: {side_counts}"
+            },
+        )
+
+    return CheckOutcome(messages=[f"{test_name} OK (total={total_black}, max={max_side})"], overlays=overlays, values=values)
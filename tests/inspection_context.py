@@ -0,0 +1,267 @@
+"""
+Inspection Context - per-frame cache of derived image planes.
+
+One InspectionContext is created for every frame that goes through
+test_top_bottom / test_feed. Checks that receive it read the grayscale
+frame, package crop, color channels and Sobel gradients from here instead
+of copying and converting the frame themselves, so every derived plane is
+computed at most once per part.
+
+Gradients are CV_16S (exact for 3x3 Sobel of uint8, a quarter of the CV_64F
+bandwidth) and keyed by (ROI, preprocessing, derivative): the gray gradient
+of the package crop is computed once per direction and shared by the
+dimension measurements and the crack checks.
+
+Band statistics (sum / mean of the gray plane, count of pixels below a
+threshold over any rectangle) are O(1) queries on summed-area tables of the
+package crop. A table (the gray one, or one per count threshold) is built
+once the pixels its queries reduced directly reach the package area, so a
+frame with a few small bands never pays for a table it would not amortize.
+
+Results several checks derive from the same planes (e.g. the fused Body
+Smear / Body Stain pass) are memoized with shared(), which computes each key
+once even when the checks run on worker threads.
+
+All planes handed out are read-only views. A check that needs to modify
+pixels (e.g. masking chamfer corners) must ask for a copy.
+
+With a work window (package ROI + pocket search window + margin, see
+inspection_plan.get_work_window) the derived planes are only computed inside
+the window. They keep full-frame shape and coordinates, so checks index them
+with absolute ROIs as before; outside the window they read 0 and the pages
+are never written (np.zeros is allocated lazily by the OS).
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+
+def _read_only(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class InspectionContext:
+    """Lazily computed, memoized image planes for one inspection frame."""
+
+    _CHANNEL_INDEX = {"b": 0, "g": 1, "r": 2}
+
+    def __init__(self, image, package_roi=None, window=None):
+        """
+        Args:
+            image: Frame to inspect (BGR or grayscale). Not copied; the caller
+                must not modify it while the inspection is running.
+            package_roi: Package ROI (x, y, w, h), or None if not taught
+            window: Work window (x, y, w, h) the planes are computed in,
+                or None for the full frame
+        """
+        self.frame = _read_only(image)
+        self.package_roi = tuple(int(v) for v in package_roi) if package_roi else None
+        self.window = tuple(int(v) for v in window) if window else None
+        self._gray = None
+        self._channels = None
+        self._gradients = {}
+        self._shared = {}
+        self._band_origin = None
+        self._band_tables = {}
+        self._band_spent = {}
+        self._shared_lock = threading.Lock()
+
+    @property
+    def is_color(self):
+        return self.frame.ndim == 3
+
+    def in_window(self, roi):
+        """True if roi (x, y, w, h) lies inside the work window."""
+        if self.window is None:
+            return True
+        x, y, w, h = roi
+        wx, wy, ww, wh = self.window
+        return x >= wx and y >= wy and x + w <= wx + ww and y + h <= wy + wh
+
+    def _windowed(self, convert):
+        """Full-frame-shaped plane with convert(frame crop) filled in the window only."""
+        wx, wy, ww, wh = self.window
+        plane = np.zeros(self.frame.shape[:2], np.uint8)
+        plane[wy:wy + wh, wx:wx + ww] = convert(self.frame[wy:wy + wh, wx:wx + ww])
+        return plane
+
+    @property
+    def gray(self):
+        """Grayscale plane (full-frame coordinates)."""
+        if self._gray is None:
+            if not self.is_color:
+                gray = self.frame
+            elif self.window is not None:
+                gray = self._windowed(lambda crop: cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY))
+            else:
+                gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+            self._gray = _read_only(gray)
+        return self._gray
+
+    def gray_crop(self, roi, copy=False):
+        """
+        Grayscale crop of roi (x, y, w, h).
+
+        Slicing follows the same semantics as image[y:y+h, x:x+w], so the
+        result is identical to cropping the BGR frame first and converting it.
+        """
+        x, y, w, h = roi
+        if not self.in_window(roi) and self.is_color:
+            # Outside the work window: convert this crop from the frame itself
+            crop = self.frame[y:y + h, x:x + w]
+            return cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.size else crop[:, :, 0].copy()
+        crop = self.gray[y:y + h, x:x + w]
+        return crop.copy() if copy else crop
+
+    @property
+    def package_gray(self):
+        """Grayscale crop of the package ROI, or None if no ROI is set."""
+        if self.package_roi is None:
+            return None
+        return self.gray_crop(self.package_roi)
+
+    def channel(self, name):
+        """Color plane: 'b', 'g' or 'r' (gray for mono frames), full-frame coordinates."""
+        if not self.is_color:
+            return self.gray
+        if self._channels is None:
+            if self.window is not None:
+                self._channels = tuple(
+                    _read_only(self._windowed(lambda crop, i=i: crop[:, :, i])) for i in range(3)
+                )
+            else:
+                self._channels = tuple(_read_only(c) for c in cv2.split(self.frame))
+        return self._channels[self._CHANNEL_INDEX[name]]
+
+    def gradient(self, roi, dx, dy, prep=None):
+        """
+        CV_16S Sobel derivative (3x3) of the gray crop at roi, read-only and memoized.
+
+        prep: None for the gray crop itself, or (key, fn): the derivative is taken
+        of fn(gray crop) (e.g. a binarization) and key identifies the
+        preprocessing, so every consumer asking for the same (roi, key, dx, dy)
+        shares one plane.
+        """
+        roi = tuple(int(v) for v in roi)
+        key = (roi, None if prep is None else prep[0], dx, dy)
+        grad = self._gradients.get(key)
+        if grad is None:
+            source = self.gray_crop(roi)
+            if prep is not None:
+                source = prep[1](source)
+            grad = _read_only(cv2.Sobel(source, cv2.CV_16S, dx, dy, ksize=3))
+            self._gradients[key] = grad
+        return grad
+
+    def _band_area(self):
+        """(x, y, w, h) of the package ROI clipped to the frame: the extent of the band tables."""
+        if self._band_origin is None:
+            frame_h, frame_w = self.frame.shape[:2]
+            x, y, w, h = self.package_roi or (0, 0, 0, 0)
+            x1, y1 = max(0, x), max(0, y)
+            x2, y2 = min(frame_w, x + w), min(frame_h, y + h)
+            self._band_origin = (x1, y1, max(0, x2 - x1), max(0, y2 - y1))
+        return self._band_origin
+
+    def _table_corners(self, roi):
+        """Corner indices (y1, x1, y2, x2) of roi in the band tables, or None if roi is not inside them."""
+        x, y, w, h = roi
+        tx, ty, tw, th = self._band_area()
+        if w <= 0 or h <= 0 or x < tx or y < ty or x + w > tx + tw or y + h > ty + th:
+            return None
+        return y - ty, x - tx, y - ty + h, x - tx + w
+
+    def _band_table(self, key, roi, source):
+        """
+        Summed-area table for key if roi lies inside the package ROI and the table pays off,
+        else None (the caller reduces the crop directly).
+
+        source() gives the package-crop plane to sum (gray, or a 0/1 binary of it).
+        """
+        if self._table_corners(roi) is None:
+            return None
+        table = self._band_tables.get(key)
+        if table is not None:
+            return table
+        _, _, tw, th = self._band_area()
+        spent = self._band_spent.get(key, 0) + roi[2] * roi[3]
+        if spent < tw * th:
+            self._band_spent[key] = spent
+            return None
+        plane = source()
+        depth = cv2.CV_32S if plane.size < (1 << 23) else cv2.CV_64F
+        table = self._band_tables[key] = _read_only(cv2.integral(plane, sdepth=depth))
+        return table
+
+    def _package_crop(self):
+        tx, ty, tw, th = self._band_area()
+        return self.gray[ty:ty + th, tx:tx + tw]
+
+    def band_sum(self, roi):
+        """
+        Sum of the gray plane over roi (x, y, w, h), as int.
+
+        O(1) from the package summed-area table once built; otherwise the gray plane is
+        cropped like image[y:y+h, x:x+w] and summed.
+        """
+        table = self._band_table("gray", roi, self._package_crop)
+        if table is None:
+            x, y, w, h = roi
+            crop = self.gray[y:y + h, x:x + w]
+            return int(cv2.sumElems(crop)[0]) if crop.size else 0
+        return _rect_sum(table, self._table_corners(roi))
+
+    def band_mean(self, roi):
+        """Mean of the gray plane over a non-empty roi, equal to np.mean of the crop."""
+        x, y, w, h = roi
+        size = self.gray[y:y + h, x:x + w].size
+        return self.band_sum(roi) / size
+
+    def band_count_below(self, roi, threshold):
+        """Number of gray pixels < threshold in roi, as int (see band_sum)."""
+        threshold = int(threshold)
+
+        def binary():
+            return cv2.threshold(self._package_crop(), threshold - 1, 1, cv2.THRESH_BINARY_INV)[1]
+
+        table = self._band_table(("below", threshold), roi, binary)
+        if table is None:
+            x, y, w, h = roi
+            return int(np.count_nonzero(self.gray[y:y + h, x:x + w] < threshold))
+        return _rect_sum(table, self._table_corners(roi))
+
+    def shared(self, key, compute):
+        """
+        Memoized compute() for this frame, e.g. a pass several checks read their results from.
+
+        The first check asking for key computes it; checks asking concurrently wait for that
+        result instead of computing it again.
+        """
+        with self._shared_lock:
+            if key not in self._shared:
+                self._shared[key] = compute()
+            return self._shared[key]
+
+
+def _rect_sum(table, corners):
+    y1, x1, y2, x2 = corners
+    return int(table[y2, x2]) - int(table[y1, x2]) - int(table[y2, x1]) + int(table[y1, x1])
+
+
+def crop_gradient(context, crop, roi, dx, dy, prep=None):
+    """
+    CV_16S Sobel derivative (3x3) of crop, the gray crop at roi (x, y, w, h).
+
+    Served from context's gradient cache when there is a context (see
+    InspectionContext.gradient), computed from crop otherwise. prep is as for
+    InspectionContext.gradient.
+    """
+    if context is not None and roi[0] >= 0 and roi[1] >= 0:
+        return context.gradient(roi, dx, dy, prep)
+    source = crop if prep is None else prep[1](crop)
+    return cv2.Sobel(source, cv2.CV_16S, dx, dy, ksize=3)
+
@@ -0,0 +1,424 @@
+"""
+Inspection Plan - compiled, cached inspection configuration.
+
+test_top_bottom / test_feed used to re-read device_inspection.json,
+pocket_params.json, device_location_setting.json and mark_inspection.json
+and rebuild the ordered check list on every part. An InspectionPlan is
+compiled once from (InspectionParameters, station, config snapshot) and is
+reused until the parameters change or one of the config files changes on
+disk (mtime/size first, then content hash).
+
+The check order comes from the station pipelines (tests/checks/pipelines.py).
+Every PlannedCheck carries its registered CheckSpec and its tab parameters
+already parsed by the spec's resolver (defaults, 255-means-not-configured),
+so the per-part loop only does pixel work.
+
+get_work_window() gives the part of the frame a plan's checks read, so the
+per-frame planes (InspectionContext) are only computed there.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from config.device_location_setting_io import DEVICE_LOCATION_FILE, load_device_location_setting
+from config.mark_inspection_io import MARK_INSPECTION_FILE, load_mark_inspection_config
+from imaging.device_location import DeviceLocationDetector, package_search_rect
+from tests.checks import (
+    FEED_PIPELINE, STATION_FEED, TOP_BOTTOM_PIPELINE, CheckSpec, get_check,
+)
+
+# Load device inspection thresholds
+DEVICE_INSPECTION_FILE = Path("device_inspection.json")
+POCKET_PARAMS_FILE = Path("pocket_params.json")
+
+_EMPTY = MappingProxyType({})
+
+
+def load_device_thresholds():
+    """Load device inspection thresholds from device_inspection.json"""
+    if not DEVICE_INSPECTION_FILE.exists():
+        return {}
+
+    try:
+        with open(DEVICE_INSPECTION_FILE, "r") as f:
+            data = json.load(f)
+        # Merge UnitParameters into top-level for backward compatibility
+        unit = data.get("UnitParameters", {})
+        merged = dict(unit)
+        merged.update(data)
+        return merged
+    except Exception as e:
+        print(f"[WARN] Failed to load device_inspection.json: {e}")
+        return {}
+
+def load_pocket_params():
+    """Load pocket parameters from pocket_params.json"""
+    if not POCKET_PARAMS_FILE.exists():
+        return {}
+
+    try:
+        with open(POCKET_PARAMS_FILE, "r") as f:
+            data = json.load(f)
+        return data
+    except Exception as e:
+        print(f"[WARN] Failed to load pocket_params.json: {e}")
+        return {}
+
+
+
+# -------------------------------------------------
+# Config file cache (mtime/size, then content hash)
+# -------------------------------------------------
+
+@dataclass
+class _CachedConfig:
+    signature: Optional[Tuple[int, int]]
+    digest: Optional[str]
+    value: Any
+
+
+_config_cache: Dict[Tuple[str, Callable], _CachedConfig] = {}
+_config_lock = threading.Lock()
+
+
+def _file_signature(path):
+    """(mtime_ns, size) of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_cached_config(path, loader):
+    """
+    Return loader() for the config file at path, re-running it only when the file changed.
+
+    The file's mtime/size is checked on every call. When it differs from the
+    cached one, the content hash decides whether the file really changed
+    (a re-save of identical content keeps the parsed value).
+    """
+    key = (os.path.abspath(path), loader)
+    signature = _file_signature(path)
+
+    with _config_lock:
+        entry = _config_cache.get(key)
+        if entry is not None and entry.signature == signature:
+            return entry.value
+
+    digest = _file_digest(path) if signature is not None else None
+    with _config_lock:
+        entry = _config_cache.get(key)
+        if entry is not None and entry.digest == digest:
+            entry.signature = signature
+            return entry.value
+
+    value = loader()
+    with _config_lock:
+        _config_cache[key] = _CachedConfig(signature, digest, value)
+    return value
+
+
+def clear_config_cache():
+    """Drop all cached config files and compiled plans."""
+    with _config_lock:
+        _config_cache.clear()
+        _plan_cache.clear()
+
+
+def _config_signatures():
+    return tuple(
+        _file_signature(path)
+        for path in (DEVICE_INSPECTION_FILE, POCKET_PARAMS_FILE, DEVICE_LOCATION_FILE, MARK_INSPECTION_FILE)
+    )
+
+
+# -------------------------------------------------
+# Plan data
+# -------------------------------------------------
+
+@dataclass(frozen=True)
+class PlannedCheck:
+    """One enabled check of a compiled plan, with its pre-parsed parameters."""
+    test_name: str
+    key: str
+    spec: CheckSpec = field(repr=False)
+    resolved: Mapping[str, Any] = field(default_factory=lambda: _EMPTY, repr=False)
+    error: Optional[Exception] = field(default=None, repr=False)
+
+    @property
+    def options(self):
+        """
+        Parsed tab parameters of this check.
+
+        A malformed config value is reported when the check runs, exactly as
+        if the parameter had been parsed inside the check itself.
+        """
+        if self.error is not None:
+            raise self.error.with_traceback(None)
+        return self.resolved
+
+
+@dataclass(frozen=True)
+class InspectionPlan:
+    """Immutable, pre-resolved inspection sequence for one station."""
+    station: str
+    checks: Tuple[PlannedCheck, ...]
+    skipped_tests: Tuple[str, ...]
+    device_thresholds: Mapping[str, Any]
+    pocket_params: Mapping[str, Any]
+    no_terminal: bool
+    edge_contrast_value: int
+    dev_loc_settings: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    mark_config: Any = None
+    enable_post_seal: bool = False
+    enable_emboss_tape: bool = False
+    # frame size -> DeviceLocationDetector for dev_loc_settings, built on first use
+    _detectors: Dict[Tuple[int, int], DeviceLocationDetector] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def device_location_detector(self, frame_shape):
+        """
+        Package location detector for dev_loc_settings and this frame size.
+
+        A plan is recompiled whenever its settings change, so the detector is
+        built once per plan and frame size and reused for every part.
+        """
+        key = tuple(frame_shape[:2])
+        detector = self._detectors.get(key)
+        if detector is None:
+            detector = self._detectors.setdefault(key, DeviceLocationDetector(self.dev_loc_settings, frame_shape))
+        return detector
+
+
+# -------------------------------------------------
+# Compiler
+# -------------------------------------------------
+
+def _plan_check(test_name, spec, params, thresholds, pocket_params, station):
+    if spec.resolve is None:
+        return PlannedCheck(test_name, spec.key, spec)
+    try:
+        resolved = MappingProxyType(spec.resolve(params, thresholds, pocket_params, station))
+    except (ValueError, TypeError, AttributeError) as e:
+        return PlannedCheck(test_name, spec.key, spec, error=e)
+    return PlannedCheck(test_name, spec.key, spec, resolved)
+
+
+def compile_inspection_plan(params, station, device_thresholds=None, pocket_params=None,
+                            dev_loc_settings=None, mark_config=None):
+    """
+    Build the ordered, pre-resolved check list for one station.
+
+    Args:
+        params: InspectionParameters (flags, ranges, taught limits)
+        station: STATION_TOP_BOTTOM or STATION_FEED
+        device_thresholds: Parsed device_inspection.json (UnitParameters merged)
+        pocket_params: Parsed pocket_params.json
+        dev_loc_settings: Device location settings (package location only)
+        mark_config: MarkInspectionConfig (package location only)
+
+    Returns:
+        InspectionPlan
+    """
+    device_thresholds = device_thresholds or {}
+    pocket_params = pocket_params or {}
+    is_feed = station == STATION_FEED
+
+    no_terminal = bool(device_thresholds.get("no_terminal", False))
+    if is_feed:
+        edge_contrast_value = int(pocket_params.get("edge_contrast_value", 106)) if pocket_params else 106
+        enable_post_seal = bool(params.flags.get("enable_pocket_post_seal", False) or pocket_params.get("enable_post_seal", False))
+        enable_emboss_tape = bool(pocket_params.get("enable_emboss_tape", False))
+    else:
+        edge_contrast_value = int(pocket_params.get("edge_contrast_value", 106))
+        enable_post_seal = False
+        enable_emboss_tape = False
+
+    checks = []
+    skipped_tests = []
+    for test_name, flag, check_key, terminal_check in (FEED_PIPELINE if is_feed else TOP_BOTTOM_PIPELINE):
+        if flag is None:
+            is_enabled = bool(pocket_params.get("outer_stain_black", False) or pocket_params.get("outer_stain_white", False))
+        else:
+            is_enabled = params.flags.get(flag, False) and not (terminal_check and no_terminal)
+
+        if is_enabled:
+            checks.append(_plan_check(
+                test_name, get_check(check_key), params, device_thresholds, pocket_params, station
+            ))
+        elif no_terminal and ("Terminal" in test_name or (is_feed and test_name == "Pocket Post Seal")):
+            # Add reason for why test is skipped
+            skipped_tests.append(f"{test_name} (no terminal mode)")
+        else:
+            skipped_tests.append(f"{test_name} (disabled)")
+
+    # If emboss tape enabled, only allow pocket-related inspections
+    if enable_emboss_tape:
+        pocket_only = []
+        for check in checks:
+            if "Pocket" in check.test_name:
+                pocket_only.append(check)
+            else:
+                skipped_tests.append(f"{check.test_name} (emboss tape)")
+        checks = pocket_only
+
+    return InspectionPlan(
+        station=station,
+        checks=tuple(checks),
+        skipped_tests=tuple(skipped_tests),
+        device_thresholds=MappingProxyType(device_thresholds),
+        pocket_params=MappingProxyType(pocket_params),
+        no_terminal=no_terminal,
+        edge_contrast_value=edge_contrast_value,
+        dev_loc_settings=MappingProxyType(dev_loc_settings or {}),
+        mark_config=mark_config,
+        enable_post_seal=enable_post_seal,
+        enable_emboss_tape=enable_emboss_tape,
+    )
+
+
+# -------------------------------------------------
+# Plan cache
+# -------------------------------------------------
+
+# Geometry that is re-located per part; it never changes the plan
+_GEOMETRY_FIELDS = frozenset({
+    "package_x", "package_y", "package_w", "package_h",
+    "pocket_x", "pocket_y", "pocket_w", "pocket_h",
+})
+
+# (station, params key) -> (config signatures, plan); TOP and BOTTOM share a
+# station, so each parameter set keeps its own entry
+_PLAN_CACHE_SIZE = 8
+_plan_cache: Dict[Tuple[str, tuple], Tuple[tuple, InspectionPlan]] = {}
+
+
+def _params_key(params):
+    return tuple(
+        (name, repr(value)) for name, value in vars(params).items()
+        if name not in _GEOMETRY_FIELDS
+    )
+
+
+def get_inspection_plan(params, station):
+    """
+    Return the compiled plan for params/station, compiling it only when needed.
+
+    The plan is rebuilt when the inspection parameters change or when one of
+    device_inspection.json, pocket_params.json, device_location_setting.json or
+    mark_inspection.json changes on disk. Otherwise this is a dictionary lookup
+    plus one stat() per config file.
+    """
+    key = (station, _params_key(params))
+    signatures = _config_signatures()
+    with _config_lock:
+        cached = _plan_cache.get(key)
+    if cached is not None and cached[0] == signatures:
+        return cached[1]
+
+    device_thresholds = load_cached_config(DEVICE_INSPECTION_FILE, load_device_thresholds)
+    pocket_params = load_cached_config(POCKET_PARAMS_FILE, load_pocket_params)
+    dev_loc_settings = None
+    mark_config = None
+    if params.flags.get("enable_package_location", False):
+        dev_loc_settings = load_cached_config(DEVICE_LOCATION_FILE, load_device_location_setting)
+        mark_config = load_cached_config(MARK_INSPECTION_FILE, load_mark_inspection_config)
+
+    plan = compile_inspection_plan(
+        params, station,
+        device_thresholds=device_thresholds,
+        pocket_params=pocket_params,
+        dev_loc_settings=dev_loc_settings,
+        mark_config=mark_config,
+    )
+    with _config_lock:
+        _plan_cache.pop(key, None)
+        _plan_cache[key] = (signatures, plan)
+        while len(_plan_cache) > _PLAN_CACHE_SIZE:
+            del _plan_cache[next(iter(_plan_cache))]
+    return plan
+
+
+# -------------------------------------------------
+# Work window
+# -------------------------------------------------
+
+# Margin around the inspected ROIs (edge searches, offsets, chamfers)
+WORK_WINDOW_MARGIN = 64
+
+
+def _pocket_int(pocket_params, key, default):
+    # Same parsing as imaging.pocket_location: 255 = not configured
+    try:
+        value = int(pocket_params.get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return default if value == 255 else value
+
+
+def get_work_window(plan, params, frame_shape, margin=WORK_WINDOW_MARGIN):
+    """
+    Region (x, y, w, h) of the frame the plan's checks read, or None for the
+    whole frame.
+
+    Union of the package ROI (mark inspection runs inside it) and, on FEED,
+    the pocket search window (taught pocket + shift tolerance + outer stain
+    bands), padded by margin. FEED package auto-detection scans the whole
+    frame, so it gets no window unless it is limited to a search window
+    around the taught package (pkg_search_window).
+    """
+    frame_h, frame_w = frame_shape[:2]
+    rects = []
+    if plan.station == STATION_FEED and not plan.dev_loc_settings.get("teach_pos", False) \
+            and any(check.key == "package_location" for check in plan.checks):
+        search = package_search_rect(
+            plan.dev_loc_settings, (params.package_x, params.package_y, params.package_w, params.package_h),
+            frame_shape
+        )
+        if search is None:
+            return None
+        # The location recheck reads 20% of the package size around the result
+        pad = int(max(search[2], search[3]) * 0.2)
+        rects.append((search[0] - pad, search[1] - pad, search[0] + search[2] + pad, search[1] + search[3] + pad))
+
+    if params.package_w > 0 and params.package_h > 0:
+        rects.append((params.package_x, params.package_y,
+                      params.package_x + params.package_w, params.package_y + params.package_h))
+    if plan.station == STATION_FEED and params.pocket_w > 0 and params.pocket_h > 0:
+        pp = plan.pocket_params
+        band = max(
+            _pocket_int(pp, f"inspect_width_{side}", 0) + _pocket_int(pp, f"inspect_offset_{side}", 0)
+            for side in ("left", "top", "right", "bottom")
+        )
+        rects.append((
+            params.pocket_x - _pocket_int(pp, "pocket_shift_x_neg", 50) - band,
+            params.pocket_y - _pocket_int(pp, "pocket_shift_y_neg", 50) - band,
+            params.pocket_x + params.pocket_w + _pocket_int(pp, "pocket_shift_x_pos", 50) + band,
+            params.pocket_y + params.pocket_h + _pocket_int(pp, "pocket_shift_y_pos", 50) + band,
+        ))
+    if not rects:
+        return None
+
+    x1 = max(0, min(r[0] for r in rects) - margin)
+    y1 = max(0, min(r[1] for r in rects) - margin)
+    x2 = min(frame_w, max(r[2] for r in rects) + margin)
+    y2 = min(frame_h, max(r[3] for r in rects) + margin)
+    if x2 <= x1 or y2 <= y1 or (x2 - x1) * (y2 - y1) >= frame_w * frame_h:
+        return None
+    return (x1, y1, x2 - x1, y2 - y1)
@@ -1,5 +1,9 @@
 import cv2
 from config.debug_runtime import resolve_debug
+from tests.inspection_context import crop_gradient
+from tests.subpixel_edges import (
+    crossing_offset, fit_line_robust, profile_gradient, scan_edge_points, select_edges, white_extents,
+)
 import numpy as np
 
 def _binary_from_edge_contrast(gray, edge_contrast, debug=False):
@@ -27,18 +31,65 @@ def _binary_from_edge_contrast(gray, edge_contrast, debug=False):
     chosen = cv2.morphologyEx(chosen, cv2.MORPH_CLOSE, kernel, iterations=1)
     return chosen
 
-def _measure_band_thickness_top_bottom(gray, edge_contrast=106, num_scans=60, debug=False):
+def _edge_binary_prep(edge_contrast, debug=False):
+    """crop_gradient preprocessing: the _binary_from_edge_contrast binary (shared by band thickness and gap)."""
+    return ("edge_binary", int(edge_contrast)), lambda gray: _binary_from_edge_contrast(gray, edge_contrast, debug)
+
+def _body_binary_prep(threshold):
+    """crop_gradient preprocessing: body threshold, lightly blurred (body width / length edges)."""
+    def binarize(gray):
+        _, binary = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
+        return cv2.GaussianBlur(binary, (5, 5), 1.0)
+    return ("body_binary", int(threshold)), binarize
+
+def _peak_pair_distance(grad, lo, hi, rising_first=False, from_bottom=False):
+    """
+    Peak pairing for every column of a gradient block at once.
+
+    Peaks are gradient values > 5 (rising) / < -5 (falling). Each falling peak is paired
+    with the next rising peak below it (rising_first: rising with the next falling) and
+    the first pair, top-down, whose distance is in [lo, hi] wins. With from_bottom each
+    rising peak is paired with the nearest falling peak above it and the last valid pair
+    wins. Returns the winning distance per column, -1 where no pair is valid.
+    """
+    length, cols = grad.shape
+    if length == 0:
+        return np.full(cols, -1)
+    rising = grad > 5
+    falling = grad < -5
+    rows = np.arange(length)[:, None]
+    if from_bottom:
+        # Nearest falling peak strictly above each row
+        above = np.maximum.accumulate(np.where(falling, rows, -1), axis=0)
+        partner = np.vstack((np.full((1, cols), -1), above[:-1]))
+        dist = rows - partner
+        valid = rising & (partner >= 0) & (dist >= lo) & (dist <= hi)
+        pick = length - 1 - np.argmax(valid[::-1], axis=0)
+    else:
+        start, end = (rising, falling) if rising_first else (falling, rising)
+        # Next end peak strictly below each row
+        below = np.minimum.accumulate(np.where(end, rows, length)[::-1], axis=0)[::-1]
+        partner = np.vstack((below[1:], np.full((1, cols), length)))
+        dist = partner - rows
+        valid = start & (partner < length) & (dist >= lo) & (dist <= hi)
+        pick = np.argmax(valid, axis=0)
+    return np.where(valid.any(axis=0), dist[pick, np.arange(cols)], -1)
+
+
+def _measure_band_thickness_top_bottom(gray, edge_contrast=106, num_scans=60, debug=False, context=None, roi=None):
     debug = resolve_debug(debug)
     """
     Estimate thickness of top and bottom body bands between terminal inner edge and central body area.
+    gray is the crop at roi; with the inspection context its binary gradient is shared
+    with measure_term_to_body_gap.
     Returns (top_thickness, bottom_thickness) in pixels, or (None, None) if failed.
     """
     h, w = gray.shape[:2]
     if h == 0 or w == 0:
         return None, None
 
-    binary = _binary_from_edge_contrast(gray, edge_contrast, debug)
-    sobel_y = cv2.Sobel(binary, cv2.CV_64F, 0, 1, ksize=3)
+    sobel_y = crop_gradient(context if roi is not None else None, gray, roi, 0, 1,
+                            _edge_binary_prep(edge_contrast, debug))
 
     # Regions: top 35%, bottom 35%
     top_h = int(h * 0.35)
@@ -47,125 +98,90 @@ def _measure_band_thickness_top_bottom(gray, edge_contrast=106, num_scans=60, de
     bot_region = sobel_y[h - bot_h:h, :]
 
     skip = max(1, w // max(10, num_scans))
-
-    def thickness_in_region(grad_region, offset_y, is_top=True):
-        vals = []
-        for col in range(0, grad_region.shape[1], skip):
-            col_data = grad_region[:, col]
-            # Find candidate edges by prominence
-            # For top: terminal inner edge tends to be a negative peak first, central body edge positive after
-            # For bottom: polarity can flip; try both orders and pick plausible distances
-            peaks_pos = np.argwhere(col_data > 5).flatten()
-            peaks_neg = np.argwhere(col_data < -5).flatten()
-            best = None
-            if is_top:
-                for n in peaks_neg:
-                    # find next positive after n
-                    p_after = peaks_pos[peaks_pos > n]
-                    if p_after.size:
-                        dist = int(p_after[0] - n)
-                        if 4 <= dist <= int(h * 0.5):
-                            best = dist
-                            break
-            else:
-                # bottom: try positive then negative after
-                for p in peaks_pos[::-1]:  # start from bottom side by reversing
-                    n_before = peaks_neg[peaks_neg < p]
-                    if n_before.size:
-                        dist = int(p - n_before[-1])
-                        if 4 <= dist <= int(h * 0.5):
-                            best = dist
-                            break
-                # fallback: try negative then positive
-                if best is None:
-                    for n in peaks_neg:
-                        p_after = peaks_pos[peaks_pos > n]
-                        if p_after.size:
-                            dist = int(p_after[0] - n)
-                            if 4 <= dist <= int(h * 0.5):
-                                best = dist
-                                break
-            if best is not None:
-                vals.append(best)
-        if not vals:
+    max_dist = int(h * 0.5)
+
+    def thickness_in_region(grad_region, is_top=True):
+        # All sampled columns at once
+        cols = grad_region[:, ::skip]
+        # For top: terminal inner edge tends to be a negative peak first, central body edge positive after
+        # For bottom: polarity can flip; pair each positive peak with the negative before it, from the
+        # bottom side, falling back to negative then positive
+        if is_top:
+            vals = _peak_pair_distance(cols, 4, max_dist)
+        else:
+            vals = _peak_pair_distance(cols, 4, max_dist, from_bottom=True)
+            missing = vals < 0
+            if missing.any():
+                vals[missing] = _peak_pair_distance(cols[:, missing], 4, max_dist)
+        vals = vals[vals >= 0]
+        if not vals.size:
             return None
         # use median for robustness
         return float(np.median(vals))
 
-    top_t = thickness_in_region(top_region, 0, is_top=True)
-    bot_t = thickness_in_region(bot_region, h - bot_h, is_top=False)
+    top_t = thickness_in_region(top_region, is_top=True)
+    bot_t = thickness_in_region(bot_region, is_top=False)
     if debug:
         print(f"[DEBUG] Band thickness top={top_t}, bottom={bot_t}")
     return top_t, bot_t
 
-def measure_body_to_term_width(image, roi, edge_contrast=106, num_scans=60, debug=False):
+def measure_body_to_term_width(image, roi, edge_contrast=106, num_scans=60, debug=False, context=None):
     debug = resolve_debug(debug)
     """
     Measure the thickness of the body bands adjacent to terminals (top and bottom).
     Returns dict: { 'top': value(px) or None, 'bottom': value(px) or None }
     """
-    # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
-    
     x, y, w, h = roi
-    crop = image[y:y+h, x:x+w].copy()
-    if crop.size == 0:
-        return {'top': None, 'bottom': None}
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-    top_t, bot_t = _measure_band_thickness_top_bottom(gray, edge_contrast, num_scans, debug)
+    if context is not None:
+        gray = context.gray_crop(roi)
+        if gray.size == 0:
+            return {'top': None, 'bottom': None}
+    else:
+        # CRITICAL: Create independent copy to prevent memory corruption
+        image = np.copy(image)
+        crop = image[y:y+h, x:x+w].copy()
+        if crop.size == 0:
+            return {'top': None, 'bottom': None}
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    top_t, bot_t = _measure_band_thickness_top_bottom(gray, edge_contrast, num_scans, debug, context, roi)
     return {'top': top_t, 'bottom': bot_t}
 
-def measure_term_to_body_gap(image, roi, edge_contrast=106, num_scans=60, debug=False):
+def measure_term_to_body_gap(image, roi, edge_contrast=106, num_scans=60, debug=False, context=None):
     debug = resolve_debug(debug)
     """
     Measure the minimum gap between terminal inner edge and body area (top and bottom),
     returning the worst-case (minimum) gap in pixels.
     """
-    # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
-    
     x, y, w, h = roi
-    crop = image[y:y+h, x:x+w].copy()
-    if crop.size == 0:
-        return None
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-    binary = _binary_from_edge_contrast(gray, edge_contrast, debug)
-    sobel_y = cv2.Sobel(binary, cv2.CV_64F, 0, 1, ksize=3)
+    if context is not None:
+        gray = context.gray_crop(roi)
+        if gray.size == 0:
+            return None
+    else:
+        # CRITICAL: Create independent copy to prevent memory corruption
+        image = np.copy(image)
+        crop = image[y:y+h, x:x+w].copy()
+        if crop.size == 0:
+            return None
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    sobel_y = crop_gradient(context, gray, roi, 0, 1, _edge_binary_prep(edge_contrast, debug))
 
     top_h = int(h * 0.35)
     bot_h = int(h * 0.35)
     top_region = sobel_y[0:top_h, :]
     bot_region = sobel_y[h - bot_h:h, :]
     skip = max(1, w // max(20, num_scans))
+    max_dist = int(h * 0.5)
 
     def min_gap_region(grad_region, is_top=True):
-        gaps = []
-        for col in range(0, grad_region.shape[1], skip):
-            col_data = grad_region[:, col]
-            peaks_pos = np.argwhere(col_data > 5).flatten()
-            peaks_neg = np.argwhere(col_data < -5).flatten()
-            # Try both polarities; take smaller plausible gap
-            best = None
-            # negative then positive
-            for n in peaks_neg:
-                p_after = peaks_pos[peaks_pos > n]
-                if p_after.size:
-                    dist = int(p_after[0] - n)
-                    if 2 <= dist <= int(h * 0.5):
-                        best = dist
-                        break
-            # positive then negative
-            if best is None:
-                for p in peaks_pos:
-                    n_after = peaks_neg[peaks_neg > p]
-                    if n_after.size:
-                        dist = int(n_after[0] - p)
-                        if 2 <= dist <= int(h * 0.5):
-                            best = dist
-                            break
-            if best is not None:
-                gaps.append(best)
-        if not gaps:
+        # All sampled columns at once; negative then positive, falling back to positive then negative
+        cols = grad_region[:, ::skip]
+        gaps = _peak_pair_distance(cols, 2, max_dist)
+        missing = gaps < 0
+        if missing.any():
+            gaps[missing] = _peak_pair_distance(cols[:, missing], 2, max_dist, rising_first=True)
+        gaps = gaps[gaps >= 0]
+        if not gaps.size:
             return None
         return int(np.min(gaps))
 
@@ -179,7 +195,7 @@ def measure_term_to_body_gap(image, roi, edge_contrast=106, num_scans=60, debug=
         return None
     return int(min(candidates))
 
-def measure_body_width(image, roi, body_contrast=75, debug=False):
+def measure_body_width(image, roi, body_contrast=75, debug=False, context=None, quality=None):
     debug = resolve_debug(debug)
     """
     Measure body width using edge scanning method similar to old system.
@@ -190,9 +206,12 @@ def measure_body_width(image, roi, body_contrast=75, debug=False):
         roi: Package ROI (x, y, w, h)
         body_contrast: Threshold for binarization (default 75)
         debug: If True, print debug information
+        context: Optional InspectionContext supplying the shared gray plane
+        quality: Optional dict; receives "edge_rms", the worse residual RMS (px) of the
+            two edge line fits, so a noisy edge can be flagged
         
     Returns:
-        Body width in pixels (distance between top and bottom edges), or None if failed
+        Body width in pixels (sub-pixel, 2 decimals) (distance between top and bottom edges), or None if failed
     """
     x, y, w, h = roi
     
@@ -204,17 +223,21 @@ def measure_body_width(image, roi, body_contrast=75, debug=False):
         full_roi_mean_before = cv2.mean(full_roi_before)[0]
         print(f"[DEBUG] Body Width: Input ROI BGR mean (BEFORE copy)={full_roi_mean_before:.1f}")
     
-    # CRITICAL: Create independent copy to prevent any memory corruption from QImage or other sources
-    image = np.copy(image)
-    
-    if debug:
-        # Verify copy worked
-        print(f"[DEBUG] Body Width: Copied image id={id(image)}, shape={image.shape}")
-        full_roi_after = image[y:y+h, x:x+w]
-        full_roi_mean_after = cv2.mean(full_roi_after)[0]
-        print(f"[DEBUG] Body Width: Input ROI BGR mean (AFTER copy)={full_roi_mean_after:.1f}")
-    
-    crop = image[y:y+h, x:x+w].copy()
+    if context is not None:
+        # Shared per-frame gray plane; the context frame is already a private snapshot
+        crop = context.gray_crop(roi)
+    else:
+        # CRITICAL: Create independent copy to prevent any memory corruption from QImage or other sources
+        image = np.copy(image)
+        
+        if debug:
+            # Verify copy worked
+            print(f"[DEBUG] Body Width: Copied image id={id(image)}, shape={image.shape}")
+            full_roi_after = image[y:y+h, x:x+w]
+            full_roi_mean_after = cv2.mean(full_roi_after)[0]
+            print(f"[DEBUG] Body Width: Input ROI BGR mean (AFTER copy)={full_roi_mean_after:.1f}")
+        
+        crop = image[y:y+h, x:x+w].copy()
 
     if crop.size == 0:
         if debug:
@@ -222,7 +245,7 @@ def measure_body_width(image, roi, body_contrast=75, debug=False):
         return None
 
     # Convert to grayscale
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    gray = crop if context is not None else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
     
     if debug:
         gray_mean = np.mean(gray)
@@ -255,60 +278,42 @@ def measure_body_width(image, roi, body_contrast=75, debug=False):
         print(f"[DEBUG] Body Width: Region means - top={top_mean:.1f}, bottom={bottom_mean:.1f}")
         print(f"[DEBUG] Body Width: Adaptive thresholds - top={top_threshold}, bottom={bottom_threshold}")
     
-    # Binarize both regions with adaptive thresholds
-    _, top_binary = cv2.threshold(top_region, top_threshold, 255, cv2.THRESH_BINARY)
-    _, bottom_binary = cv2.threshold(bottom_region, bottom_threshold, 255, cv2.THRESH_BINARY)
-    
     if debug:
-        top_white_pct = (np.sum(top_binary == 255) / top_binary.size) * 100
-        bottom_white_pct = (np.sum(bottom_binary == 255) / bottom_binary.size) * 100
+        top_white_pct = (np.sum(top_region > top_threshold) / top_region.size) * 100
+        bottom_white_pct = (np.sum(bottom_region > bottom_threshold) / bottom_region.size) * 100
         print(f"[DEBUG] Body Width: Binary white% - top={top_white_pct:.1f}, bottom={bottom_white_pct:.1f}")
     
-    # Apply Gaussian smoothing (similar to binomial filter)
-    top_binary = cv2.GaussianBlur(top_binary, (5, 5), 1.0)
-    bottom_binary = cv2.GaussianBlur(bottom_binary, (5, 5), 1.0)
-    
-    # Detect edges using Sobel gradient
-    top_edges = cv2.Sobel(top_binary, cv2.CV_64F, 0, 1, ksize=3)  # Vertical gradient
-    bottom_edges = cv2.Sobel(bottom_binary, cv2.CV_64F, 0, 1, ksize=3)
-    
-    # Find edge points by scanning columns
-    top_edge_points = []
-    bottom_edge_points = []
-    
-    skip_factor = max(1, w // 30)  # Scan ~30 columns for better sampling
-    
-    def collect_edge_points(top_sign="neg", bottom_sign="pos", threshold=5):
-        """Collect edge points with configurable gradient directions."""
-        top_pts = []
-        bottom_pts = []
-
-        for col in range(0, top_region.shape[1], skip_factor):
-            column_data = top_edges[:, col]
-            edge_idx = np.argmin(column_data) if top_sign == "neg" else np.argmax(column_data)
-            grad_val = column_data[edge_idx]
-            if (top_sign == "neg" and grad_val < -threshold) or (top_sign == "pos" and grad_val > threshold):
-                top_pts.append([col, edge_idx])
-
-        for col in range(0, bottom_region.shape[1], skip_factor):
-            column_data = bottom_edges[:, col]
-            edge_idx = np.argmax(column_data) if bottom_sign == "pos" else np.argmin(column_data)
-            grad_val = column_data[edge_idx]
-            if (bottom_sign == "pos" and grad_val > threshold) or (bottom_sign == "neg" and grad_val < -threshold):
-                bottom_pts.append([col, edge_idx + (h - bottom_region_height)])
-
-        return top_pts, bottom_pts
+    # Vertical gradient of the binarized, smoothed (similar to binomial filter) regions and of
+    # the gray profile, CV_16S from the shared per-frame gradient cache
+    top_roi = (x, y, w, top_region_height)
+    bottom_roi = (x, y + h - bottom_region_height, w, bottom_region_height)
+    top_edges = crop_gradient(context, top_region, top_roi, 0, 1, _body_binary_prep(top_threshold))
+    bottom_edges = crop_gradient(context, bottom_region, bottom_roi, 0, 1, _body_binary_prep(bottom_threshold))
+    profile = profile_gradient(crop_gradient(context, gray, roi, 0, 1))
+    top_profile = profile[0:top_region_height, :]
+    bottom_profile = profile[h - bottom_region_height:h, :]
+    
+    # Find edge points on every column, both polarities in one pass, refined to sub-pixel on the gray profile
+    top_rising, top_falling = scan_edge_points(top_edges, axis=0, profile=top_profile)
+    bottom_rising, bottom_falling = scan_edge_points(bottom_edges, axis=0, offset=h - bottom_region_height,
+                                                     profile=bottom_profile)
+
+    # A polarity needs edges on >= 10% of the scan lines (3 of the ~30 lines sampled by the old
+    # scanner); a fixed count would let a few corner / noise hits win on dense scans
+    min_points = max(3, w // 10)
 
     # Primary attempt: bright background → dark body at top, dark body → bright background at bottom
-    top_edge_points, bottom_edge_points = collect_edge_points("neg", "pos", threshold=5)
+    top_edge_points = select_edges(top_falling, 5)
+    bottom_edge_points = select_edges(bottom_rising, 5)
 
     # Fallback: try opposite gradient polarity with an even lower threshold
-    if len(top_edge_points) < 3 or len(bottom_edge_points) < 3:
-        alt_top, alt_bottom = collect_edge_points("pos", "neg", threshold=3)
+    if len(top_edge_points) < min_points or len(bottom_edge_points) < min_points:
+        alt_top = select_edges(top_rising, 3)
+        alt_bottom = select_edges(bottom_falling, 3)
         if debug:
             print(f"[DEBUG] Fallback polarity used: top={len(alt_top)} bottom={len(alt_bottom)}")
-        top_edge_points = top_edge_points if len(top_edge_points) >= 3 else alt_top
-        bottom_edge_points = bottom_edge_points if len(bottom_edge_points) >= 3 else alt_bottom
+        top_edge_points = top_edge_points if len(top_edge_points) >= min_points else alt_top
+        bottom_edge_points = bottom_edge_points if len(bottom_edge_points) >= min_points else alt_bottom
 
     if debug:
         print(f"[DEBUG] Edge points: top={len(top_edge_points)}, bottom={len(bottom_edge_points)}")
@@ -318,25 +323,19 @@ def measure_body_width(image, roi, body_contrast=75, debug=False):
             print(f"[WARN] Insufficient edge points: top={len(top_edge_points)}, bottom={len(bottom_edge_points)}")
         return None
     
-    # Convert to numpy arrays
-    top_edge_points = np.array(top_edge_points)
-    bottom_edge_points = np.array(bottom_edge_points)
+    # Robust line fits (outliers rejected, fixed cost)
+    top_fit = fit_line_robust(top_edge_points)
+    bottom_fit = fit_line_robust(bottom_edge_points)
     
-    # Fit lines and remove outliers iteratively (5 iterations with decreasing tolerance)
-    top_edge_points = _fit_line_with_outlier_removal(top_edge_points, iterations=5, initial_tolerance=15)
-    bottom_edge_points = _fit_line_with_outlier_removal(bottom_edge_points, iterations=5, initial_tolerance=15)
-    
-    if len(top_edge_points) < 2 or len(bottom_edge_points) < 2:
+    if top_fit is None or bottom_fit is None:
         if debug:
-            print(f"[WARN] Too few points after outlier removal")
+            print(f"[WARN] Edge line fit failed")
         return None
     
-    # Final line fitting
-    top_line = _fit_line(top_edge_points)
-    bottom_line = _fit_line(bottom_edge_points)
-    
-    if top_line is None or bottom_line is None:
-        return None
+    top_line = top_fit.line
+    bottom_line = bottom_fit.line
+    if quality is not None:
+        quality["edge_rms"] = round(max(top_fit.rms, bottom_fit.rms), 3)
     
     # Calculate vertical distance between lines at center of image
     center_x = w / 2
@@ -346,15 +345,16 @@ def measure_body_width(image, roi, body_contrast=75, debug=False):
     body_width = abs(bottom_y - top_y)
     
     if debug:
-        print(f"[DEBUG] Top edge points: {len(top_edge_points)}, Bottom edge points: {len(bottom_edge_points)}")
+        print(f"[DEBUG] Top edge inliers: {int(top_fit.inliers.sum())}/{len(top_edge_points)}, RMS={top_fit.rms:.3f}")
+        print(f"[DEBUG] Bottom edge inliers: {int(bottom_fit.inliers.sum())}/{len(bottom_edge_points)}, RMS={bottom_fit.rms:.3f}")
         print(f"[DEBUG] Top line: y = {top_line[0]:.3f}x + {top_line[1]:.3f}")
         print(f"[DEBUG] Bottom line: y = {bottom_line[0]:.3f}x + {bottom_line[1]:.3f}")
-        print(f"[DEBUG] Body width at center: {body_width:.1f} pixels")
+        print(f"[DEBUG] Body width at center: {body_width:.2f} pixels")
     
-    return int(round(body_width))
+    return round(float(body_width), 2)
 
 
-def measure_body_length(image, roi, body_contrast=75, debug=False):
+def measure_body_length(image, roi, body_contrast=75, debug=False, context=None, quality=None):
     debug = resolve_debug(debug)
     """
     Measure body length (left-to-right) using edge scanning.
@@ -365,20 +365,25 @@ def measure_body_length(image, roi, body_contrast=75, debug=False):
         roi: Package ROI (x, y, w, h)
         body_contrast: Threshold for binarization (default 75)
         debug: If True, print debug information
+        context: Optional InspectionContext supplying the shared gray plane
+        quality: Optional dict; receives "edge_rms", the worse residual RMS (px) of the
+            two edge line fits, so a noisy edge can be flagged
 
     Returns:
-        Body length in pixels (distance between left and right edges), or None if failed
+        Body length in pixels (sub-pixel, 2 decimals) (distance between left and right edges), or None if failed
     """
-    # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
-    
     x, y, w, h = roi
-    crop = image[y:y+h, x:x+w].copy()
+    if context is not None:
+        crop = context.gray_crop(roi)
+    else:
+        # CRITICAL: Create independent copy to prevent memory corruption
+        image = np.copy(image)
+        crop = image[y:y+h, x:x+w].copy()
 
     if crop.size == 0:
         return None
 
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    gray = crop if context is not None else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
 
     if debug:
         print(f"[DEBUG] Body Length: ROI=({x}, {y}, {w}, {h})")
@@ -391,8 +396,10 @@ def measure_body_length(image, roi, body_contrast=75, debug=False):
     left_region_width = int(w * 0.5)  # 50% from center toward left
     right_region_width = int(w * 0.5)  # 50% from center toward right
 
-    left_region = gray[:, max(0, center_x - left_region_width):center_x]
-    right_region = gray[:, center_x:min(w, center_x + right_region_width)]
+    left_start = max(0, center_x - left_region_width)
+    right_end = min(w, center_x + right_region_width)
+    left_region = gray[:, left_start:center_x]
+    right_region = gray[:, center_x:right_end]
 
     if left_region.size == 0 or right_region.size == 0:
         return None
@@ -411,193 +418,86 @@ def measure_body_length(image, roi, body_contrast=75, debug=False):
         print(f"[DEBUG] Body Length: left_mean={left_mean:.1f}, right_mean={right_mean:.1f}")
         print(f"[DEBUG] Body Length: left_threshold={left_threshold}, right_threshold={right_threshold}")
 
-    # Binarize both regions
-    _, left_binary = cv2.threshold(left_region, left_threshold, 255, cv2.THRESH_BINARY)
-    _, right_binary = cv2.threshold(right_region, right_threshold, 255, cv2.THRESH_BINARY)
-    
     if debug:
-        left_white_pct = (np.sum(left_binary == 255) / left_binary.size) * 100
-        right_white_pct = (np.sum(right_binary == 255) / right_binary.size) * 100
+        left_white_pct = (np.sum(left_region > left_threshold) / left_region.size) * 100
+        right_white_pct = (np.sum(right_region > right_threshold) / right_region.size) * 100
         print(f"[DEBUG] Body Length: Binary left white%={left_white_pct:.1f}, right white%={right_white_pct:.1f}")
 
-    # Smooth
-    left_binary = cv2.GaussianBlur(left_binary, (5, 5), 1.0)
-    right_binary = cv2.GaussianBlur(right_binary, (5, 5), 1.0)
-
-    # Horizontal gradient (dx)
-    left_edges = cv2.Sobel(left_binary, cv2.CV_64F, 1, 0, ksize=3)
-    right_edges = cv2.Sobel(right_binary, cv2.CV_64F, 1, 0, ksize=3)
-
-    left_edge_points = []
-    right_edge_points = []
-
-    skip_factor = max(1, h // 30)  # sample ~30 rows
-
-    def collect_edge_points(left_sign="pos", right_sign="neg", threshold=5):
-        lpts = []
-        rpts = []
-
-        # iterate rows
-        for row in range(0, left_region.shape[0], skip_factor):
-            row_data = left_edges[row, :]
-            edge_idx = int(np.argmax(row_data)) if left_sign == "pos" else int(np.argmin(row_data))
-            grad_val = row_data[edge_idx]
-            if (left_sign == "pos" and grad_val > threshold) or (left_sign == "neg" and grad_val < -threshold):
-                lpts.append([edge_idx, row])
+    # Horizontal gradient (dx) of the binarized, smoothed regions and of the gray profile,
+    # CV_16S from the shared per-frame gradient cache
+    left_roi = (x + left_start, y, center_x - left_start, h)
+    right_roi = (x + center_x, y, right_end - center_x, h)
+    left_edges = crop_gradient(context, left_region, left_roi, 1, 0, _body_binary_prep(left_threshold))
+    right_edges = crop_gradient(context, right_region, right_roi, 1, 0, _body_binary_prep(right_threshold))
+    profile = profile_gradient(crop_gradient(context, gray, roi, 1, 0))
+    left_profile = profile[:, left_start:center_x]
+    right_profile = profile[:, center_x:right_end]
 
-        for row in range(0, right_region.shape[0], skip_factor):
-            row_data = right_edges[row, :]
-            edge_idx = int(np.argmin(row_data)) if right_sign == "neg" else int(np.argmax(row_data))
-            grad_val = row_data[edge_idx]
-            if (right_sign == "neg" and grad_val < -threshold) or (right_sign == "pos" and grad_val > threshold):
-                rpts.append([edge_idx + (w - right_region_width), row])
+    # Edge points on every row, both polarities in one pass, refined to sub-pixel on the gray profile
+    left_rising, left_falling = scan_edge_points(left_edges, axis=1, profile=left_profile)
+    right_rising, right_falling = scan_edge_points(right_edges, axis=1, offset=w - right_region_width,
+                                                   profile=right_profile)
 
-        return lpts, rpts
+    # A polarity needs edges on >= 10% of the rows (see measure_body_width)
+    min_points = max(3, h // 10)
 
     # Primary polarity: rising edge on left, falling edge on right
-    left_edge_points, right_edge_points = collect_edge_points("pos", "neg", threshold=5)
+    left_edge_points = select_edges(left_rising, 5)
+    right_edge_points = select_edges(right_falling, 5)
 
     # Fallback polarity
-    if len(left_edge_points) < 3 or len(right_edge_points) < 3:
-        alt_left, alt_right = collect_edge_points("neg", "pos", threshold=3)
+    if len(left_edge_points) < min_points or len(right_edge_points) < min_points:
+        alt_left = select_edges(left_falling, 3)
+        alt_right = select_edges(right_rising, 3)
         if debug:
             print(f"[DEBUG] Length fallback polarity used: left={len(alt_left)} right={len(alt_right)}")
-        left_edge_points = left_edge_points if len(left_edge_points) >= 3 else alt_left
-        right_edge_points = right_edge_points if len(right_edge_points) >= 3 else alt_right
+        left_edge_points = left_edge_points if len(left_edge_points) >= min_points else alt_left
+        right_edge_points = right_edge_points if len(right_edge_points) >= min_points else alt_right
 
     if debug:
         print(f"[DEBUG] Length edge points: left={len(left_edge_points)}, right={len(right_edge_points)}")
         if len(left_edge_points) > 0:
-            print(f"[DEBUG] Left edge sample points (first 5): {left_edge_points[:5]}")
+            print(f"[DEBUG] Left edge sample points (first 5): {left_edge_points[:5].tolist()}")
         if len(right_edge_points) > 0:
-            print(f"[DEBUG] Right edge sample points (first 5): {right_edge_points[:5]}")
+            print(f"[DEBUG] Right edge sample points (first 5): {right_edge_points[:5].tolist()}")
 
     if len(left_edge_points) < 3 or len(right_edge_points) < 3:
         return None
 
-    left_edge_points = np.array(left_edge_points)
-    right_edge_points = np.array(right_edge_points)
-
-    if debug:
-        print(f"[DEBUG] Before outlier removal: left={len(left_edge_points)}, right={len(right_edge_points)}")
-
-    # Fit lines with outlier removal
-    left_edge_points = _fit_line_with_outlier_removal(left_edge_points, iterations=5, initial_tolerance=15)
-    right_edge_points = _fit_line_with_outlier_removal(right_edge_points, iterations=5, initial_tolerance=15)
+    # Robust line fits. The edges are near-vertical, so lines are fitted as x(y) on
+    # [y, x] points (a y(x) fit is ill-conditioned and rejects points erratically)
+    left_fit = fit_line_robust(left_edge_points[:, ::-1])
+    right_fit = fit_line_robust(right_edge_points[:, ::-1])
 
-    if debug:
-        print(f"[DEBUG] After outlier removal: left={len(left_edge_points)}, right={len(right_edge_points)}")
-        if len(left_edge_points) > 0:
-            print(f"[DEBUG] Left points after cleanup (first 5): {left_edge_points[:5].tolist()}")
-        if len(right_edge_points) > 0:
-            print(f"[DEBUG] Right points after cleanup (first 5): {right_edge_points[:5].tolist()}")
-
-    if len(left_edge_points) < 2 or len(right_edge_points) < 2:
+    if left_fit is None or right_fit is None:
         return None
 
-    left_line = _fit_line(left_edge_points)   # returns [slope, intercept] for y(x)
-    right_line = _fit_line(right_edge_points)
+    if debug:
+        print(f"[DEBUG] Line fit inliers: left={int(left_fit.inliers.sum())}/{len(left_edge_points)}, "
+              f"right={int(right_fit.inliers.sum())}/{len(right_edge_points)}")
+        print(f"[DEBUG] Line fit RMS: left={left_fit.rms:.3f}, right={right_fit.rms:.3f}")
 
-    if left_line is None or right_line is None:
-        return None
+    left_line = left_fit.line   # [slope, intercept] for x(y)
+    right_line = right_fit.line
+    if quality is not None:
+        quality["edge_rms"] = round(max(left_fit.rms, right_fit.rms), 3)
 
-    # Compute x at center_y using inverse of y(x): x = (y - intercept) / slope
+    # Compute x at center_y
     center_y = h / 2
-    left_slope, left_intercept = left_line
-    right_slope, right_intercept = right_line
-
-    # Guard against near-zero slopes to avoid division errors
-    eps = 1e-6
-    if abs(left_slope) < eps or abs(right_slope) < eps:
-        return None
-
-    left_x = (center_y - left_intercept) / left_slope
-    right_x = (center_y - right_intercept) / right_slope
+    left_x = left_line[0] * center_y + left_line[1]
+    right_x = right_line[0] * center_y + right_line[1]
 
     body_length = abs(right_x - left_x)
 
     if debug:
         print(f"[DEBUG] Left line: x = {left_line[0]:.3f}y + {left_line[1]:.3f}")
         print(f"[DEBUG] Right line: x = {right_line[0]:.3f}y + {right_line[1]:.3f}")
-        print(f"[DEBUG] Body length at center: {body_length:.1f} pixels")
-
-    return int(round(body_length))
+        print(f"[DEBUG] Body length at center: {body_length:.2f} pixels")
 
-
-def _fit_line(points):
-    """
-    Fit a line to points using least squares.
-    
-    Args:
-        points: Nx2 array of [x, y] coordinates
-        
-    Returns:
-        [slope, intercept] or None if fitting fails
-    """
-    if len(points) < 2:
-        return None
-    
-    x = points[:, 0].reshape(-1, 1)
-    y = points[:, 1]
-    
-    # Use linear regression: y = slope * x + intercept
-    x_mean = np.mean(x)
-    y_mean = np.mean(y)
-    
-    numerator = np.sum((x.flatten() - x_mean) * (y - y_mean))
-    denominator = np.sum((x.flatten() - x_mean) ** 2)
-    
-    if denominator == 0:
-        return None
-    
-    slope = numerator / denominator
-    intercept = y_mean - slope * x_mean
-    
-    return [slope, intercept]
+    return round(float(body_length), 2)
 
 
-def _fit_line_with_outlier_removal(points, iterations=5, initial_tolerance=15):
-    """
-    Iteratively fit line and remove outliers.
-    
-    Args:
-        points: Nx2 array of [x, y] coordinates
-        iterations: Number of outlier removal iterations
-        initial_tolerance: Initial distance threshold in pixels
-        
-    Returns:
-        Filtered points array
-    """
-    tolerance = initial_tolerance
-    
-    for i in range(iterations):
-        if len(points) < 3:
-            break
-        
-        line = _fit_line(points)
-        if line is None:
-            break
-        
-        slope, intercept = line
-        
-        # Calculate distance of each point from fitted line
-        x = points[:, 0]
-        y = points[:, 1]
-        predicted_y = slope * x + intercept
-        distances = np.abs(y - predicted_y)
-        
-        # Keep only points within tolerance
-        mask = distances < tolerance
-        points = points[mask]
-        
-        # Decrease tolerance for next iteration
-        tolerance -= 2
-        if tolerance < 5:
-            tolerance = 5
-    
-    return points
-
-def measure_terminal_width(image, roi, terminal_roi, edge_contrast=106, debug=False):
+def measure_terminal_width(image, roi, terminal_roi, edge_contrast=106, debug=False, context=None):
     debug = resolve_debug(debug)
     """
     Measure terminal width using blob contour detection and projection onto package edges.
@@ -609,12 +509,14 @@ def measure_terminal_width(image, roi, terminal_roi, edge_contrast=106, debug=Fa
         terminal_roi: Terminal ROI (x, y, w, h) within package
         edge_contrast: Contrast threshold from pocket_params (default 106)
         debug: If True, print debug information
+        context: Optional InspectionContext supplying the shared gray plane
     
     Returns:
-        Terminal width in pixels, or None if failed
+        Terminal width in pixels (sub-pixel, 2 decimals), or None if failed
     """
     # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
+    if context is None:
+        image = np.copy(image)
     
     x, y, w, h = roi
     tx, ty, tw, th = terminal_roi
@@ -623,14 +525,14 @@ def measure_terminal_width(image, roi, terminal_roi, edge_contrast=106, debug=Fa
         print(f"[DEBUG] Terminal Width: Package ROI=({x}, {y}, {w}, {h}), Terminal ROI=({tx}, {ty}, {tw}, {th})")
     
     # Crop terminal region from image
-    crop = image[ty:ty+th, tx:tx+tw]
+    crop = context.gray_crop(terminal_roi) if context is not None else image[ty:ty+th, tx:tx+tw]
     
     if crop.size == 0:
         if debug:
             print(f"[DEBUG] Terminal Width: Empty crop")
         return None
     
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    gray = crop if context is not None else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
     
     # Use edge contrast from pocket_params
     contrast_threshold = edge_contrast
@@ -670,16 +572,25 @@ def measure_terminal_width(image, roi, terminal_roi, edge_contrast=106, debug=Fa
     if debug:
         print(f"[DEBUG] Terminal Width: Leftmost={leftmost}, Rightmost={rightmost}")
     
+    # Sub-pixel: refine the extreme x positions to where the gray row crosses the threshold
+    (left_x, left_y), (right_x, right_y) = leftmost, rightmost
+    level = contrast_threshold + 0.5
+    left_edge = left_x + (float(crossing_offset(gray[left_y, left_x - 1], gray[left_y, left_x], level))
+                          if left_x > 0 else 0.0)
+    right_edge = right_x + (float(crossing_offset(gray[right_y, right_x], gray[right_y, right_x + 1], level))
+                            if right_x + 1 < gray.shape[1] else 0.0)
+    
     # Calculate Euclidean distance (old ChipCap method)
-    dist = np.sqrt((rightmost[0] - leftmost[0])**2 + (rightmost[1] - leftmost[1])**2)
+    dist = np.sqrt((right_edge - left_edge)**2 + (right_y - left_y)**2)
     
     if debug:
-        print(f"[DEBUG] Terminal Width: Distance={dist:.1f} pixels")
+        print(f"[DEBUG] Terminal Width: Distance={dist:.2f} pixels")
     
-    return int(round(dist))
+    return round(float(dist), 2)
 
 
-def measure_terminal_length(image, roi, terminal_roi, edge_contrast=106, num_scans=100, debug=False):
+def measure_terminal_length(image, roi, terminal_roi, edge_contrast=106, num_scans=100, debug=False,
+                            context=None):
     debug = resolve_debug(debug)
     """
     Measure terminal length using multi-scan edge detection.
@@ -693,12 +604,14 @@ def measure_terminal_length(image, roi, terminal_roi, edge_contrast=106, num_sca
         edge_contrast: Contrast threshold from pocket_params (default 106)
         num_scans: Number of scan lines (default 100)
         debug: If True, print debug information
+        context: Optional InspectionContext supplying the shared gray plane
     
     Returns:
-        Terminal length in pixels (median of all scan measurements), or None if failed
+        Terminal length in pixels (sub-pixel, 2 decimals) (median of all scan measurements), or None if failed
     """
     # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
+    if context is None:
+        image = np.copy(image)
     
     x, y, w, h = roi
     tx, ty, tw, th = terminal_roi
@@ -706,14 +619,14 @@ def measure_terminal_length(image, roi, terminal_roi, edge_contrast=106, num_sca
     if debug:
         print(f"[DEBUG] Terminal Length: Package ROI=({x}, {y}, {w}, {h}), Terminal ROI=({tx}, {ty}, {tw}, {th})")
     
-    crop = image[ty:ty+th, tx:tx+tw]
+    crop = context.gray_crop(terminal_roi) if context is not None else image[ty:ty+th, tx:tx+tw]
     
     if crop.size == 0:
         if debug:
             print(f"[DEBUG] Terminal Length: Empty crop")
         return None
     
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    gray = crop if context is not None else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
     
     # Try two binarization approaches: inverted and non-inverted
     binary_inv = None
@@ -751,30 +664,15 @@ def measure_terminal_length(image, roi, terminal_roi, edge_contrast=106, num_sca
         print(f"[DEBUG] Terminal Length: Using {polarity_used} polarity")
     
     # Perform edge detection on each scan line
-    measurements = []
     skip_factor = max(1, tw // num_scans)
     
-    # Scan horizontally across terminal width
-    for col in range(0, tw, skip_factor):
-        if col >= binary.shape[1]:
-            continue
-            
-        column_data = binary[:, col]
-        
-        # Find white regions (terminal) in this column
-        white_pixels = np.where(column_data == 255)[0]
-        
-        if len(white_pixels) < 2:
-            continue
-        
-        # Inner edge = first white pixel, Outer edge = last white pixel
-        inner_edge = white_pixels[0]
-        outer_edge = white_pixels[-1]
-        
-        length = outer_edge - inner_edge
-        
-        if length > 2:  # Only count valid measurements
-            measurements.append(length)
+    # Scan horizontally across terminal width, all scan lines at once:
+    # inner edge = first white (terminal) pixel, outer edge = last white pixel
+    # (edges refined to sub-pixel where the gray profile crosses the threshold)
+    inner_edge, outer_edge, white_count = white_extents(binary, skip_factor, tw, gray, edge_contrast + 0.5)
+    lengths = outer_edge - inner_edge
+    # Only count valid measurements
+    measurements = lengths[(white_count >= 2) & (lengths > 2)]
     
     if len(measurements) < 3:
         if debug:
@@ -786,16 +684,9 @@ def measure_terminal_length(image, roi, terminal_roi, edge_contrast=106, num_sca
         sobel_edges = np.abs(sobelx)
         sobel_thresh = cv2.threshold(sobel_edges.astype(np.uint8), 30, 255, cv2.THRESH_BINARY)[1]
         
-        measurements = []
-        for col in range(0, tw, skip_factor):
-            if col >= sobel_thresh.shape[1]:
-                continue
-            column_data = sobel_thresh[:, col]
-            edge_pixels = np.where(column_data == 255)[0]
-            
-            if len(edge_pixels) >= 2:
-                # Find the two strongest edges (likely boundaries)
-                measurements.append(edge_pixels[-1] - edge_pixels[0])
+        # Outermost edge pixels of each scan line (likely boundaries)
+        first_edge, last_edge, edge_count = white_extents(sobel_thresh, skip_factor, tw)
+        measurements = (last_edge - first_edge)[edge_count >= 2]
         
         if len(measurements) < 3:
             if debug:
@@ -806,14 +697,14 @@ def measure_terminal_length(image, roi, terminal_roi, edge_contrast=106, num_sca
     median_length = np.median(measurements)
     
     if debug:
-        print(f"[DEBUG] Terminal Length: Measurements count={len(measurements)}, median={median_length:.1f}")
-        print(f"[DEBUG] Terminal Length: Min={np.min(measurements)}, Max={np.max(measurements)}, Mean={np.mean(measurements):.1f}")
+        print(f"[DEBUG] Terminal Length: Measurements count={len(measurements)}, median={median_length:.2f}")
+        print(f"[DEBUG] Terminal Length: Min={np.min(measurements):.2f}, Max={np.max(measurements):.2f}, Mean={np.mean(measurements):.2f}")
     
-    return int(round(median_length))
+    return round(float(median_length), 2)
 
 
 def measure_term_to_term_length(image, roi, left_terminal_roi, right_terminal_roi, 
-                               edge_contrast=106, num_scans=100, debug=False):
+                               edge_contrast=106, num_scans=100, debug=False, context=None):
     """
     Measure terminal-to-terminal length (gap between opposing terminals).
     Matches old ChipCap algorithm: scans multiple lines, finds outer edge of left terminal
@@ -827,12 +718,14 @@ def measure_term_to_term_length(image, roi, left_terminal_roi, right_terminal_ro
         edge_contrast: Contrast threshold from pocket_params (default 106)
         num_scans: Number of scan lines (default 100)
         debug: If True, print debug information
+        context: Optional InspectionContext supplying the shared gray plane
     
     Returns:
-        Terminal-to-terminal length in pixels (median gap), or None if failed
+        Terminal-to-terminal length in pixels (sub-pixel, 2 decimals) (median gap), or None if failed
     """
     # CRITICAL: Create independent copy to prevent memory corruption
-    image = np.copy(image)
+    if context is None:
+        image = np.copy(image)
     
     x, y, w, h = roi
     ltx, lty, ltw, lth = left_terminal_roi
@@ -842,16 +735,23 @@ def measure_term_to_term_length(image, roi, left_terminal_roi, right_terminal_ro
         print(f"[DEBUG] Term-Term Length: Left={left_terminal_roi}, Right={right_terminal_roi}")
     
     # Crop left terminal
-    left_crop = image[lty:lty+lth, ltx:ltx+ltw]
-    right_crop = image[rty:rty+rth, rtx:rtx+rtw]
+    if context is not None:
+        left_crop = context.gray_crop(left_terminal_roi)
+        right_crop = context.gray_crop(right_terminal_roi)
+    else:
+        left_crop = image[lty:lty+lth, ltx:ltx+ltw]
+        right_crop = image[rty:rty+rth, rtx:rtx+rtw]
     
     if left_crop.size == 0 or right_crop.size == 0:
         if debug:
             print(f"[DEBUG] Term-Term Length: Empty crop")
         return None
     
-    left_gray = cv2.cvtColor(left_crop, cv2.COLOR_BGR2GRAY)
-    right_gray = cv2.cvtColor(right_crop, cv2.COLOR_BGR2GRAY)
+    if context is not None:
+        left_gray, right_gray = left_crop, right_crop
+    else:
+        left_gray = cv2.cvtColor(left_crop, cv2.COLOR_BGR2GRAY)
+        right_gray = cv2.cvtColor(right_crop, cv2.COLOR_BGR2GRAY)
     
     # Try two binarization approaches for both terminals
     def get_best_binary(gray, edge_contrast, debug=False):
@@ -879,42 +779,22 @@ def measure_term_to_term_length(image, roi, left_terminal_roi, right_terminal_ro
     left_binary = cv2.morphologyEx(left_binary, cv2.MORPH_CLOSE, kernel, iterations=1)
     right_binary = cv2.morphologyEx(right_binary, cv2.MORPH_CLOSE, kernel, iterations=1)
     
-    measurements = []
     skip_factor = max(1, ltw // num_scans)
     
-    # Scan horizontally through both terminals
-    for col in range(0, min(ltw, rtw), skip_factor):
-        # Left terminal: find rightmost edge (outer edge)
-        if col < left_binary.shape[1]:
-            left_column = left_binary[:, col]
-            left_white = np.where(left_column == 255)[0]
-            
-            if len(left_white) == 0:
-                continue
-            
-            left_outer_edge = left_white[-1]  # rightmost (outer) edge
-        else:
-            continue
-        
-        # Right terminal: find leftmost edge (inner edge)
-        if col < right_binary.shape[1]:
-            right_column = right_binary[:, col]
-            right_white = np.where(right_column == 255)[0]
-            
-            if len(right_white) == 0:
-                continue
-            
-            right_inner_edge = right_white[0]  # leftmost (inner) edge
-        else:
-            continue
-        
-        # Gap = distance between right terminal's inner edge and left terminal's outer edge
-        # We need to account for the offset between the two ROIs
-        roi_offset = rtx - (ltx + ltw)
-        gap = (right_inner_edge + roi_offset) - left_outer_edge
-        
-        if gap > 1:  # Only count positive gaps
-            measurements.append(gap)
+    # Scan horizontally through both terminals (columns present in both crops), all at once
+    limit = min(ltw, rtw, left_binary.shape[1], right_binary.shape[1])
+    # Left terminal: rightmost (outer) edge; right terminal: leftmost (inner) edge
+    # (edges refined to sub-pixel where the gray profile crosses the threshold)
+    level = edge_contrast + 0.5
+    _, left_outer_edge, left_count = white_extents(left_binary, skip_factor, limit, left_gray, level)
+    right_inner_edge, _, right_count = white_extents(right_binary, skip_factor, limit, right_gray, level)
+    
+    # Gap = distance between right terminal's inner edge and left terminal's outer edge
+    # We need to account for the offset between the two ROIs
+    roi_offset = rtx - (ltx + ltw)
+    gaps = (right_inner_edge + roi_offset) - left_outer_edge
+    # Only count positive gaps
+    measurements = gaps[(left_count > 0) & (right_count > 0) & (gaps > 1)]
     
     if len(measurements) < 3:
         if debug:
@@ -924,10 +804,10 @@ def measure_term_to_term_length(image, roi, left_terminal_roi, right_terminal_ro
     median_gap = np.median(measurements)
     
     if debug:
-        print(f"[DEBUG] Term-Term Length: Measurements count={len(measurements)}, median={median_gap:.1f}")
-        print(f"[DEBUG] Term-Term Length: Min={np.min(measurements)}, Max={np.max(measurements)}, Mean={np.mean(measurements):.1f}")
+        print(f"[DEBUG] Term-Term Length: Measurements count={len(measurements)}, median={median_gap:.2f}")
+        print(f"[DEBUG] Term-Term Length: Min={np.min(measurements):.2f}, Max={np.max(measurements):.2f}, Mean={np.mean(measurements):.2f}")
     
-    return int(round(median_gap))
+    return round(float(median_gap), 2)
 
 
 def check_body_width_difference(top_body_width, bottom_body_width, tolerance, debug=False):
@@ -0,0 +1,241 @@
+"""
+Sub-pixel edge localization shared by the dimension measurements.
+
+The measurements still decide *which* edge to measure on a binarized image
+(threshold polarity, strongest gradient per scan line); the position of that
+edge is then refined on the gray profile:
+
+- gradient edges: the gray-profile gradient peak near the coarse edge is
+  interpolated with a parabola through the peak and its two neighbours;
+- threshold edges (first / last white pixel of a scan line): the gray
+  profile is linearly interpolated where it crosses the threshold.
+
+Positions are in pixel-centre coordinates. A sharp edge lying on a pixel
+boundary gives the same result as the integer-pixel measurement, so taught
+ranges stay valid; an edge shifted by 0.3 px reads as shifted by ~0.3 px.
+
+Lines are fitted to the edge points with fit_line_robust, whose residual RMS
+doubles as a quality metric of the measured edge.
+"""
+
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+# Robust line fit budget: point pairs for the median start line, then IRLS passes
+LINE_FIT_PAIRS = 32
+LINE_FIT_IRLS_ITERATIONS = 3
+# Preallocated point-pair draws (fractions of the point count); fixed, so a fit is repeatable
+_PAIR_DRAWS = np.random.default_rng(0).random((LINE_FIT_PAIRS, 2))
+
+
+def profile_gradient(grad):
+    """
+    Gradient of the lightly smoothed gray profile, float32.
+
+    grad is the CV_16S 3x3 Sobel of the whole gray crop (see inspection_context.crop_gradient);
+    both filters are linear, so smoothing the shared gradient plane equals the gradient of the
+    smoothed profile. Slice the result for a scan region, so edges near the region border are
+    refined on real neighbouring pixels.
+    """
+    return cv2.GaussianBlur(np.asarray(grad, np.float32), (5, 5), 1.0)
+
+
+def parabolic_offset(left, center, right):
+    """Vertex offset (-0.5..0.5) of the parabola through three samples around a peak."""
+    left, center, right = (np.asarray(v, np.float64) for v in (left, center, right))
+    denom = left - 2.0 * center + right
+    offset = np.divide(0.5 * (left - right), denom, out=np.zeros_like(denom), where=denom != 0)
+    return np.clip(offset, -0.5, 0.5)
+
+
+def crossing_offset(lower, upper, level):
+    """
+    Sub-pixel offset (-0.5..0.5) of a threshold edge between pixels k and k+1.
+
+    lower / upper are the profile values at k and k+1; the result is where the
+    profile crosses level, relative to the k+0.5 pixel boundary. 0 where the
+    two samples do not straddle level (e.g. an edge moved by morphology).
+    """
+    lower, upper = np.asarray(lower, np.float64), np.asarray(upper, np.float64)
+    straddle = (lower - level) * (upper - level) < 0
+    frac = np.divide(level - lower, upper - lower, out=np.full_like(lower, 0.5), where=straddle)
+    return frac - 0.5
+
+
+def refine_peaks(profile, index, sign=1, radius=2):
+    """
+    Sub-pixel gradient peak near each coarse edge index.
+
+    profile: (length, lines) gradient block of the gray profile, one scan line per
+    column; index: coarse edge position per scan line; sign: +1 rising, -1 falling.
+    The strongest same-sign gradient within +-radius of the coarse index is refined
+    with parabolic_offset. Returns float positions.
+    """
+    length = profile.shape[0]
+    lines = np.arange(profile.shape[1])
+    window = np.clip(index[None, :] + np.arange(-radius, radius + 1)[:, None], 0, length - 1)
+    peak = window[np.argmax(sign * profile[window, lines], axis=0), lines]
+    inner = (peak > 0) & (peak < length - 1)
+    left = profile[np.maximum(peak - 1, 0), lines]
+    right = profile[np.minimum(peak + 1, length - 1), lines]
+    offset = parabolic_offset(sign * left, sign * profile[peak, lines], sign * right)
+    return peak + np.where(inner, offset, 0.0)
+
+
+def scan_edge_points(grad, axis, step=1, offset=0, profile=None):
+    """
+    Strongest rising and falling edge on every step-th scan line of a gradient block, in one pass.
+
+    axis=0 scans columns (edge position is y), axis=1 scans rows (edge position is x).
+    Returns (rising, falling), each (points, strength): points is an (N, 2) array of [x, y]
+    with offset added to the edge position, strength the gradient magnitude at the edge.
+    With profile (the gray-profile gradient, see profile_gradient) the edge positions are
+    refined to sub-pixel. Threshold with select_edges, so a fallback polarity / threshold
+    needs no rescan.
+    """
+    block = grad[:, ::step] if axis == 0 else grad[::step, :].T
+    lines = np.arange(block.shape[1]) * step
+    pos_idx = np.argmax(block, axis=0)
+    neg_idx = np.argmin(block, axis=0)
+    pos_val = block[pos_idx, np.arange(block.shape[1])]
+    neg_val = block[neg_idx, np.arange(block.shape[1])]
+    if profile is not None:
+        profile = profile[:, ::step] if axis == 0 else profile[::step, :].T
+        pos_idx = refine_peaks(profile, pos_idx, 1)
+        neg_idx = refine_peaks(profile, neg_idx, -1)
+
+    def points(idx):
+        idx = idx + offset
+        return np.column_stack((lines, idx) if axis == 0 else (idx, lines))
+
+    return (points(pos_idx), pos_val), (points(neg_idx), -neg_val)
+
+
+def select_edges(edges, threshold):
+    """Edge points from scan_edge_points whose gradient magnitude exceeds threshold."""
+    points, strength = edges
+    return points[strength > threshold]
+
+
+def white_extents(binary, step=1, limit=None, gray=None, level=None):
+    """
+    First and last white (255) row of every step-th column of binary (columns < limit).
+
+    Returns (first, last, count) arrays, one entry per scanned column; count is the
+    number of white pixels, first/last are only meaningful where count > 0. With the
+    gray image binary was thresholded from and the threshold level, first/last are
+    refined to where the gray profile crosses level.
+    """
+    white = binary[:, :limit:step] == 255
+    count = np.count_nonzero(white, axis=0)
+    first = np.argmax(white, axis=0)
+    last = white.shape[0] - 1 - np.argmax(white[::-1], axis=0)
+    if gray is None:
+        return first, last, count
+
+    profile = gray[:, :limit:step]
+    length = profile.shape[0]
+    lines = np.arange(profile.shape[1])
+    before = profile[np.maximum(first - 1, 0), lines]
+    after = profile[np.minimum(last + 1, length - 1), lines]
+    first_offset = crossing_offset(before, profile[first, lines], level)
+    last_offset = crossing_offset(profile[last, lines], after, level)
+    first = first + np.where(first > 0, first_offset, 0.0)
+    last = last + np.where(last < length - 1, last_offset, 0.0)
+    return first, last, count
+
+
+def fit_line(points):
+    """
+    Least-squares line through points.
+
+    Args:
+        points: Nx2 array of [x, y] coordinates
+
+    Returns:
+        [slope, intercept] of y = slope * x + intercept, or None if fitting fails
+    """
+    if len(points) < 2:
+        return None
+
+    x = points[:, 0].astype(np.float64)
+    y = points[:, 1].astype(np.float64)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    denominator = np.dot(dx, dx)
+    if denominator == 0:
+        return None
+
+    slope = np.dot(dx, y - y_mean) / denominator
+    return [slope, y_mean - slope * x_mean]
+
+
+class LineFit(NamedTuple):
+    """Result of fit_line_robust."""
+    line: list              # [slope, intercept] of y = slope * x + intercept
+    inliers: np.ndarray     # bool mask over the fitted points
+    rms: float              # residual RMS of the inliers (px), the edge quality
+
+
+def fit_line_robust(points, tolerance=7.0):
+    """
+    Robust least-squares line with a fixed compute budget.
+
+    The start line is a median estimate: the median slope of LINE_FIT_PAIRS
+    preallocated point pairs and the median intercept for that slope, so it
+    sits in the bulk of the points even when they form several groups. It is
+    refined by LINE_FIT_IRLS_ITERATIONS Huber-weighted least-squares passes on
+    contiguous float32 arrays, which pull it to the centre of that bulk without
+    letting it jump to a smaller, tighter group. Points within tolerance (px)
+    of it are the inliers, and the returned line is the least-squares fit of
+    the inliers.
+
+    Args:
+        points: Nx2 array of [x, y] coordinates
+        tolerance: Inlier distance (px), also the Huber weight cut-off; the default
+            matches the final band of the iterative outlier removal it replaced
+
+    Returns:
+        LineFit, or None if no line can be fitted (fewer than 2 distinct x)
+    """
+    count = len(points)
+    if count < 2:
+        return None
+    x = np.ascontiguousarray(points[:, 0], dtype=np.float32)
+    y = np.ascontiguousarray(points[:, 1], dtype=np.float32)
+
+    # Median start line: median pair slope, then the median intercept for it
+    first = (_PAIR_DRAWS[:, 0] * count).astype(np.intp)
+    second = (_PAIR_DRAWS[:, 1] * count).astype(np.intp)
+    second = np.where(first == second, (second + 1) % count, second)
+    run = x[second] - x[first]
+    usable = run != 0
+    if not usable.any():
+        return None
+    slope = np.median((y[second] - y[first])[usable] / run[usable])
+    intercept = np.median(y - slope * x)
+
+    # IRLS with Huber weights
+    for _ in range(LINE_FIT_IRLS_ITERATIONS):
+        distance = np.abs(y - (slope * x + intercept))
+        weights = (tolerance / np.maximum(distance, tolerance)).astype(np.float32)
+        total = weights.sum()
+        x_mean = np.dot(weights, x) / total
+        y_mean = np.dot(weights, y) / total
+        dx = x - x_mean
+        denominator = np.dot(weights, dx * dx)
+        if denominator == 0:
+            break
+        slope = np.dot(weights, dx * (y - y_mean)) / denominator
+        intercept = y_mean - slope * x_mean
+
+    inliers = np.abs(y - (slope * x + intercept)) < tolerance
+    line = fit_line(points[inliers]) if np.count_nonzero(inliers) >= 2 else None
+    if line is None:
+        line = [float(slope), float(intercept)]
+    residuals = points[inliers, 1] - (line[0] * points[inliers, 0] + line[1])
+    rms = float(np.sqrt(np.mean(residuals * residuals))) if residuals.size else 0.0
+    return LineFit(line, inliers, rms)
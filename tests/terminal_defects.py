@@ -1,11 +1,12 @@
 import cv2
 import numpy as np
 from config.debug_runtime import resolve_debug
+from tests.blob_analysis import clean_defect_mask, find_defect_blobs
 
 
 def check_terminal_pogo(image, roi, contrast, min_area, min_square=255,
                         offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
-                        apply_or=True, debug=False):
+                        apply_or=True, debug=False, context=None):
     """
     Detect black defects (pogo) within the terminal region using package ROI offsets.
 
@@ -17,9 +18,12 @@ def check_terminal_pogo(image, roi, contrast, min_area, min_square=255,
         offset_*: margins to ignore edges of the package ROI
         apply_or: OR/AND logic for area vs size
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
 
     Returns: (defects_found, largest_area, is_pass, defect_rects)
     """
+    if context is not None:
+        image = context.gray
     x, y, w, h = roi
     ix = x + offset_left
     iy = y + offset_top
@@ -53,7 +57,7 @@ def check_terminal_oxidation(image, roi,
                              teach_contrast=128, contrast_difference=20,
                              offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
                              corner_x=0, corner_y=0,
-                             debug=False):
+                             debug=False, context=None):
     """
     Detect terminal oxidation by comparing current terminal contrast against taught reference.
     
@@ -68,9 +72,12 @@ def check_terminal_oxidation(image, roi,
         offset_*: margins to ignore edges of terminal
         corner_x/corner_y: corner chamfer to ignore oxidation-free corners
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
 
     Returns: (measured_contrast, difference, is_pass)
     """
+    if context is not None:
+        image = context.gray
     x, y, w, h = roi
     
     # Define inspection region (full terminal area with offsets)
@@ -89,7 +96,30 @@ def check_terminal_oxidation(image, roi,
         return teach_contrast, 0, True
     
     gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if len(crop.shape) == 3 else crop
+    chamfer = corner_x > 0 and corner_y > 0
+    chx, chy = min(corner_x, iw), min(corner_y, ih)
     
+    if context is not None and gray.shape == (ih, iw) and 2 * chx <= iw and 2 * chy <= ih:
+        # O(1) band sums: the chamfer corners (disjoint here) count as 255
+        total = context.band_sum((ix, iy, iw, ih))
+        if chamfer:
+            for cx, cy in ((ix, iy), (ix + iw - chx, iy), (ix, iy + ih - chy), (ix + iw - chx, iy + ih - chy)):
+                total += 255 * chx * chy - context.band_sum((cx, cy, chx, chy))
+        measured_contrast = int(total / (iw * ih))
+    else:
+        measured_contrast = _chamfered_mean(gray, iw, ih, corner_x, corner_y)
+    difference = abs(measured_contrast - teach_contrast)
+    is_pass = (difference <= contrast_difference)
+    
+    if debug:
+        print(f"[DEBUG] Terminal Oxidation: taught={teach_contrast}, measured={measured_contrast}, diff={difference}, threshold={contrast_difference}, pass={is_pass}")
+        print(f"[DEBUG] Oxidation ROI: ({ix},{iy},{iw},{ih}), corner_chamfer=({corner_x},{corner_y})")
+    
+    return measured_contrast, difference, is_pass
+
+
+def _chamfered_mean(gray, iw, ih, corner_x, corner_y):
+    """int mean of an oxidation crop with its chamfer corners set to 255."""
     # Apply corner chamfer to ignore clean corners
     if corner_x > 0 and corner_y > 0:
         chx = min(corner_x, iw)
@@ -102,15 +132,7 @@ def check_terminal_oxidation(image, roi,
         gray[ih - chy:ih, iw - chx:iw] = 255  # BR
     
     # Measure average contrast (intensity) in the region
-    measured_contrast = int(np.mean(gray))
-    difference = abs(measured_contrast - teach_contrast)
-    is_pass = (difference <= contrast_difference)
-    
-    if debug:
-        print(f"[DEBUG] Terminal Oxidation: taught={teach_contrast}, measured={measured_contrast}, diff={difference}, threshold={contrast_difference}, pass={is_pass}")
-        print(f"[DEBUG] Oxidation ROI: ({ix},{iy},{iw},{ih}), corner_chamfer=({corner_x},{corner_y})")
-    
-    return measured_contrast, difference, is_pass
+    return int(np.mean(gray))
 
 
 # -----------------------------------------------------------------------------
@@ -124,7 +146,7 @@ def check_terminal_chipoff_inner(image, roi, contrast, min_area, min_square=255,
                                  offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
                                  apply_or=True, 
                                  enable_pocket_edge_filter=False, pocket_roi=None,
-                                 debug=False):
+                                 debug=False, context=None):
     """
     Detect missing material (chip-off) on inner terminal regions (4 corners of terminals).
     
@@ -147,6 +169,7 @@ def check_terminal_chipoff_inner(image, roi, contrast, min_area, min_square=255,
         enable_pocket_edge_filter: if True, filter defects touching pocket edges
         pocket_roi: pocket ROI (x,y,w,h) for edge filtering, None = use image edges
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
         
     Returns: (defects_found, largest_area, is_pass, defect_rects)
     """
@@ -177,7 +200,7 @@ def check_terminal_chipoff_inner(image, roi, contrast, min_area, min_square=255,
         enable_corner_offset, corner_offset_x, corner_offset_y,
         offset_top, offset_bottom, offset_left, offset_right,
         apply_or, enable_pocket_edge_filter, pocket_roi,
-        debug, label="Inner"
+        debug, label="Inner", context=context
     )
 
 
@@ -185,7 +208,7 @@ def check_terminal_chipoff_outer(image, roi, contrast, min_area, min_square=255,
                                  offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
                                  band_width_ratio=0.25, apply_or=True,
                                  enable_pocket_edge_filter=False, pocket_roi=None,
-                                 debug=False):
+                                 debug=False, context=None):
     """
     Detect missing material (chip-off) on outer terminal regions (left & right bands).
 
@@ -200,6 +223,7 @@ def check_terminal_chipoff_outer(image, roi, contrast, min_area, min_square=255,
         enable_pocket_edge_filter: if True, filter defects touching pocket edges
         pocket_roi: pocket ROI (x,y,w,h) for edge filtering, None = use image edges
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
     Returns: (defects_found, largest_area, is_pass, defect_rects)
     """
     x, y, w, h = roi
@@ -211,7 +235,7 @@ def check_terminal_chipoff_outer(image, roi, contrast, min_area, min_square=255,
     return _inspect_chipoff_regions(image, regions, contrast, min_area, min_square,
                                     offset_top, offset_bottom, offset_left, offset_right,
                                     apply_or, enable_pocket_edge_filter, pocket_roi,
-                                    debug, label="Outer")
+                                    debug, label="Outer", context=context)
 
 
 def _inspect_chipoff_corners(image, regions, contrast, min_area, min_square,
@@ -219,7 +243,7 @@ def _inspect_chipoff_corners(image, regions, contrast, min_area, min_square,
                             enable_corner_offset, corner_offset_x, corner_offset_y,
                             offset_top, offset_bottom, offset_left, offset_right,
                             apply_or, enable_pocket_edge_filter, pocket_roi,
-                            debug, label="Chipoff"):
+                            debug, label="Chipoff", context=None):
     """
     Inspect chipoff defects in corner regions with optional ellipse masking or offset modes.
     
@@ -230,7 +254,10 @@ def _inspect_chipoff_corners(image, regions, contrast, min_area, min_square,
         corner_offset_x/y: chamfer pixels (when enable_corner_offset=True)
         offset_*: rectangular margins (when enable_corner_offset=False)
     """
-    image = np.copy(image)
+    if context is not None:
+        image = context.gray
+    else:
+        image = np.copy(image)
     total_defects = 0
     largest_area = 0
     all_rects = []
@@ -299,8 +326,11 @@ def _inspect_chipoff_corners(image, regions, contrast, min_area, min_square,
 def _inspect_chipoff_regions(image, regions, contrast, min_area, min_square,
                              offset_top, offset_bottom, offset_left, offset_right,
                              apply_or, enable_pocket_edge_filter, pocket_roi,
-                             debug, label="Chipoff"):
-    image = np.copy(image)
+                             debug, label="Chipoff", context=None):
+    if context is not None:
+        image = context.gray
+    else:
+        image = np.copy(image)
     total_defects = 0
     largest_area = 0
     all_rects = []
@@ -318,16 +348,22 @@ def _inspect_chipoff_regions(image, regions, contrast, min_area, min_square,
             continue
         gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if len(crop.shape) == 3 else crop
 
-        cnt, largest, rects = _detect_black_defects(gray, contrast, min_area, min_square, apply_or, debug)
+        blobs = _black_defect_blobs(gray, contrast, min_area, min_square, apply_or)
+        cnt, largest = blobs.count, blobs.largest_area
         
-        # Apply pocket edge filter if enabled
-        if enable_pocket_edge_filter and pocket_roi:
-            rects = _filter_pocket_edge_defects(rects, (ix, iy), pocket_roi, debug)
-            cnt = len(rects)
-            largest = max([rw0 * rh0 for (_, _, rw0, rh0) in rects]) if rects else 0
+        # Apply pocket edge filter if enabled (on the whole rect array)
+        if enable_pocket_edge_filter and pocket_roi and cnt:
+            keep = ~_pocket_edge_mask(blobs.rects, (ix, iy), pocket_roi)
+            if debug:
+                for (fx, fy, fw, fh), kept in zip(blobs.rect_list(ix, iy), keep.tolist()):
+                    if not kept:
+                        print(f"[DEBUG] Filtered pocket edge defect at ({fx},{fy},{fw},{fh})")
+            blobs = blobs._replace(rects=blobs.rects[keep], areas=blobs.areas[keep])
+            cnt = blobs.count
+            largest = int((blobs.rects[:, 2] * blobs.rects[:, 3]).max()) if cnt else 0
         
         # Offset rects to image coordinates
-        rects = [(ix + rx0, iy + ry0, rw0, rh0) for (rx0, ry0, rw0, rh0) in rects]
+        rects = blobs.rect_list(ix, iy)
 
         total_defects += cnt
         largest_area = max(largest_area, largest)
@@ -359,86 +395,59 @@ def _filter_pocket_edge_defects(rects, crop_offset, pocket_roi, debug=False):
     if not pocket_roi or not rects:
         return rects
     
-    px, py, pw, ph = pocket_roi
     crop_x, crop_y = crop_offset
+    touches_edge = _pocket_edge_mask(np.asarray(rects), crop_offset, pocket_roi)
     
     filtered = []
-    for (rx, ry, rw, rh) in rects:
-        # Convert rect to image coordinates
-        img_x = crop_x + rx
-        img_y = crop_y + ry
-        
-        # Check if defect touches any pocket edge (with 2px tolerance)
-        edge_tolerance = 2
-        touches_left = (img_x <= px + edge_tolerance)
-        touches_right = (img_x + rw >= px + pw - edge_tolerance)
-        touches_top = (img_y <= py + edge_tolerance)
-        touches_bottom = (img_y + rh >= py + ph - edge_tolerance)
-        
-        touches_edge = touches_left or touches_right or touches_top or touches_bottom
-        
-        if not touches_edge:
+    for (rx, ry, rw, rh), touches in zip(rects, touches_edge.tolist()):
+        if not touches:
             filtered.append((rx, ry, rw, rh))
         elif debug:
-            print(f"[DEBUG] Filtered pocket edge defect at ({img_x},{img_y},{rw},{rh})")
+            print(f"[DEBUG] Filtered pocket edge defect at ({crop_x + rx},{crop_y + ry},{rw},{rh})")
     
     return filtered
 
 
+def _pocket_edge_mask(rects, crop_offset, pocket_roi):
+    """
+    True for each rect of an (N, 4) crop-coordinate array that touches a pocket edge
+    (2px tolerance), evaluated for all rects at once.
+    """
+    px, py, pw, ph = pocket_roi
+    edge_tolerance = 2
+    img_x = rects[:, 0] + crop_offset[0]
+    img_y = rects[:, 1] + crop_offset[1]
+    return ((img_x <= px + edge_tolerance) | (img_x + rects[:, 2] >= px + pw - edge_tolerance)
+            | (img_y <= py + edge_tolerance) | (img_y + rects[:, 3] >= py + ph - edge_tolerance))
+
+
 def _detect_black_defects(gray, contrast, min_area, min_square, apply_or=True, debug=False):
     debug = resolve_debug(debug)
     """
-    Common helper: binarize for black defects and collect qualifying contours.
+    Common helper: binarize for black defects and collect qualifying blobs.
     Returns (defects_found, largest_area, rects)
     """
     if gray.size == 0:
         return 0, 0, []
+    blobs = _black_defect_blobs(gray, contrast, min_area, min_square, apply_or)
+    return blobs.count, blobs.largest_area, blobs.rect_list()
+
 
+def _black_defect_blobs(gray, contrast, min_area, min_square, apply_or=True):
+    """Black defect blobs (tests.blob_analysis.Blobs) of a non-empty gray crop: avg - contrast threshold."""
     # Adaptive threshold: terminal avg - contrast
     body_avg = int(np.mean(gray))
     threshold = max(0, min(255, body_avg - int(contrast)))
     _, binary = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY_INV)
 
-    # Clean small noise
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=1)
-    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, iterations=1)
-
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    defects = []
-    rects = []
-    for cnt in contours:
-        area = cv2.contourArea(cnt)
-        if area < 10:
-            continue
-        x, y, w, h = cv2.boundingRect(cnt)
-        area_fail = (min_area != 255) and (area >= int(min_area))
-        size_fail = False
-        if min_square != 255:
-            size_fail = (w >= int(min_square)) or (h >= int(min_square))
-        if apply_or:
-            is_defect = area_fail or size_fail
-        else:
-            checks = []
-            if min_area != 255:
-                checks.append(area_fail)
-            if min_square != 255:
-                checks.append(size_fail)
-            is_defect = all(checks) if checks else False
-        if is_defect:
-            defects.append({'area': area, 'rect': (x, y, w, h)})
-            rects.append((x, y, w, h))
-
-    count = len(defects)
-    largest = int(max([d['area'] for d in defects]) if defects else 0)
-    return count, largest, rects
+    # Clean small noise, then label and apply the area / size rule to all blobs at once
+    return find_defect_blobs(clean_defect_mask(binary), min_area, min_square, apply_or)
 
 
 def check_incomplete_termination_1(image, roi, contrast, min_area, min_square=255,
                                     offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
                                     corner_x=0, corner_y=0,
-                                    apply_or=True, debug=False):
+                                    apply_or=True, debug=False, context=None):
     """
     Incomplete Termination 1: detect black defects (poor plating) on terminal areas
     using fixed terminal regions (top and bottom bands).
@@ -453,10 +462,14 @@ def check_incomplete_termination_1(image, roi, contrast, min_area, min_square=25
         corner_x/corner_y: chamfer offsets to ignore corners (pixels)
         apply_or: OR/AND logic for area vs size
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
 
     Returns: (defects_found, largest_area, is_pass, defect_rects)
     """
-    image = np.copy(image)
+    if context is not None:
+        image = context.gray
+    else:
+        image = np.copy(image)
     x, y, w, h = roi
 
     # Define terminal regions: top and bottom fixed bands (30% each)
@@ -510,7 +523,7 @@ def check_incomplete_termination_2(image, roi, contrast, min_area, min_square=25
                                     left_top=0, left_bottom=0, left_left=0, left_right=0,
                                     right_top=0, right_bottom=0, right_left=0, right_right=0,
                                     corner_x=0, corner_y=0,
-                                    apply_or=True, debug=False):
+                                    apply_or=True, debug=False, context=None):
     """
     Incomplete Termination 2: per-electrode inspection with user-defined inspection areas.
     
@@ -532,7 +545,10 @@ def check_incomplete_termination_2(image, roi, contrast, min_area, min_square=25
         apply_or: OR/AND logic for area vs size
     Returns: (defects_found, largest_area, is_pass, defect_rects)
     """
-    image = np.copy(image)
+    if context is not None:
+        image = context.gray
+    else:
+        image = np.copy(image)
     x, y, w, h = roi
 
     # LEFT terminal: start from left edge + left_left (A), width = left_right (B)
@@ -591,7 +607,7 @@ def check_terminal_offset(image, roi,
                          left_top=0, left_bottom=0, left_left=0, left_right=0, left_corner_x=0, left_corner_y=0,
                          right_top=0, right_bottom=0, right_left=0, right_right=0, right_corner_x=0, right_corner_y=0,
                          contrast=255, min_area=255, min_square=255,
-                         apply_or=True, debug=False):
+                         apply_or=True, debug=False, context=None):
     """
     Check terminal dimensions against configured offset limits (inspection coverage area).
     Detects if terminals fall outside expected offset boundaries.
@@ -613,9 +629,12 @@ def check_terminal_offset(image, roi,
         contrast/min_area/min_square: defect detection thresholds (optional)
         apply_or: OR/AND logic for area vs size
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
 
     Returns: (is_pass, debug_info_dict)
     """
+    if context is not None:
+        image = context.gray
     x, y, w, h = roi
 
     # Define left and right terminal ROIs based on offset parameters
@@ -689,7 +708,7 @@ def check_terminal_offset(image, roi,
 
 def check_compare_terminal_corner(image, roi, manually_difference=20,
                                   offset_top=0, offset_bottom=0, offset_left=0, offset_right=0,
-                                  corner_width_ratio=0.15, debug=False):
+                                  corner_width_ratio=0.15, debug=False, context=None):
     """
     Compare left and right terminal corner brightness to detect plating differences.
     
@@ -704,9 +723,12 @@ def check_compare_terminal_corner(image, roi, manually_difference=20,
         offset_*: margins to ignore from terminal edges
         corner_width_ratio: fraction of package width to use for corner sampling (default 0.15)
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
 
     Returns: (left_avg, right_avg, difference, is_pass)
     """
+    if context is not None:
+        image = context.gray
     x, y, w, h = roi
     
     # Define corner sampling width (default 15% of package width on each side)
@@ -733,15 +755,21 @@ def check_compare_terminal_corner(image, roi, manually_difference=20,
     left_crop = image[ly:ly+lh, lx:lx+lw]
     if left_crop.size == 0:
         return 0, 0, 0, True
-    left_gray = cv2.cvtColor(left_crop, cv2.COLOR_BGR2GRAY) if len(left_crop.shape) == 3 else left_crop
-    left_avg = int(np.mean(left_gray))
+    if context is not None:
+        left_avg = int(context.band_mean((lx, ly, lw, lh)))
+    else:
+        left_gray = cv2.cvtColor(left_crop, cv2.COLOR_BGR2GRAY) if len(left_crop.shape) == 3 else left_crop
+        left_avg = int(np.mean(left_gray))
     
     # Sample right corner
     right_crop = image[ry:ry+rh, rx:rx+rw]
     if right_crop.size == 0:
         return left_avg, 0, 0, True
-    right_gray = cv2.cvtColor(right_crop, cv2.COLOR_BGR2GRAY) if len(right_crop.shape) == 3 else right_crop
-    right_avg = int(np.mean(right_gray))
+    if context is not None:
+        right_avg = int(context.band_mean((rx, ry, rw, rh)))
+    else:
+        right_gray = cv2.cvtColor(right_crop, cv2.COLOR_BGR2GRAY) if len(right_crop.shape) == 3 else right_crop
+        right_avg = int(np.mean(right_gray))
     
     # Calculate absolute difference
     difference = abs(left_avg - right_avg)
@@ -757,7 +785,7 @@ def check_compare_terminal_corner(image, roi, manually_difference=20,
 def check_black_pixels_count(image, roi, contrast, level, 
                              inspection_width_left=15, inspection_width_right=15,
                              inspection_width_top=15, inspection_width_bottom=15,
-                             debug=False):
+                             debug=False, context=None):
     """
     Count black pixels in terminal inspection bands and compare to threshold.
     
@@ -772,9 +800,12 @@ def check_black_pixels_count(image, roi, contrast, level,
         level: maximum acceptable black pixel count per side
         inspection_width_*: band width for each side in pixels
         debug: verbose logging
+        context: Optional InspectionContext; crops are taken from its shared gray plane
 
     Returns: (total_black_pixels, max_side_count, is_pass, side_counts_dict)
     """
+    if context is not None:
+        image = context.gray
     x, y, w, h = roi
     
     # Define inspection bands for each side
@@ -798,14 +829,20 @@ def check_black_pixels_count(image, roi, contrast, level,
         if crop.size == 0:
             return 0
         
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if len(crop.shape) == 3 else crop
-        
-        # Calculate threshold: avg - contrast
-        avg = int(np.mean(gray))
-        threshold = max(0, avg - int(contrast))
-        
-        # Count pixels below threshold (black defects)
-        black_pixels = np.sum(gray < threshold)
+        if context is not None:
+            # O(1) band mean / count from the frame's band tables
+            avg = int(context.band_mean(band_roi))
+            threshold = max(0, avg - int(contrast))
+            black_pixels = context.band_count_below(band_roi, threshold)
+        else:
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if len(crop.shape) == 3 else crop
+            
+            # Calculate threshold: avg - contrast
+            avg = int(np.mean(gray))
+            threshold = max(0, avg - int(contrast))
+            
+            # Count pixels below threshold (black defects)
+            black_pixels = np.sum(gray < threshold)
         
         if debug:
             print(f"[DEBUG] Black Pixels {label}: count={black_pixels}, avg={avg}, threshold={threshold}, ROI=({bx},{by},{bw},{bh})")
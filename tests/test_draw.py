@@ -1,5 +1,41 @@
 import cv2
 
+
+def status_label(status):
+    """Draw op: PASS/FAIL/PAUSE status text in the top-left corner."""
+    def draw(image):
+        color = (0, 255, 0) if status == "PASS" else (0, 0, 255)
+        cv2.putText(
+            image,
+            status,
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.8,
+            color,
+            2,
+            cv2.LINE_AA
+        )
+        return image
+    return draw
+
+
+def defect_boxes(rects, color=(0, 0, 255), thickness=2):
+    """Draw op: (x, y, w, h) defect rectangles."""
+    def draw(image):
+        for rx, ry, rw, rh in rects:
+            cv2.rectangle(image, (rx, ry), (rx + rw, ry + rh), color, thickness)
+        return image
+    return draw
+
+
+def render_overlay(image, draw_ops):
+    """Rasterize draw ops fn(image) -> image on a copy of image."""
+    overlay = image.copy()
+    for draw in draw_ops:
+        overlay = draw(overlay)
+    return overlay
+
+
 def draw_test_result(image, lines, status):
     """
     Draw inspection result (PASS/FAIL only) on top-left of image.
@@ -13,20 +49,8 @@ def draw_test_result(image, lines, status):
     Returns:
         Tuple of (overlay_image, reason_text)
     """
-    overlay = image.copy()
-    color = (0, 255, 0) if status == "PASS" else (0, 0, 255)
-
     # Draw only the status on the image
-    cv2.putText(
-        overlay,
-        status,
-        (10, 30),
-        cv2.FONT_HERSHEY_SIMPLEX,
-        0.8,
-        color,
-        2,
-        cv2.LINE_AA
-    )
+    overlay = render_overlay(image, [status_label(status)])
 
     # Combine all reason lines into a single string for dialog display
     reason_text = "\n".join(lines) if isinstance(lines, list) else str(lines)
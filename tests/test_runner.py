@@ -1,12 +1,52 @@
 from enum import Enum
-from dataclasses import dataclass
+
 
 class TestStatus(str, Enum):
     PASS = "PASS"
     FAIL = "FAIL"
 
-@dataclass
+
 class TestResult:
-    status: TestStatus
-    message: str
-    result_image: object | None = None   # 👈 ADD THIS
+    """
+    Inspection verdict and its overlay image.
+
+    The overlay is either given ready-made (result_image) or described by the
+    inspected frame (base_image) plus draw operations fn(image) -> image
+    (tests/test_draw.py). Those are only rasterized, on a copy of the frame,
+    the first time result_image is read (display panel, image saver), so a
+    verdict nobody displays costs no drawing and no full-frame copy.
+    base_image is kept by reference: do not modify the frame while the
+    result may still be rendered.
+
+    spans: config.inspection_timing.Span per check / location / mark step,
+    plus the whole inspection, in completion order.
+    """
+
+    def __init__(self, status, message, result_image=None, base_image=None, draw_ops=()):
+        self.status = status
+        self.message = message
+        self._result_image = result_image
+        self.base_image = base_image
+        self.draw_ops = list(draw_ops)
+        self.spans = []
+
+    @property
+    def has_image(self):
+        """True if result_image is available (without rendering it)."""
+        return self._result_image is not None or self.base_image is not None
+
+    @property
+    def result_image(self):
+        if self._result_image is None and self.base_image is not None:
+            from tests.test_draw import render_overlay
+            self._result_image = render_overlay(self.base_image, self.draw_ops)
+        return self._result_image
+
+    @result_image.setter
+    def result_image(self, image):
+        self._result_image = image
+        self.base_image = None
+        self.draw_ops = []
+
+    def __repr__(self):
+        return f"TestResult(status={self.status!r}, message={self.message!r})"
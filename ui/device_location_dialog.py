@@ -271,6 +271,7 @@ class DeviceLocationDialog(QDialog):
             ("y_pkg_shift_tol", "Y Package Shift Tolerance:", 50),
             ("x_sampling_size", "X Sampling Size:", 4),
             ("y_sampling_size", "Y Sampling Size:", 4),
+            ("pyramid_scale", "Pyramid Scale (1 = Off):", 1),
             ("max_parallel_angle", "Max Parallel Angle Tolerance:", 10),
             ("terminal_height_diff", "Terminal Height Difference:", 10),
             ("edge_scan_part_size", "Edge Scan Part Size:", 4),
@@ -282,6 +283,8 @@ class DeviceLocationDialog(QDialog):
             g4.addWidget(label_widget, i, 0)
             self._add_numeric(key, default, g4, i, 1)
 
+        self._add_checkbox("pkg_search_window", "Search Only Within Shift Tolerance", g4, len(fields), 0, 1, 2)
+
         left.addWidget(grp_param)
 
         # ---- Index Gap Inspection ----
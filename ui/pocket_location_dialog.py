@@ -230,6 +230,20 @@ class PocketLocationDialog(QDialog):
         post_row.addStretch()
         left_col.addLayout(post_row)
 
+        # Pyramid Scale row
+        pyramid_row = QHBoxLayout()
+        pyramid_row.setSpacing(10)
+        pyramid_label = QLabel("Pyramid Scale (1 = Off):")
+        pyramid_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        pyramid_row.addWidget(pyramid_label)
+
+        pyramid_scale = self._box("1", "pocket_pyramid_scale")
+        pyramid_scale.setAlignment(Qt.AlignCenter)
+        pyramid_row.addWidget(pyramid_scale)
+
+        pyramid_row.addStretch()
+        left_col.addLayout(pyramid_row)
+
         # Separator
         separator1 = QFrame()
         separator1.setFrameShape(QFrame.HLine)